@@ -0,0 +1,385 @@
+#! /usr/bin/env python
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import resource
+import datetime
+import tempfile
+import multiprocessing
+from argparse import ArgumentParser
+
+# the benchmarks run against the scripts in the source tree
+SCRIPTS_DIR = os.path.join (os.path.dirname (os.path.abspath (__file__)),
+    '..', 'scripts')
+for subdir in ['burn_threshold', 'boosted_regression_tree',
+    'seasonal_summary', '']:
+    sys.path.insert (0, os.path.join (SCRIPTS_DIR, subdir))
+from synthetic_stack import *
+from stack_table import *
+from ENVI_scene import ENVI_Scene
+from process_temporal_ba_stack import temporalBAStack
+from generate_boosted_regression_config import BoostedRegressionConfig
+from do_boosted_regression import BoostedRegression
+from do_threshold_stack import BurnAreaThreshold
+from do_annual_burn_summaries import AnnualBurnSummary
+from product_encoding import INT16_FILL, INT16_CLOUD_WATER
+from qa_mask import qa_is_bad, QA_NODATA
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created benchmark of the burned area processing stages on a synthetic
+#   temporal stack, reporting the time, throughput, and peak memory of each
+#   stage as JSON so regressions can be tracked between runs.
+#
+# History:
+#
+# Notes:
+#   1. Each stage runs in its own process, so the peak RSS reported is that
+#      of the stage (including any processes it runs, i.e.
+#      predict_burned_area) rather than the high water mark of the whole
+#      benchmark.  The benchmark process itself is small, since the stack is
+#      generated on disk before the stages are run.
+#   2. The stages are run one scene, season, or year at a time on a single
+#      CPU, via the same methods the parallel workers call.
+#   3. Throughput is the number of input pixels read by the stage, i.e.
+#      scenes x lines x samples at the maximum extents, divided by the
+#      elapsed time.
+#   4. If predict_burned_area isn't available, the predict stage is
+#      reported as skipped and burn probabilities are derived from the NBR
+#      so the later stages can still be benchmarked.
+#
+# Usage: bench_pipeline.py --help prints the help message
+############################################################################
+
+# stages in processing order
+STAGES = ['sceneResample', 'generateYearSeasonalSummaries',
+    'generateYearMaximums', 'predict_burned_area', 'sceneBurnThreshold',
+    'runAnnualBurnSummaries']
+
+
+def peak_rss_mb ():
+    """Returns the peak RSS, in MB, of this process and its children."""
+
+    rss = max (resource.getrusage (resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage (resource.RUSAGE_CHILDREN).ru_maxrss)
+
+    # ru_maxrss is in kilobytes on Linux and bytes on Mac OS X
+    if sys.platform == 'darwin':
+        return rss / (1024.0 * 1024.0)
+    return rss / 1024.0
+
+
+def stage_process (stage_func, args, result_queue):
+    """Runs a stage and puts its result on the queue."""
+
+    start_time = time.time()
+    try:
+        (status, npixels, count) = stage_func (*args)
+    except Exception, e:
+        (status, npixels, count) = ('error: %s' % str(e), 0, 0)
+    elapsed = time.time() - start_time
+
+    result_queue.put ({'status': status, 'seconds': elapsed,
+        'pixels': npixels, 'count': count, 'peak_rss_mb': peak_rss_mb()})
+
+
+def run_stage (stage, stage_func, args):
+    """Runs a stage in its own process and returns its result."""
+
+    result_queue = multiprocessing.Queue()
+    process = multiprocessing.Process (target=stage_process,
+        args=(stage_func, args, result_queue))
+    process.start()
+    result = result_queue.get()
+    process.join()
+
+    result['stage'] = stage
+    result['pixels_per_second'] = 0.0
+    if result['seconds'] > 0:
+        result['pixels_per_second'] = result['pixels'] / result['seconds']
+    return result
+
+
+def stack_setup (input_dir):
+    """Sets up a temporalBAStack the way processStack and resampleStack do,
+       for running the stages one scene, season, or year at a time.
+    """
+
+    stack = temporalBAStack()
+    stack.input_dir = input_dir
+    stack.log_handler = None
+    stack.cache = None
+    stack.delete_src = False
+    stack.gdal_merge = False
+    stack.refl_dir = input_dir + 'refl/'
+    stack.ndvi_dir = input_dir + 'ndvi/'
+    stack.ndmi_dir = input_dir + 'ndmi/'
+    stack.nbr_dir = input_dir + 'nbr/'
+    stack.nbr2_dir = input_dir + 'nbr2/'
+    stack.mask_dir = input_dir + 'mask/'
+    for dir_name in [stack.refl_dir, stack.ndvi_dir, stack.ndmi_dir,
+        stack.nbr_dir, stack.nbr2_dir, stack.mask_dir]:
+        if not os.path.exists (dir_name):
+            os.makedirs (dir_name)
+
+    stack.spatial_extent = stack.stackSpatialExtent (input_dir + EXTENT_FILE)
+    stack.stack = read_stack_table (input_dir + STACK_FILE)
+    stack.stack.derivePaths (input_dir)
+    return stack
+
+
+def stack_geometry (stack):
+    """Sets the size and georeferencing of the resampled stack, as
+       generateSeasonalSummaries does.
+
+    Returns:
+        number of pixels in a resampled scene
+    """
+
+    first_file = stack.stack.sceneFiles ('band1')[0]
+    enviScene = ENVI_Scene (first_file, stack.log_handler)
+    stack.ncol = enviScene.NCol
+    stack.nrow = enviScene.NRow
+    stack.geotrans = enviScene.dataset.GetGeoTransform()
+    stack.prj = enviScene.dataset.GetProjectionRef()
+    stack.nodata = enviScene.NoData
+    enviScene = None
+    return stack.nrow * stack.ncol
+
+
+def burn_scenes (stack):
+    """Returns the scenes which get burn probabilities; the first year of
+       the stack has no previous year, so it is skipped.
+    """
+
+    table = stack.stack
+    return table['file'][table.yearRangeRows (table.years[0] + 1,
+        table.years[-1])]
+
+
+def bench_resample (input_dir):
+    stack = stack_setup (input_dir)
+    for xml_file in stack.stack['file']:
+        if stack.sceneResample (xml_file) != SUCCESS:
+            return ('error resampling ' + xml_file, 0, 0)
+    npixels = len(stack.stack) * stack_geometry (stack)
+    return ('success', npixels, len(stack.stack))
+
+
+def bench_seasonal (input_dir):
+    stack = stack_setup (input_dir)
+    scene_pixels = stack_geometry (stack)
+    npixels = 0
+    count = 0
+    for year in stack.stack.years:
+        for season in stack.stack.season_names:
+            if stack.generateYearSeasonalSummaries (year, season) != SUCCESS:
+                return ('error in %d %s' % (year, season), 0, 0)
+            npixels += len (stack.stack.seasonRows (year, season)) *  \
+                scene_pixels
+            count += 1
+    return ('success', npixels, count)
+
+
+def bench_maximums (input_dir):
+    stack = stack_setup (input_dir)
+    scene_pixels = stack_geometry (stack)
+    npixels = 0
+    for year in stack.stack.years:
+        if stack.generateYearMaximums (year) != SUCCESS:
+            return ('error in %d' % year, 0, 0)
+        npixels += len (stack.stack.yearRows (year)) * scene_pixels
+    return ('success', npixels, len (stack.stack.years))
+
+
+def bench_predict (input_dir, output_dir, model_file):
+    stack = stack_setup (input_dir)
+    scene_pixels = stack_geometry (stack)
+    if model_file is None:
+        # derive the burn probabilities from the NBR, so the later stages
+        # have inputs
+        for xml_file in burn_scenes (stack):
+            write_nbr_probability (stack, xml_file, output_dir)
+        return ('skipped: predict_burned_area is not available', 0, 0)
+
+    config_dir = output_dir + 'config/'
+    if not os.path.exists (config_dir):
+        os.makedirs (config_dir)
+    npixels = 0
+    count = 0
+    for xml_file in burn_scenes (stack):
+        base_name = os.path.basename (xml_file)
+        config_file = config_dir + base_name.replace ('.xml', '.config')
+        status = BoostedRegressionConfig().runGenerateConfig (
+            config_file=config_file, seasonal_sum_dir=input_dir,
+            input_base_file=stack.refl_dir + base_name.replace ('.xml', ''),
+            input_mask_file=stack.mask_dir +  \
+                base_name.replace ('.xml', '_mask.img'),
+            output_dir=output_dir, model_file=model_file)
+        if status == SUCCESS:
+            status = BoostedRegression().runBoostedRegression (
+                config_file=config_file)
+        if status != SUCCESS:
+            return ('error predicting ' + xml_file, 0, 0)
+        npixels += scene_pixels
+        count += 1
+    return ('success', npixels, count)
+
+
+def write_nbr_probability (stack, xml_file, output_dir):
+    """Writes burn probabilities for the scene from its NBR, for when the
+       model can't be run.
+    """
+
+    base_name = os.path.basename (xml_file)
+    nbr = gdal.Open (stack.nbr_dir +  \
+        base_name.replace ('.xml', '_nbr.img')).ReadAsArray()
+    qa = gdal.Open (stack.mask_dir +  \
+        base_name.replace ('.xml', '_mask.img')).ReadAsArray()
+    prob = numpy.clip (50 - nbr.astype (numpy.int32) / 10, 0, 100)
+    prob = prob.astype (numpy.int16)
+    prob[qa_is_bad (qa)] = INT16_CLOUD_WATER
+    prob[(qa == QA_NODATA) | (nbr == NODATA)] = INT16_FILL
+    write_band (output_dir + base_name.replace ('.xml',
+        '_burn_probability.img'), prob, stack.geotrans, stack.prj,
+        gdal.GDT_Int16, INT16_FILL)
+
+
+def bench_threshold (input_dir, output_dir):
+    stack = stack_setup (input_dir)
+    scene_pixels = stack_geometry (stack)
+    threshold = BurnAreaThreshold()
+    threshold.log_handler = None
+    threshold.seed_prob_thresh = 97.5
+    threshold.seed_size_thresh = 5
+    threshold.flood_fill_prob_thresh = 75
+    threshold.output_dir = output_dir
+    npixels = 0
+    count = 0
+    for xml_file in burn_scenes (stack):
+        bp_file = output_dir + os.path.basename (xml_file).replace ('.xml',
+            '_burn_probability.img')
+        if threshold.sceneBurnThreshold (bp_file) != SUCCESS:
+            return ('error thresholding ' + bp_file, 0, 0)
+        npixels += scene_pixels
+        count += 1
+    return ('success', npixels, count)
+
+
+def bench_annual (input_dir, output_dir):
+    stack = stack_setup (input_dir)
+    scene_pixels = stack_geometry (stack)
+    table = stack.stack
+    status = AnnualBurnSummary().runAnnualBurnSummaries (
+        stack_file=table, bp_dir=output_dir, bc_dir=output_dir,
+        output_dir=output_dir, start_year=table.years[0] + 1,
+        end_year=table.years[-1], num_processors=1)
+    if status != SUCCESS:
+        return ('error generating the annual summaries', 0, 0)
+    return ('success', len (burn_scenes (stack)) * scene_pixels,
+        len (table.years) - 1)
+
+
+def main ():
+    parser = ArgumentParser(description='Benchmark the burned area '  \
+        'processing stages on a synthetic temporal stack')
+    parser.add_argument ('--work_dir', type=str, dest='work_dir',
+        help='directory for the synthetic stack; a temporary directory is '
+             'used and removed if not specified', metavar='DIR')
+    parser.add_argument ('--scenes_per_year', type=int,
+        dest='scenes_per_year', default=12,
+        help='number of scenes in each year (default = 12)')
+    parser.add_argument ('--years', type=int, dest='years', default=3,
+        help='number of years in the stack (default = 3)')
+    parser.add_argument ('--nrow', type=int, dest='nrow', default=1000,
+        help='number of lines in each scene (default = 1000)')
+    parser.add_argument ('--ncol', type=int, dest='ncol', default=1000,
+        help='number of samples in each scene (default = 1000)')
+    parser.add_argument ('--cloud_fraction', type=float,
+        dest='cloud_fraction', default=0.1,
+        help='fraction of each scene which is cloudy (default = 0.1)')
+    parser.add_argument ('--seed', type=int, dest='seed', default=0,
+        help='seed of the random number generator (default = 0)')
+    parser.add_argument ('--stages', type=str, dest='stages', nargs='+',
+        choices=STAGES, default=STAGES,
+        help='stages to report (default = all); the earlier stages are '
+             'still run to create the inputs of the later ones')
+    parser.add_argument ('--output', type=str, dest='output',
+        help='JSON file for the results (default = stdout)', metavar='FILE')
+    options = parser.parse_args()
+
+    if options.years < 2:
+        parser.error ('at least 2 years are needed for the burn products')
+
+    work_dir = options.work_dir
+    if work_dir is None:
+        work_dir = tempfile.mkdtemp (prefix='bench_pipeline')
+    work_dir = os.path.abspath (work_dir) + '/'
+    output_dir = work_dir + 'output/'
+    if not os.path.exists (output_dir):
+        os.makedirs (output_dir)
+
+    try:
+        start_time = time.time()
+        stack = generate_stack (work_dir, options.scenes_per_year,
+            options.years, options.nrow, options.ncol,
+            options.cloud_fraction, seed=options.seed)
+        generate_seconds = time.time() - start_time
+        input_dir = stack['input_dir']
+
+        stage_args = {
+            'sceneResample': (bench_resample, (input_dir,)),
+            'generateYearSeasonalSummaries': (bench_seasonal, (input_dir,)),
+            'generateYearMaximums': (bench_maximums, (input_dir,)),
+            'predict_burned_area': (bench_predict, (input_dir, output_dir,
+                stack['model_file'])),
+            'sceneBurnThreshold': (bench_threshold, (input_dir,
+                output_dir)),
+            'runAnnualBurnSummaries': (bench_annual, (input_dir,
+                output_dir))}
+
+        # run the stages up to the last one requested
+        last = max ([STAGES.index (stage) for stage in options.stages])
+        results = []
+        for stage in STAGES[0:last+1]:
+            (stage_func, args) = stage_args[stage]
+            result = run_stage (stage, stage_func, args)
+            if stage in options.stages:
+                results.append (result)
+            if result['status'] != 'success' and  \
+               not result['status'].startswith ('skipped'):
+                break
+    finally:
+        if options.work_dir is None:
+            shutil.rmtree (work_dir)
+
+    report = {'benchmark': 'bench_pipeline',
+        'created': datetime.datetime.now().strftime ('%Y-%m-%dT%H:%M:%S'),
+        'host': platform.node(), 'python': platform.python_version(),
+        'gdal': gdal.__version__,
+        'parameters': {'scenes_per_year': options.scenes_per_year,
+            'years': options.years, 'nrow': options.nrow,
+            'ncol': options.ncol, 'cloud_fraction': options.cloud_fraction,
+            'seed': options.seed},
+        'generate_seconds': generate_seconds,
+        'stages': results}
+
+    if options.output is None:
+        print json.dumps (report, indent=2, sort_keys=True)
+    else:
+        fd = open (options.output, 'w')
+        json.dump (report, fd, indent=2, sort_keys=True)
+        fd.close()
+
+    for result in results:
+        if result['status'] != 'success' and  \
+           not result['status'].startswith ('skipped'):
+            return ERROR
+    return SUCCESS
+
+
+if __name__ == "__main__":
+    sys.exit (main())
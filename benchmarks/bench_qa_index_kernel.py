@@ -0,0 +1,199 @@
+#! /usr/bin/env python
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+from numpy import *
+
+# the benchmarks run against the scripts in the source tree
+sys.path.insert (0, os.path.join (os.path.dirname (os.path.abspath (  \
+    __file__)), '..', 'scripts', 'seasonal_summary'))
+from qa_index_kernel import *
+from spectral_indices import *
+from qa_mask import *
+from log_it import *
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created benchmark to compare the compiled QA and spectral index kernel
+#   against the NumPy path, and to verify the two produce identical outputs.
+#
+# History:
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Added the comparison of the NumPy path against the original single
+#       index functions and QA codes.  --verify exits with an error if numba
+#       isn't available, since the compiled kernel can't be verified.
+#
+# Usage: bench_qa_index_kernel.py --help prints the help message
+############################################################################
+
+NODATA = -9999
+
+
+def create_block (nrow, ncol):
+    """Creates a synthetic block of QA and reflectance bands.  The
+       reflectance includes fill, zeros (0/0 in the indices), and negative
+       values (large or infinite indices) to exercise the edge cases.
+
+    Returns:
+        (qa_bands, refl)
+    """
+
+    random.seed (0)
+    fill = random.random ((nrow, ncol)) < 0.05
+    qa_bands = [fill.astype (uint8)]
+    for i in range (5):
+        qa_bands.append ((random.random ((nrow, ncol)) < 0.05).astype (uint8))
+
+    refl = {}
+    for band in ['band3', 'band4', 'band5', 'band7']:
+        vals = random.randint (-100, 10000, (nrow, ncol)).astype (int16)
+        vals[random.random ((nrow, ncol)) < 0.02] = 0
+        vals[random.random ((nrow, ncol)) < 0.01] = NODATA
+        vals[fill] = NODATA
+        refl[band] = vals
+
+    return (qa_bands, refl)
+
+
+def combine_qa (fill_QA, cloud_QA, shadow_QA, snow_QA, land_water_QA,
+    adjacent_cloud_QA, nodata=NODATA):
+    """Combines the QA bands into the int16 QA codes, as the original
+       XML_Scene.getBandValues did prior to the bit-packed QA mask.
+    """
+
+    QA = zeros (shape(fill_QA), dtype=int16)
+    QA[land_water_QA > 0] = -3
+    QA[snow_QA > 0] = -4
+    QA[shadow_QA > 0] = -5
+    QA[adjacent_cloud_QA > 0] = -6
+    QA[cloud_QA > 0] = -7
+    QA[fill_QA > 0] = nodata  # fill
+    return QA
+
+
+def reference (qa_bands, refl):
+    """Generates the QA codes and the scaled indices with the original
+       combine_qa and single index functions.
+
+    Returns:
+        (qa_codes, index_out)
+    """
+
+    funcs = {'ndvi': (NDVI, 'band3', 'band4'),
+        'ndmi': (NDMI, 'band4', 'band5'),
+        'nbr': (NBR, 'band4', 'band7'),
+        'nbr2': (NBR2, 'band5', 'band7')}
+
+    qa_codes = combine_qa (*qa_bands)
+    index_out = {}
+    for index in KERNEL_INDICES:
+        (func, band_a, band_b) = funcs[index]
+        vals = 1000.0 * func (refl[band_a], refl[band_b], NODATA)
+        vals[(refl[band_a] == NODATA) | (refl[band_b] == NODATA) |  \
+            (qa_codes != 0)] = NODATA
+        index_out[index] = round_to_int16 (vals,
+            empty (vals.shape, dtype=int16))
+
+    return (qa_codes, index_out)
+
+
+def compare (name, qa, idx, ref_qa, ref_idx):
+    """Reports the QA and index pixels which differ from the reference.
+
+    Returns:
+        number of the outputs which differ
+    """
+
+    mismatches = 0
+    if not array_equal (qa, ref_qa):
+        print '%s QA differs in %d pixels' % (name, (qa != ref_qa).sum())
+        mismatches += 1
+    for index in KERNEL_INDICES:
+        if not array_equal (idx[index], ref_idx[index]):
+            print '%s %s differs in %d pixels' % (name, index,
+                (idx[index] != ref_idx[index]).sum())
+            mismatches += 1
+    if mismatches == 0:
+        print '%s outputs are identical' % name
+
+    return mismatches
+
+
+def run (qa_bands, refl, compiled, repeat):
+    """Runs the kernel and returns the best time along with the outputs."""
+
+    shape = qa_bands[0].shape
+    qa_out = empty (shape, dtype=uint8)
+    index_out = {}
+    for index in KERNEL_INDICES:
+        index_out[index] = empty (shape, dtype=int16)
+    workspace = qa_indices_workspace (shape)
+
+    best = None
+    for i in range (repeat):
+        start_time = time.time()
+        qa_indices (qa_bands, refl, qa_out, index_out, NODATA, compiled,
+            workspace)
+        elapsed = time.time() - start_time
+        if (best is None) or (elapsed < best):
+            best = elapsed
+
+    return (best, qa_out, index_out)
+
+
+def main ():
+    parser = ArgumentParser(description='Benchmark the compiled QA and '  \
+        'spectral index kernel against the NumPy path')
+    parser.add_argument ('--nrow', type=int, dest='nrow', default=2000,
+        help='number of lines in the synthetic block (default = 2000)')
+    parser.add_argument ('--ncol', type=int, dest='ncol', default=2000,
+        help='number of samples in the synthetic block (default = 2000)')
+    parser.add_argument ('--repeat', type=int, dest='repeat', default=3,
+        help='number of runs for each case; the best time is reported')
+    parser.add_argument ('--verify', dest='verify', default=False,
+        action='store_true',
+        help='exit with an error if the outputs are not identical, or if '
+        'the compiled kernel is not available to be verified')
+    options = parser.parse_args()
+
+    (qa_bands, refl) = create_block (options.nrow, options.ncol)
+    npixels = options.nrow * options.ncol
+
+    (numpy_time, numpy_qa, numpy_idx) = run (qa_bands, refl, False,
+        options.repeat)
+    print '%-10s %10.3f seconds %10.2f Mpixels/s' % ('numpy', numpy_time,
+        npixels / numpy_time / 1.0e6)
+
+    # compare the NumPy path against the original QA codes and single index
+    # functions
+    (ref_qa, ref_idx) = reference (qa_bands, refl)
+    mismatches = compare ('NumPy vs. original', qa_to_codes (numpy_qa,
+        NODATA), numpy_idx, ref_qa, ref_idx)
+
+    if not HAVE_COMPILED_KERNEL:
+        print 'numba is not available; skipped the compiled kernel'
+        if options.verify:
+            print 'Unable to verify the compiled kernel'
+            return ERROR
+        return SUCCESS
+
+    # the first call compiles the kernel, so don't time it
+    run (qa_bands, refl, True, 1)
+    (compiled_time, compiled_qa, compiled_idx) = run (qa_bands, refl, True,
+        options.repeat)
+    print '%-10s %10.3f seconds %10.2f Mpixels/s' % ('compiled',
+        compiled_time, npixels / compiled_time / 1.0e6)
+
+    # compare the compiled kernel against the NumPy path
+    mismatches += compare ('Compiled vs. NumPy', compiled_qa, compiled_idx,
+        numpy_qa, numpy_idx)
+    if (mismatches > 0) and options.verify:
+        return ERROR
+
+    return SUCCESS
+
+
+if __name__ == "__main__":
+    sys.exit (main())
@@ -0,0 +1,191 @@
+#! /usr/bin/env python
+# use true division so we don't have to worry about scalar divided by scalar
+# not being a floating point
+from __future__ import division
+import os
+import sys
+import time
+import shutil
+import tempfile
+from argparse import ArgumentParser
+
+from numpy import *
+from osgeo import gdal
+
+# the benchmarks run against the scripts in the source tree
+sys.path.insert (0, os.path.join (os.path.dirname (os.path.abspath (  \
+    __file__)), '..', 'scripts', 'seasonal_summary'))
+from spectral_indices import *
+from spectral_index_from_espa import *
+from qa_mask import *
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created benchmark to compare the throughput of the block-based
+#   spectralIndex.createSpectralIndices against the previous line-at-a-time
+#   loop, using a synthetic scene.
+#
+# History:
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Modified to write the bit-packed byte QA mask.
+#
+# Usage: bench_spectral_indices.py --help prints the help message
+############################################################################
+
+INDICES = ['ndvi', 'ndmi', 'nbr', 'nbr2']
+
+
+def write_band (filename, vals, data_type=gdal.GDT_Int16, nodata=-9999):
+    """Writes the array to an ENVI file, int16 with -9999 as noData by
+       default.
+    """
+
+    driver = gdal.GetDriverByName('ENVI')
+    ds = driver.Create (filename, vals.shape[1], vals.shape[0], 1,
+        data_type)
+    ds.SetGeoTransform ([500000.0, 30.0, 0.0, 4000000.0, 0.0, -30.0])
+    band = ds.GetRasterBand(1)
+    band.SetNoDataValue(nodata)
+    band.WriteArray(vals, 0, 0)
+    band = None
+    ds = None
+
+
+def create_scene (work_dir, nrow, ncol):
+    """Creates a synthetic scene of reflectance bands and a QA mask, with a
+       border of fill and some flagged QA pixels.
+
+    Returns:
+        dictionary of the band filenames for spectralIndex
+    """
+
+    random.seed (0)
+    band_dict = {}
+    fill = zeros ((nrow, ncol), dtype=bool)
+    fill[:, :ncol//10] = True
+    for band in ['band1', 'band2', 'band3', 'band4', 'band5', 'band7']:
+        vals = random.randint (0, 10000, (nrow, ncol)).astype (int16)
+        vals[fill] = -9999
+        band_dict[band] = os.path.join (work_dir, band + '.img')
+        write_band (band_dict[band], vals)
+
+    qa = zeros ((nrow, ncol), dtype=uint8)
+    qa[random.random ((nrow, ncol)) < 0.1] = QA_CLOUD
+    qa[fill] = QA_FILL
+    band_dict['band_qa'] = os.path.join (work_dir, 'mask.img')
+    write_band (band_dict['band_qa'], qa, gdal.GDT_Byte, QA_NODATA)
+
+    return band_dict
+
+
+def line_loop (specIndx, index_dict):
+    """Generates the spectral indices one line at a time via the single
+       index functions, as createSpectralIndices did prior to the block
+       processing.
+    """
+
+    seterr(divide='ignore', invalid='ignore')
+    ncol = specIndx.dataset1.RasterXSize
+    nrow = specIndx.dataset1.RasterYSize
+    nodata = -9999
+    funcs = {'ndvi': (NDVI, specIndx.band3, specIndx.band4),
+        'ndmi': (NDMI, specIndx.band4, specIndx.band5),
+        'nbr': (NBR, specIndx.band4, specIndx.band7),
+        'nbr2': (NBR2, specIndx.band5, specIndx.band7)}
+
+    driver = gdal.GetDriverByName('ENVI')
+    output_ds = {}
+    output_band = {}
+    for index in index_dict.keys():
+        output_ds[index] = driver.Create (index_dict[index], ncol, nrow, 1,
+            gdal.GDT_Int16)
+        output_band[index] = output_ds[index].GetRasterBand(1)
+
+    for y in range (0, nrow):
+        qa = specIndx.band_mask.ReadAsArray(0, y, ncol, 1)
+        lines = {}
+        for index in index_dict.keys():
+            (func, band_a, band_b) = funcs[index]
+            for band in [band_a, band_b]:
+                if band not in lines:
+                    lines[band] = band.ReadAsArray(0, y, ncol, 1)
+            newVals = 1000.0 * func(lines[band_a], lines[band_b], nodata)
+            newVals[qa_is_bad (qa)] = nodata
+            output_band[index].WriteArray(newVals, 0, y)
+
+    output_band = None
+    output_ds = None
+    return SUCCESS
+
+
+def compare (index_dict, ref_dict):
+    """Returns the maximum absolute difference between the index files."""
+
+    max_diff = 0
+    for index in index_dict.keys():
+        vals = gdal.Open (index_dict[index]).ReadAsArray().astype(int32)
+        ref = gdal.Open (ref_dict[index]).ReadAsArray().astype(int32)
+        max_diff = max (max_diff, abs (vals - ref).max())
+    return max_diff
+
+
+def main ():
+    parser = ArgumentParser(description='Benchmark the spectral index '  \
+        'generation for block sizes vs. the line-at-a-time loop')
+    parser.add_argument ('--nrow', type=int, dest='nrow', default=2000,
+        help='number of lines in the synthetic scene (default = 2000)')
+    parser.add_argument ('--ncol', type=int, dest='ncol', default=2000,
+        help='number of samples in the synthetic scene (default = 2000)')
+    parser.add_argument ('--block_mb', type=float, dest='block_mb',
+        nargs='+', default=[1.0, 16.0, DEFAULT_BLOCK_MB],
+        help='memory budgets (MB) to benchmark')
+    parser.add_argument ('--repeat', type=int, dest='repeat', default=3,
+        help='number of runs for each case; the best time is reported')
+    options = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp (prefix='bench_spectral_indices')
+    specIndx = None
+    try:
+        band_dict = create_scene (work_dir, options.nrow, options.ncol)
+        npixels = options.nrow * options.ncol
+        specIndx = spectralIndex (band_dict)
+
+        cases = [('line loop', None)]
+        for block_mb in options.block_mb:
+            cases.append (('block %.1f MB' % block_mb, block_mb))
+
+        ref_dict = None
+        print '%-16s %10s %12s %10s' % ('case', 'seconds', 'Mpixels/s',
+            'max diff')
+        for (name, block_mb) in cases:
+            index_dict = {}
+            for index in INDICES:
+                index_dict[index] = os.path.join (work_dir,
+                    '%s_%s.img' % (index, name.replace(' ', '_')))
+
+            best = None
+            for i in range (options.repeat):
+                start_time = time.time()
+                if block_mb is None:
+                    line_loop (specIndx, index_dict)
+                else:
+                    specIndx.createSpectralIndices (index_dict,
+                        max_block_mb=block_mb)
+                elapsed = time.time() - start_time
+                if (best is None) or (elapsed < best):
+                    best = elapsed
+
+            if ref_dict is None:
+                ref_dict = index_dict
+            print '%-16s %10.3f %12.2f %10d' % (name, best,
+                len(INDICES) * npixels / best / 1.0e6,
+                compare (index_dict, ref_dict))
+    finally:
+        specIndx = None
+        shutil.rmtree (work_dir)
+
+    return SUCCESS
+
+
+if __name__ == "__main__":
+    sys.exit (main())
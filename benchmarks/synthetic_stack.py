@@ -0,0 +1,591 @@
+#! /usr/bin/env python
+import os
+import sys
+import math
+import datetime
+import subprocess
+from distutils.spawn import find_executable
+from argparse import ArgumentParser
+
+import numpy
+from osgeo import gdal
+from osgeo import osr
+
+# the benchmarks run against the scripts in the source tree
+sys.path.insert (0, os.path.join (os.path.dirname (os.path.abspath (  \
+    __file__)), '..', 'scripts', 'seasonal_summary'))
+from log_it import *
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created a generator of synthetic temporal stacks of surface reflectance
+#   scenes, so the burned area processing can be benchmarked without real
+#   ESPA products.
+#
+# History:
+#
+# Notes:
+#   1. Each scene has the ESPA XML file, the six surface reflectance bands
+#      (_sr_bandN.img), the six surface reflectance QA bands, and an _MTL.txt
+#      file.  The XML file follows the ESPA internal metadata schema v1.2 so
+#      it can be parsed by stack_metadata and metadata_api.
+#   2. The scenes share a path/row, but each one is shifted by up to
+#      MAX_SHIFT pixels so they need to be resampled to the maximum extents.
+#      The land cover, water, and burn scars are defined on the maximum
+#      extents, so they line up between the scenes.
+#   3. The stack file and maximum extents are written the way stack_metadata
+#      writes them, so the stages can be run without the C applications.
+#   4. The training data for the tiny GBT model is random, with the response
+#      tied to the change in NBR.  The model is only meant for timing the
+#      predictions, not for producing meaningful burn probabilities.
+#
+# Usage: synthetic_stack.py --help prints the help message
+############################################################################
+
+NODATA = -9999
+PIXEL_SIZE = 30.0
+
+# synthetic path/row and the upper left corner of its grid
+WRS_PATH = 34
+WRS_ROW = 33
+UTM_ZONE = 13
+ULX = 400000.0
+ULY = 4300000.0
+
+# maximum shift, in pixels, of a scene from the upper left corner
+MAX_SHIFT = 8
+
+# files written for the stack, matching processStack
+STACK_FILE = 'input_stack.csv'
+EXTENT_FILE = 'bounding_box_coordinates.csv'
+LIST_FILE = 'input_list.txt'
+
+# files written for the tiny GBT model
+TRAIN_CSV_FILE = 'gbt_synthetic_train.csv'
+TRAIN_CONFIG_FILE = 'gbt_synthetic_train.config'
+MODEL_FILE = 'gbt_synthetic_model.xml'
+NCSV_INPUTS = 50
+TRAIN_SAMPLES = 2000
+
+REFL_BANDS = ['band1', 'band2', 'band3', 'band4', 'band5', 'band7']
+QA_BANDS = ['fill', 'cloud', 'cloud_shadow', 'snow', 'land_water',
+    'adjacent_cloud']
+
+# mean reflectance (scaled by 10000) of vegetation at the peak of the
+# growing season and of a fresh burn scar
+VEG_REFL = {'band1': 300, 'band2': 500, 'band3': 400, 'band4': 3000,
+    'band5': 1800, 'band7': 800}
+BURN_REFL = {'band1': 350, 'band2': 500, 'band3': 600, 'band4': 1400,
+    'band5': 2200, 'band7': 2000}
+WATER_REFL = {'band1': 400, 'band2': 350, 'band3': 250, 'band4': 150,
+    'band5': 80, 'band7': 50}
+
+# number of years for a burn scar to recover to vegetation
+RECOVERY_YEARS = 3.0
+
+
+def utm_srs ():
+    """Returns the spatial reference of the synthetic UTM zone."""
+
+    srs = osr.SpatialReference()
+    srs.SetWellKnownGeogCS ('WGS84')
+    srs.SetUTM (UTM_ZONE, 1)
+    return srs
+
+
+def to_geographic (points):
+    """Converts UTM points to (longitude, latitude) points."""
+
+    src = utm_srs()
+    dst = osr.SpatialReference()
+    dst.SetWellKnownGeogCS ('WGS84')
+    if hasattr (osr, 'OAMS_TRADITIONAL_GIS_ORDER'):
+        src.SetAxisMappingStrategy (osr.OAMS_TRADITIONAL_GIS_ORDER)
+        dst.SetAxisMappingStrategy (osr.OAMS_TRADITIONAL_GIS_ORDER)
+    transform = osr.CoordinateTransformation (src, dst)
+    return [transform.TransformPoint (x, y)[0:2] for (x, y) in points]
+
+
+def scene_season (month):
+    """Returns the season of the month, as written by stack_metadata."""
+
+    if month in [12, 1, 2]:
+        return 'winter'
+    elif month in [3, 4, 5]:
+        return 'spring'
+    elif month in [6, 7, 8]:
+        return 'summer'
+    return 'fall'
+
+
+def scene_dates (start_year, nyears, scenes_per_year, rng):
+    """Returns the acquisition dates and satellites of the scenes, spread
+       through each year and alternating between Landsat 5 and 7.
+    """
+
+    scenes = []
+    spacing = 365.0 / scenes_per_year
+    for year in range (start_year, start_year + nyears):
+        for i in range (scenes_per_year):
+            offset = int(i * spacing) +  \
+                rng.randint (0, max (1, int(spacing / 2)))
+            date = datetime.date (year, 1, 1) +  \
+                datetime.timedelta (days=min (offset, 364))
+            satellite = ['LANDSAT_5', 'LANDSAT_7'][len(scenes) % 2]
+            scenes.append ((date, satellite))
+
+    return scenes
+
+
+def scene_name (date, satellite):
+    """Returns the Landsat scene ID; the year is 9 characters in, as the
+       burned area applications expect.
+    """
+
+    prefix = {'LANDSAT_5': 'LT5', 'LANDSAT_7': 'LE7'}[satellite]
+    return '%s%03d%03d%04d%03dPAC01' % (prefix, WRS_PATH, WRS_ROW, date.year,
+        date.timetuple().tm_yday)
+
+
+def coarse_field (nrow, ncol, block, rng):
+    """Returns a blocky random field in [0, 1), used for the clouds, snow,
+       and land cover.
+    """
+
+    coarse = rng.random_sample ((nrow // block + 1, ncol // block + 1))
+    return coarse.repeat (block, 0).repeat (block, 1)[0:nrow,0:ncol]
+
+
+def shift_mask (mask, dy, dx):
+    """Shifts the mask by dy lines and dx samples, without wrapping."""
+
+    out = numpy.zeros_like (mask)
+    (nrow, ncol) = mask.shape
+    out[max(dy,0):nrow+min(dy,0), max(dx,0):ncol+min(dx,0)] =  \
+        mask[max(-dy,0):nrow+min(-dy,0), max(-dx,0):ncol+min(-dx,0)]
+    return out
+
+
+def dilate_mask (mask, size):
+    """Dilates the mask by size pixels in each direction."""
+
+    out = mask.copy()
+    for dy in range (-size, size+1):
+        for dx in range (-size, size+1):
+            out |= shift_mask (mask, dy, dx)
+    return out
+
+
+def create_landscape (nrow, ncol, start_year, nyears, rng):
+    """Creates the land cover, water, and burn events on the maximum
+       extents of the stack.
+
+    Returns:
+        dictionary of the land cover (vegetation density), water mask, and
+        list of burn events (center line, center sample, radius, date)
+    """
+
+    nrow = nrow + MAX_SHIFT
+    ncol = ncol + MAX_SHIFT
+    density = 0.6 + 0.8 * coarse_field (nrow, ncol, 64, rng)
+
+    # a lake in the lower right
+    (yy, xx) = numpy.mgrid[0:nrow, 0:ncol]
+    water = ((yy - nrow * 0.8) ** 2 + (xx - ncol * 0.75) ** 2) <  \
+        (min (nrow, ncol) * 0.08) ** 2
+
+    # two fires each year during the fire season
+    burns = []
+    for year in range (start_year, start_year + nyears):
+        for i in range (2):
+            burns.append ((rng.randint (0, nrow), rng.randint (0, ncol),
+                min (nrow, ncol) * rng.uniform (0.05, 0.15),
+                datetime.date (year, 1, 1) +  \
+                    datetime.timedelta (days=rng.randint (150, 270))))
+
+    return {'density': density, 'water': water, 'burns': burns}
+
+
+def write_band (filename, vals, geotrans, prj, data_type, nodata=None):
+    """Writes the array to a single band ENVI file."""
+
+    driver = gdal.GetDriverByName('ENVI')
+    ds = driver.Create (filename, vals.shape[1], vals.shape[0], 1, data_type)
+    ds.SetGeoTransform (geotrans)
+    ds.SetProjection (prj)
+    band = ds.GetRasterBand(1)
+    if nodata is not None:
+        band.SetNoDataValue (nodata)
+    band.WriteArray (vals, 0, 0)
+    band = None
+    ds = None
+
+
+def write_xml (xml_file, scene):
+    """Writes the ESPA XML metadata file for the scene."""
+
+    base_name = os.path.basename (xml_file).replace ('.xml', '')
+    (west, east, north, south) = scene['bounds']
+    instrument = {'LANDSAT_5': 'TM', 'LANDSAT_7': 'ETM'}[scene['satellite']]
+    date = scene['date'].strftime ('%Y-%m-%d')
+
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+        '<espa_metadata version="1.2" '
+        'xmlns="http://espa.cr.usgs.gov/v1.2" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+        'xsi:schemaLocation="http://espa.cr.usgs.gov/v1.2 '
+        'http://espa.cr.usgs.gov/schema/espa_internal_metadata_v1_2.xsd">',
+        '    <global_metadata>',
+        '        <data_provider>USGS/EROS</data_provider>',
+        '        <satellite>%s</satellite>' % scene['satellite'],
+        '        <instrument>%s</instrument>' % instrument,
+        '        <acquisition_date>%s</acquisition_date>' % date,
+        '        <scene_center_time>17:30:00.000000Z</scene_center_time>',
+        '        <level1_production_date>%sT00:00:00Z'
+        '</level1_production_date>' % date,
+        '        <solar_angles zenith="35.000000" azimuth="135.000000" '
+        'units="degrees"/>',
+        '        <wrs system="2" path="%d" row="%d"/>' % (WRS_PATH, WRS_ROW),
+        '        <lpgs_metadata_file>%s_MTL.txt</lpgs_metadata_file>' %  \
+            base_name,
+        '        <corner location="UL" latitude="%f" longitude="%f"/>' %  \
+            (north, west),
+        '        <corner location="LR" latitude="%f" longitude="%f"/>' %  \
+            (south, east),
+        '        <bounding_coordinates>',
+        '            <west>%f</west>' % west,
+        '            <east>%f</east>' % east,
+        '            <north>%f</north>' % north,
+        '            <south>%f</south>' % south,
+        '        </bounding_coordinates>',
+        '        <projection_information projection="UTM" datum="WGS84" '
+        'units="meters">',
+        '            <corner_point location="UL" x="%f" y="%f"/>' %  \
+            (scene['ulx'], scene['uly']),
+        '            <corner_point location="LR" x="%f" y="%f"/>' %  \
+            (scene['lrx'], scene['lry']),
+        '            <grid_origin>UL</grid_origin>',
+        '            <utm_proj_params>',
+        '                <zone_code>%d</zone_code>' % UTM_ZONE,
+        '            </utm_proj_params>',
+        '        </projection_information>',
+        '        <orientation_angle>0.000000</orientation_angle>',
+        '    </global_metadata>',
+        '    <bands>']
+
+    bands = [('sr_%s' % band, 'image', 'INT16', NODATA, 'reflectance')
+        for band in REFL_BANDS]
+    bands += [('sr_%s_qa' % qa, 'qa', 'UINT8', None, 'quality/feature '
+        'classification') for qa in QA_BANDS]
+    for (name, category, data_type, fill_value, units) in bands:
+        fill_attr = ''
+        if fill_value is not None:
+            fill_attr = ' fill_value="%d"' % fill_value
+        lines += [
+            '        <band product="sr_refl" source="toa_refl" name="%s" '
+            'category="%s" data_type="%s" nlines="%d" nsamps="%d"%s>' %  \
+                (name, category, data_type, scene['nrow'], scene['ncol'],
+                fill_attr),
+            '            <short_name>%sSR</short_name>' % base_name[0:3],
+            '            <long_name>%s</long_name>' % name.replace ('_', ' '),
+            '            <file_name>%s_%s.img</file_name>' % (base_name,
+                name),
+            '            <pixel_size x="%d" y="%d" units="meters"/>' %  \
+                (PIXEL_SIZE, PIXEL_SIZE),
+            '            <resample_method>none</resample_method>',
+            '            <data_units>%s</data_units>' % units,
+            '            <app_version>synthetic_stack</app_version>',
+            '            <production_date>%sT00:00:00Z</production_date>' %  \
+                date,
+            '        </band>']
+
+    lines += ['    </bands>', '</espa_metadata>']
+
+    fd = open (xml_file, 'w')
+    fd.write ('\n'.join (lines) + '\n')
+    fd.close()
+
+
+def write_mtl (mtl_file, scene):
+    """Writes the _MTL.txt file for the scene, with the fields read by the
+       L1G, RMSE, and cloud cover exclusions.
+    """
+
+    lines = ['GROUP = L1_METADATA_FILE',
+        '  GROUP = PRODUCT_METADATA',
+        '    DATA_TYPE = "L1T"',
+        '    SPACECRAFT_ID = "%s"' % scene['satellite'],
+        '    DATE_ACQUIRED = %s' % scene['date'].strftime ('%Y-%m-%d'),
+        '    WRS_PATH = %d' % WRS_PATH,
+        '    WRS_ROW = %d' % WRS_ROW,
+        '  END_GROUP = PRODUCT_METADATA',
+        '  GROUP = IMAGE_ATTRIBUTES',
+        '    CLOUD_COVER = %.2f' % scene['cloud_cover'],
+        '    GEOMETRIC_RMSE_MODEL = 4.500',
+        '  END_GROUP = IMAGE_ATTRIBUTES',
+        'END_GROUP = L1_METADATA_FILE',
+        'END']
+
+    fd = open (mtl_file, 'w')
+    fd.write ('\n'.join (lines) + '\n')
+    fd.close()
+
+
+def create_scene (input_dir, date, satellite, nrow, ncol, cloud_fraction,
+    landscape, rng):
+    """Creates the bands, QA bands, XML, and MTL files of a synthetic scene.
+
+    Returns:
+        dictionary of the scene metadata
+    """
+
+    base_name = scene_name (date, satellite)
+    xoff = rng.randint (0, MAX_SHIFT + 1)
+    yoff = rng.randint (0, MAX_SHIFT + 1)
+    scene = {'file': input_dir + base_name + '.xml', 'date': date,
+        'satellite': satellite, 'nrow': nrow, 'ncol': ncol,
+        'ulx': ULX + xoff * PIXEL_SIZE, 'uly': ULY - yoff * PIXEL_SIZE}
+    scene['lrx'] = scene['ulx'] + ncol * PIXEL_SIZE
+    scene['lry'] = scene['uly'] - nrow * PIXEL_SIZE
+    corners = to_geographic ([(scene['ulx'], scene['uly']),
+        (scene['lrx'], scene['lry'])])
+    scene['bounds'] = (corners[0][0], corners[1][0], corners[0][1],
+        corners[1][1])
+
+    window = (slice (yoff, yoff + nrow), slice (xoff, xoff + ncol))
+    density = landscape['density'][window]
+    water = landscape['water'][window]
+
+    # seasonal greenness, peaking in mid-summer
+    doy = date.timetuple().tm_yday
+    greenness = 0.6 + 0.4 * math.sin (2.0 * math.pi * (doy - 100) / 365.0)
+
+    # burn scars which have occurred before the scene, recovering over time
+    burn = numpy.zeros ((nrow, ncol), dtype=numpy.float32)
+    (yy, xx) = numpy.mgrid[0:nrow, 0:ncol]
+    for (cy, cx, radius, burn_date) in landscape['burns']:
+        age = (date - burn_date).days / 365.0
+        if age < 0 or age >= RECOVERY_YEARS:
+            continue
+        scar = ((yy + yoff - cy) ** 2 + (xx + xoff - cx) ** 2) < radius ** 2
+        burn[scar] = numpy.maximum (burn[scar], 1.0 - age / RECOVERY_YEARS)
+
+    # a few columns of fill on each side, as for the edges of a scene
+    fill = numpy.zeros ((nrow, ncol), dtype=bool)
+    fill[:,0:rng.randint (1, MAX_SHIFT + 1)] = True
+    fill[:,ncol-rng.randint (1, MAX_SHIFT + 1):] = True
+
+    # clouds, their shadows, and the pixels adjacent to the clouds
+    cloud = numpy.zeros ((nrow, ncol), dtype=bool)
+    if cloud_fraction > 0:
+        field = coarse_field (nrow, ncol, 32, rng)
+        cloud = field > numpy.percentile (field, 100.0 * (1.0 -  \
+            cloud_fraction))
+    shadow = shift_mask (cloud, 12, 12) & ~cloud
+    adjacent = dilate_mask (cloud, 2) & ~cloud
+    snow = numpy.zeros ((nrow, ncol), dtype=bool)
+    if date.month in [12, 1, 2]:
+        snow = (coarse_field (nrow, ncol, 32, rng) > 0.8) & ~cloud
+    valid = ~fill
+    scene['cloud_cover'] = 100.0 * (cloud & valid).sum() /  \
+        max (valid.sum(), 1)
+
+    srs = utm_srs()
+    prj = srs.ExportToWkt()
+    geotrans = [scene['ulx'], PIXEL_SIZE, 0.0, scene['uly'], 0.0,
+        -PIXEL_SIZE]
+    for band in REFL_BANDS:
+        veg = VEG_REFL[band] * density
+        if band == 'band4':
+            veg = veg * greenness
+        vals = veg * (1.0 - burn) + BURN_REFL[band] * burn
+        vals[water] = WATER_REFL[band]
+        vals[cloud] = 6000
+        vals += rng.normal (0.0, 50.0, (nrow, ncol))
+        vals = numpy.clip (vals, 0, 16000).astype (numpy.int16)
+        vals[fill] = NODATA
+        write_band (input_dir + base_name + '_sr_%s.img' % band, vals,
+            geotrans, prj, gdal.GDT_Int16, NODATA)
+
+    qa_masks = {'fill': fill, 'cloud': cloud, 'cloud_shadow': shadow,
+        'snow': snow, 'land_water': water, 'adjacent_cloud': adjacent}
+    for qa in QA_BANDS:
+        vals = numpy.where (qa_masks[qa], 255, 0).astype (numpy.uint8)
+        if qa != 'fill':
+            vals[fill] = 0
+        write_band (input_dir + base_name + '_sr_%s_qa.img' % qa, vals,
+            geotrans, prj, gdal.GDT_Byte)
+
+    write_xml (scene['file'], scene)
+    write_mtl (input_dir + base_name + '_MTL.txt', scene)
+
+    return scene
+
+
+def write_stack_files (input_dir, scenes):
+    """Writes the list, stack, and maximum extents files of the stack, in
+       the format written by processStack and stack_metadata.
+    """
+
+    fd = open (input_dir + LIST_FILE, 'w')
+    for scene in scenes:
+        fd.write (scene['file'] + '\n')
+    fd.close()
+
+    fd = open (input_dir + STACK_FILE, 'w')
+    fd.write ('file, year, season, month, day, julian, path, row, '
+        'satellite, west, east, north, south, nrow, ncol, dx, dy, '
+        'utm_zone\n')
+    for scene in scenes:
+        date = scene['date']
+        (west, east, north, south) = scene['bounds']
+        fd.write ('%s, %d, %s, %d, %d, %d, %d, %d, %s, %f, %f, %f, %f, %d, '
+            '%d, %f, %f, %d\n' % (scene['file'], date.year,
+            scene_season (date.month), date.month, date.day,
+            date.timetuple().tm_yday, WRS_PATH, WRS_ROW, scene['satellite'],
+            west, east, north, south, scene['nrow'], scene['ncol'],
+            PIXEL_SIZE, PIXEL_SIZE, UTM_ZONE))
+    fd.close()
+
+    fd = open (input_dir + EXTENT_FILE, 'w')
+    fd.write ('West, North, East, South\n')
+    fd.write ('%f, %f, %f, %f' % (min ([s['ulx'] for s in scenes]),
+        max ([s['uly'] for s in scenes]), max ([s['lrx'] for s in scenes]),
+        min ([s['lry'] for s in scenes])))
+    fd.close()
+
+
+def write_training_csv (csv_file, nsamples, rng):
+    """Writes random training data for the tiny GBT model.  The last value
+       of each line is the response (1 for burned), which is set where the
+       first input, standing in for the change in NBR, is large.
+    """
+
+    inputs = rng.normal (0.0, 300.0, (nsamples, NCSV_INPUTS))
+    response = (inputs[:,0] + rng.normal (0.0, 100.0, nsamples)) > 300.0
+    fd = open (csv_file, 'w')
+    for i in range (nsamples):
+        fd.write (','.join (['%.1f' % val for val in inputs[i]]) +  \
+            ',%d\n' % response[i])
+    fd.close()
+
+
+def train_model (work_dir, rng, log_handler=None):
+    """Trains the tiny GBT model with predict_burned_area.
+
+    Args:
+      work_dir - directory for the training data and model, ending with '/'
+      rng - numpy RandomState for the training data
+      log_handler - handler for the logging information
+
+    Returns:
+        None - predict_burned_area isn't available or the training failed
+        name of the model XML file
+    """
+
+    if find_executable ('predict_burned_area') is None:
+        msg = 'predict_burned_area is not available; the GBT model is not '  \
+            'trained'
+        logIt (msg, log_handler)
+        return None
+
+    write_training_csv (work_dir + TRAIN_CSV_FILE, TRAIN_SAMPLES, rng)
+    fd = open (work_dir + TRAIN_CONFIG_FILE, 'w')
+    fd.write ('CSV_FILE=%s\n' % (work_dir + TRAIN_CSV_FILE))
+    fd.write ('NCSV_INPUTS=%d\n' % NCSV_INPUTS)
+    fd.write ('TREE_CNT=10\n')
+    fd.write ('SHRINKAGE=0.05\n')
+    fd.write ('MAX_DEPTH=3\n')
+    fd.write ('SUBSAMPLE_FRACTION=0.5\n')
+    fd.write ('SAVE_MODEL_XML=%s\n' % (work_dir + MODEL_FILE))
+    fd.write ('PREDICT_OUT=%s\n' % (work_dir + 'gbt_synthetic_train.txt'))
+    fd.close()
+
+    try:
+        output = subprocess.check_output (['predict_burned_area',
+            '--config_file', work_dir + TRAIN_CONFIG_FILE], cwd=work_dir)
+        logIt (output, log_handler)
+    except subprocess.CalledProcessError, e:
+        msg = 'Error training the GBT model:\n ' + e.output
+        logIt (msg, log_handler)
+        return None
+
+    return work_dir + MODEL_FILE
+
+
+def generate_stack (work_dir, scenes_per_year=12, nyears=3, nrow=1000,
+    ncol=1000, cloud_fraction=0.1, start_year=2000, seed=0,
+    log_handler=None):
+    """Generates a synthetic temporal stack.
+
+    Args:
+      work_dir - directory for the stack; the scenes are written to
+          work_dir/input/
+      scenes_per_year - number of scenes in each year
+      nyears - number of years in the stack
+      nrow - number of lines in each scene
+      ncol - number of samples in each scene
+      cloud_fraction - fraction of each scene which is cloudy
+      start_year - first year of the stack
+      seed - seed of the random number generator
+      log_handler - handler for the logging information
+
+    Returns:
+        dictionary of the input directory, the list of scene dictionaries,
+        and the model file (None if the model couldn't be trained)
+    """
+
+    rng = numpy.random.RandomState (seed)
+    work_dir = os.path.abspath (work_dir) + '/'
+    input_dir = work_dir + 'input/'
+    if not os.path.exists (input_dir):
+        os.makedirs (input_dir)
+
+    landscape = create_landscape (nrow, ncol, start_year, nyears, rng)
+    scenes = []
+    for (date, satellite) in scene_dates (start_year, nyears,
+        scenes_per_year, rng):
+        scenes.append (create_scene (input_dir, date, satellite, nrow, ncol,
+            cloud_fraction, landscape, rng))
+    write_stack_files (input_dir, scenes)
+
+    msg = 'Generated %d synthetic scenes (%d x %d) in %s' % (len(scenes),
+        nrow, ncol, input_dir)
+    logIt (msg, log_handler)
+
+    return {'input_dir': input_dir, 'scenes': scenes,
+        'model_file': train_model (work_dir, rng, log_handler)}
+
+
+def main ():
+    parser = ArgumentParser(description='Generate a synthetic temporal '  \
+        'stack of surface reflectance scenes for benchmarking')
+    parser.add_argument ('--work_dir', type=str, dest='work_dir',
+        required=True, help='directory for the synthetic stack',
+        metavar='DIR')
+    parser.add_argument ('--scenes_per_year', type=int,
+        dest='scenes_per_year', default=12,
+        help='number of scenes in each year (default = 12)')
+    parser.add_argument ('--years', type=int, dest='years', default=3,
+        help='number of years in the stack (default = 3)')
+    parser.add_argument ('--start_year', type=int, dest='start_year',
+        default=2000, help='first year of the stack (default = 2000)')
+    parser.add_argument ('--nrow', type=int, dest='nrow', default=1000,
+        help='number of lines in each scene (default = 1000)')
+    parser.add_argument ('--ncol', type=int, dest='ncol', default=1000,
+        help='number of samples in each scene (default = 1000)')
+    parser.add_argument ('--cloud_fraction', type=float,
+        dest='cloud_fraction', default=0.1,
+        help='fraction of each scene which is cloudy (default = 0.1)')
+    parser.add_argument ('--seed', type=int, dest='seed', default=0,
+        help='seed of the random number generator (default = 0)')
+    options = parser.parse_args()
+
+    generate_stack (options.work_dir, options.scenes_per_year,
+        options.years, options.nrow, options.ncol, options.cloud_fraction,
+        options.start_year, options.seed)
+    return SUCCESS
+
+
+if __name__ == "__main__":
+    sys.exit (main())
@@ -13,9 +13,54 @@ from log_it import *
 #     Created Python script to run the boosted regression tree algorithm.
 # 
 # History:
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Stream the output of predict_burned_area to the log as it runs, and
+#       parse its PROGRESS lines.
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Added RegressionPredictor to run a series of scenes through a single
+#       predict_burned_area process, so the model is only loaded once.
 # 
 # Usage: do_boosted_regression.py --help prints the help message
 #######################################################################
+
+# keyword of the progress lines written by predict_burned_area
+PROGRESS_KEYWORD = 'PROGRESS'
+
+# keyword of the line written by predict_burned_area --config_stdin when the
+# predictions for a configuration file are complete
+SCENE_DONE_KEYWORD = 'SCENE_DONE'
+
+
+def parse_progress (line):
+    """Parses a PROGRESS line written by predict_burned_area.
+
+    Args:
+      line - line of output from predict_burned_area
+
+    Returns:
+      None - the line isn't a PROGRESS line
+      dictionary of the values in the line, i.e. lines, nlines, pixels,
+          valid_pixels, elapsed, pixels_per_second, io_seconds,
+          feature_seconds, and tree_seconds
+    """
+
+    fields = line.split()
+    if len(fields) == 0 or fields[0] != PROGRESS_KEYWORD:
+        return None
+
+    values = {}
+    for field in fields[1:]:
+        (key, sep, value) = field.partition ('=')
+        try:
+            if value.isdigit():
+                values[key] = int (value)
+            else:
+                values[key] = float (value)
+        except ValueError:
+            return None
+    return values
+
+
 class BoostedRegression():
     """Class for handling boosted regression tree processing.
     """
@@ -25,7 +70,7 @@ class BoostedRegression():
 
 
     def runBoostedRegression (self, config_file=None, logfile=None, \
-        usebin=None):
+        usebin=None, progress=None):
         """Runs the boosted regression algorithm for the specified file.
         Description: runBoostedRegression will use the parameter passed for
         the input configuration file.  If input config file is None (i.e. not
@@ -42,6 +87,10 @@ class BoostedRegression():
           Updated on Dec. 2, 2013 by Gail Schmidt, USGS/EROS LSRD Project
               Modified to use argparser vs. optionparser, since optionparser
               is deprecated.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              The output of predict_burned_area is logged line by line as it
+              runs, vs. all at once when it completes.  Added progress for
+              the values of the PROGRESS lines.
         Args:
           config_file - name of the input configuration file to be processed
           logfile - name of the logfile for logging information; if None then
@@ -49,6 +98,9 @@ class BoostedRegression():
           usebin - this specifies if the boosted regression tree exe resides
               in the $BIN directory; if None then the boosted regression exe
               is expected to be in the PATH
+          progress - optional function called with the dictionary of values
+              of each PROGRESS line written by predict_burned_area (see
+              parse_progress)
         
         Returns:
             ERROR - error running the boosted regression tree application
@@ -136,17 +188,33 @@ class BoostedRegression():
         logIt (msg, log_handler)
         os.chdir (configdir)
 
-        # run boosted regression algorithm, checking the return status.  exit
-        # if any errors occur.
+        # run boosted regression algorithm, logging the output as it is
+        # written and passing along the progress, then check the return
+        # status.  exit if any errors occur.
         cmdstr = "%spredict_burned_area --config_file %s --verbose" %  \
             (bin_dir, config_file)
         cmdlist = cmdstr.split(' ')
         try:
-            output = subprocess.check_output (cmdlist, stderr=None)
-            logIt (output, log_handler)
-        except subprocess.CalledProcessError, e:
+            proc = subprocess.Popen (cmdlist, stdout=subprocess.PIPE,
+                stderr=None, bufsize=1)
+        except OSError, e:
             msg = 'Error running boosted regression. Processing will '  \
-                'terminate.\n ' + e.output
+                'terminate.\n ' + str(e)
+            logIt (msg, log_handler)
+            os.chdir (mydir)
+            return ERROR
+
+        for line in iter (proc.stdout.readline, ''):
+            line = line.rstrip ('\n')
+            logIt (line, log_handler)
+            values = parse_progress (line)
+            if (values is not None) and (progress is not None):
+                progress (values)
+        proc.stdout.close()
+
+        if proc.wait() != 0:
+            msg = 'Error running boosted regression. Processing will '  \
+                'terminate.'
             logIt (msg, log_handler)
             os.chdir (mydir)
             return ERROR
@@ -161,5 +229,109 @@ class BoostedRegression():
 
 ######end of BoostedRegression class######
 
+
+class RegressionPredictor():
+    """Class for running the boosted regression on a series of scenes with a
+       single predict_burned_area process.  The process reads the
+       configuration files from stdin and only loads the model again when it
+       changes, so the scenes which share a model don't each pay for loading
+       it.
+    """
+
+    def __init__(self, log_handler=None, usebin=None):
+        """Initializes the predictor; the process is started with the
+           first scene.
+
+        Args:
+          log_handler - handler for the logging information
+          usebin - this specifies if the boosted regression tree exe resides
+              in the $BIN directory; if None then the boosted regression exe
+              is expected to be in the PATH
+        """
+
+        self.log_handler = log_handler
+        self.bin_dir = ""
+        if usebin:
+            self.bin_dir = os.environ.get('BIN') + '/'
+        self.proc = None
+
+
+    def predict (self, config_file, progress=None):
+        """Runs the boosted regression for the configuration file.
+        Description: The configuration file is sent to the predict_burned_area
+            process, starting it if needed, and its output is logged until
+            the predictions for the scene are complete.  The process exits
+            on an error, in which case it is started again for the next
+            scene.
+
+        Args:
+          config_file - name of the configuration file of the scene.  The
+              files in the configuration need to be absolute paths, or
+              relative to the directory of the first configuration file.
+          progress - optional function called with the dictionary of values
+              of each PROGRESS line (see parse_progress)
+
+        Returns:
+            ERROR - error running the boosted regression for the scene
+            SUCCESS - successful processing
+        """
+
+        config_file = os.path.abspath (config_file)
+        if not os.path.isfile(config_file):
+            msg = 'Error: configuration file does not exist or is not ' \
+                'accessible: %s' % config_file
+            logIt (msg, self.log_handler)
+            return ERROR
+
+        if self.proc is None:
+            cmdlist = ['%spredict_burned_area' % self.bin_dir,
+                '--config_stdin', '--verbose']
+            try:
+                self.proc = subprocess.Popen (cmdlist, stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE, stderr=None, bufsize=1,
+                    cwd=os.path.dirname (config_file))
+            except OSError, e:
+                msg = 'Error running boosted regression.\n ' + str(e)
+                logIt (msg, self.log_handler)
+                return ERROR
+
+        # send the configuration file, then log the output until the scene
+        # is done or the process exits
+        try:
+            self.proc.stdin.write (config_file + '\n')
+            self.proc.stdin.flush()
+        except IOError:
+            pass
+        for line in iter (self.proc.stdout.readline, ''):
+            line = line.rstrip ('\n')
+            if line.startswith (SCENE_DONE_KEYWORD):
+                return SUCCESS
+            logIt (line, self.log_handler)
+            values = parse_progress (line)
+            if (values is not None) and (progress is not None):
+                progress (values)
+
+        self.close()
+        msg = 'Error running boosted regression for ' + config_file
+        logIt (msg, self.log_handler)
+        return ERROR
+
+
+    def close (self):
+        """Ends the predict_burned_area process, if it is running."""
+
+        if self.proc is None:
+            return
+        try:
+            self.proc.stdin.close()
+        except IOError:
+            # the process already exited
+            pass
+        self.proc.stdout.close()
+        self.proc.wait()
+        self.proc = None
+
+######end of RegressionPredictor class######
+
 if __name__ == "__main__":
     sys.exit (BoostedRegression().runBoostedRegression())
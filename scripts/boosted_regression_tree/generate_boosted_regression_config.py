@@ -13,6 +13,8 @@ from log_it import *
 #   regression modeling
 #
 # History:
+#   Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+#       Added the OUTPUT_COMPACT option for uint8 burn probabilities.
 #
 # Usage: generate_boosted_regression_config.py --help prints the help message
 ############################################################################
@@ -27,7 +29,7 @@ class BoostedRegressionConfig():
 
     def runGenerateConfig (self, config_file=None, seasonal_sum_dir=None,
         input_base_file=None, input_mask_file=None, output_dir=None,
-        model_file=None, logfile=None):
+        model_file=None, logfile=None, compact=False):
         """Generates the configuration file.
         Description: runGenerateConfig will use the input parameters to
         generate the configuration file needed for running the boosted
@@ -44,6 +46,8 @@ class BoostedRegressionConfig():
               Modified to support ESPA internal file format as input and output.
           Updated on April 9, 2014 by Gail Schmidt, USGS/EROS LSRD Project
               Modified to support the use of a log file.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Added compact to write the burn probabilities as uint8.
 
         Args:
           config_file - name of the configuration file to be created or
@@ -58,6 +62,9 @@ class BoostedRegressionConfig():
           model_file - name of the geographic model to be used
           logfile - name of the logfile for logging information; if None then
               the output will be written to stdout
+          compact - if True then the burn probabilities are written as
+              uint8 (OUTPUT_COMPACT=1), with 254 for the bad QA pixels and
+              255 for fill
        
         Returns:
             ERROR - error generating the configuration file
@@ -93,6 +100,10 @@ class BoostedRegressionConfig():
                 metavar='FILE')
             parser.add_argument ('-l', '--logfile', type=str, dest='logfile',
                 help='name of optional log file', metavar='FILE')
+            parser.add_argument ('--compact',
+                dest='compact', default=False, action='store_true',
+                help='if True, the burn probabilities are written as uint8 '
+                     'vs. int16')
 
             options = parser.parse_args()
     
@@ -133,6 +144,7 @@ class BoostedRegressionConfig():
             model_file = options.model_file
 
             logfile = options.logfile
+            compact = options.compact
 
         # open the log file if it exists; use line buffering for the output
         log_handler = None
@@ -203,6 +215,9 @@ class BoostedRegressionConfig():
         config_handler.write (config_line + '\n')
         config_line = 'LOAD_MODEL_XML=%s' % model_file
         config_handler.write (config_line + '\n')
+        if compact:
+            config_line = 'OUTPUT_COMPACT=1'
+            config_handler.write (config_line + '\n')
 
         # successful completion
         config_handler.close()
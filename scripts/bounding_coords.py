@@ -0,0 +1,135 @@
+import numpy
+
+from osgeo import osr
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created a module to determine the geographic bounding coordinates of the
+#     stack grid.  The image edges are densified and transformed to lat/long
+#     in a single batched call, rather than one transform call per edge
+#     pixel.
+#
+# History:
+#
+############################################################################
+
+# number of points along each edge for the first pass of the adaptive
+# bounding coordinate computation
+INITIAL_EDGE_SAMPLES = 32
+
+
+def edge_points (nsamps, nlines, nsteps_x, nsteps_y):
+    """Returns the image coordinates along the outer edges of the image.
+    Description: Generates the image coordinates along the top, bottom, left,
+        and right edges of the image.  The edges go one extra line and sample
+        to get the outer extents of the image vs. just the UL of the outer
+        edge.
+
+    History:
+      Created on October 18, 2026 by USGS/EROS LSRD Project
+
+    Args:
+      nsamps - number of samples in the image
+      nlines - number of lines in the image
+      nsteps_x - number of intervals along the top and bottom edges; use
+          nsamps for every pixel along the edge
+      nsteps_y - number of intervals along the left and right edges; use
+          nlines for every pixel along the edge
+
+    Returns:
+      (image_x, image_y) - numpy arrays of the image coordinates
+    """
+
+    samps = numpy.linspace (0.0, float(nsamps), nsteps_x + 1)
+    lines = numpy.linspace (0.0, float(nlines), nsteps_y + 1)
+
+    # top edge, bottom edge, left edge, right edge
+    image_x = numpy.concatenate ((samps, samps,
+        numpy.zeros (lines.shape), numpy.zeros (lines.shape) + nsamps))
+    image_y = numpy.concatenate ((numpy.zeros (samps.shape),
+        numpy.zeros (samps.shape) + nlines, lines, lines))
+
+    return (image_x, image_y)
+
+
+def transform_bounds (image_x, image_y, transform, coord_tf):
+    """Returns the geographic bounds of the specified image coordinates.
+    Description: Converts the image coordinates to map coordinates via the
+        geotransform and then transforms all of the map coordinates to
+        lat/long with a single TransformPoints call.
+
+    History:
+      Created on October 18, 2026 by USGS/EROS LSRD Project
+
+    Args:
+      image_x - numpy array of x-coordinates from the image
+      image_y - numpy array of y-coordinates from the image
+      transform - geotransform array from GDAL GetGeoTransform()
+      coord_tf - osr.CoordinateTransformation from the image projection to
+          lat/long
+
+    Returns:
+      (west_lon, east_lon, north_lat, south_lat)
+    """
+
+    map_x = transform[0] + image_x * transform[1] + image_y * transform[2]
+    map_y = transform[3] + image_x * transform[4] + image_y * transform[5]
+
+    geo = numpy.array (coord_tf.TransformPoints (zip (map_x.tolist(),
+        map_y.tolist())))
+    lon = geo[:,0]
+    lat = geo[:,1]
+
+    return (lon.min(), lon.max(), lat.max(), lat.min())
+
+
+def get_bounding_coords (transform, srs, nsamps, nlines, max_error=None):
+    """Returns the geographic bounding coordinates of the image.
+    Description: Determines the west, east, north, and south bounding
+        coordinates by traversing the boundaries of the image.  By default
+        every pixel along the edges is transformed, which matches the
+        per-pixel traversal previously done in createXML.  If max_error is
+        specified, then the edges are sampled at an increasing density until
+        the bounds change by less than max_error degrees between passes.
+
+    History:
+      Created on October 18, 2026 by USGS/EROS LSRD Project
+
+    Args:
+      transform - geotransform array from GDAL GetGeoTransform()
+      srs - osr.SpatialReference for the image projection
+      nsamps - number of samples in the image
+      nlines - number of lines in the image
+      max_error - maximum change in the bounds (degrees) between successive
+          passes in order to stop densifying the edges; None means every
+          pixel along the edges is used
+
+    Returns:
+      (west_lon, east_lon, north_lat, south_lat)
+    """
+
+    srs_lat_lon = srs.CloneGeogCS()
+    coord_tf = osr.CoordinateTransformation (srs, srs_lat_lon)
+
+    # every pixel along the edges
+    if max_error is None:
+        (image_x, image_y) = edge_points (nsamps, nlines, nsamps, nlines)
+        return transform_bounds (image_x, image_y, transform, coord_tf)
+
+    # adaptively densify the edges, doubling the number of points until the
+    # bounds settle down or every pixel along the edges has been used
+    nsteps_x = min (INITIAL_EDGE_SAMPLES, nsamps)
+    nsteps_y = min (INITIAL_EDGE_SAMPLES, nlines)
+    (image_x, image_y) = edge_points (nsamps, nlines, nsteps_x, nsteps_y)
+    bounds = transform_bounds (image_x, image_y, transform, coord_tf)
+    while (nsteps_x < nsamps) or (nsteps_y < nlines):
+        nsteps_x = min (nsteps_x * 2, nsamps)
+        nsteps_y = min (nsteps_y * 2, nlines)
+        (image_x, image_y) = edge_points (nsamps, nlines, nsteps_x, nsteps_y)
+        new_bounds = transform_bounds (image_x, image_y, transform, coord_tf)
+        error = max ([abs (new_bounds[i] - bounds[i]) for i in range (4)])
+        bounds = new_bounds
+        if error < max_error:
+            break
+
+    return bounds
@@ -15,6 +15,18 @@
 #       burned area products
 #   Updated on 5/19/2014 by Gail Schmimdt, USGS/EROS LSRD Project
 #       Changed the use of burn scar to burned area
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Modified to process the annual summaries for each year in parallel
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Added the compact (uint8) option for the burn count, good looks
+#       count, and maximum burn probability products
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Added the output format option (ENVI or tiled, compressed GeoTIFF) and
+#       read the inputs in blocks of lines which are aligned with the tiles
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Added the memory budget which admits the years of the workers
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Record each year in the task journal of the calling application
 #############################################################################
 
 import sys
@@ -24,6 +36,7 @@ import time
 import datetime as datetime_
 import getopt
 import csv
+import multiprocessing, Queue
 
 import numpy
 
@@ -35,6 +48,14 @@ from osgeo import gdal_array
 from osgeo import gdalconst
 
 import metadata_api
+from bounding_coords import get_bounding_coords
+from product_encoding import *
+from raster_output import *
+from stack_table import *
+from run_metrics import *
+from run_profile import *
+from task_scheduler import *
+from task_journal import *
 
 ERROR = 1
 SUCCESS = 0
@@ -87,6 +108,69 @@ def convert_imageXY_to_mapXY (image_x, image_y, transform):
     return (map_x, map_y)
 
 
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created Python class to handle the multiprocessing of the annual burn
+# summaries, one year at a time.
+#
+# History:
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       An exception processing a year is stored as an error result for the
+#       year, so the year isn't waited on.
+#
+############################################################################
+class parallelYearSummaryWorker(multiprocessing.Process):
+    """Runs the annual burn summaries in parallel for a range of years.
+    """
+ 
+    def __init__ (self, work_queue, result_queue, summaryObject):
+        # base class initialization
+        multiprocessing.Process.__init__(self)
+ 
+        # job management stuff
+        self.work_queue = work_queue
+        self.result_queue = result_queue
+        self.summaryObject = summaryObject
+        self.kill_received = False
+ 
+
+    def run(self):
+        # profile the worker, if specified
+        profiler = start_profile (self.summaryObject.profile_dir)
+        while not self.kill_received:
+            # get a task
+            try:
+                year = self.work_queue.get_nowait()
+            except Queue.Empty:
+                break
+ 
+            # process the year
+            msg = 'Processing %d ...' % year
+            logIt (msg, self.summaryObject.log_handler)
+            self.summaryObject.budget.acquire (year)
+            try:
+                task_started (self.result_queue, year)
+                span = self.summaryObject.metrics.start (str (year), SPAN_YEAR)
+                status = self.summaryObject.yearBurnSummary (year)
+                self.summaryObject.metrics.end (span, status)
+                msg = 'Error running the annual burn summary for year %d.' %  \
+                    year
+            except Exception, e:
+                status = ERROR
+                msg = 'Error running the annual burn summary for year %d: ' \
+                    '%s' % (year, str(e))
+            finally:
+                self.summaryObject.budget.release (year)
+            if status != SUCCESS:
+                logIt (msg, self.summaryObject.log_handler)
+ 
+            # store the result along with the year
+            self.result_queue.put((year, status))
+
+        end_profile (profiler, self.summaryObject.profile_dir,
+            'annual_summaries')
+
+
 
 #############################################################################
 # Created on December 2, 2013 by Gail Schmidt, USGS/EROS LSRD Project
@@ -106,12 +190,15 @@ class AnnualBurnSummary():
     burned_area_version = "version 1.0.0"
 
     def __init__(self):
-        pass
+        self.metrics = RunMetrics (None)
+        self.profile_dir = None
+        self.budget = MemoryBudget (None)
+        self.journal = None
 
 
     def createXML(self, scene_xml_file=None, output_xml_file=None,
         start_year=None, end_year=None, fill_value=None, imgfile=None,
-        log_handler=None):
+        log_handler=None, compact=False, output_format=DEFAULT_FORMAT):
         """Creates an XML file for the products produced by
            runAnnualBurnSummaries.
         Description: routine to create the XML file for the burned area summary
@@ -122,6 +209,17 @@ class AnnualBurnSummary():
         
         History:
           Created on May 12, 2014 by Gail Schmidt, USGS/EROS LSRD Project
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Modified to use get_bounding_coords for the bounding
+              coordinates instead of transforming each edge pixel separately.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Added compact for the UINT8 burn count, good looks count, and
+              maximum burn probability bands.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Added output_format for the file names of the bands.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              The valid range of the compact burn count and good looks
+              count stops below COMPACT_CLOUD_WATER.
 
         Args:
           scene_xml_file - scene-based XML file to be used as the base XML
@@ -134,6 +232,11 @@ class AnnualBurnSummary():
               which can be used to obtain the extents and geographic
               information for these products
           log_handler - handler for the logging information
+          compact - if True then the burn count, good looks count, and
+              maximum burn probability bands are UINT8 with COMPACT_FILL as
+              the fill value
+          output_format - format of the products, which determines the
+              extension of the band file names
    
         Returns:
             ERROR - error creating the XML file
@@ -148,6 +251,9 @@ class AnnualBurnSummary():
         meta_bands = xml.get_bands()
         meta_global = xml.get_global_metadata()
 
+        # extension of the band files
+        ext = raster_ext (output_format)
+
         # update the global information
         meta_global.set_data_provider("USGS/EROS")
         meta_global.set_satellite("LANDSAT")
@@ -223,59 +329,11 @@ class AnnualBurnSummary():
                 mycorner.set_longitude (lon)
                 mycorner.set_latitude (lat)
 
-        # determine the bounding coordinates; initialize using the UL and LR
-        # then work around the scene edges
-        # UL
-        (map_x, map_y) = convert_imageXY_to_mapXY (0.0, 0.0, ds_transform)
-        (ul_lon, ul_lat, height) = coord_tf.TransformPoint (map_x, map_y)
-        # LR
-        (map_x, map_y) = convert_imageXY_to_mapXY (nsamps, nlines, ds_transform)
-        (lr_lon, lr_lat, height) = coord_tf.TransformPoint (map_x, map_y)
-
-        # find the min and max values accordingly, for initialization
-        west_lon = min (ul_lon, lr_lon)
-        east_lon = max (ul_lon, lr_lon)
-        north_lat = max (ul_lat, lr_lat)
-        south_lat = min (ul_lat, lr_lat)
-
-        # traverse the boundaries of the image to determine the bounding
-        # coords; traverse one extra line and sample to get the the outer
-        # extents of the image vs. just the UL of the outer edge.
-        # top and bottom edges
-        for samp in range (0, nsamps_int+1):
-            # top edge
-            (map_x, map_y) = convert_imageXY_to_mapXY (samp, 0.0, ds_transform)
-            (top_lon, top_lat, height) = coord_tf.TransformPoint (map_x, map_y)
-
-            # lower edge
-            (map_x, map_y) = convert_imageXY_to_mapXY (samp, nlines,
-                ds_transform)
-            (low_lon, low_lat, height) = coord_tf.TransformPoint (map_x, map_y)
-
-            # update the min and max values
-            west_lon = min (top_lon, low_lon, west_lon)
-            east_lon = max (top_lon, low_lon, east_lon)
-            north_lat = max (top_lat, low_lat, north_lat)
-            south_lat = min (top_lat, low_lat, south_lat)
-
-        # left and right edges
-        for line in range (0, nlines_int+1):
-            # left edge
-            (map_x, map_y) = convert_imageXY_to_mapXY (0.0, line, ds_transform)
-            (left_lon, left_lat, height) = coord_tf.TransformPoint (map_x,
-                map_y)
-
-            # right edge
-            (map_x, map_y) = convert_imageXY_to_mapXY (nsamps, line,
-                ds_transform)
-            (right_lon, right_lat, height) = coord_tf.TransformPoint (map_x,
-                map_y)
-
-            # update the min and max values
-            west_lon = min (left_lon, right_lon, west_lon)
-            east_lon = max (left_lon, right_lon, east_lon)
-            north_lat = max (left_lat, right_lat, north_lat)
-            south_lat = min (left_lat, right_lat, south_lat)
+        # determine the bounding coordinates by traversing the boundaries of
+        # the image; the edges are transformed in one batch vs. one pixel at a
+        # time
+        (west_lon, east_lon, north_lat, south_lat) = get_bounding_coords (
+            ds_transform, ds_srs, nsamps_int, nlines_int)
 
         # update the XML
         bounding_coords = meta_global.get_bounding_coordinates()
@@ -334,9 +392,13 @@ class AnnualBurnSummary():
                 myband = meta_bands.band[band_count]
                 myband.set_product("burned_area")
                 myband.set_short_name("LNDBA")
-                myband.set_data_type("INT16")
+                if compact and (product != 1):
+                    myband.set_data_type(COMPACT_DATA_TYPE)
+                    myband.set_fill_value(COMPACT_FILL)
+                else:
+                    myband.set_data_type("INT16")
+                    myband.set_fill_value(fill_value)
                 myband.set_pixel_size(myband_save.get_pixel_size())
-                myband.set_fill_value(fill_value)
                 myband.set_nlines(nlines)
                 myband.set_nsamps(nsamps)
                 myband.set_app_version(self.burned_area_version)
@@ -377,7 +439,7 @@ class AnnualBurnSummary():
                 if product == 1:
                     name = "burned_area_%d" % year
                     long_name = "first DOY a burn was observed"
-                    file_name = "burned_area_%d.img" % year
+                    file_name = "burned_area_%d%s" % (year, ext)
                     category = "image"
                     data_units = "day of year"
                     valid_range.min = 0
@@ -387,33 +449,42 @@ class AnnualBurnSummary():
                 elif product == 2:
                     name = "burn_count_%d" % year
                     long_name = "number of times a burn was observed"
-                    file_name = "burn_count_%d.img" % year
+                    file_name = "burn_count_%d%s" % (year, ext)
                     category = "image"
                     data_units = "count"
                     valid_range.min = 0
                     valid_range.max = 366
+                    if compact:
+                        valid_range.max = COMPACT_CLOUD_WATER - 1
                     qa_description = "0: no burn observed" 
 
                 elif product == 3:
                     name = "good_looks_count_%d" % year
                     long_name = "number of good looks (pixels with good QA)"
-                    file_name = "good_looks_count_%d.img" % year
+                    file_name = "good_looks_count_%d%s" % (year, ext)
                     category = "qa"
                     data_units = "count"
                     valid_range.min = 0
                     valid_range.max = 366
+                    if compact:
+                        valid_range.max = COMPACT_CLOUD_WATER - 1
                     qa_description = "0: no valid pixels (water, cloud, " \
                         "snow, etc.)"
 
                 elif product == 4:
                     name = "max_burn_prob_%d" % year
                     long_name = "maximum probability for burned area"
-                    file_name = "max_burn_prob_%d.img" % year
+                    file_name = "max_burn_prob_%d%s" % (year, ext)
                     category = "image"
                     data_units = "probability"
                     valid_range.min = 0
                     valid_range.max = 100
-                    qa_description = "-9998: bad QA (water, cloud, snow, etc.)"
+                    if compact:
+                        qa_description = "%d: bad QA (water, cloud, snow, " \
+                            "etc.)" % COMPACT_CLOUD_WATER
+                    else:
+                        qa_description = "-9998: bad QA (water, cloud, " \
+                            "snow, etc.)"
 
                 myband.set_name(name)
                 myband.set_long_name(long_name)
@@ -445,8 +516,195 @@ class AnnualBurnSummary():
         return SUCCESS
 
 
+    def yearBurnSummary(self, year):
+        """Processes the annual burn summary for the specified year.
+        Description: routine to generate the burned area (first DOY burned),
+            burn count, good looks count, and maximum burn probability images
+            for a single year of the stack.  The stack information, geographic
+            information, and input/output directories are set up in
+            runAnnualBurnSummaries and are available as class attributes.
+        
+        History:
+          Created on October 18, 2026 by USGS/EROS LSRD Project
+              Pulled from runAnnualBurnSummaries so the years can be
+              processed in parallel.
+          Updated on October 18, 2026 by USGS/EROS LSRD Project
+              Write the burn count, good looks count, and maximum burn
+              probability as uint8 if self.compact is set.  Compact burn
+              probability inputs are converted to int16.
+          Updated on October 18, 2026 by USGS/EROS LSRD Project
+              Write the products in self.output_format and process the data
+              in blocks of lines aligned with the tiles of the inputs and
+              outputs, vs. a line at a time.
+          Updated on October 18, 2026 by USGS/EROS LSRD Project
+              Pull the scenes for the year from the year index of the
+              StackTable, and only allocate the inputs for those scenes.
+
+        Args:
+          year - year to be processed
+   
+        Returns:
+            ERROR - error running the annual burn summary for this year
+            SUCCESS - successful processing
+        """
+
+        # pull the scenes for this year from the stack
+        stack3 = self.stack.data[self.stack.yearRows(year)]
+
+        # initialize the input and output datasets
+        input_datasets = numpy.empty( (stack3.shape[0],2), dtype=object )
+        input_bands = numpy.empty( (stack3.shape[0],2), dtype=object )
+        
+        output_datasets = numpy.empty((4), dtype=object)
+        output_bands = numpy.empty((4), dtype=object)
+    
+        # open the input datasets - 1st band is burn probability,
+        # 2nd band is burn classification
+        for i in range(0, stack3.shape[0]):
+            xml_file = stack3['file'][i]
+            
+            # construct the burn probability and classification filenames
+            # from the XML filenames in the CSV
+            fname = os.path.basename(xml_file).replace  \
+                ('.xml','_burn_probability.img')
+            bp_file = self.bp_dir + '/' + fname
+            if not os.path.exists(bp_file):
+                msg = 'burn probability file does not exist: ' + bp_file
+                logIt (msg, self.log_handler)
+                return ERROR
+
+            msg = '    Reading %s ...' % bp_file
+            logIt (msg, self.log_handler)
+            input_datasets[i,0] = gdal.Open(bp_file)
+            input_bands[i,0] = input_datasets[i,0].GetRasterBand(1)
+
+            # the burn classifications may be ENVI or GeoTIFF
+            fname = os.path.basename(xml_file).replace  \
+                ('.xml','_burn_class')
+            bc_name = find_raster (self.bc_dir + '/' + fname)
+            if bc_name is None:
+                msg = 'burn classification file does not exist: ' +  \
+                    self.bc_dir + '/' + fname + '.img'
+                logIt (msg, self.log_handler)
+                return ERROR
+
+            msg = '    Reading %s ...' % bc_name
+            logIt (msg, self.log_handler)
+            input_datasets[i,1] = gdal.Open(bc_name)
+            input_bands[i,1] = input_datasets[i,1].GetRasterBand(1)
+
+        # the burn count, good looks count, and maximum burn probability are
+        # written as uint8 for the compact products
+        if self.compact:
+            (count_type, count_nodata) = (gdal.GDT_Byte, COMPACT_FILL)
+        else:
+            (count_type, count_nodata) = (gdal.GDT_Int16, self.nodata)
+
+        # open the output datasets
+        #    0. first date of burned area (burned_area)
+        #    1. count of times a pixel was burned (burn_count)
+        #    2. count of good looks (good_looks_count)
+        #    3. maximum burn probability (max_burn_prob)
+        ext = raster_ext (self.output_format)
+        products = [('burned_area', gdal.GDT_Int16, self.nodata),
+            ('burn_count', count_type, count_nodata),
+            ('good_looks_count', count_type, count_nodata),
+            ('max_burn_prob', count_type, count_nodata)]
+        for (j, (product, data_type, nodata)) in enumerate(products):
+            fname = self.output_dir + '/' + product + '_' + str(year) + ext
+            output_datasets[j] = create_raster (fname, self.ncol, self.nrow,
+                data_type, self.geotrans, self.prj, nodata,
+                self.output_format, self.compress)
+            if output_datasets[j] is None:
+                msg = 'GDAL could not create output file: ' + fname
+                logIt (msg, self.log_handler)
+                return ERROR
+            output_bands[j] = output_datasets[j].GetRasterBand(1)
+
+        # process a block of lines at a time, so each tile of the GeoTIFF
+        # inputs and outputs is only decompressed or compressed once
+        step = block_lines (list(input_bands[0:stack3.shape[0]].flat) +  \
+            list(output_bands))
+
+        # create the arrays to hold input and output data (one block)
+        input_data = numpy.empty((stack3.shape[0], 2, step, self.ncol),  \
+            dtype=numpy.int16)
+
+        # loop through the blocks of lines in the images
+        for y in range (0, self.nrow, step):
+            nlines = min (step, self.nrow - y)
+            my_input = input_data[:,:,0:nlines,:]
+            my_input.fill(self.nodata)
+
+            # read input data for burn probs and burn classes
+            for i in range(0, stack3.shape[0]):
+                my_input[i,0,:,:] = decode_probability (  \
+                    input_bands[i,0].ReadAsArray(0, y, self.ncol, nlines),
+                    self.nodata)
+                my_input[i,1,:,:] = input_bands[i,1].ReadAsArray(  \
+                    0, y, self.ncol, nlines)
+
+            # find the maximum burn probability (using burn prob)
+            bp_max = numpy.apply_over_axes(numpy.max, my_input[:,0,:,:], \
+                axes=[0])[0,:,:]
+
+            # find the count of burns - how many times a pixel burned
+            # (using burn class)
+            bc = numpy.apply_over_axes(numpy.sum,  \
+                my_input[:,1,:,:] >= 1, axes=[0])[0,:,:]
+            bc[bp_max == self.nodata] = self.nodata
+
+            # find the first date of burn (using burn class)
+            bdi = numpy.apply_over_axes(numpy.argmax,  \
+                my_input[:,1,:,:] >= 1, axes=[0])[0,:,:]
+            
+            # convert bdi to julian date
+            bd = stack3['julian'][bdi]
+            bd[bc == 0] = 0
+            bd[bp_max == self.nodata] = self.nodata
+            
+            # find the number of good looks (using burn class)
+            gc = numpy.apply_over_axes(numpy.sum,  \
+                my_input[:,1,:,:] >= 0, axes=[0])[0,:,:]
+            gc[bp_max == self.nodata] = self.nodata
+        
+            # write output data for the burned area DOY, burn count, good
+            # looks count, and the maximum burn probability
+            if self.compact:
+                bc = encode_count (bc, self.nodata)
+                gc = encode_count (gc, self.nodata)
+                bp_max = encode_probability (bp_max, self.nodata)
+            output_bands[0].WriteArray(bd, xoff=0, yoff=y)
+            output_bands[1].WriteArray(bc, xoff=0, yoff=y)
+            output_bands[2].WriteArray(gc, xoff=0, yoff=y)
+            output_bands[3].WriteArray(bp_max, xoff=0, yoff=y)
+
+        # close the input datasets 
+        for i in range(0, stack3.shape[0]):
+            input_datasets[i,0] = None
+            input_bands[i,0] = None
+            input_datasets[i,1] = None
+            input_bands[i,1] = None
+
+        # close the output datasets 
+        output_datasets[0] = None
+        output_datasets[1] = None
+        output_datasets[2] = None
+        output_datasets[3] = None
+        output_bands[0] = None
+        output_bands[1] = None
+        output_bands[2] = None
+        output_bands[3] = None
+
+        return SUCCESS
+
+
     def runAnnualBurnSummaries(self, stack_file=None, bp_dir=None, bc_dir=None,
-        output_dir=None, start_year=None, end_year=None, logfile=None):
+        output_dir=None, start_year=None, end_year=None, num_processors=1,
+        logfile=None, years=None, compact=False,
+        output_format=DEFAULT_FORMAT, compress=DEFAULT_COMPRESS,
+        year_done=None, metrics_file=None, profile=None, profile_dir=None,
+        memory_limit=None, finalize=True, journal=None):
         """Processes the annual burn summaries for each year in the stack.
         Description: routine to process the annual burn summaries for each
             pixel.
@@ -472,11 +730,44 @@ class AnnualBurnSummary():
               Modified the recfromcsv calls to not specify the datatype and to
               instead use the automatically-determined datatype from the read
               itself.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Modified to process each year in parallel via yearBurnSummary.
+              The XML file is still created once, after all the years have
+              been processed.  Added years to only regenerate a subset of the
+              years, while the XML file still covers start_year to end_year.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Added --compact to write the burn count, good looks count, and
+              maximum burn probability as uint8.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Added --output_format and --compress to write the products as
+              tiled, compressed GeoTIFF.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Added year_done so the products of each year can be packaged
+              as soon as the year is complete.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Modified stack_file to also accept a StackTable, so the stack
+              file isn't parsed again when run from do_burned_area.
+              The years are selected via the year index of the StackTable.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Added metrics_file for the run metrics of each year.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Added profile and profile_dir to profile the main process and
+              each of the workers.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Added memory_limit for the memory budget of the workers.  A
+              num_processors of 0 uses all the cores.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Added finalize so the years can be processed as separate
+              tasks, with the products finished once.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Added journal to record each year in the task journal of the
+              calling application.  The results of all the years are
+              collected, vs. returning on the first failure.
 
         Args:
-          stack_file - input CSV file with information about the files to be
-              processed.  this is generated as part of the seasonal summaries
-              application.
+          stack_file - StackTable, or input CSV file with information about
+              the files to be processed.  this is generated as part of the
+              seasonal summaries application.
           bp_dir - location of the burn probability files
           bc_dir - location of the burn classification files
           output_dir - location to write the output burn classifications
@@ -484,8 +775,42 @@ class AnnualBurnSummary():
               to start with the lowest year + 1
           end_year - ending year of the stack_file to process; default is to end
               with the highest year
+          num_processors - how many processors should be used for parallel
+              processing of the years; default is 1, single threaded.  0
+              uses all the cores.
           logfile - name of the logfile for logging information; if None then
               the output will be written to stdout
+          years - set of years to be processed; if None then all the years
+              from start_year to end_year are processed
+          compact - if True then the burn count, good looks count, and
+              maximum burn probability are written as uint8, with
+              COMPACT_FILL as the fill value and COMPACT_CLOUD_WATER for the
+              bad QA burn probabilities
+          output_format - format of the products, FORMAT_ENVI or
+              FORMAT_GTIFF (tiled and compressed GeoTIFF)
+          compress - compression method of the GeoTIFF products
+          year_done - optional function called with the year as each year
+              is successfully processed
+          metrics_file - name of the JSON-lines file for the run metrics of
+              each year; None disables the metrics
+          profile - if set to true then the main process and each of the
+              workers are profiled with cProfile.  The profiles are written
+              to the profile directory in the output directory and merged
+              into a report of the top functions at the end of processing.
+          profile_dir - directory for the profiles of the workers, when the
+              profiling was set up by the calling application; None
+              disables the profiling unless profile is set
+          memory_limit - memory budget of the workers in gigabytes.  Each
+              year is processed once its estimated memory fits within the
+              budget.  If None then most of the memory available on the node
+              is used.
+          finalize - if False then the GDAL .aux.xml files aren't removed
+              and the output XML file isn't written, i.e. when the years are
+              processed as separate tasks
+          journal - TaskJournal of the calling application.  Each year is
+              recorded in the journal, and the years which completed in a
+              previous attempt are skipped.  None if the years aren't
+              journaled.
    
         Returns:
             ERROR - error running the annual burn summary application
@@ -525,10 +850,52 @@ class AnnualBurnSummary():
                     'probabilities; default is to use the maximum year '  \
                     'of the files in the stack_file',
                 metavar='YEAR')
+            parser.add_argument ('-n', '--num_processors', type=int,
+                dest='num_processors',
+                help='how many processors should be used for parallel '  \
+                    'processing of the years; 0 uses all the cores '  \
+                    '(default = 1, single threaded)')
+            parser.add_argument ('--memory_limit', type=float,
+                dest='memory_limit',
+                help='memory budget of the parallel workers in gigabytes; '  \
+                     'years are only processed once their estimated '  \
+                     'memory fits within the budget (default = most of '  \
+                     'the available memory)', metavar='GB')
             parser.add_argument ('-l', '--logfile', type=str, dest='logfile',
                 help='name of optional log file', metavar='FILE')
+            parser.add_argument ('--compact',
+                dest='compact', default=False, action='store_true',
+                help='if True, the burn count, good looks count, and '
+                     'maximum burn probability are written as uint8 vs. '
+                     'int16')
+            parser.add_argument ('--output_format', type=str,
+                dest='output_format', default=DEFAULT_FORMAT,
+                choices=OUTPUT_FORMATS,
+                help='format of the annual products; gtiff is tiled and '  \
+                     'compressed GeoTIFF (default = %s)' % DEFAULT_FORMAT)
+            parser.add_argument ('--compress', type=str, dest='compress',
+                default=DEFAULT_COMPRESS, choices=COMPRESS_METHODS,
+                help='compression method for the gtiff output format '  \
+                     '(default = %s)' % DEFAULT_COMPRESS)
+            parser.add_argument ('--metrics_file', type=str,
+                dest='metrics_file',
+                help='name of the JSON-lines file for the timing and '  \
+                     'resource usage of each year; the metrics are not '  \
+                     'recorded if not specified', metavar='FILE')
+            parser.add_argument ('--profile',
+                dest='profile', default=False, action='store_true',
+                help='if True, the main process and each worker are '
+                     'profiled with cProfile, and a merged report of the '
+                     'top functions is written to the profile directory in '
+                     'the output directory.')
 
             options = parser.parse_args()
+            compact = options.compact
+            metrics_file = options.metrics_file
+            profile = options.profile
+            memory_limit = options.memory_limit
+            output_format = options.output_format
+            compress = options.compress
 
             # validate command-line options and arguments
             stack_file = options.stack_file
@@ -537,13 +904,13 @@ class AnnualBurnSummary():
                 return ERROR
 
             bp_dir = options.bp_dir
-            if input_dir is None:
+            if bp_dir is None:
                 parser.error ("missing input directory for the burn "  \
                     "probabilities cmd-line argument")
                 return ERROR
 
             bc_dir = options.bc_dir
-            if input_dir is None:
+            if bc_dir is None:
                 parser.error ("missing input directory for the burn "  \
                     "classifications cmd-line argument")
                 return ERROR
@@ -559,10 +926,22 @@ class AnnualBurnSummary():
             if options.end_year is not None:
                 end_year = options.end_year
 
+            # number of processors
+            if options.num_processors is not None:
+                num_processors = options.num_processors
+
+            if options.logfile is not None:
+                logfile = options.logfile
+        num_processors = resolve_processors (num_processors)
+
         # open the log file if it exists; use line buffering for the output
         log_handler = None
         if logfile is not None:
             log_handler = open (logfile, 'w', buffering=1)
+        self.log_handler = log_handler
+
+        # set up the run metrics, if specified
+        self.metrics = open_metrics (metrics_file, log_handler)
 
         # validate options and arguments
         if start_year is not None:
@@ -584,11 +963,17 @@ class AnnualBurnSummary():
                 logIt (msg, log_handler)
                 return ERROR
 
-        if not os.path.exists(stack_file):
+        if (not isinstance(stack_file, StackTable)) and  \
+           (not os.path.exists(stack_file)):
             msg = 'CSV stack file does not exist: ' + stack_file
             logIt (msg, log_handler)
             return ERROR
 
+        # read the stack file, unless the stack table was passed in
+        stack = read_stack_table(stack_file, log_handler)
+        if stack is None:
+            return ERROR
+
         if not os.path.exists(bp_dir):
             msg = 'Burn probability directory does not exist: ' + bp_dir
             logIt (msg, log_handler)
@@ -605,6 +990,18 @@ class AnnualBurnSummary():
             logIt (msg, log_handler)
             os.makedirs(output_dir, 0755)
 
+        # set up the profiling of the workers, if specified.  the main
+        # process is also profiled when the profiling is requested here,
+        # vs. by the calling application.
+        self.profile_dir = profile_dir
+        self.journal = journal
+        main_profiler = None
+        if profile:
+            self.profile_dir = os.path.abspath (os.path.join (output_dir,
+                PROFILE_DIR))
+            clear_profiles (self.profile_dir)
+            main_profiler = start_profile (self.profile_dir)
+
         # save the current working directory for return to upon error or when
         # processing is complete
         mydir = os.getcwd()
@@ -616,9 +1013,6 @@ class AnnualBurnSummary():
         # start of threshold processing
         start_time0 = time.time()
     
-        # open the stack file
-        stack = numpy.recfromcsv(stack_file, delimiter=',', names=True)
-
         # use the minimum and maximum years in the stack if the start year and
         # end year were not specified on the command line.  start year needs
         # to be one more than the actual starting year in the stack since the
@@ -629,15 +1023,14 @@ class AnnualBurnSummary():
             start_year = numpy.min(stack['year']) + 1
         if end_year is None:
             end_year = numpy.max(stack['year'])
-        stack_mask = (stack['year'] >= start_year) & (stack['year'] <= end_year)
-        stack2 = stack[stack_mask]
+        stack2 = stack.data[stack.yearRangeRows(start_year, end_year)]
 
         # given that all burn products in this temporal stack have the same
         # scene extents and projection information, just obtain that
         # information from the first file and use it for all of the files.
         # use the XML filename in the CSV file to obtain the burn probability
         # filename
-        xml_file = stack2['file_'][0]
+        xml_file = stack2['file'][0]
         fname = os.path.basename(xml_file).replace  \
             ('.xml','_burn_probability.img')
         bp_file = bp_dir + '/' + fname
@@ -681,8 +1074,12 @@ class AnnualBurnSummary():
             logIt (msg, log_handler)
             return ERROR
 
+        # compact burn probabilities are converted to int16 as they are
+        # read, so use the int16 fill value
         nodata = bp_band.GetNoDataValue()
-        if nodata is None:
+        if bp_band.DataType == gdal.GDT_Byte:
+            nodata = INT16_FILL
+        elif nodata is None:
             nodata = -9999
             msg = 'Failed to obtain the NoDataValue from %s.  Using %d.' % \
                 (bp_file, nodata)
@@ -692,213 +1089,121 @@ class AnnualBurnSummary():
         bp_band = None
         bp_dataset = None
 
-        # create the ENVI driver for output data
-        driver = gdal.GetDriverByName('ENVI')
-    
+        # save the information needed by the parallel workers
+        self.stack = stack
+        self.bp_dir = bp_dir
+        self.bc_dir = bc_dir
+        self.output_dir = output_dir
+        self.nrow = nrow
+        self.ncol = ncol
+        self.geotrans = geotrans
+        self.prj = prj
+        self.nodata = nodata
+        self.compact = compact
+        self.output_format = output_format
+        self.compress = compress
+
         # process the data for the years specified
         # create images for:
         #    1. first date a burned area was observed (burned_area)
         #    2. number of times burn was observed (burn_count)
         #    3. number of good looks (good_looks_count)
         #    4. maximum probability for burned area (max_burn_prob)
-    
-        # loop through the years in the stack
-        msg = 'Processing burn files for %d-%d' % (start_year, end_year)
+
+        # load up the work queue for processing the years in parallel, since
+        # each year reads a disjoint set of scenes from the stack, along with
+        # the estimated memory of each year.  the years which completed in a
+        # previous attempt are skipped.
+        self.budget = memory_budget (memory_limit, log_handler)
+        work_queue = multiprocessing.Queue()
+        tasks = {}
+        for year in range(start_year, end_year+1):
+            if (years is not None) and (year not in years):
+                continue
+            task = 'annual_summary/%d' % year
+            if (self.journal is not None) and self.journal.isDone (task):
+                continue
+            self.budget.estimate (year,
+                summary_memory_mb (len (stack.yearRows (year)), ncol))
+            work_queue.put(year)
+            tasks[year] = task
+        num_years = len(tasks)
+
+        # create a queue to pass to workers to store the processing status
+        result_queue = multiprocessing.Queue()
+
+        # spawn workers to process each year in the stack
+        msg = 'Spawning %d years (%d-%d) for the annual burn summaries via ' \
+            '%d processors, %s ....' % (num_years, start_year, end_year,
+            num_processors, self.budget.describe())
         logIt (msg, log_handler)
-        for year in range(start_year,end_year+1):
-            msg = '########################################################'
-            logIt (msg, log_handler)
-            msg = 'Processing %d ...' % year
+        workers = []
+        for i in range(min(num_processors, num_years)):
+            worker = parallelYearSummaryWorker(work_queue, result_queue, self)
+            worker.start()
+            workers.append(worker)
+
+        # collect the annual burn summary results off the queue, recording
+        # each year in the task journal
+        failed = collect_results (result_queue, tasks, workers, self.journal,
+            year_done, self.budget, log_handler)
+        if len(failed) > 0:
+            msg = 'Error processing the annual burn summaries for the ' \
+                'years %s' % ', '.join([str(year) for year in sorted(failed)])
             logIt (msg, log_handler)
-                
-            stack_mask = stack2['year'] == year
-            stack3 = stack2[stack_mask]
+            os.chdir (mydir)
+            return ERROR
 
-            # initialize the input and output datasets
-            input_datasets = numpy.empty( (stack2.shape[0],2), dtype=object )
-            input_bands = numpy.empty( (stack2.shape[0],2), dtype=object )
-            
-            output_datasets = numpy.empty((4), dtype=object)
-            output_bands = numpy.empty((4), dtype=object)
-        
-            # open the input datasets - 1st band is burn probability,
-            # 2nd band is burn classification
-            for i in range(0, stack3.shape[0]):
-                xml_file = stack3['file_'][i]
-                
-                # construct the burn probability and classification filenames
-                # from the XML filenames in the CSV
-                fname = os.path.basename(xml_file).replace  \
-                    ('.xml','_burn_probability.img')
-                bp_file = bp_dir + '/' + fname
-                if not os.path.exists(bp_file):
-                    msg = 'burn probability file does not exist: ' + bp_file
-                    logIt (msg, log_handler)
-                    os.chdir (mydir)
-                    return ERROR
-
-                msg = '    Reading %s ...' % bp_file
-                logIt (msg, log_handler)
-                input_datasets[i,0] = gdal.Open(bp_file)
-                input_bands[i,0] = input_datasets[i,0].GetRasterBand(1)
-
-                fname = os.path.basename(xml_file).replace  \
-                    ('.xml','_burn_class.img')
-                bc_name = bc_dir + '/' + fname
-                if not os.path.exists(bc_name):
-                    msg = 'burn classification file does not exist: ' + bc_name
-                    logIt (msg, log_handler)
-                    os.chdir (mydir)
-                    return ERROR
-
-                msg = '    Reading %s ...' % bc_name
+        # finish the products, unless the years are being processed as
+        # separate tasks and the products are finished by the caller
+        if finalize:
+            # remove the .img.aux.xml and .tif.aux.xml files that are
+            # generated by GDAL as these won't be delivered to the user
+            rm_files = glob.glob (output_dir + '/burned_area_*.aux.xml')
+            for file in rm_files:
+                print 'Remove: ' + file
+                os.remove (os.path.join (file))
+
+            rm_files = glob.glob (output_dir + '/burn_count_*.aux.xml')
+            for file in rm_files:
+                print 'Remove: ' + file
+                os.remove (os.path.join (file))
+
+            rm_files = glob.glob (output_dir +  \
+                '/good_looks_count_*.aux.xml')
+            for file in rm_files:
+                print 'Remove: ' + file
+                os.remove (os.path.join (file))
+
+            rm_files = glob.glob (output_dir + '/max_burn_prob_*.aux.xml')
+            for file in rm_files:
+                print 'Remove: ' + file
+                os.remove (os.path.join (file))
+
+            # create the output XML file which contains information for each
+            # of the bands: burned area date, burn count, good looks count, and
+            # the maximum burn probability
+            print "Creating output XML file for burned area ..."
+            xml_file = stack2['file'][0]
+            fname = os.path.basename(xml_file).replace  \
+                ('.xml','_burn_probability.img')
+            output_xml_file = "burned_area_%d_%d.xml" % (start_year, end_year)
+            status = self.createXML (xml_file, output_xml_file, start_year,
+                end_year, nodata, fname, log_handler, compact, output_format)
+            if status != SUCCESS:
+                msg = 'Failed to write the output XML file: ' +  \
+                    output_xml_file
                 logIt (msg, log_handler)
-                input_datasets[i,1] = gdal.Open(bc_name)
-                input_bands[i,1] = input_datasets[i,1].GetRasterBand(1)
-
-            # open the output datasets
-            # first date of burned area (burned_area)
-            fname = output_dir + '/burned_area_' + str(year) + '.img'
-            output_datasets[0] = driver.Create(fname, ncol, nrow, 1, \
-                gdal.GDT_Int16)
-            output_datasets[0].SetGeoTransform(geotrans)
-            output_datasets[0].SetProjection(prj)
-            output_bands[0] = output_datasets[0].GetRasterBand(1)
-            output_bands[0].SetNoDataValue(nodata)
-            
-            # count of times a pixel was burned (burn_count)
-            fname = output_dir + '/burn_count_' + str(year) + '.img'
-            output_datasets[1] = driver.Create(fname, ncol, nrow, 1,  \
-                gdal.GDT_Int16)
-            output_datasets[1].SetGeoTransform(geotrans)
-            output_datasets[1].SetProjection(prj)
-            output_bands[1] = output_datasets[1].GetRasterBand(1)
-            output_bands[1].SetNoDataValue(nodata)
-            
-            # count of good looks (good_looks_count)
-            fname = output_dir + '/good_looks_count_' + str(year) + '.img'
-            output_datasets[2] = driver.Create(fname, ncol, nrow, 1,  \
-                gdal.GDT_Int16)
-            output_datasets[2].SetGeoTransform(geotrans)
-            output_datasets[2].SetProjection(prj)
-            output_bands[2] = output_datasets[2].GetRasterBand(1)
-            output_bands[2].SetNoDataValue(nodata)
-            
-            # maximum burn probability (max_burn_prob)
-            fname = output_dir + '/max_burn_prob_' + str(year) + '.img'
-            output_datasets[3] = driver.Create(fname, ncol, nrow, 1,  \
-                gdal.GDT_Int16)
-            output_datasets[3].SetGeoTransform(geotrans)
-            output_datasets[3].SetProjection(prj)
-            output_bands[3] = output_datasets[3].GetRasterBand(1)
-            output_bands[3].SetNoDataValue(nodata)
-
-            # loop through the lines in the images
-            for y in range (0, nrow):
-                # create the arrays to hold input and output data (one line)
-                input_data = numpy.empty((stack3.shape[0], 2, 1, ncol),  \
-                    dtype=numpy.int16)
-                input_data.fill(nodata)
-
-                output_data = numpy.empty((1, 4, 1, ncol), dtype=numpy.int16)
-                output_data.fill(nodata)
-
-                # read input data for burn probs and burn classes
-                for i in range(0, stack3.shape[0]):
-                    input_data[i,0,:,:] = input_bands[i,0].ReadAsArray(  \
-                        0, y, ncol, 1)
-                    input_data[i,1,:,:] = input_bands[i,1].ReadAsArray(  \
-                        0, y, ncol, 1)
-
-                # find the maximum burn probability (using burn prob)
-                bp_max = numpy.apply_over_axes(numpy.max, input_data[:,0,:,:], \
-                    axes=[0])[0,:,:]
-
-                # find the count of burns - how many times a pixel burned
-                # (using burn class)
-                bc = numpy.apply_over_axes(numpy.sum,  \
-                    input_data[:,1,:,:] >= 1, axes=[0])[0,:,:]
-                bc[bp_max == nodata] = nodata
-    
-                # find the first date of burn (using burn class)
-                bdi = numpy.apply_over_axes(numpy.argmax,  \
-                    input_data[:,1,:,:] >= 1, axes=[0])[0,:,:]
-                
-                # convert bdi to julian date
-                bd = stack3['julian'][bdi]
-                bd[bc == 0] = 0
-                bd[bp_max == nodata] = nodata
-                
-                # find the number of good looks (using burn class)
-                gc = numpy.apply_over_axes(numpy.sum,  \
-                    input_data[:,1,:,:] >= 0, axes=[0])[0,:,:]
-                gc[bp_max == nodata] = nodata
-            
-                # write output data for the burned area DOY, burn count, good
-                # looks count, and the maximum burn probability
-                output_bands[0].WriteArray(bd, xoff=0, yoff=y)
-                output_bands[1].WriteArray(bc, xoff=0, yoff=y)
-                output_bands[2].WriteArray(gc, xoff=0, yoff=y)
-                output_bands[3].WriteArray(bp_max, xoff=0, yoff=y)
-
-            # close the input datasets 
-            for i in range(0, stack3.shape[0]):
-                input_datasets[i,0] = None
-                input_bands[i,0] = None
-                input_datasets[i,1] = None
-                input_bands[i,1] = None
-
-            # close the output datasets 
-            output_datasets[0] = None
-            output_datasets[1] = None
-            output_datasets[2] = None
-            output_datasets[3] = None
-            output_bands[0] = None
-            output_bands[1] = None
-            output_bands[2] = None
-            output_bands[3] = None
-        # end for year
-
-        # remove the .img.aux.xml files that are generated by GDAL as these
-        # won't be delivered to the user
-        rm_files = glob.glob (output_dir + '/burned_area_*.img.aux.xml')
-        for file in rm_files:
-            print 'Remove: ' + file
-            os.remove (os.path.join (file))
-
-        rm_files = glob.glob (output_dir + '/burn_count_*.img.aux.xml')
-        for file in rm_files:
-            print 'Remove: ' + file
-            os.remove (os.path.join (file))
-
-        rm_files = glob.glob (output_dir + '/good_looks_count_*.img.aux.xml')
-        for file in rm_files:
-            print 'Remove: ' + file
-            os.remove (os.path.join (file))
-
-        rm_files = glob.glob (output_dir + '/max_burn_prob_*.img.aux.xml')
-        for file in rm_files:
-            print 'Remove: ' + file
-            os.remove (os.path.join (file))
-
-        # create the output XML file which contains information for each of
-        # the bands: burned area date, burn count, good looks count, and the
-        # maximum burn probability
-        print "Creating output XML file for burned area ..."
-        xml_file = stack2['file_'][0]
-        fname = os.path.basename(xml_file).replace  \
-            ('.xml','_burn_probability.img')
-        output_xml_file = "burned_area_%d_%d.xml" % (start_year, end_year)
-        status = self.createXML (xml_file, output_xml_file, start_year,
-            end_year, nodata, fname, log_handler)
-        if status != SUCCESS:
-            msg = 'Failed to write the output XML file: ' + output_xml_file
-            logIt (msg, log_handler)
-            return ERROR
+                return ERROR
 
         # successful completion.  return to the original directory.
         msg = 'Completion of annual burn summaries.'
         logIt (msg, log_handler)
+
+        # merge the profiles into the report of the top functions
+        if main_profiler is not None:
+            end_profile (main_profiler, self.profile_dir, 'main')
+            profile_report (self.profile_dir, log_handler=log_handler)
         if logfile is not None:
             log_handler.close()
         os.chdir (mydir)
@@ -21,6 +21,14 @@
 #   Updated on 2/11/2015 by Gail Schmidt, USGS/EROS
 #       Modified the recfromcsv calls to not specify the datatype and to
 #       instead use the automatically-determined datatype from the read itself.
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Modified to read the compact (uint8) burn probabilities
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Added the output format option for the burn classifications
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Added the memory budget which admits the scenes of the workers
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Record each scene in the task journal of the calling application
 #############################################################################
 
 import sys
@@ -40,6 +48,15 @@ from osgeo import osr
 from osgeo import gdal_array
 from osgeo import gdalconst
 
+from stage_cache import *
+from product_encoding import *
+from raster_output import *
+from stack_table import *
+from run_metrics import *
+from run_profile import *
+from task_scheduler import *
+from task_journal import *
+
 ERROR = 1
 SUCCESS = 0
 
@@ -66,6 +83,9 @@ def logIt (msg, log_handler):
 # Created Python class to handle the multiprocessing of a stack of scenes.
 #
 # History:
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Modified to return the burn probability file along with the status,
+#       and to store an exception processing a scene as an error result.
 #
 ############################################################################
 class parallelSceneThresholdWorker(multiprocessing.Process):
@@ -84,6 +104,8 @@ class parallelSceneThresholdWorker(multiprocessing.Process):
  
 
     def run(self):
+        # profile the worker, if specified
+        profiler = start_profile (self.stackObject.profile_dir)
         while not self.kill_received:
             # get a task
             try:
@@ -94,14 +116,28 @@ class parallelSceneThresholdWorker(multiprocessing.Process):
             # process the scene
             msg = 'Processing %s ...' % xml_file
             logIt (msg, self.stackObject.log_handler)
-            status = self.stackObject.sceneBurnThreshold (xml_file)
-            if status != SUCCESS:
+            self.stackObject.budget.acquire (xml_file)
+            try:
+                task_started (self.result_queue, xml_file)
+                span = self.stackObject.metrics.start (
+                    os.path.basename (xml_file), SPAN_SCENE)
+                status = self.stackObject.sceneBurnThreshold (xml_file)
+                self.stackObject.metrics.end (span, status)
                 msg = 'Error running burn thresholding on the XML file ' \
-                    '(%s). Processing will terminate.' % xml_file
+                    '(%s).' % xml_file
+            except Exception, e:
+                status = ERROR
+                msg = 'Error running burn thresholding on the XML file ' \
+                    '(%s): %s' % (xml_file, str(e))
+            finally:
+                self.stackObject.budget.release (xml_file)
+            if status != SUCCESS:
                 logIt (msg, self.stackObject.log_handler)
  
-            # store the result
-            self.result_queue.put(status)
+            # store the result along with the scene
+            self.result_queue.put((xml_file, status))
+
+        end_profile (profiler, self.stackObject.profile_dir, 'threshold')
 
 
 #############################################################################
@@ -120,7 +156,13 @@ class BurnAreaThreshold():
     """
 
     def __init__(self):
-        pass
+        self.cache = None
+        self.metrics = RunMetrics (None)
+        self.profile_dir = None
+        self.budget = MemoryBudget (None)
+        self.journal = None
+        self.output_format = DEFAULT_FORMAT
+        self.compress = DEFAULT_COMPRESS
 
 
     def writeResults(self, outputData, outputFilename, geotrans, prj, nodata, \
@@ -134,6 +176,9 @@ class BurnAreaThreshold():
               Geographic Science Center
           Updated in April, 2013 by Gail Schmidt, USGE/EROS LSRD Project
               Modified to utilize the ESPA internal file format.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Modified to write the output in self.output_format via
+              create_raster.
         
         Args:
           outputData - output data structure to be written
@@ -149,18 +194,13 @@ class BurnAreaThreshold():
             Nothing
         """
 
-        # create the ENVI driver for output data
-        driver = gdal.GetDriverByName('ENVI')
-        
-        # create the output dataset
-        bp_dataset = driver.Create(outputFilename, outputData.shape[1],  \
-            outputData.shape[0], 1, gdal.GDT_Int16)
-        bp_dataset.SetGeoTransform(geotrans)
-        bp_dataset.SetProjection(prj)
+        # create the output dataset in the output format
+        bp_dataset = create_raster (outputFilename, outputData.shape[1],  \
+            outputData.shape[0], gdal.GDT_Int16, geotrans, prj, nodata,
+            self.output_format, self.compress)
         
         # get the output band
         bp_band = bp_dataset.GetRasterBand(1)
-        bp_band.SetNoDataValue(nodata)
         bp_band.WriteArray(outputData)
         
         if outputRAT <> None:
@@ -372,6 +412,16 @@ class BurnAreaThreshold():
               Geographic Science Center
           Updated on 4/10/2014 by Gail Schmidt, USGS/EROS LSRD Project
               Modified to run as a multi-threaded process.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Modified to restore the burn classification from the stage
+              cache, if one was specified and the burn probabilities and
+              thresholds haven't changed.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Modified to convert compact (uint8) burn probabilities to int16
+              as they are read.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Modified to write the burn classification in the output
+              format.
         
         Args:
           bp_file - name of burn probability file to process
@@ -387,8 +437,20 @@ class BurnAreaThreshold():
 
         # determine the output classification name
         fname = os.path.basename(bp_file).replace('burn_probability.img', \
-            'burn_class.img')
+            'burn_class' + raster_ext (self.output_format))
         bc_file_name = self.output_dir + '/' + fname
+
+        # restore the burn classification from the stage cache if these burn
+        # probabilities have already been thresholded with the same settings
+        if self.cache is not None:
+            outputs = raster_files (bc_file_name)
+            cache_key = self.cache.key ('threshold', [bp_file],
+                [self.seed_prob_thresh, self.seed_size_thresh,
+                self.flood_fill_prob_thresh, self.output_format,
+                self.compress])
+            if self.cache.restore (cache_key, outputs):
+                return SUCCESS
+            self.cache.prepare (outputs)
         
         # process the current burn probability file
         bp_dataset = gdal.Open(bp_file)
@@ -425,8 +487,12 @@ class BurnAreaThreshold():
             logIt (msg, self.log_handler)
             return ERROR
 
+        # compact burn probabilities are converted to int16 as they are
+        # read, so use the int16 fill value
         nodata = bp_band.GetNoDataValue()
-        if nodata is None:
+        if bp_band.DataType == gdal.GDT_Byte:
+            nodata = INT16_FILL
+        elif nodata is None:
             nodata = -9999
             msg = 'Failed to obtain the NoDataValue from %s.  Using %d.' % \
                 (bp_file, nodata)
@@ -437,7 +503,7 @@ class BurnAreaThreshold():
         bp_rats = []
         
         # read the probabilities for the current scene
-        bp_data = bp_band.ReadAsArray()
+        bp_data = decode_probability (bp_band.ReadAsArray(), nodata)
         
         # find the final burn scars from the burn probabilities
         bp_scar_results = self.findBurnScars(bp_data, self.seed_prob_thresh,
@@ -454,13 +520,20 @@ class BurnAreaThreshold():
             outputFilename=bc_file_name, geotrans=geotrans, prj=prj,
             nodata=nodata, outputRAT=bp_scar_results[1])
 
+        # save the burn classification in the stage cache
+        if self.cache is not None:
+            self.cache.store (cache_key, outputs)
+
         return SUCCESS
 
 
     def runBurnThreshold(self, stack_file=None, input_dir=None,
         output_dir=None, start_year=None, end_year=None, seed_prob_thresh=97.5,
         seed_size_thresh=5, flood_fill_prob_thresh=75, num_processors=1,
-        logfile=None):
+        logfile=None, scene_list=None, cache_dir=None,
+        cache_size=DEFAULT_CACHE_SIZE, output_format=DEFAULT_FORMAT,
+        compress=DEFAULT_COMPRESS, metrics_file=None, profile=None,
+        profile_dir=None, memory_limit=None, journal=None):
         """Runs the burn thresholding algorithm to find the burn scars from the
            input burn probabilities.
         Description: routine to find the burn scars using the flood-fill
@@ -482,11 +555,32 @@ class BurnAreaThreshold():
               is deprecated.
           Updated on April 13, 2014 by Gail Schmidt, USGS/EROS LSRD Project
               Modified to utilize the ESPA internal file format.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Added scene_list to only threshold a subset of the stack.
+              Added cache_dir and cache_size for the stage cache.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Added output_format and compress for the burn classifications.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Added metrics_file for the run metrics of each scene.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Added profile and profile_dir to profile the main process and
+              each of the workers.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Modified stack_file to also accept a StackTable, so the stack
+              file isn't parsed again when run from do_burned_area.
+              The years are selected via the year index of the StackTable.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Added memory_limit for the memory budget of the workers.  A
+              num_processors of 0 uses all the cores.
+          Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+              Added journal to record each scene in the task journal of the
+              calling application.  The results of all the scenes are
+              collected, vs. returning on the first failure.
 
         Args:
-          stack_file - input CSV file with information about the files to be
-              processed.  this is generated as part of the seasonal summaries
-              application.
+          stack_file - StackTable, or input CSV file with information about
+              the files to be processed.  this is generated as part of the
+              seasonal summaries application.
           input_dir - location of the burn probability files
           output_dir - location to write the output burn classifications
           start_year - starting year of the stack_file to process; default is
@@ -506,9 +600,37 @@ class BurnAreaThreshold():
               from the burn probability image to the burn classification via
               flood filling; default is 75%
           num_processors - how many processors should be used for parallel
-              processing sections of the application
+              processing sections of the application; 0 uses all the cores
           logfile - name of the logfile for logging information; if None then
               the output will be written to stdout
+          scene_list - list of XML files to be thresholded; if None then all
+              the scenes in the stack_file for the specified years are
+              thresholded
+          cache_dir - directory of the stage cache; if specified then the
+              burn classifications are restored from the cache when the burn
+              probabilities and thresholds haven't changed.  None disables
+              the cache.
+          cache_size - maximum size of the stage cache in gigabytes
+          output_format - format of the burn classifications, FORMAT_ENVI
+              or FORMAT_GTIFF (tiled and compressed GeoTIFF)
+          compress - compression method of the GeoTIFF burn classifications
+          metrics_file - name of the JSON-lines file for the run metrics of
+              each scene; None disables the metrics
+          profile - if set to true then the main process and each of the
+              workers are profiled with cProfile.  The profiles are written
+              to the profile directory in the output directory and merged
+              into a report of the top functions at the end of processing.
+          profile_dir - directory for the profiles of the workers, when the
+              profiling was set up by the calling application; None
+              disables the profiling unless profile is set
+          memory_limit - memory budget of the workers in gigabytes.  Each
+              scene is thresholded once its estimated memory fits within the
+              budget.  If None then most of the memory available on the node
+              is used.
+          journal - TaskJournal of the calling application.  Each scene is
+              recorded in the journal, and the scenes which completed in a
+              previous attempt are skipped.  None if the scenes aren't
+              journaled.
         
         Returns:
             ERROR - error running the burn threshold application
@@ -564,10 +686,44 @@ class BurnAreaThreshold():
             parser.add_argument ('-p', '--num_processors', type=int,
                 dest='num_processors',
                 help='how many processors should be used for parallel '  \
-                    'processing sections of the application '  \
-                    '(default = 1, single threaded)')
+                    'processing sections of the application; 0 uses all '  \
+                    'the cores (default = 1, single threaded)')
+            parser.add_argument ('--memory_limit', type=float,
+                dest='memory_limit',
+                help='memory budget of the parallel workers in gigabytes; '  \
+                     'scenes are only thresholded once their estimated '  \
+                     'memory fits within the budget (default = most of '  \
+                     'the available memory)', metavar='GB')
             parser.add_argument ('-l', '--logfile', type=str, dest='logfile',
                 help='name of optional log file', metavar='FILE')
+            parser.add_argument ('--cache_dir', type=str, dest='cache_dir',
+                help='directory for the stage cache of intermediate '  \
+                     'products; the cache is not used if not specified',
+                metavar='DIR')
+            parser.add_argument ('--cache_size', type=float,
+                dest='cache_size', default=DEFAULT_CACHE_SIZE,
+                help='maximum size of the stage cache in gigabytes '  \
+                     '(default = %.0f)' % DEFAULT_CACHE_SIZE, metavar='GB')
+            parser.add_argument ('--output_format', type=str,
+                dest='output_format', default=DEFAULT_FORMAT,
+                choices=OUTPUT_FORMATS,
+                help='format of the burn classifications; gtiff is tiled '  \
+                     'and compressed GeoTIFF (default = %s)' % DEFAULT_FORMAT)
+            parser.add_argument ('--compress', type=str, dest='compress',
+                default=DEFAULT_COMPRESS, choices=COMPRESS_METHODS,
+                help='compression method for the gtiff output format '  \
+                     '(default = %s)' % DEFAULT_COMPRESS)
+            parser.add_argument ('--metrics_file', type=str,
+                dest='metrics_file',
+                help='name of the JSON-lines file for the timing and '  \
+                     'resource usage of each scene; the metrics are not '  \
+                     'recorded if not specified', metavar='FILE')
+            parser.add_argument ('--profile',
+                dest='profile', default=False, action='store_true',
+                help='if True, the main process and each worker are '
+                     'profiled with cProfile, and a merged report of the '
+                     'top functions is written to the profile directory in '
+                     'the output directory.')
 
             options = parser.parse_args()
 
@@ -605,8 +761,17 @@ class BurnAreaThreshold():
             # number of processors
             if options.num_processors is not None:
                 num_processors = options.num_processors
+
+            cache_dir = options.cache_dir
+            cache_size = options.cache_size
+            output_format = options.output_format
+            compress = options.compress
+            metrics_file = options.metrics_file
+            profile = options.profile
+            memory_limit = options.memory_limit
         else:
             num_processors = num_processors
+        num_processors = resolve_processors (num_processors)
 
         # open the log file if it exists; use line buffering for the output
         log_handler = None
@@ -616,6 +781,16 @@ class BurnAreaThreshold():
         self.seed_prob_thresh = seed_prob_thresh
         self.seed_size_thresh = seed_size_thresh
         self.flood_fill_prob_thresh = flood_fill_prob_thresh
+        self.output_format = output_format
+        self.compress = compress
+
+        # set up the stage cache, if specified
+        self.cache = None
+        if cache_dir is not None:
+            self.cache = StageCache (cache_dir, cache_size, log_handler)
+
+        # set up the run metrics, if specified
+        self.metrics = open_metrics (metrics_file, log_handler)
 
         # validate options and arguments
         if start_year is not None:
@@ -637,10 +812,16 @@ class BurnAreaThreshold():
                 logIt (msg, log_handler)
                 return ERROR
             
-        if not os.path.exists(stack_file):
+        if (not isinstance(stack_file, StackTable)) and  \
+           (not os.path.exists(stack_file)):
             msg = 'CSV stack file does not exist: ' + stack_file
             logIt (msg, log_handler)
             return ERROR
+
+        # read the stack file, unless the stack table was passed in
+        stack = read_stack_table(stack_file, log_handler)
+        if stack is None:
+            return ERROR
     
         if not os.path.exists(input_dir):
             msg = 'Input directory does not exist: ' + input_dir
@@ -654,6 +835,18 @@ class BurnAreaThreshold():
             os.makedirs(output_dir, 0755)
         self.output_dir = output_dir
 
+        # set up the profiling of the workers, if specified.  the main
+        # process is also profiled when the profiling is requested here,
+        # vs. by the calling application.
+        self.profile_dir = profile_dir
+        self.journal = journal
+        main_profiler = None
+        if profile:
+            self.profile_dir = os.path.abspath (os.path.join (output_dir,
+                PROFILE_DIR))
+            clear_profiles (self.profile_dir)
+            main_profiler = start_profile (self.profile_dir)
+
         # save the current working directory for return to upon error or when
         # processing is complete
         mydir = os.getcwd()
@@ -662,9 +855,6 @@ class BurnAreaThreshold():
         logIt (msg, log_handler)
         os.chdir (output_dir)
 
-        # open the stack file
-        stack = numpy.recfromcsv(stack_file, delimiter=",", names=True)
-        
         # use the minimum and maximum years in the stack if the start year and
         # end year were not specified on the command line.  start year needs
         # to be one more than the actual starting year in the stack since the
@@ -677,8 +867,7 @@ class BurnAreaThreshold():
         if end_year is None:
             end_year = numpy.max(stack['year'])
         
-        stack_mask = (stack['year'] >= start_year) & (stack['year'] <= end_year)
-        stack2 = stack[stack_mask]
+        stack2 = stack.data[stack.yearRangeRows(start_year, end_year)]
         
         # read the input data from the stack, for the years specified
         msg = 'Processing burn probabilities for %d-%d' % (start_year, end_year)
@@ -691,14 +880,30 @@ class BurnAreaThreshold():
             flood_fill_prob_thresh
         logIt (msg, log_handler)
 
+        # only threshold the specified scenes, if a list was provided
+        if scene_list is not None:
+            scene_names = [os.path.basename(xml_file) for xml_file in  \
+                scene_list]
+            stack_mask = numpy.array([os.path.basename(xml_file) in  \
+                scene_names for xml_file in stack2['file']], dtype=bool)
+            stack2 = stack2[stack_mask]
+
         # load up the work queue for processing scenes in parallel for burn
-        # thresholding
+        # thresholding, along with the estimated memory of each scene.  the
+        # burn probabilities all have the extents of the stack, so the size
+        # of the first one is used for all of the scenes.  the scenes which
+        # completed in a previous attempt are skipped.
+        self.budget = memory_budget (memory_limit, log_handler)
+        scene_mb = None
         work_queue = multiprocessing.Queue()
-        num_scenes = stack2.shape[0]
-        for i in range(num_scenes):
+        tasks = {}
+        for i in range(stack2.shape[0]):
             # use the XML filename in the CSV file to obtain the burn
             # probability filename to be thresholded
-            xml_file = stack2['file_'][i]
+            xml_file = stack2['file'][i]
+            task = 'threshold/' + os.path.basename(xml_file)
+            if (self.journal is not None) and self.journal.isDone (task):
+                continue
             bp_file_name = xml_file.replace('.xml','_burn_probability.img')
             if not os.path.exists(bp_file_name):
                 msg = 'burn probability file does not exist: ' +  bp_file_name
@@ -706,9 +911,23 @@ class BurnAreaThreshold():
                 os.chdir (mydir)
                 return ERROR
 
+            if scene_mb is None:
+                bp_dataset = gdal.Open(bp_file_name)
+                if bp_dataset is None:
+                    msg = 'Failed to open bp file: ' + bp_file_name
+                    logIt (msg, log_handler)
+                    os.chdir (mydir)
+                    return ERROR
+                scene_mb = threshold_memory_mb (bp_dataset.RasterYSize,
+                    bp_dataset.RasterXSize)
+                bp_dataset = None
+            self.budget.estimate (bp_file_name, scene_mb)
+
             # add this file to the queue to be processed
             print 'Pushing on the queue ... ' + bp_file_name
             work_queue.put(bp_file_name)
+            tasks[bp_file_name] = task
+        num_scenes = len(tasks)
 
         # create a queue to pass to workers to store the processing status
         result_queue = multiprocessing.Queue()
@@ -716,25 +935,35 @@ class BurnAreaThreshold():
         # spawn workers to process each scene in the stack - run the burn
         # thresholding on each scene in the stack
         msg = 'Spawning %d scenes for burn thresholding via %d '  \
-            'processors ....' % (num_scenes, num_processors)
+            'processors, %s ....' % (num_scenes, num_processors,
+            self.budget.describe())
         logIt (msg, log_handler)
-        for i in range(num_processors):
+        workers = []
+        for i in range(min(num_processors, num_scenes)):
             worker = parallelSceneThresholdWorker(work_queue, result_queue,
                 self)
             worker.start()
+            workers.append(worker)
  
-        # collect the burn threshold results off the queue
-        for i in range(num_scenes):
-            status = result_queue.get()
-            if status != SUCCESS:
-                msg = 'Error in burn threshold for %d file in the list '  \
-                    '(associated XML file is %s).' % (i, stack2['file_'][i])
-                logIt (msg, log_handler)
-                return ERROR
+        # collect the burn threshold results off the queue, recording each
+        # scene in the task journal
+        failed = collect_results (result_queue, tasks, workers, self.journal,
+            budget=self.budget, log_handler=log_handler)
+        if len(failed) > 0:
+            msg = 'Error in burn threshold for %d files in the list: %s' %  \
+                (len(failed), ', '.join(failed))
+            logIt (msg, log_handler)
+            os.chdir (mydir)
+            return ERROR
 
         # successful completion.  return to the original directory.
         msg = 'Completion of burn threshold.'
         logIt (msg, log_handler)
+
+        # merge the profiles into the report of the top functions
+        if main_profiler is not None:
+            end_profile (main_profiler, self.profile_dir, 'main')
+            profile_report (self.profile_dir, log_handler=log_handler)
         if logfile is not None:
             log_handler.close()
         os.chdir (mydir)
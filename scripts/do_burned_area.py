@@ -6,13 +6,23 @@ import datetime
 import time
 import numpy
 import tempfile
-import zipfile
 import multiprocessing, Queue
-from model_hash import get_model_name
+from model_registry import open_registry
+from stack_manifest import *
+from stack_table import *
+from stage_cache import *
+from task_journal import *
+from run_metrics import *
+from run_profile import *
+from task_scheduler import *
+from raster_output import *
+from product_package import ProductPackage
 from argparse import ArgumentParser
 from process_temporal_ba_stack import temporalBAStack
+from scene_resample import DEFAULT_IO_THREADS
+from qa_mask import QA_MASK_FORMAT
 from generate_boosted_regression_config import BoostedRegressionConfig
-from do_boosted_regression import BoostedRegression
+from do_boosted_regression import BoostedRegression, RegressionPredictor
 from do_threshold_stack import BurnAreaThreshold
 from do_annual_burn_summaries import AnnualBurnSummary
 from do_spectral_indices import SpectralIndices
@@ -20,6 +30,10 @@ from do_spectral_indices import SpectralIndices
 ERROR = 1
 SUCCESS = 0
 
+# base names of the annual burned area products which are packaged
+ANNUAL_PRODUCTS = ['burned_area', 'burn_count', 'good_looks_count',
+    'max_burn_prob']
+
 def logIt (msg, log_handler):
     """Logs the user-specified message.
     logIt logs the information to the logfile (if valid) or to stdout if the
@@ -43,6 +57,15 @@ def logIt (msg, log_handler):
 # Created Python class to handle the multiprocessing of a stack of scenes.
 #
 # History:
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Modified to return the XML file along with the status, so that the
+#       failed scenes can be identified and retried.
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Each worker runs its scenes through a single predict_burned_area
+#       process, so the model is loaded once per worker vs. once per scene.
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       An exception processing a scene is stored as an error result for the
+#       scene, so the scene isn't waited on.
 #
 ############################################################################
 class parallelSceneRegressionWorker(multiprocessing.Process):
@@ -61,6 +84,18 @@ class parallelSceneRegressionWorker(multiprocessing.Process):
  
 
     def run(self):
+        # profile the worker, if specified
+        profiler = start_profile (self.stackObject.profile_dir)
+
+        # run the scenes of this worker through the same predictor.  if the
+        # predictor can't be started then each scene is run by itself.
+        try:
+            self.stackObject.predictor = RegressionPredictor (  \
+                self.stackObject.log_handler)
+        except Exception, e:
+            msg = 'Error starting the regression predictor: ' + str(e)
+            logIt (msg, self.stackObject.log_handler)
+            self.stackObject.predictor = None
         while not self.kill_received:
             # get a task
             try:
@@ -68,17 +103,31 @@ class parallelSceneRegressionWorker(multiprocessing.Process):
             except Queue.Empty:
                 break
  
-            # process the scene
+            # process the scene, always storing a result so the scene isn't
+            # waited on if it raises an exception
             msg = 'Processing %s ...' % xml_file
             logIt (msg, self.stackObject.log_handler)
-            status = self.stackObject.sceneBoostedRegression (xml_file)
-            if status != SUCCESS:
+            try:
+                task_started (self.result_queue, xml_file)
+                span = self.stackObject.metrics.start (
+                    os.path.basename (xml_file), SPAN_SCENE)
+                status = self.stackObject.sceneBoostedRegression (xml_file)
+                self.stackObject.metrics.end (span, status)
+                msg = 'Error running boosted regression on the XML file ' \
+                    '(%s).' % xml_file
+            except Exception, e:
+                status = ERROR
                 msg = 'Error running boosted regression on the XML file ' \
-                    '(%s). Processing will terminate.' % xml_file
+                    '(%s): %s' % (xml_file, str(e))
+            if status != SUCCESS:
                 logIt (msg, self.stackObject.log_handler)
  
             # store the result
-            self.result_queue.put(status)
+            self.result_queue.put((xml_file, status))
+
+        if self.stackObject.predictor is not None:
+            self.stackObject.predictor.close()
+        end_profile (profiler, self.stackObject.profile_dir, 'regression')
 
 
 #############################################################################
@@ -96,7 +145,10 @@ class BurnedArea():
     """
 
     def __init__(self):
-        pass
+        self.cache = None
+        self.metrics = RunMetrics (None)
+        self.profile_dir = None
+        self.predictor = None
 
     def sceneBoostedRegression(self, xml_file):
         """Runs the boosted resgression model on the current scene.
@@ -114,6 +166,22 @@ class BurnedArea():
               Modified to use the ESPA internal raw binary format
           Updated on 4/10/2014 by Gail Schmidt, USGS/EROS LSRD Project
               Modified to run as a multi-threaded process.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Modified to restore the burn probabilities from the stage
+              cache, if one was specified and neither the scene, the scenes
+              in the previous year's seasonal summaries, nor the model have
+              changed.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Modified to write compact (uint8) burn probabilities if
+              self.compact is set.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Modified to use the year and season indexes of the StackTable.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Modified to record the progress of the predictions in the run
+              metrics as the model runs.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Modified to run the scene through self.predictor, if set, so
+              the model isn't loaded again for each scene.
         
         Args:
           xml_file - name of XML file to process
@@ -127,6 +195,27 @@ class BurnedArea():
         dir_name = os.path.dirname(xml_file)
         base_name = os.path.basename(xml_file)
 
+        # restore the burn probabilities from the stage cache if this scene
+        # has already been run through the model with the same inputs.  the
+        # seasonal summaries and annual maximums for the previous year are
+        # identified by the scenes which went into them, which includes the
+        # December scenes from two years prior for the winter season.
+        if self.cache is not None:
+            outputs = envi_files (self.output_dir + '/' +  \
+                base_name.replace('.xml', '_burn_probability.img'))
+            year = int(base_name[9:13])
+            prev_rows = numpy.union1d (self.stack_data.yearRows (year-1),
+                self.stack_data.seasonRows (year-1, 'winter'))
+            prev_files = [str(xml) for xml in  \
+                self.stack_data['file'][prev_rows]]
+            cache_key = self.cache.key ('regression',
+                [xml_file] + sorted(prev_files) +  \
+                [self.model_file, self.extent_file],
+                [self.compact, QA_MASK_FORMAT])
+            if self.cache.restore (cache_key, outputs):
+                return SUCCESS
+            self.cache.prepare (outputs)
+
         # create a unique config file since these will potentially be
         # processed in parallel.  if the config directory doesn't already
         # exist then create it.
@@ -161,15 +250,24 @@ class BurnedArea():
         status = BoostedRegressionConfig().runGenerateConfig(
             config_file=config_file, seasonal_sum_dir=dir_name,
             input_base_file=base_file, input_mask_file=mask_file,
-            output_dir=self.output_dir, model_file=self.model_file)
+            output_dir=self.output_dir, model_file=self.model_file,
+            compact=self.compact)
         if status != SUCCESS:
             msg = 'Error creating the configuration file for ' + xml_file
             logIt (msg, self.log_handler)
             return ERROR
 
-        # run the boosted regression, passing the configuration file
-        status = BoostedRegression().runBoostedRegression(  \
-            config_file=config_file, logfile=self.logfile)
+        # run the boosted regression, passing the configuration file and
+        # recording the progress of the predictions in the run metrics
+        def predict_progress (values):
+            self.metrics.event (EVENT_PREDICT_PROGRESS, base_name, values)
+
+        if self.predictor is not None:
+            status = self.predictor.predict (config_file, predict_progress)
+        else:
+            status = BoostedRegression().runBoostedRegression(  \
+                config_file=config_file, logfile=self.logfile,
+                progress=predict_progress)
         if status != SUCCESS:
             msg = 'Error running boosted regression for ' + xml_file
             logIt (msg, self.log_handler)
@@ -178,12 +276,124 @@ class BurnedArea():
         # clean up the temporary configuration file
         os.remove(config_file)
 
+        # save the burn probabilities in the stage cache
+        if self.cache is not None:
+            self.cache.store (cache_key, outputs)
+
         return SUCCESS
 
 
+    def parallelBoostedRegression(self, scene_list, num_processors):
+        """Runs the boosted regression model on a list of scenes in parallel.
+        Description: Spawns the workers to run the boosted regression on each
+            of the scenes, and waits for all of the scenes to finish before
+            returning so no worker processes are left running.  Each scene
+            is recorded in the task journal as done or failed.
+
+        History:
+          Created on October 18, 2026 by USGS/EROS LSRD Project
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Modified to collect the results via collect_results, so a
+              worker which dies doesn't hang the processing.  The scene it
+              was running is failed, while the other workers keep going.
+
+        Args:
+          scene_list - list of XML files to process
+          num_processors - how many processors should be used for parallel
+              processing
+
+        Returns:
+          list of the XML files which failed
+        """
+
+        # load up the work queue for processing scenes in parallel for boosted
+        # regression
+        work_queue = multiprocessing.Queue()
+        for xml_file in scene_list:
+            print 'Pushing on the queue ... ' + xml_file
+            work_queue.put(xml_file)
+
+        # create a queue to pass to workers to store the processing status
+        result_queue = multiprocessing.Queue()
+ 
+        # spawn workers to process each scene in the stack - run the boosted
+        # regression model on each scene in the stack
+        msg = 'Spawning %d scenes for boosted regression via %d '  \
+            'processors ....' % (len(scene_list), num_processors)
+        logIt (msg, self.log_handler)
+        workers = []
+        for i in range(min(num_processors, len(scene_list))):
+            worker = parallelSceneRegressionWorker(work_queue, result_queue,
+                self)
+            worker.start()
+            workers.append(worker)
+ 
+        # collect the boosted regression results off the queue, recording
+        # each scene in the journal as it completes.  the scenes of a worker
+        # which dies are failed.
+        tasks = {}
+        for xml_file in scene_list:
+            tasks[xml_file] = 'regression/' + os.path.basename(xml_file)
+        return collect_results (result_queue, tasks, workers, self.journal,
+            log_handler=self.log_handler)
+
+
+    def runStage(self, task, stage_func, **kwargs):
+        """Runs a processing stage as a journaled task.
+        Description: Skips the stage if the journal shows it completed in a
+            previous run.  Otherwise the stage is run, and retried up to the
+            retry budget if it fails.  The outcome is recorded in the journal.
+
+        History:
+          Created on October 18, 2026 by USGS/EROS LSRD Project
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              The stage, including any retries, is recorded as a span in the
+              run metrics.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              The stages record their scenes, seasons, and years in the
+              journal and skip those which already completed, so a retry
+              only reruns the tasks which failed.
+
+        Args:
+          task - name of the task in the journal
+          stage_func - function to run the stage, returning ERROR or SUCCESS
+          kwargs - keyword arguments for stage_func
+
+        Returns:
+            ERROR - error running the stage
+            SUCCESS - successful processing
+        """
+
+        if self.journal.isDone (task):
+            msg = 'Skipping %s, which completed in a previous run' % task
+            logIt (msg, self.log_handler)
+            return SUCCESS
+
+        span = self.metrics.start (task)
+        for attempt in range(self.max_retries + 1):
+            if attempt > 0:
+                msg = 'Retrying %s (retry %d of %d)' % (task, attempt,
+                    self.max_retries)
+                logIt (msg, self.log_handler)
+            status = stage_func(**kwargs)
+            if status == SUCCESS:
+                self.journal.markDone (task)
+                self.metrics.end (span, SUCCESS)
+                return SUCCESS
+            self.journal.markFailed (task, 'Error running ' + task)
+
+        self.metrics.end (span, ERROR)
+        return ERROR
+
+
     def runBurnedArea(self, sr_list_file=None, input_dir=None,  \
         output_dir=None, model_dir=None, num_processors=1, logfile=None,
-        delete_src=None):
+        delete_src=None, incremental=None, cache_dir=None,
+        cache_size=DEFAULT_CACHE_SIZE, resume=None,
+        max_retries=DEFAULT_MAX_RETRIES, compact=None,
+        output_format=DEFAULT_FORMAT, compress=DEFAULT_COMPRESS,
+        checksum_manifest=None, metrics_file=None, profile=None,
+        memory_limit=None, io_threads=DEFAULT_IO_THREADS):
         """Runs the burned area processing from end-to-end for a given
            stack of surface reflectance products.
         Description: Reads the XML list file to determine the path/row and
@@ -213,6 +423,50 @@ class BurnedArea():
               Added --delete_src argument.  If specified then the original
               source scenes will be removed after each has been resampled to
               the maximum geographic extents.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Added --incremental argument.  If specified then only the
+              scenes and years affected by new or changed scenes are
+              reprocessed.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Added --cache_dir and --cache_size arguments for the stage
+              cache of the intermediate products.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Added a task journal along with the --resume and --max_retries
+              arguments.  Failed scenes no longer stop the boosted regression
+              for the rest of the stack; they are retried and the run only
+              fails once the retry budget is used up.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Added --compact argument for uint8 burn probabilities, burn
+              counts, good looks counts, and maximum burn probabilities.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Added --output_format and --compress arguments for tiled,
+              compressed GeoTIFF burn classifications and annual products.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Replaced the external zip command with ProductPackage, which
+              compresses the annual products in parallel as each year of
+              the annual summaries completes.  Added --checksum_manifest.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              The stack is read once into a StackTable and passed to the
+              burn threshold and annual summary stages.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Added run metrics for each stage, scene, and year, written to
+              the --metrics_file and summarized along with the critical path
+              at the end of the run.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Added --profile argument to profile the main process and the
+              workers of each stage, and merge the profiles into a report.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Added --memory_limit argument for the memory budget of the
+              workers of each stage.  A num_processors of 0 uses all the
+              cores.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Added --io_threads argument for the number of threads reading
+              and writing the blocks of each resampled scene.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Incremental mode records the burn probabilities and
+              classifications of the scenes and the annual products of the
+              years in the manifest, and reprocesses those which were
+              deleted or modified.
 
         Args:
           sr_list_file - input file listing the surface reflectance scenes
@@ -226,11 +480,56 @@ class BurnedArea():
           model_dir - location of the geographic models for the boosted
               regression algorithm
           num_processors - how many processors should be used for parallel
-              processing sections of the application
+              processing sections of the application; 0 uses all the cores.
+              The boosted regression is CPU-bound and isn't gated, while
+              the other stages admit their scenes and years within the
+              memory budget.
           logfile - name of the logfile for logging information; if None then
               the output will be written to stdout
           delete_src - if set to true then the source scenes will be deleted
               after being resampled to the maximum geographic extents
+          incremental - if set to true then only the scenes which are new or
+              have changed since the last run are processed.  A scene in year
+              Y affects the seasonal summaries for year Y (and Y+1 for
+              December scenes), the boosted regressions for the scenes in the
+              following year which use those summaries, and the annual
+              summaries for the years of any reprocessed scenes.
+          cache_dir - directory of the stage cache; if specified then the
+              resampled scenes, seasonal summaries, annual maximums, burn
+              probabilities, and burn classifications are restored from the
+              cache when their inputs and parameters haven't changed.  None
+              disables the cache.
+          cache_size - maximum size of the stage cache in gigabytes
+          resume - if set to true then the tasks recorded as completed in
+              the task journal of a previous failed run are skipped.  The
+              journal is removed once the run completes successfully.
+          max_retries - number of times a failed task is retried within the
+              run
+          compact - if set to true then the burn probabilities and the
+              annual burn count, good looks count, and maximum burn
+              probability products are written as uint8 vs. int16
+          output_format - format of the burn classifications and the annual
+              burn products, FORMAT_ENVI or FORMAT_GTIFF (tiled and
+              compressed GeoTIFF).  The inputs to the boosted regression are
+              always ENVI.
+          compress - compression method of the GeoTIFF products
+          checksum_manifest - if set to true then a manifest with the
+              SHA-256 checksum of each product is added to the zip file
+          metrics_file - name of the JSON-lines file for the wall time, CPU
+              time, bytes read and written, and peak memory of each stage,
+              scene, and year; if None then METRICS_FILE in the output
+              directory is used
+          profile - if set to true then the main process and the workers
+              of each stage are profiled with cProfile.  The profiles are
+              written to the profile directory in the output directory and
+              merged into a report of the top functions at the end of the
+              run.
+          memory_limit - memory budget of the workers of each stage in
+              gigabytes; if None then most of the memory available on the
+              node is used
+          io_threads - number of threads reading and writing the blocks of
+              each scene while it is resampled; 0 reads and writes them in
+              the workers themselves
         
         Returns:
             ERROR - error running the burned area applications
@@ -276,8 +575,21 @@ class BurnedArea():
             parser.add_argument ('-p', '--num_processors', type=int,
                 dest='num_processors',
                 help='how many processors should be used for parallel '  \
-                    'processing sections of the application '  \
-                    '(default = 1, single threaded)')
+                    'processing sections of the application; 0 uses all '  \
+                    'the cores (default = 1, single threaded)')
+            parser.add_argument ('--memory_limit', type=float,
+                dest='memory_limit',
+                help='memory budget of the parallel workers of each stage '  \
+                     'in gigabytes; scenes and years are only processed '  \
+                     'once their estimated memory fits within the budget '  \
+                     '(default = most of the available memory)',
+                metavar='GB')
+            parser.add_argument ('--io_threads', type=int,
+                dest='io_threads', default=DEFAULT_IO_THREADS,
+                help='number of threads reading and writing the blocks of '  \
+                     'each scene while it is resampled; 0 reads and writes '  \
+                     'them in the worker itself (default = %d)' %  \
+                     DEFAULT_IO_THREADS)
             parser.add_argument ('-l', '--logfile', type=str, dest='logfile',
                 help='name of optional log file', metavar='FILE')
             parser.add_argument ('--delete_src',
@@ -286,11 +598,78 @@ class BurnedArea():
                      'scene has been resampled to the maximum geographic '
                      'extents. The MTL and XML file will remain for downstream '
                      'processing.')
+            parser.add_argument ('--incremental',
+                dest='incremental', default=False, action='store_true',
+                help='if True, only the scenes which are new or have changed '
+                     'since the last run are processed, along with the years '
+                     'and scenes they affect.')
+            parser.add_argument ('--cache_dir', type=str, dest='cache_dir',
+                help='directory for the stage cache of intermediate '  \
+                     'products; the cache is not used if not specified',
+                metavar='DIR')
+            parser.add_argument ('--cache_size', type=float,
+                dest='cache_size', default=DEFAULT_CACHE_SIZE,
+                help='maximum size of the stage cache in gigabytes '  \
+                     '(default = %.0f)' % DEFAULT_CACHE_SIZE, metavar='GB')
+            parser.add_argument ('--resume',
+                dest='resume', default=False, action='store_true',
+                help='if True, the tasks which completed in a previous '
+                     'failed run are skipped and only the remaining tasks '
+                     'are processed.')
+            parser.add_argument ('--max_retries', type=int,
+                dest='max_retries', default=DEFAULT_MAX_RETRIES,
+                help='number of times a failed task is retried '  \
+                     '(default = %d)' % DEFAULT_MAX_RETRIES)
+            parser.add_argument ('--compact',
+                dest='compact', default=False, action='store_true',
+                help='if True, the burn probabilities and the annual burn '
+                     'count, good looks count, and maximum burn probability '
+                     'products are written as uint8 vs. int16, halving '
+                     'their size.')
+            parser.add_argument ('--output_format', type=str,
+                dest='output_format', default=DEFAULT_FORMAT,
+                choices=OUTPUT_FORMATS,
+                help='format of the burn classifications and annual '  \
+                     'products; gtiff is tiled and compressed GeoTIFF '  \
+                     '(default = %s)' % DEFAULT_FORMAT)
+            parser.add_argument ('--compress', type=str, dest='compress',
+                default=DEFAULT_COMPRESS, choices=COMPRESS_METHODS,
+                help='compression method for the gtiff output format '  \
+                     '(default = %s)' % DEFAULT_COMPRESS)
+            parser.add_argument ('--checksum_manifest',
+                dest='checksum_manifest', default=False, action='store_true',
+                help='if True, a manifest with the SHA-256 checksum of '
+                     'each annual product is added to the zip file')
+            parser.add_argument ('--metrics_file', type=str,
+                dest='metrics_file',
+                help='name of the JSON-lines file for the timing and '  \
+                     'resource usage of each stage, scene, and year '  \
+                     '(default = %s in the output directory)' % METRICS_FILE,
+                metavar='FILE')
+            parser.add_argument ('--profile',
+                dest='profile', default=False, action='store_true',
+                help='if True, the main process and the workers of each '
+                     'stage are profiled with cProfile, and a merged report '
+                     'of the top functions is written to the profile '
+                     'directory in the output directory.')
 
             options = parser.parse_args()
 
             # validate command-line options and arguments
             delete_src = options.delete_src
+            incremental = options.incremental
+            cache_dir = options.cache_dir
+            cache_size = options.cache_size
+            resume = options.resume
+            max_retries = options.max_retries
+            compact = options.compact
+            output_format = options.output_format
+            compress = options.compress
+            checksum_manifest = options.checksum_manifest
+            metrics_file = options.metrics_file
+            profile = options.profile
+            memory_limit = options.memory_limit
+            io_threads = options.io_threads
             logfile = options.logfile
             sr_list_file = options.sr_list_file
             if sr_list_file is None:
@@ -316,6 +695,7 @@ class BurnedArea():
             # number of processors
             if options.num_processors is not None:
                 num_processors = options.num_processors
+        num_processors = resolve_processors (num_processors)
 
         # open the log file if it exists; use line buffering for the output
         self.log_handler = None
@@ -346,6 +726,29 @@ class BurnedArea():
             logIt (msg, self.log_handler)
             return ERROR
 
+        # open the task journal for checkpointing the completed tasks
+        journal_file = os.path.abspath(output_dir + '/' + JOURNAL_FILE)
+        self.journal = TaskJournal (journal_file, resume, self.log_handler)
+        self.max_retries = max_retries
+        self.compact = bool(compact)
+
+        # record the timing and resource usage of each stage, scene, and year
+        # of the run
+        if metrics_file is None:
+            metrics_file = output_dir + '/' + METRICS_FILE
+        self.metrics_file = os.path.abspath(metrics_file)
+        self.metrics = open_metrics (self.metrics_file, self.log_handler)
+        run_span = self.metrics.start ('burned_area', SPAN_RUN)
+
+        # profile the main process and the workers of each stage, if
+        # specified
+        self.profile_dir = None
+        main_profiler = None
+        if profile:
+            self.profile_dir = os.path.abspath(output_dir + '/' + PROFILE_DIR)
+            clear_profiles (self.profile_dir)
+            main_profiler = start_profile (self.profile_dir)
+
         # save the current working directory for return to upon error or when
         # processing is complete
         mydir = os.getcwd()
@@ -431,10 +834,14 @@ class BurnedArea():
 
         # run the seasonal summaries and annual maximums for this stack
         msg = '\nProcessing seasonal summaries and annual maximums ...'
-        status = temporalBAStack().processStack(input_dir=input_dir,  \
-            exclude_l1g=True, exclude_rmse=True, exclude_cloud_cover=True,  \
-            logfile=logfile, num_processors=num_processors,
-            delete_src=delete_src)
+        status = self.runStage('stack', temporalBAStack().processStack,
+            input_dir=input_dir, exclude_l1g=True, exclude_rmse=True,
+            exclude_cloud_cover=True, logfile=logfile,
+            num_processors=num_processors, delete_src=delete_src,
+            incremental=incremental, cache_dir=cache_dir,
+            cache_size=cache_size, metrics_file=self.metrics_file,
+            profile_dir=self.profile_dir, memory_limit=memory_limit,
+            io_threads=io_threads, journal=self.journal)
         if status != SUCCESS:
             msg = 'Error running seasonal summaries and annual maximums'
             logIt (msg, self.log_handler)
@@ -457,26 +864,101 @@ class BurnedArea():
             os.chdir (mydir)
             return ERROR
 
-        # TODO - GAIL update the model hash table
-        # determine the model file for this path/row
-        model_base_file = get_model_name(path, row)
-        self.model_file = '%s/%s' % (model_dir, model_base_file)
-        if not os.path.exists(self.model_file):
-            msg = 'Model file for path/row %d, %d does not exist: %s' %  \
-                (path, row, self.model_file)
+        # determine the model file for this path/row from the model registry,
+        # which validates the model files when it's opened
+        registry = open_registry (model_dir, self.log_handler)
+        self.model_file = registry.modelFile (path, row)
+        if self.model_file is None:
+            # error message already written by the registry
+            os.chdir (mydir)
+            return ERROR
+
+        # if processing incrementally, then determine which scenes need to
+        # be rerun through the boosted regression and burn thresholds, and
+        # which years need new annual summaries
+        stack_file = input_dir + '/input_stack.csv'
+        self.stack_data = read_stack_table (stack_file, self.log_handler)
+        if self.stack_data is None:
+            msg = 'Error reading the stack file. Processing will terminate.'
             logIt (msg, self.log_handler)
+            os.chdir (mydir)
             return ERROR
 
-       # run the boosted regression algorithm for each scene
+        # set up the stage cache, if specified.  the boosted regression cache
+        # key needs the scenes in the stack along with the maximum extents.
+        self.cache = None
+        if cache_dir is not None:
+            self.cache = StageCache (cache_dir, cache_size, self.log_handler)
+            self.extent_file = input_dir + '/bounding_box_coordinates.csv'
+
+        regression_list = None
+        summary_years = None
+        if incremental:
+            manifest = StackManifest (input_dir + '/' + MANIFEST_FILE,
+                self.log_handler)
+            scenes = manifest.stackScenes (self.stack_data)
+            extent = manifest.extentSignature (input_dir +  \
+                '/bounding_box_coordinates.csv')
+            changed = manifest.changedScenes ('burned_area', scenes, extent)
+            if changed is None:
+                msg = 'Incremental processing: no previous run of the ' \
+                    'burned area products is available, so all scenes will ' \
+                    'be processed.'
+                logIt (msg, self.log_handler)
+            else:
+                # scenes whose burn probabilities or classifications were
+                # deleted or modified since the last run are reprocessed as
+                # if they changed, as are the years whose annual summaries
+                # were
+                (output_scenes, output_years) =  \
+                    manifest.changedOutputs ('burned_area')
+                changed_names = set([os.path.basename (scene['file'])  \
+                    for scene in changed])
+                changed += [scenes[name] for name in output_scenes  \
+                    if (name in scenes) and (name not in changed_names)]
+
+                # a scene needs the boosted regression if it changed, if the
+                # seasonal summaries or annual maximums for the previous year
+                # changed, or if its burn probabilities don't exist
+                changed_names = set([os.path.basename (scene['file'])  \
+                    for scene in changed])
+                changed_years = affected_summary_years (changed)
+                regression_list = []
+                for name in scenes:
+                    bp_file = output_dir + '/' +  \
+                        name.replace ('.xml', '_burn_probability.img')
+                    if (name in changed_names) or  \
+                       (scenes[name]['year'] - 1 in changed_years) or  \
+                       (not os.path.exists (bp_file)):
+                        regression_list.append (scenes[name]['file'])
+
+                # the annual summaries are needed for the years of the
+                # reprocessed and removed scenes, along with any years
+                # missing the annual summaries
+                summary_years = set([scene['year'] for scene in changed]) |  \
+                    output_years
+                for xml_file in regression_list:
+                    summary_years.add (  \
+                        scenes[os.path.basename (xml_file)]['year'])
+                for year in range (start_year+1, end_year+1):
+                    if not os.path.exists ('%s/burned_area_%d.img' %  \
+                        (output_dir, year)):
+                        summary_years.add (year)
+
+                msg = 'Incremental processing: %d new or changed scenes, ' \
+                    '%d scenes to reprocess, annual summary years %s' %  \
+                    (len (changed), len (regression_list),
+                    sorted (summary_years))
+                logIt (msg, self.log_handler)
+
+        # run the boosted regression algorithm for each scene
         msg = '\nRunning boosted regression for each scene from %d - %d ...' % \
             (start_year+1, end_year)
         logIt (msg, self.log_handler)
 
-        # load up the work queue for processing scenes in parallel for boosted
-        # regression
+        # determine the scenes to be processed for boosted regression
         self.config_file = 'temp_%03d_%03d.config' % (path, row)
-        work_queue = multiprocessing.Queue()
-        num_boosted_scenes = 0
+        regression_scenes = []
         for i in range(num_scenes):
             xml_file = sr_list[i].rstrip('\n')
 
@@ -489,75 +971,149 @@ class BurnedArea():
                 # skip to the next scene
                 continue
 
-            # add this file to the queue to be processed
-            print 'Pushing on the queue ... ' + xml_file
-            work_queue.put(xml_file)
-            num_boosted_scenes += 1
+            # skip the scenes which don't need to be reprocessed
+            if (regression_list is not None) and  \
+               (xml_file not in regression_list):
+                continue
 
-        # create a queue to pass to workers to store the processing status
-        result_queue = multiprocessing.Queue()
- 
-        # spawn workers to process each scene in the stack - run the boosted
-        # regression model on each scene in the stack
-        msg = 'Spawning %d scenes for boosted regression via %d '  \
-            'processors ....' % (num_boosted_scenes, num_processors)
-        logIt (msg, self.log_handler)
-        for i in range(num_processors):
-            worker = parallelSceneRegressionWorker(work_queue, result_queue,
-                self)
-            worker.start()
- 
-        # collect the boosted regression results off the queue
-        for i in range(num_boosted_scenes):
-            status = result_queue.get()
-            if status != SUCCESS:
-                msg = 'Error in boosted regression for XML file %s.' %  \
-                    sr_list[i]
+            # skip the scenes which completed in a previous run
+            if self.journal.isDone ('regression/' + base_file):
+                continue
+
+            regression_scenes.append (xml_file)
+
+        # process the scenes in parallel, retrying the scenes which fail
+        # until they succeed or the retry budget is used up
+        span = self.metrics.start ('regression')
+        for attempt in range(self.max_retries + 1):
+            if len(regression_scenes) == 0:
+                break
+            if attempt > 0:
+                msg = 'Retrying boosted regression for %d failed scenes '  \
+                    '(retry %d of %d)' % (len(regression_scenes), attempt,
+                    self.max_retries)
                 logIt (msg, self.log_handler)
-                return ERROR
+            regression_scenes = self.parallelBoostedRegression (  \
+                regression_scenes, num_processors)
+
+        self.metrics.end (span,
+            ERROR if len(regression_scenes) > 0 else SUCCESS)
+        if len(regression_scenes) > 0:
+            msg = 'Error in boosted regression for %d XML files: %s' %  \
+                (len(regression_scenes), ', '.join(regression_scenes))
+            logIt (msg, self.log_handler)
+            os.chdir (mydir)
+            return ERROR
 
         # run the burn threshold algorithm to identify burned areas
-        stack_file = input_dir + '/input_stack.csv'
-        status = BurnAreaThreshold().runBurnThreshold(stack_file=stack_file,
+        status = self.runStage('threshold',
+            BurnAreaThreshold().runBurnThreshold, stack_file=self.stack_data,
             input_dir=output_dir, output_dir=output_dir,
             start_year=start_year+1, end_year=end_year,
-            num_processors=num_processors)
+            num_processors=num_processors, scene_list=regression_list,
+            cache_dir=cache_dir, cache_size=cache_size,
+            output_format=output_format, compress=compress,
+            metrics_file=self.metrics_file, profile_dir=self.profile_dir,
+            memory_limit=memory_limit, journal=self.journal)
         if status != SUCCESS:
             msg = 'Error running burn thresholds'
             logIt (msg, self.log_handler)
             os.chdir (mydir)
             return ERROR
 
+        # start packaging the annual products into the zip file, so each
+        # year is compressed as soon as its annual summaries are done
+        zip_file = 'burned_area_%03d_%03d.zip' % (path, row)
+        msg = '\nZipping the annual summaries to ' + zip_file
+        logIt (msg, self.log_handler)
+        package = ProductPackage (zip_file, num_processors,
+            checksum_manifest, self.log_handler)
+
+        def package_year (year):
+            package.addPattern (['%s_%d.*' % (product, year)
+                for product in ANNUAL_PRODUCTS])
+
         # run the algorithm to generate annual summaries for the burn
         # probabilities and burned areas
-        status = AnnualBurnSummary().runAnnualBurnSummaries(
-            stack_file=stack_file, bp_dir=output_dir, bc_dir=output_dir,
-            output_dir=output_dir, start_year=start_year+1, end_year=end_year)
+        status = self.runStage('annual_summaries',
+            AnnualBurnSummary().runAnnualBurnSummaries,
+            stack_file=self.stack_data, bp_dir=output_dir, bc_dir=output_dir,
+            output_dir=output_dir, start_year=start_year+1, end_year=end_year,
+            num_processors=num_processors, years=summary_years,
+            compact=self.compact, output_format=output_format,
+            compress=compress, year_done=package_year,
+            metrics_file=self.metrics_file, profile_dir=self.profile_dir,
+            memory_limit=memory_limit, journal=self.journal)
         if status != SUCCESS:
             msg = 'Error running annual burn summaries'
             logIt (msg, self.log_handler)
+            package.abort()
             os.chdir (mydir)
             return ERROR
 
-        # zip the burn area annual summaries
-        zip_file = 'burned_area_%03d_%03d.zip' % (path, row)
-        msg = '\nZipping the annual summaries to ' + zip_file
-        logIt (msg, self.log_handler)
-        cmdstr = 'zip %s burned_area_* burn_count_* good_looks_count_* '  \
-            'max_burn_prob_*' % zip_file
-        os.system(cmdstr)
-        if not os.path.exists(zip_file):
+        # package the years which weren't reprocessed in this run, along
+        # with the XML file, and finish the zip file
+        span = self.metrics.start ('package')
+        package.addPattern (['%s_[0-9][0-9][0-9][0-9].*' % product
+            for product in ANNUAL_PRODUCTS])
+        package.addPattern (['burned_area_%d_%d.xml' % (start_year+1,
+            end_year)])
+        status = package.close()
+        self.metrics.end (span, status)
+        if status != SUCCESS:
             msg = 'Error creating the zip file of all the annual burn ' \
                 'summaries: ' + zip_file
             logIt (msg, self.log_handler)
             os.chdir (mydir)
             return ERROR
 
+        # record the scenes which were processed, along with their burn
+        # probabilities and classifications and the annual products of each
+        # year, so the next incremental run only processes what has changed
+        if incremental:
+            ext = raster_ext (output_format)
+            scene_outputs = {}
+            for name in scenes:
+                bp_file = output_dir + '/' +  \
+                    name.replace ('.xml', '_burn_probability.img')
+                bc_file = output_dir + '/' +  \
+                    name.replace ('.xml', '_burn_class' + ext)
+                scene_outputs[name] = envi_files (bp_file) +  \
+                    raster_files (bc_file)
+            year_outputs = {}
+            for year in range (start_year+1, end_year+1):
+                year_outputs[year] = []
+                for product in ANNUAL_PRODUCTS:
+                    year_outputs[year] += raster_files ('%s/%s_%d%s' %  \
+                        (output_dir, product, year, ext))
+            manifest.updateStage ('burned_area', scenes, extent,
+                scene_outputs, year_outputs)
+            status = manifest.write()
+            if status != SUCCESS:
+                msg = 'Error writing the stack manifest'
+                logIt (msg, self.log_handler)
+                os.chdir (mydir)
+                return ERROR
+
+        # the run is complete, so the journal is no longer needed
+        if os.path.exists(journal_file):
+            os.remove(journal_file)
+
         # successful processing
         end_time = time.time()
         msg = '***Total scene processing time = %f hours' %  \
             ((end_time - start_time) / 3600.0)
         logIt (msg, self.log_handler)
+
+        # summarize the stages of the run and their critical path
+        self.metrics.end (run_span, SUCCESS)
+        for msg in self.metrics.summary():
+            logIt (msg, self.log_handler)
+
+        # merge the profiles into the report of the top functions
+        if main_profiler is not None:
+            end_profile (main_profiler, self.profile_dir, 'main')
+            profile_report (self.profile_dir, log_handler=self.log_handler)
         msg = 'Success running burned area processing'
         logIt (msg, self.log_handler)
         os.chdir (mydir)
@@ -0,0 +1,892 @@
+#! /usr/bin/env python
+import sys
+import os
+import time
+import threading
+import multiprocessing
+from argparse import ArgumentParser
+from model_registry import open_registry
+from stack_table import *
+from stage_cache import *
+from task_journal import DEFAULT_MAX_RETRIES
+from task_scheduler import resolve_processors
+from task_broker import *
+from raster_output import *
+from product_package import ProductPackage
+from process_temporal_ba_stack import temporalBAStack, LIST_FILE,  \
+    STACK_FILE, BOUNDING_BOX_FILE
+from scene_resample import DEFAULT_IO_THREADS
+from do_burned_area import BurnedArea, ANNUAL_PRODUCTS
+from do_boosted_regression import RegressionPredictor
+from do_threshold_stack import BurnAreaThreshold
+from do_annual_burn_summaries import AnnualBurnSummary
+
+# commands of the distributed processing
+COMMANDS = ['submit', 'worker', 'status', 'retry', 'batch']
+
+# stages of each job, along with the stages whose products they read
+STAGES = [
+    ('stack', []),
+    ('resample', ['stack']),
+    ('seasonal_summaries', ['resample']),
+    ('annual_maximums', ['resample']),
+    ('regression', ['seasonal_summaries', 'annual_maximums']),
+    ('threshold', ['regression']),
+    ('annual_summaries', ['threshold']),
+    ('package', ['annual_summaries'])]
+
+# seconds a worker waits before checking the broker again, when none of the
+# remaining tasks are ready to run
+POLL_INTERVAL = 30
+
+
+def renew_lease (broker_file, lease, task_id, done):
+    """Renews the lease of a running task until done is set.  Runs in a
+       thread of the worker, with its own connection to the broker.
+    """
+
+    broker = TaskBroker (broker_file, lease)
+    while not done.wait (lease / 3.0):
+        broker.renew (task_id)
+    broker.close()
+
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created Python class to run the tasks handed out by the task broker.
+#
+# History:
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Ends the predict_burned_area process of the worker when done.
+#
+############################################################################
+class brokerWorker(multiprocessing.Process):
+    """Runs the tasks of the task broker until none are left.
+    """
+
+    def __init__ (self, broker_file, lease, distObject):
+        # base class initialization
+        multiprocessing.Process.__init__(self)
+
+        # job management stuff
+        self.broker_file = broker_file
+        self.lease = lease
+        self.distObject = distObject
+        self.kill_received = False
+
+
+    def run(self):
+        broker = TaskBroker (self.broker_file, self.lease,
+            self.distObject.log_handler)
+        worker = worker_name()
+        mydir = os.getcwd()
+        while not self.kill_received:
+            # get a task; wait for the tasks of the other workers if none
+            # are ready, unless there is nothing left to do
+            task = broker.claim (worker)
+            if task is None:
+                if broker.remaining() == 0:
+                    break
+                time.sleep (POLL_INTERVAL)
+                continue
+
+            # process the task, renewing its lease while it runs
+            name = '%s %s %s' % (task['job'], task['stage'],
+                str(task['task']))
+            msg = '%s: processing %s (attempt %d) ...' % (worker, name,
+                task['attempts'])
+            logIt (msg, self.distObject.log_handler)
+            done = threading.Event()
+            heartbeat = threading.Thread (target=renew_lease,
+                args=(self.broker_file, self.lease, task['id'], done))
+            heartbeat.start()
+            try:
+                (status, new_tasks) = self.distObject.runTask (task)
+                msg = 'Error processing ' + name
+            except Exception, e:
+                status = ERROR
+                msg = 'Error processing %s: %s' % (name, str(e))
+            done.set()
+            heartbeat.join()
+            os.chdir (mydir)
+
+            # store the result
+            if status != SUCCESS:
+                logIt (msg, self.distObject.log_handler)
+                broker.fail (task['id'], msg)
+            else:
+                broker.complete (task['id'], new_tasks)
+
+        self.distObject.closePredictor()
+        broker.close()
+
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created Python script to run the burned area processing of many path/row
+#     stacks across the nodes of a cluster, via the task broker.
+#
+# History:
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Added the batch command for a list of stacks on a single node.  The
+#       workers keep the StackTables and predict_burned_area process across
+#       their tasks.
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       The seasonal summaries and annual maximums are planned for every
+#       year from the first through the last year of the stack, including
+#       the years without scenes, as on a single node.
+#
+# Notes:
+#   1. Each path/row stack is submitted as a job.  The stages of the job are
+#      split into tasks (the scenes or years of the stack, or the seasons of
+#      each year), which are pulled by the workers on each node.  Each task
+#      runs the same methods as do_burned_area, restricted to its scene,
+#      year, or season.
+#   2. The input, output, model, and cache directories, along with the
+#      broker database, need to be on storage shared by all of the nodes.
+#   3. The run metrics, profiling, incremental processing, custom seasons,
+#      and task journal of do_burned_area are not supported.  The broker
+#      takes the place of the task journal; a failed job is resumed with the
+#      retry command.
+#   4. The batch command submits a list of stack directories to a broker in
+#      the output directory and runs their tasks on this node.  Since the
+#      tasks of all the stacks are pulled from the same queue, the workers
+#      move on to the tasks of the other stacks while a stack waits for the
+#      last tasks of a stage.
+#   5. Each worker keeps the StackTable of each stack it has processed, vs.
+#      reading it for every task, and runs its scenes through a single
+#      predict_burned_area process, which only loads the model again when
+#      the scene is for a different model.
+#
+# Usage: do_distributed_burned_area.py --help prints the help message
+############################################################################
+class DistributedBurnedArea():
+    """Class for handling the distributed burned area processing of many
+       path/row temporal stacks of surface reflectance products.
+    """
+
+    def __init__(self):
+        self.log_handler = None
+        self.predictor = None
+        self.stacks = {}
+        self.planners = {'stack': self.planStack,
+            'resample': self.planResample,
+            'seasonal_summaries': self.planSeasonalSummaries,
+            'annual_maximums': self.planAnnualMaximums,
+            'regression': self.planRegression,
+            'threshold': self.planThreshold,
+            'annual_summaries': self.planAnnualSummaries,
+            'package': self.planPackage}
+        self.runners = {'resample': self.runResample,
+            'seasonal_summaries': self.runSeasonalSummaries,
+            'annual_maximums': self.runAnnualMaximums,
+            'regression': self.runRegression,
+            'threshold': self.runThreshold,
+            'annual_summaries': self.runAnnualSummaries}
+
+
+    def runTask(self, task):
+        """Runs a task handed out by the broker.
+
+        Args:
+          task - dictionary of the claimed task, from TaskBroker.claim
+
+        Returns:
+          (status, new_tasks) - ERROR or SUCCESS, along with the list of
+              the tasks of the stage for a plan task
+        """
+
+        if task['kind'] == KIND_PLAN:
+            new_tasks = self.planners[task['stage']](task['params'])
+            if new_tasks is None:
+                return (ERROR, None)
+            msg = 'Planned %d %s tasks for %s' % (len (new_tasks),
+                task['stage'], task['job'])
+            logIt (msg, self.log_handler)
+            return (SUCCESS, new_tasks)
+
+        status = self.runners[task['stage']](task['params'], task['task'])
+        return (status, None)
+
+
+    def stackObject(self, params):
+        """Returns the temporalBAStack for the stack of the job, set up to
+           process a single task.
+        """
+
+        stack = temporalBAStack()
+        stack.input_dir = params['input_dir']
+        stack.log_handler = self.log_handler
+        stack.num_processors = 1
+        stack.delete_src = params['delete_src']
+        stack.io_threads = params.get ('io_threads', DEFAULT_IO_THREADS)
+        stack.cache = self.stageCache (params)
+        stack.setupDirectories()
+        return stack
+
+
+    def stageCache(self, params):
+        """Returns the StageCache of the job, or None if not specified."""
+
+        if params['cache_dir'] is None:
+            return None
+        return StageCache (params['cache_dir'], params['cache_size'],
+            self.log_handler)
+
+
+    def stackFile(self, params):
+        """Returns the name of the stack file of the job."""
+
+        return params['input_dir'] + STACK_FILE
+
+
+    def stackTable(self, params):
+        """Returns the StackTable of the job, or None if it can't be read.
+           The table is kept for the later tasks of the job, until the
+           stack is generated again.
+        """
+
+        stack_file = self.stackFile (params)
+        npz_file = stack_npz_file (stack_file)
+        mtime = None
+        if os.path.exists (npz_file):
+            mtime = os.path.getmtime (npz_file)
+        if (mtime is not None) and (stack_file in self.stacks) and  \
+           (self.stacks[stack_file][0] == mtime):
+            return self.stacks[stack_file][1]
+
+        stack = read_stack_table (stack_file, self.log_handler)
+        if stack is not None:
+            self.stacks[stack_file] = (mtime, stack)
+        return stack
+
+
+    def closePredictor(self):
+        """Ends the predict_burned_area process of the worker, if any."""
+
+        if self.predictor is not None:
+            self.predictor.close()
+            self.predictor = None
+
+
+    def regressionScenes(self, params):
+        """Returns the list of XML files of the job to be run through the
+           boosted regression, i.e. the scenes of the stack after the start
+           year, or None if the list of scenes can't be read.
+        """
+
+        list_file = params['input_dir'] + LIST_FILE
+        if not os.path.exists (list_file):
+            msg = 'List of scenes does not exist: ' + list_file
+            logIt (msg, self.log_handler)
+            return None
+
+        text_file = open (list_file, 'r')
+        sr_list = text_file.readlines()
+        text_file.close()
+
+        # filter out the start_year scenes since we need the previous year to
+        # run the boosted regression algorithm
+        scenes = []
+        for line in sr_list:
+            xml_file = line.rstrip('\n')
+            year = int(os.path.basename(xml_file)[9:13])
+            if year != params['start_year']:
+                scenes.append (xml_file)
+        return scenes
+
+
+    def planStack(self, params):
+        """Generates the stack of the job; the stage has no other tasks."""
+
+        stack = self.stackObject (params)
+        os.chdir (params['input_dir'])
+        status = stack.prepareStack (exclude_l1g=True, exclude_rmse=True,
+            exclude_cloud_cover=True)
+        if status != SUCCESS:
+            return None
+        return []
+
+
+    def planResample(self, params):
+        """Returns the scenes of the stack to be resampled."""
+
+        stack = self.stackTable (params)
+        if stack is None:
+            return None
+        return [str(xml_file) for xml_file in stack['file']]
+
+
+    def runResample(self, params, xml_file):
+        """Resamples a scene to the maximum extents of the stack."""
+
+        table = self.stackTable (params)
+        if table is None:
+            return ERROR
+        stack = self.stackObject (params)
+        return stack.resampleStack (params['input_dir'] + BOUNDING_BOX_FILE,
+            table, [xml_file])
+
+
+    def stackYears(self, stack):
+        """Returns the years from the first through the last year of the
+           stack, including the years without any scenes, as processed by
+           generateSeasonalSummaries and generateAnnualMaximums.
+        """
+
+        return range (int(stack.years[0]), int(stack.years[-1]) + 1)
+
+
+    def planSeasonalSummaries(self, params):
+        """Returns the [year, season] of each seasonal summary of the
+           stack.
+        """
+
+        stack = self.stackTable (params)
+        if stack is None:
+            return None
+        return [[year, season] for year in self.stackYears (stack)
+            for season in stack.season_names]
+
+
+    def runSeasonalSummaries(self, params, year_season):
+        """Generates the summary of a season of a year."""
+
+        (year, season) = year_season
+        table = self.stackTable (params)
+        if table is None:
+            return ERROR
+        stack = self.stackObject (params)
+        return stack.generateSeasonalSummaries (table, [year], [season])
+
+
+    def planAnnualMaximums(self, params):
+        """Returns the years of the stack for the annual maximums."""
+
+        stack = self.stackTable (params)
+        if stack is None:
+            return None
+        return self.stackYears (stack)
+
+
+    def runAnnualMaximums(self, params, year):
+        """Generates the annual maximums of a year."""
+
+        table = self.stackTable (params)
+        if table is None:
+            return ERROR
+        stack = self.stackObject (params)
+        return stack.generateAnnualMaximums (table, [year])
+
+
+    def modelFile(self, params):
+        """Returns the model file for the path/row of the job."""
+
+        registry = open_registry (params['model_dir'], self.log_handler)
+        return registry.modelFile (params['path'], params['row'])
+
+
+    def planRegression(self, params):
+        """Removes the spectral index files, which are no longer needed, and
+           returns the scenes to be run through the boosted regression.
+        """
+
+        stack = self.stackObject (params)
+        stack.stack = self.stackTable (params)
+        if stack.stack is None:
+            return None
+        stack.removeIndexFiles()
+
+        # error message already written by the model registry
+        if self.modelFile (params) is None:
+            return None
+
+        return self.regressionScenes (params)
+
+
+    def runRegression(self, params, xml_file):
+        """Runs the boosted regression model on a scene, via the
+           predict_burned_area process of the worker.
+        """
+
+        if self.predictor is None:
+            self.predictor = RegressionPredictor (self.log_handler)
+
+        burned_area = BurnedArea()
+        burned_area.predictor = self.predictor
+        burned_area.log_handler = self.log_handler
+        burned_area.logfile = None
+        burned_area.output_dir = params['output_dir']
+        burned_area.model_file = self.modelFile (params)
+        burned_area.compact = params['compact']
+        burned_area.cache = self.stageCache (params)
+        burned_area.extent_file = params['input_dir'] + BOUNDING_BOX_FILE
+        burned_area.config_file = 'temp_%03d_%03d.config' %  \
+            (params['path'], params['row'])
+        burned_area.stack_data = self.stackTable (params)
+        if burned_area.stack_data is None:
+            return ERROR
+
+        os.chdir (params['output_dir'])
+        return burned_area.sceneBoostedRegression (xml_file)
+
+
+    def planThreshold(self, params):
+        """Returns the scenes whose burn probabilities are thresholded."""
+
+        return self.regressionScenes (params)
+
+
+    def runThreshold(self, params, xml_file):
+        """Runs the burn threshold classification on a scene."""
+
+        table = self.stackTable (params)
+        if table is None:
+            return ERROR
+        return BurnAreaThreshold().runBurnThreshold (stack_file=table,
+            input_dir=params['output_dir'], output_dir=params['output_dir'],
+            start_year=params['start_year']+1, end_year=params['end_year'],
+            num_processors=1, scene_list=[xml_file],
+            cache_dir=params['cache_dir'], cache_size=params['cache_size'],
+            output_format=params['output_format'],
+            compress=params['compress'])
+
+
+    def planAnnualSummaries(self, params):
+        """Returns the years of the annual burn summaries."""
+
+        return range (params['start_year']+1, params['end_year']+1)
+
+
+    def annualSummaries(self, params, years, finalize):
+        """Runs the annual burn summaries for the years of the job."""
+
+        table = self.stackTable (params)
+        if table is None:
+            return ERROR
+        return AnnualBurnSummary().runAnnualBurnSummaries (stack_file=table,
+            bp_dir=params['output_dir'],
+            bc_dir=params['output_dir'], output_dir=params['output_dir'],
+            start_year=params['start_year']+1, end_year=params['end_year'],
+            num_processors=1, years=years, compact=params['compact'],
+            output_format=params['output_format'],
+            compress=params['compress'], finalize=finalize)
+
+
+    def runAnnualSummaries(self, params, year):
+        """Generates the annual burn summaries of a year."""
+
+        return self.annualSummaries (params, [year], False)
+
+
+    def planPackage(self, params):
+        """Finishes the annual burn summaries, i.e. writes the XML file, and
+           zips the annual products; the stage has no other tasks.
+        """
+
+        status = self.annualSummaries (params, [], True)
+        if status != SUCCESS:
+            return None
+
+        os.chdir (params['output_dir'])
+        zip_file = 'burned_area_%03d_%03d.zip' %  \
+            (params['path'], params['row'])
+        msg = 'Zipping the annual summaries to ' + zip_file
+        logIt (msg, self.log_handler)
+        package = ProductPackage (zip_file, 1, params['checksum_manifest'],
+            self.log_handler)
+        package.addPattern (['%s_[0-9][0-9][0-9][0-9].*' % product
+            for product in ANNUAL_PRODUCTS])
+        package.addPattern (['burned_area_%d_%d.xml' %  \
+            (params['start_year']+1, params['end_year'])])
+        if package.close() != SUCCESS:
+            msg = 'Error creating the zip file of all the annual burn ' \
+                'summaries: ' + zip_file
+            logIt (msg, self.log_handler)
+            return None
+        return []
+
+
+    def submitJob(self, broker, sr_list_file, input_dir, output_dir,
+        model_dir, max_retries, params):
+        """Submits the burned area processing of a stack to the broker.
+        Description: Reads the XML list file to determine the path/row and
+            start/end year of the stack, the same as do_burned_area, then
+            submits the stages of the stack as a job.
+
+        History:
+          Created on October 18, 2026 by USGS/EROS LSRD Project
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              The XML files in the input directory are used if no list file
+              is specified.
+
+        Args:
+          broker - TaskBroker for the job
+          sr_list_file - input file listing the surface reflectance scenes
+              to be processed for a single path/row; if None then the XML
+              files in the input directory are used
+          input_dir - location of the input stack of scenes to process
+          output_dir - location to write the output burned area products
+          model_dir - location of the geographic models for the boosted
+              regression algorithm
+          max_retries - number of times a failed task is retried
+          params - dictionary of the processing options of the job
+
+        Returns:
+            ERROR - error submitting the job
+            SUCCESS - successful processing
+        """
+
+        if not os.path.exists(input_dir):
+            msg = 'Input directory does not exist: ' + input_dir
+            logIt (msg, self.log_handler)
+            return ERROR
+
+        if not os.path.exists(model_dir):
+            msg = 'Model directory does not exist: ' + model_dir
+            logIt (msg, self.log_handler)
+            return ERROR
+
+        if not os.path.exists(output_dir):
+            msg = 'Output directory does not exist: %s. Creating ...' % \
+                output_dir
+            logIt (msg, self.log_handler)
+            os.makedirs(output_dir, 0755)
+
+        # open and read the input stack of scenes, or list the XML files in
+        # the input directory
+        if sr_list_file is None:
+            sr_list = [f_in for f_in in sorted(os.listdir(input_dir))
+                if f_in.endswith('.xml') and not f_in.endswith('.aux.xml')]
+        elif not os.path.exists(sr_list_file):
+            msg = 'Input surface reflectance list file does not exist: ' +  \
+                sr_list_file
+            logIt (msg, self.log_handler)
+            return ERROR
+        else:
+            text_file = open(sr_list_file, "r")
+            sr_list = [line.rstrip('\n') for line in text_file.readlines()
+                if line.strip() != '']
+            text_file.close()
+        if len(sr_list) == 0:
+            msg = 'error reading the list of scenes for ' + input_dir
+            logIt (msg, self.log_handler)
+            return ERROR
+
+        # determine the path/row from the first scene along with the
+        # starting and ending year in the stack
+        # (Ex. LT50170391984072XXX07.xml)
+        scene_names = [os.path.basename(curr_file).replace('.xml', '')
+            for curr_file in sr_list]
+        path = int(scene_names[0][3:6])
+        row = int(scene_names[0][6:9])
+        years = [int(scene_name[9:13]) for scene_name in scene_names]
+        start_year = min(years)
+        end_year = max(years)
+        if start_year < 1984:
+            msg = 'start_year cannot begin before 1984: %d' % start_year
+            logIt (msg, self.log_handler)
+            return ERROR
+
+        # the directories are shared by the nodes, so use absolute paths
+        input_dir = os.path.abspath(input_dir) + '/'
+        params = dict(params)
+        params.update ({'input_dir': input_dir,
+            'output_dir': os.path.abspath(output_dir),
+            'model_dir': os.path.abspath(model_dir), 'path': path,
+            'row': row, 'start_year': start_year, 'end_year': end_year})
+        if params['cache_dir'] is not None:
+            params['cache_dir'] = os.path.abspath(params['cache_dir'])
+
+        job = '%03d_%03d' % (path, row)
+        if not broker.submitJob (job, params, STAGES, max_retries):
+            msg = 'Job %s was already submitted; use the retry command to '  \
+                'rerun its failed tasks' % job
+            logIt (msg, self.log_handler)
+            return SUCCESS
+
+        msg = 'Submitted job %s: path/row %d, %d, years %d - %d' %  \
+            (job, path, row, start_year, end_year)
+        logIt (msg, self.log_handler)
+        return SUCCESS
+
+
+    def submitBatch(self, broker, stack_list_file, output_dir, model_dir,
+        max_retries, params):
+        """Submits the burned area processing of a list of stacks to the
+           broker.
+        Description: Each stack directory is submitted as a job, using the
+            XML files in the directory.  The products of each stack are
+            written to the subdirectory of the output directory with the
+            same name as the stack directory.
+
+        History:
+          Created on October 18, 2026 by USGS/EROS LSRD Project
+
+        Args:
+          broker - TaskBroker for the jobs
+          stack_list_file - input file listing the directories of the
+              path/row stacks, one per line
+          output_dir - location to write the output burned area products of
+              each stack
+          model_dir - location of the geographic models for the boosted
+              regression algorithm
+          max_retries - number of times a failed task is retried
+          params - dictionary of the processing options of the jobs
+
+        Returns:
+            ERROR - error submitting one or more of the stacks
+            SUCCESS - successful processing
+        """
+
+        if not os.path.exists(stack_list_file):
+            msg = 'Stack list file does not exist: ' + stack_list_file
+            logIt (msg, self.log_handler)
+            return ERROR
+
+        text_file = open(stack_list_file, "r")
+        stack_dirs = [line.strip() for line in text_file.readlines()
+            if line.strip() != '']
+        text_file.close()
+
+        status = SUCCESS
+        for stack_dir in stack_dirs:
+            stack_output_dir = os.path.join (output_dir,
+                os.path.basename (stack_dir.rstrip('/')))
+            if self.submitJob (broker, None, stack_dir, stack_output_dir,
+                model_dir, max_retries, params) != SUCCESS:
+                msg = 'Error submitting the stack in ' + stack_dir
+                logIt (msg, self.log_handler)
+                status = ERROR
+
+        msg = 'Submitted %d stacks' % len (stack_dirs)
+        logIt (msg, self.log_handler)
+        return status
+
+
+    def runWorkers(self, broker_file, lease, num_processors):
+        """Runs the tasks of the broker on this node until none are left.
+        Description: Spawns a worker for each processor.  Each worker pulls
+            the tasks which are ready to run from the broker, until all of
+            the jobs are done or failed.
+
+        History:
+          Created on October 18, 2026 by USGS/EROS LSRD Project
+
+        Args:
+          broker_file - name of the broker database
+          lease - seconds a claimed task is leased to a worker
+          num_processors - how many workers to run on this node
+
+        Returns:
+            ERROR - one or more of the jobs failed
+            SUCCESS - successful processing
+        """
+
+        msg = 'Spawning %d workers for the tasks of %s ....' %  \
+            (num_processors, broker_file)
+        logIt (msg, self.log_handler)
+        workers = []
+        for i in range(num_processors):
+            worker = brokerWorker (broker_file, lease, self)
+            worker.start()
+            workers.append (worker)
+
+        for worker in workers:
+            worker.join()
+
+        broker = TaskBroker (broker_file, lease, self.log_handler)
+        lines = broker.status()
+        broker.close()
+        for msg in lines:
+            logIt (msg, self.log_handler)
+        if len ([line for line in lines  \
+            if line.endswith (': ' + STATUS_FAILED)]) > 0:
+            return ERROR
+        return SUCCESS
+
+
+    def runDistributed(self):
+        """Runs the distributed burned area processing.
+        Description: Submits the path/row stacks to the broker, runs the
+            workers of this node, reports the status of the jobs, or
+            retries the failed jobs, depending on the command.
+
+        History:
+          Created on October 18, 2026 by USGS/EROS LSRD Project
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Added the batch command, which submits a list of stack
+              directories and runs their tasks on this node.
+
+        Returns:
+            ERROR - error running the command
+            SUCCESS - successful processing
+        """
+
+        # get the command line argument for the input parameters
+        parser = ArgumentParser(  \
+            description='Run burned area processing for temporal stacks '  \
+                'of surface reflectance products, distributed across the '  \
+                'nodes of a cluster via a shared task broker')
+        parser.add_argument ('command', type=str, choices=COMMANDS,
+            help='submit a stack, run the workers of this node, report '  \
+                 'the status of the jobs, retry the failed tasks of the '  \
+                 'jobs, or submit a list of stacks and run their tasks on '  \
+                 'this node')
+        parser.add_argument ('jobs', type=str, nargs='*',
+            help='jobs (path_row) to be retried')
+        parser.add_argument ('--broker_file', type=str, dest='broker_file',
+            help='SQLite database of the task broker, on storage shared '  \
+                 'by all the nodes (default = %s, in the output directory '  \
+                 'for batch)' % BROKER_FILE,
+            metavar='FILE')
+        parser.add_argument ('--lease', type=int, dest='lease',
+            default=DEFAULT_LEASE,
+            help='seconds a task is leased to a worker before it is '  \
+                 'handed out again, unless the worker renews it '  \
+                 '(default = %d)' % DEFAULT_LEASE)
+        parser.add_argument ('-s', '--sr_list_file', type=str,
+            dest='sr_list_file',
+            help='input file, each row contains the full pathname of '  \
+                 'surface reflectance products to be processed',
+            metavar='FILE')
+        parser.add_argument ('--stack_list', type=str, dest='stack_list',
+            help='input file for batch, each row contains the directory '  \
+                 'of a path/row stack of surface reflectance products',
+            metavar='FILE')
+        parser.add_argument ('-i', '--input_dir', type=str,
+            dest='input_dir',
+            help='input directory, location of input scenes to be '  \
+                 'processed',
+            metavar='DIR')
+        parser.add_argument ('-o', '--output_dir', type=str,
+            dest='output_dir',
+            help='output directory, location to write output burned '  \
+                 'area products which have been processed',
+            metavar='DIR')
+        parser.add_argument ('-m', '--model_dir', type=str,
+            dest='model_dir',
+            help='input directory, location of the geographic models ' \
+                 'for the boosted regression algorithm',
+            metavar='DIR')
+        parser.add_argument ('-p', '--num_processors', type=int,
+            dest='num_processors', default=1,
+            help='how many workers to run on this node; 0 uses all the '  \
+                'cores (default = 1)')
+        parser.add_argument ('--delete_src',
+            dest='delete_src', default=False, action='store_true',
+            help='if True, the source files will be deleted after each '
+                 'scene has been resampled to the maximum geographic '
+                 'extents.')
+        parser.add_argument ('--cache_dir', type=str, dest='cache_dir',
+            help='directory for the stage cache of intermediate '  \
+                 'products; the cache is not used if not specified',
+            metavar='DIR')
+        parser.add_argument ('--cache_size', type=float,
+            dest='cache_size', default=DEFAULT_CACHE_SIZE,
+            help='maximum size of the stage cache in gigabytes '  \
+                 '(default = %.0f)' % DEFAULT_CACHE_SIZE, metavar='GB')
+        parser.add_argument ('--max_retries', type=int,
+            dest='max_retries', default=DEFAULT_MAX_RETRIES,
+            help='number of times a failed task is retried '  \
+                 '(default = %d)' % DEFAULT_MAX_RETRIES)
+        parser.add_argument ('--io_threads', type=int,
+            dest='io_threads', default=DEFAULT_IO_THREADS,
+            help='number of threads reading and writing the blocks of '  \
+                 'each scene while it is resampled; 0 reads and writes '  \
+                 'them in the worker itself (default = %d)' %  \
+                 DEFAULT_IO_THREADS)
+        parser.add_argument ('--compact',
+            dest='compact', default=False, action='store_true',
+            help='if True, the burn probabilities and the annual burn '
+                 'count, good looks count, and maximum burn probability '
+                 'products are written as uint8 vs. int16.')
+        parser.add_argument ('--output_format', type=str,
+            dest='output_format', default=DEFAULT_FORMAT,
+            choices=OUTPUT_FORMATS,
+            help='format of the burn classifications and annual '  \
+                 'products; gtiff is tiled and compressed GeoTIFF '  \
+                 '(default = %s)' % DEFAULT_FORMAT)
+        parser.add_argument ('--compress', type=str, dest='compress',
+            default=DEFAULT_COMPRESS, choices=COMPRESS_METHODS,
+            help='compression method for the gtiff output format '  \
+                 '(default = %s)' % DEFAULT_COMPRESS)
+        parser.add_argument ('--checksum_manifest',
+            dest='checksum_manifest', default=False, action='store_true',
+            help='if True, a manifest with the SHA-256 checksum of '
+                 'each annual product is added to the zip file')
+
+        options = parser.parse_args()
+
+        params = {'delete_src': options.delete_src,
+            'cache_dir': options.cache_dir,
+            'cache_size': options.cache_size,
+            'compact': options.compact,
+            'output_format': options.output_format,
+            'compress': options.compress,
+            'checksum_manifest': options.checksum_manifest,
+            'io_threads': options.io_threads}
+
+        # the broker of a batch is kept with its products
+        broker_file = options.broker_file
+        if options.command == 'batch':
+            if (options.stack_list is None) or  \
+               (options.output_dir is None) or  \
+               (options.model_dir is None):
+                parser.error ('batch needs the stack list file, output, '  \
+                    'and model directories')
+                return ERROR
+            if not os.path.exists(options.output_dir):
+                os.makedirs(options.output_dir, 0755)
+            if broker_file is None:
+                broker_file = os.path.join (options.output_dir, BROKER_FILE)
+        elif broker_file is None:
+            broker_file = BROKER_FILE
+
+        broker = TaskBroker (broker_file, options.lease, self.log_handler)
+        try:
+            if options.command == 'batch':
+                status = self.submitBatch (broker, options.stack_list,
+                    options.output_dir, options.model_dir,
+                    options.max_retries, params)
+                if status != SUCCESS:
+                    return ERROR
+
+            if options.command == 'submit':
+                if (options.sr_list_file is None) or  \
+                   (options.input_dir is None) or  \
+                   (options.output_dir is None) or  \
+                   (options.model_dir is None):
+                    parser.error ('submit needs the surface reflectance '  \
+                        'list file, input, output, and model directories')
+                    return ERROR
+
+                return self.submitJob (broker, options.sr_list_file,
+                    options.input_dir, options.output_dir,
+                    options.model_dir, options.max_retries, params)
+
+            if options.command == 'status':
+                for msg in broker.status():
+                    logIt (msg, self.log_handler)
+                return SUCCESS
+
+            if options.command == 'retry':
+                if len (options.jobs) == 0:
+                    parser.error ('retry needs the jobs to be retried')
+                    return ERROR
+                for job in options.jobs:
+                    msg = 'Retrying %d failed tasks of job %s' %  \
+                        (broker.retryJob (job), job)
+                    logIt (msg, self.log_handler)
+                return SUCCESS
+        finally:
+            broker.close()
+
+        # run the workers of this node
+        return self.runWorkers (broker_file, options.lease,
+            resolve_processors (options.num_processors))
+
+######end of DistributedBurnedArea class######
+
+if __name__ == "__main__":
+    sys.exit (DistributedBurnedArea().runDistributed())
@@ -1,6 +1,8 @@
 import sys
 import os
 
+from model_registry import MODEL_RULES
+
 #############################################################################
 # Created on December 6, 2013 by Gail Schmidt, USGS/EROS
 # Created a hash table to store the models used for each of the path/row
@@ -10,732 +12,18 @@ import os
 # History:
 # Updated on November 10, 2014 by Gail Schmidt, USGS/EROS
 # Updated some of the models in the hash table for the various path/rows.
+# Updated on October 18, 2026 by USGS/EROS LSRD Project
+# The hash table is built from the rules of the model registry
+#     (model_registry.py) instead of listing each path/row.
 ############################################################################
 
-# TODO - GAIL update the model hash table.  Currently most path/rows are
-#   pointing to the Mountain West.
-# hash table for the path/row combinations.  'invalid' means no model exists
-# for the specified path/row.
-model_hash = {'010026':'gbt_mountain_west_model.xml',  # 010
-              '010027':'gbt_mountain_west_model.xml',
-              '010028':'gbt_mountain_west_model.xml',
-              '010029':'gbt_mountain_west_model.xml',
-              '010030':'gbt_mountain_west_model.xml',
-              '010031':'gbt_mountain_west_model.xml',
-              '010032':'gbt_mountain_west_model.xml',
-              '010033':'gbt_mountain_west_model.xml',
-              '010034':'gbt_mountain_west_model.xml',
-              '010035':'gbt_mountain_west_model.xml',
-              '010036':'gbt_mountain_west_model.xml',
-              '010037':'gbt_mountain_west_model.xml',
-              '010038':'gbt_mountain_west_model.xml',
-              '010039':'gbt_mountain_west_model.xml',
-              '010040':'gbt_mountain_west_model.xml',
-              '010041':'gbt_mountain_west_model.xml',
-              '010042':'gbt_mountain_west_model.xml',
-              '010043':'gbt_mountain_west_model.xml',
-              '011026':'gbt_mountain_west_model.xml',  # 011
-              '011027':'gbt_mountain_west_model.xml',
-              '011028':'gbt_mountain_west_model.xml',
-              '011029':'gbt_mountain_west_model.xml',
-              '011030':'gbt_mountain_west_model.xml',
-              '011031':'gbt_mountain_west_model.xml',
-              '011032':'gbt_mountain_west_model.xml',
-              '011033':'gbt_mountain_west_model.xml',
-              '011034':'gbt_mountain_west_model.xml',
-              '011035':'gbt_mountain_west_model.xml',
-              '011036':'gbt_mountain_west_model.xml',
-              '011037':'gbt_mountain_west_model.xml',
-              '011038':'gbt_mountain_west_model.xml',
-              '011039':'gbt_mountain_west_model.xml',
-              '011040':'gbt_mountain_west_model.xml',
-              '011041':'gbt_mountain_west_model.xml',
-              '011042':'gbt_mountain_west_model.xml',
-              '011043':'gbt_mountain_west_model.xml',
-              '012026':'gbt_mountain_west_model.xml',  # 012
-              '012027':'gbt_mountain_west_model.xml',
-              '012028':'gbt_mountain_west_model.xml',
-              '012029':'gbt_mountain_west_model.xml',
-              '012030':'gbt_mountain_west_model.xml',
-              '012031':'gbt_mountain_west_model.xml',
-              '012032':'gbt_mountain_west_model.xml',
-              '012033':'gbt_mountain_west_model.xml',
-              '012034':'gbt_mountain_west_model.xml',
-              '012035':'gbt_mountain_west_model.xml',
-              '012036':'gbt_mountain_west_model.xml',
-              '012037':'gbt_mountain_west_model.xml',
-              '012038':'gbt_mountain_west_model.xml',
-              '012039':'gbt_mountain_west_model.xml',
-              '012040':'gbt_mountain_west_model.xml',
-              '012041':'gbt_mountain_west_model.xml',
-              '012042':'gbt_mountain_west_model.xml',
-              '012043':'gbt_mountain_west_model.xml',
-              '013026':'gbt_mountain_west_model.xml',  # 013
-              '013027':'gbt_mountain_west_model.xml',
-              '013028':'gbt_mountain_west_model.xml',
-              '013029':'gbt_mountain_west_model.xml',
-              '013030':'gbt_mountain_west_model.xml',
-              '013031':'gbt_mountain_west_model.xml',
-              '013032':'gbt_mountain_west_model.xml',
-              '013033':'gbt_mountain_west_model.xml',
-              '013034':'gbt_mountain_west_model.xml',
-              '013035':'gbt_mountain_west_model.xml',
-              '013036':'gbt_mountain_west_model.xml',
-              '013037':'gbt_mountain_west_model.xml',
-              '013038':'gbt_mountain_west_model.xml',
-              '013039':'gbt_mountain_west_model.xml',
-              '013040':'gbt_mountain_west_model.xml',
-              '013041':'gbt_mountain_west_model.xml',
-              '013042':'gbt_mountain_west_model.xml',
-              '013043':'gbt_mountain_west_model.xml',
-              '014026':'gbt_mountain_west_model.xml',  # 014
-              '014027':'gbt_mountain_west_model.xml',
-              '014028':'gbt_mountain_west_model.xml',
-              '014029':'gbt_mountain_west_model.xml',
-              '014030':'gbt_mountain_west_model.xml',
-              '014031':'gbt_mountain_west_model.xml',
-              '014032':'gbt_mountain_west_model.xml',
-              '014033':'gbt_mountain_west_model.xml',
-              '014034':'gbt_mountain_west_model.xml',
-              '014035':'gbt_mountain_west_model.xml',
-              '014036':'gbt_mountain_west_model.xml',
-              '014037':'gbt_mountain_west_model.xml',
-              '014038':'gbt_mountain_west_model.xml',
-              '014039':'gbt_mountain_west_model.xml',
-              '014040':'gbt_mountain_west_model.xml',
-              '014041':'gbt_mountain_west_model.xml',
-              '014042':'gbt_mountain_west_model.xml',
-              '014043':'gbt_mountain_west_model.xml',
-              '015026':'gbt_mountain_west_model.xml',  # 015
-              '015027':'gbt_mountain_west_model.xml',
-              '015028':'gbt_mountain_west_model.xml',
-              '015029':'gbt_mountain_west_model.xml',
-              '015030':'gbt_mountain_west_model.xml',
-              '015031':'gbt_mountain_west_model.xml',
-              '015032':'gbt_mountain_west_model.xml',
-              '015033':'gbt_mountain_west_model.xml',
-              '015034':'gbt_mountain_west_model.xml',
-              '015035':'gbt_east_model.xml',
-              '015036':'gbt_mountain_west_model.xml',
-              '015037':'gbt_mountain_west_model.xml',
-              '015038':'gbt_mountain_west_model.xml',
-              '015039':'gbt_mountain_west_model.xml',
-              '015040':'gbt_mountain_west_model.xml',
-              '015041':'gbt_east_model.xml',
-              '015042':'gbt_east_model.xml',
-              '015043':'gbt_mountain_west_model.xml',
-              '016026':'gbt_mountain_west_model.xml',  # 016
-              '016027':'gbt_mountain_west_model.xml',
-              '016028':'gbt_mountain_west_model.xml',
-              '016029':'gbt_mountain_west_model.xml',
-              '016030':'gbt_mountain_west_model.xml',
-              '016031':'gbt_east_model.xml',
-              '016032':'gbt_mountain_west_model.xml',
-              '016033':'gbt_mountain_west_model.xml',
-              '016034':'gbt_mountain_west_model.xml',
-              '016035':'gbt_mountain_west_model.xml',
-              '016036':'gbt_mountain_west_model.xml',
-              '016037':'gbt_mountain_west_model.xml',
-              '016038':'gbt_mountain_west_model.xml',
-              '016039':'gbt_mountain_west_model.xml',
-              '016040':'gbt_mountain_west_model.xml',
-              '016041':'gbt_mountain_west_model.xml',
-              '016042':'gbt_mountain_west_model.xml',
-              '016043':'gbt_mountain_west_model.xml',
-              '017026':'gbt_mountain_west_model.xml',  # 017
-              '017027':'gbt_mountain_west_model.xml',
-              '017028':'gbt_mountain_west_model.xml',
-              '017029':'gbt_mountain_west_model.xml',
-              '017030':'gbt_mountain_west_model.xml',
-              '017031':'gbt_mountain_west_model.xml',
-              '017032':'gbt_mountain_west_model.xml',
-              '017033':'gbt_mountain_west_model.xml',
-              '017034':'gbt_mountain_west_model.xml',
-              '017035':'gbt_mountain_west_model.xml',
-              '017036':'gbt_mountain_west_model.xml',
-              '017037':'gbt_mountain_west_model.xml',
-              '017038':'gbt_mountain_west_model.xml',
-              '017039':'gbt_mountain_west_model.xml',
-              '017040':'gbt_mountain_west_model.xml',
-              '017041':'gbt_mountain_west_model.xml',
-              '017042':'gbt_mountain_west_model.xml',
-              '017043':'gbt_mountain_west_model.xml',
-              '018026':'gbt_mountain_west_model.xml',  # 018
-              '018027':'gbt_mountain_west_model.xml',
-              '018028':'gbt_mountain_west_model.xml',
-              '018029':'gbt_mountain_west_model.xml',
-              '018030':'gbt_mountain_west_model.xml',
-              '018031':'gbt_mountain_west_model.xml',
-              '018032':'gbt_mountain_west_model.xml',
-              '018033':'gbt_mountain_west_model.xml',
-              '018034':'gbt_mountain_west_model.xml',
-              '018035':'gbt_mountain_west_model.xml',
-              '018036':'gbt_mountain_west_model.xml',
-              '018037':'gbt_mountain_west_model.xml',
-              '018038':'gbt_east_model.xml',
-              '018039':'gbt_mountain_west_model.xml',
-              '018040':'gbt_mountain_west_model.xml',
-              '018041':'gbt_mountain_west_model.xml',
-              '018042':'gbt_mountain_west_model.xml',
-              '018043':'gbt_mountain_west_model.xml',
-              '019026':'gbt_mountain_west_model.xml',  # 019
-              '019027':'gbt_mountain_west_model.xml',
-              '019028':'gbt_mountain_west_model.xml',
-              '019029':'gbt_mountain_west_model.xml',
-              '019030':'gbt_mountain_west_model.xml',
-              '019031':'gbt_mountain_west_model.xml',
-              '019032':'gbt_mountain_west_model.xml',
-              '019033':'gbt_mountain_west_model.xml',
-              '019034':'gbt_mountain_west_model.xml',
-              '019035':'gbt_mountain_west_model.xml',
-              '019036':'gbt_mountain_west_model.xml',
-              '019037':'gbt_mountain_west_model.xml',
-              '019038':'gbt_mountain_west_model.xml',
-              '019039':'gbt_mountain_west_model.xml',
-              '019040':'gbt_mountain_west_model.xml',
-              '019041':'gbt_mountain_west_model.xml',
-              '019042':'gbt_mountain_west_model.xml',
-              '019043':'gbt_mountain_west_model.xml',
-              '020026':'gbt_mountain_west_model.xml',  # 020
-              '020027':'gbt_mountain_west_model.xml',
-              '020028':'gbt_mountain_west_model.xml',
-              '020029':'gbt_mountain_west_model.xml',
-              '020030':'gbt_mountain_west_model.xml',
-              '020031':'gbt_mountain_west_model.xml',
-              '020032':'gbt_mountain_west_model.xml',
-              '020033':'gbt_mountain_west_model.xml',
-              '020034':'gbt_mountain_west_model.xml',
-              '020035':'gbt_mountain_west_model.xml',
-              '020036':'gbt_mountain_west_model.xml',
-              '020037':'gbt_mountain_west_model.xml',
-              '020038':'gbt_mountain_west_model.xml',
-              '020039':'gbt_mountain_west_model.xml',
-              '020040':'gbt_mountain_west_model.xml',
-              '020041':'gbt_mountain_west_model.xml',
-              '020042':'gbt_mountain_west_model.xml',
-              '020043':'gbt_mountain_west_model.xml',
-              '021026':'gbt_mountain_west_model.xml',  # 021
-              '021027':'gbt_mountain_west_model.xml',
-              '021028':'gbt_mountain_west_model.xml',
-              '021029':'gbt_mountain_west_model.xml',
-              '021030':'gbt_mountain_west_model.xml',
-              '021031':'gbt_mountain_west_model.xml',
-              '021032':'gbt_mountain_west_model.xml',
-              '021033':'gbt_mountain_west_model.xml',
-              '021034':'gbt_mountain_west_model.xml',
-              '021035':'gbt_mountain_west_model.xml',
-              '021036':'gbt_mountain_west_model.xml',
-              '021037':'gbt_mountain_west_model.xml',
-              '021038':'gbt_mountain_west_model.xml',
-              '021039':'gbt_mountain_west_model.xml',
-              '021040':'gbt_mountain_west_model.xml',
-              '021041':'gbt_mountain_west_model.xml',
-              '021042':'gbt_mountain_west_model.xml',
-              '021043':'gbt_mountain_west_model.xml',
-              '022026':'gbt_mountain_west_model.xml',  # 022
-              '022027':'gbt_mountain_west_model.xml',
-              '022028':'gbt_mountain_west_model.xml',
-              '022029':'gbt_mountain_west_model.xml',
-              '022030':'gbt_mountain_west_model.xml',
-              '022031':'gbt_mountain_west_model.xml',
-              '022032':'gbt_mountain_west_model.xml',
-              '022033':'gbt_mountain_west_model.xml',
-              '022034':'gbt_mountain_west_model.xml',
-              '022035':'gbt_mountain_west_model.xml',
-              '022036':'gbt_mountain_west_model.xml',
-              '022037':'gbt_mountain_west_model.xml',
-              '022038':'gbt_mountain_west_model.xml',
-              '022039':'gbt_mountain_west_model.xml',
-              '022040':'gbt_mountain_west_model.xml',
-              '022041':'gbt_mountain_west_model.xml',
-              '022042':'gbt_mountain_west_model.xml',
-              '022043':'gbt_mountain_west_model.xml',
-              '023026':'gbt_mountain_west_model.xml',  # 023
-              '023027':'gbt_mountain_west_model.xml',
-              '023028':'gbt_mountain_west_model.xml',
-              '023029':'gbt_mountain_west_model.xml',
-              '023030':'gbt_mountain_west_model.xml',
-              '023031':'gbt_mountain_west_model.xml',
-              '023032':'gbt_mountain_west_model.xml',
-              '023033':'gbt_mountain_west_model.xml',
-              '023034':'gbt_mountain_west_model.xml',
-              '023035':'gbt_mountain_west_model.xml',
-              '023036':'gbt_mountain_west_model.xml',
-              '023037':'gbt_mountain_west_model.xml',
-              '023038':'gbt_mountain_west_model.xml',
-              '023039':'gbt_mountain_west_model.xml',
-              '023040':'gbt_mountain_west_model.xml',
-              '023041':'gbt_mountain_west_model.xml',
-              '023042':'gbt_mountain_west_model.xml',
-              '023043':'gbt_mountain_west_model.xml',
-              '024026':'gbt_mountain_west_model.xml',  # 024
-              '024027':'gbt_mountain_west_model.xml',
-              '024028':'gbt_mountain_west_model.xml',
-              '024029':'gbt_east_model.xml',
-              '024030':'gbt_mountain_west_model.xml',
-              '024031':'gbt_mountain_west_model.xml',
-              '024032':'gbt_mountain_west_model.xml',
-              '024033':'gbt_mountain_west_model.xml',
-              '024034':'gbt_mountain_west_model.xml',
-              '024035':'gbt_mountain_west_model.xml',
-              '024036':'gbt_mountain_west_model.xml',
-              '024037':'gbt_mountain_west_model.xml',
-              '024038':'gbt_mountain_west_model.xml',
-              '024039':'gbt_east_model.xml',
-              '024040':'gbt_mountain_west_model.xml',
-              '024041':'gbt_mountain_west_model.xml',
-              '024042':'gbt_mountain_west_model.xml',
-              '024043':'gbt_mountain_west_model.xml',
-              '025026':'gbt_mountain_west_model.xml',  # 025
-              '025027':'gbt_mountain_west_model.xml',
-              '025028':'gbt_mountain_west_model.xml',
-              '025029':'gbt_mountain_west_model.xml',
-              '025030':'gbt_mountain_west_model.xml',
-              '025031':'gbt_mountain_west_model.xml',
-              '025032':'gbt_mountain_west_model.xml',
-              '025033':'gbt_mountain_west_model.xml',
-              '025034':'gbt_mountain_west_model.xml',
-              '025035':'gbt_mountain_west_model.xml',
-              '025036':'gbt_mountain_west_model.xml',
-              '025037':'gbt_mountain_west_model.xml',
-              '025038':'gbt_mountain_west_model.xml',
-              '025039':'gbt_mountain_west_model.xml',
-              '025040':'gbt_east_model.xml',
-              '025041':'gbt_mountain_west_model.xml',
-              '025042':'gbt_mountain_west_model.xml',
-              '025043':'gbt_mountain_west_model.xml',
-              '026026':'gbt_mountain_west_model.xml',  # 026
-              '026027':'gbt_mountain_west_model.xml',
-              '026028':'gbt_mountain_west_model.xml',
-              '026029':'gbt_mountain_west_model.xml',
-              '026030':'gbt_mountain_west_model.xml',
-              '026031':'gbt_mountain_west_model.xml',
-              '026032':'gbt_mountain_west_model.xml',
-              '026033':'gbt_mountain_west_model.xml',
-              '026034':'gbt_mountain_west_model.xml',
-              '026035':'gbt_mountain_west_model.xml',
-              '026036':'gbt_mountain_west_model.xml',
-              '026037':'gbt_mountain_west_model.xml',
-              '026038':'gbt_mountain_west_model.xml',
-              '026039':'gbt_mountain_west_model.xml',
-              '026040':'gbt_east_model.xml',
-              '026041':'gbt_east_model.xml',
-              '026042':'gbt_east_model.xml',
-              '026043':'gbt_mountain_west_model.xml',
-              '027026':'gbt_mountain_west_model.xml',  # 027
-              '027027':'gbt_mountain_west_model.xml',
-              '027028':'gbt_mountain_west_model.xml',
-              '027029':'gbt_mountain_west_model.xml',
-              '027030':'gbt_mountain_west_model.xml',
-              '027031':'gbt_mountain_west_model.xml',
-              '027032':'gbt_mountain_west_model.xml',
-              '027033':'gbt_mountain_west_model.xml',
-              '027034':'gbt_mountain_west_model.xml',
-              '027035':'gbt_mountain_west_model.xml',
-              '027036':'gbt_mountain_west_model.xml',
-              '027037':'gbt_mountain_west_model.xml',
-              '027038':'gbt_mountain_west_model.xml',
-              '027039':'gbt_mountain_west_model.xml',
-              '027040':'gbt_mountain_west_model.xml',
-              '027041':'gbt_mountain_west_model.xml',
-              '027042':'gbt_mountain_west_model.xml',
-              '027043':'gbt_mountain_west_model.xml',
-              '028026':'gbt_mountain_west_model.xml',  # 028
-              '028027':'gbt_mountain_west_model.xml',
-              '028028':'gbt_mountain_west_model.xml',
-              '028029':'gbt_mountain_west_model.xml',
-              '028030':'gbt_mountain_west_model.xml',
-              '028031':'gbt_mountain_west_model.xml',
-              '028032':'gbt_mountain_west_model.xml',
-              '028033':'gbt_mountain_west_model.xml',
-              '028034':'gbt_mountain_west_model.xml',
-              '028035':'gbt_mountain_west_model.xml',
-              '028036':'gbt_mountain_west_model.xml',
-              '028037':'gbt_mountain_west_model.xml',
-              '028038':'gbt_mountain_west_model.xml',
-              '028039':'gbt_mountain_west_model.xml',
-              '028040':'gbt_mountain_west_model.xml',
-              '028041':'gbt_mountain_west_model.xml',
-              '028042':'gbt_mountain_west_model.xml',
-              '028043':'gbt_mountain_west_model.xml',
-              '029026':'gbt_mountain_west_model.xml',  # 029
-              '029027':'gbt_mountain_west_model.xml',
-              '029028':'gbt_mountain_west_model.xml',
-              '029029':'gbt_mountain_west_model.xml',
-              '029030':'gbt_mountain_west_model.xml',
-              '029031':'gbt_mountain_west_model.xml',
-              '029032':'gbt_mountain_west_model.xml',
-              '029033':'gbt_mountain_west_model.xml',
-              '029034':'gbt_mountain_west_model.xml',
-              '029035':'gbt_mountain_west_model.xml',
-              '029036':'gbt_mountain_west_model.xml',
-              '029037':'gbt_mountain_west_model.xml',
-              '029038':'gbt_mountain_west_model.xml',
-              '029039':'gbt_mountain_west_model.xml',
-              '029040':'gbt_mountain_west_model.xml',
-              '029041':'gbt_mountain_west_model.xml',
-              '029042':'gbt_mountain_west_model.xml',
-              '029043':'gbt_mountain_west_model.xml',
-              '030026':'gbt_mountain_west_model.xml',  # 030
-              '030027':'gbt_mountain_west_model.xml',
-              '030028':'gbt_mountain_west_model.xml',
-              '030029':'gbt_mountain_west_model.xml',
-              '030030':'gbt_gp_west_model.xml',
-              '030031':'gbt_mountain_west_model.xml',
-              '030032':'gbt_mountain_west_model.xml',
-              '030033':'gbt_mountain_west_model.xml',
-              '030034':'gbt_mountain_west_model.xml',
-              '030035':'gbt_mountain_west_model.xml',
-              '030036':'gbt_gp_west_model.xml',
-              '030037':'gbt_mountain_west_model.xml',
-              '030038':'gbt_mountain_west_model.xml',
-              '030039':'gbt_mountain_west_model.xml',
-              '030040':'gbt_mountain_west_model.xml',
-              '030041':'gbt_mountain_west_model.xml',
-              '030042':'gbt_mountain_west_model.xml',
-              '030043':'gbt_mountain_west_model.xml',
-              '030026':'gbt_mountain_west_model.xml',  # 030
-              '030027':'gbt_mountain_west_model.xml',
-              '030028':'gbt_mountain_west_model.xml',
-              '030029':'gbt_mountain_west_model.xml',
-              '030030':'gbt_mountain_west_model.xml',
-              '030031':'gbt_mountain_west_model.xml',
-              '030032':'gbt_mountain_west_model.xml',
-              '030033':'gbt_mountain_west_model.xml',
-              '030034':'gbt_mountain_west_model.xml',
-              '030035':'gbt_mountain_west_model.xml',
-              '030036':'gbt_mountain_west_model.xml',
-              '030037':'gbt_mountain_west_model.xml',
-              '030038':'gbt_mountain_west_model.xml',
-              '030039':'gbt_mountain_west_model.xml',
-              '030040':'gbt_mountain_west_model.xml',
-              '030041':'gbt_mountain_west_model.xml',
-              '030042':'gbt_mountain_west_model.xml',
-              '030043':'gbt_mountain_west_model.xml',
-              '031026':'gbt_mountain_west_model.xml',  # 031
-              '031027':'gbt_mountain_west_model.xml',
-              '031028':'gbt_mountain_west_model.xml',
-              '031029':'gbt_mountain_west_model.xml',
-              '031030':'gbt_mountain_west_model.xml',
-              '031031':'gbt_mountain_west_model.xml',
-              '031032':'gbt_mountain_west_model.xml',
-              '031033':'gbt_mountain_west_model.xml',
-              '031034':'gbt_mountain_west_model.xml',
-              '031035':'gbt_mountain_west_model.xml',
-              '031036':'gbt_mountain_west_model.xml',
-              '031037':'gbt_mountain_west_model.xml',
-              '031038':'gbt_mountain_west_model.xml',
-              '031039':'gbt_mountain_west_model.xml',
-              '031040':'gbt_mountain_west_model.xml',
-              '031041':'gbt_mountain_west_model.xml',
-              '031042':'gbt_mountain_west_model.xml',
-              '031043':'gbt_mountain_west_model.xml',
-              '032026':'gbt_mountain_west_model.xml',  # 032
-              '032027':'gbt_mountain_west_model.xml',
-              '032028':'gbt_mountain_west_model.xml',
-              '032029':'gbt_mountain_west_model.xml',
-              '032030':'gbt_mountain_west_model.xml',
-              '032031':'gbt_mountain_west_model.xml',
-              '032032':'gbt_gp_west_model.xml',
-              '032033':'gbt_mountain_west_model.xml',
-              '032034':'gbt_mountain_west_model.xml',
-              '032035':'gbt_mountain_west_model.xml',
-              '032036':'gbt_mountain_west_model.xml',
-              '032037':'gbt_mountain_west_model.xml',
-              '032038':'gbt_mountain_west_model.xml',
-              '032039':'gbt_mountain_west_model.xml',
-              '032040':'gbt_mountain_west_model.xml',
-              '032041':'gbt_mountain_west_model.xml',
-              '032042':'gbt_mountain_west_model.xml',
-              '032043':'gbt_mountain_west_model.xml',
-              '033026':'gbt_mountain_west_model.xml',  # 033
-              '033027':'gbt_mountain_west_model.xml',
-              '033028':'gbt_mountain_west_model.xml',
-              '033029':'gbt_mountain_west_model.xml',
-              '033030':'gbt_gp_west_model.xml',
-              '033031':'gbt_mountain_west_model.xml',
-              '033032':'gbt_mountain_west_model.xml',
-              '033033':'gbt_mountain_west_model.xml',
-              '033034':'gbt_mountain_west_model.xml',
-              '033035':'gbt_mountain_west_model.xml',
-              '033036':'gbt_mountain_west_model.xml',
-              '033037':'gbt_mountain_west_model.xml',
-              '033038':'gbt_mountain_west_model.xml',
-              '033039':'gbt_mountain_west_model.xml',
-              '033040':'gbt_mountain_west_model.xml',
-              '033041':'gbt_mountain_west_model.xml',
-              '033042':'gbt_mountain_west_model.xml',
-              '033043':'gbt_mountain_west_model.xml',
-              '034026':'gbt_mountain_west_model.xml',  # 034
-              '034027':'gbt_mountain_west_model.xml',
-              '034028':'gbt_mountain_west_model.xml',
-              '034029':'gbt_mountain_west_model.xml',
-              '034030':'gbt_mountain_west_model.xml',
-              '034031':'gbt_mountain_west_model.xml',
-              '034032':'gbt_mountain_west_model.xml',
-              '034033':'gbt_mountain_west_model.xml',
-              '034034':'gbt_mountain_west_model.xml',
-              '034035':'gbt_mountain_west_model.xml',
-              '034036':'gbt_mountain_west_model.xml',
-              '034037':'gbt_mountain_west_model.xml',
-              '034038':'gbt_mountain_west_model.xml',
-              '034039':'gbt_mountain_west_model.xml',
-              '034040':'gbt_mountain_west_model.xml',
-              '034041':'gbt_mountain_west_model.xml',
-              '034042':'gbt_mountain_west_model.xml',
-              '034043':'gbt_mountain_west_model.xml',
-              '035026':'gbt_mountain_west_model.xml',  # 035
-              '035027':'gbt_mountain_west_model.xml',
-              '035028':'gbt_mountain_west_model.xml',
-              '035029':'gbt_mountain_west_model.xml',
-              '035030':'gbt_mountain_west_model.xml',
-              '035031':'gbt_mountain_west_model.xml',
-              '035032':'gbt_mountain_west_model.xml',
-              '035033':'gbt_mountain_west_model.xml',
-              '035034':'gbt_mountain_west_model.xml',
-              '035035':'gbt_arid_west_model.xml',
-              '035036':'gbt_mountain_west_model.xml',
-              '035037':'gbt_mountain_west_model.xml',
-              '035038':'gbt_mountain_west_model.xml',
-              '035039':'gbt_mountain_west_model.xml',
-              '035040':'gbt_mountain_west_model.xml',
-              '035041':'gbt_mountain_west_model.xml',
-              '035042':'gbt_mountain_west_model.xml',
-              '035043':'gbt_mountain_west_model.xml',
-              '036026':'gbt_mountain_west_model.xml',  # 036
-              '036027':'gbt_mountain_west_model.xml',
-              '036028':'gbt_mountain_west_model.xml',
-              '036029':'gbt_mountain_west_model.xml',
-              '036030':'gbt_mountain_west_model.xml',
-              '036031':'gbt_mountain_west_model.xml',
-              '036032':'gbt_mountain_west_model.xml',
-              '036033':'gbt_mountain_west_model.xml',
-              '036034':'gbt_mountain_west_model.xml',
-              '036035':'gbt_arid_west_model.xml',
-              '036036':'gbt_mountain_west_model.xml',
-              '036037':'gbt_mountain_west_model.xml',
-              '036038':'gbt_mountain_west_model.xml',
-              '036039':'gbt_mountain_west_model.xml',
-              '036040':'gbt_mountain_west_model.xml',
-              '036041':'gbt_mountain_west_model.xml',
-              '036042':'gbt_mountain_west_model.xml',
-              '036043':'gbt_mountain_west_model.xml',
-              '037026':'gbt_mountain_west_model.xml',  # 037
-              '037027':'gbt_mountain_west_model.xml',
-              '037028':'gbt_mountain_west_model.xml',
-              '037029':'gbt_mountain_west_model.xml',
-              '037030':'gbt_mountain_west_model.xml',
-              '037031':'gbt_mountain_west_model.xml',
-              '037032':'gbt_mountain_west_model.xml',
-              '037033':'gbt_mountain_west_model.xml',
-              '037034':'gbt_mountain_west_model.xml',
-              '037035':'gbt_mountain_west_model.xml',
-              '037036':'gbt_mountain_west_model.xml',
-              '037037':'gbt_mountain_west_model.xml',
-              '037038':'gbt_arid_west_model.xml',
-              '037039':'gbt_mountain_west_model.xml',
-              '037040':'gbt_mountain_west_model.xml',
-              '037041':'gbt_mountain_west_model.xml',
-              '037042':'gbt_mountain_west_model.xml',
-              '037043':'gbt_mountain_west_model.xml',
-              '038026':'gbt_mountain_west_model.xml',  # 038
-              '038027':'gbt_mountain_west_model.xml',
-              '038028':'gbt_mountain_west_model.xml',
-              '038029':'gbt_mountain_west_model.xml',
-              '038030':'gbt_mountain_west_model.xml',
-              '038031':'gbt_mountain_west_model.xml',
-              '038032':'gbt_mountain_west_model.xml',
-              '038033':'gbt_mountain_west_model.xml',
-              '038034':'gbt_mountain_west_model.xml',
-              '038035':'gbt_mountain_west_model.xml',
-              '038036':'gbt_mountain_west_model.xml',
-              '038037':'gbt_mountain_west_model.xml',
-              '038038':'gbt_mountain_west_model.xml',
-              '038039':'gbt_mountain_west_model.xml',
-              '038040':'gbt_mountain_west_model.xml',
-              '038041':'gbt_mountain_west_model.xml',
-              '038042':'gbt_mountain_west_model.xml',
-              '038043':'gbt_mountain_west_model.xml',
-              '039026':'gbt_mountain_west_model.xml',  # 039
-              '039027':'gbt_mountain_west_model.xml',
-              '039028':'gbt_mountain_west_model.xml',
-              '039029':'gbt_mountain_west_model.xml',
-              '039030':'gbt_mountain_west_model.xml',
-              '039031':'gbt_mountain_west_model.xml',
-              '039032':'gbt_mountain_west_model.xml',
-              '039033':'gbt_mountain_west_model.xml',
-              '039034':'gbt_arid_west_model.xml',
-              '039035':'gbt_mountain_west_model.xml',
-              '039036':'gbt_mountain_west_model.xml',
-              '039037':'gbt_mountain_west_model.xml',
-              '039038':'gbt_mountain_west_model.xml',
-              '039039':'gbt_mountain_west_model.xml',
-              '039040':'gbt_mountain_west_model.xml',
-              '039041':'gbt_mountain_west_model.xml',
-              '039042':'gbt_mountain_west_model.xml',
-              '039043':'gbt_mountain_west_model.xml',
-              '040026':'gbt_mountain_west_model.xml',  # 040
-              '040027':'gbt_mountain_west_model.xml',
-              '040028':'gbt_mountain_west_model.xml',
-              '040029':'gbt_mountain_west_model.xml',
-              '040030':'gbt_mountain_west_model.xml',
-              '040031':'gbt_mountain_west_model.xml',
-              '040032':'gbt_mountain_west_model.xml',
-              '040033':'gbt_mountain_west_model.xml',
-              '040034':'gbt_mountain_west_model.xml',
-              '040035':'gbt_mountain_west_model.xml',
-              '040036':'gbt_mountain_west_model.xml',
-              '040037':'gbt_mountain_west_model.xml',
-              '040038':'gbt_mountain_west_model.xml',
-              '040039':'gbt_mountain_west_model.xml',
-              '040040':'gbt_mountain_west_model.xml',
-              '040041':'gbt_mountain_west_model.xml',
-              '040042':'gbt_mountain_west_model.xml',
-              '040043':'gbt_mountain_west_model.xml',
-              '041026':'gbt_mountain_west_model.xml',  # 041
-              '041027':'gbt_mountain_west_model.xml',
-              '041028':'gbt_mountain_west_model.xml',
-              '041029':'gbt_mountain_west_model.xml',
-              '041030':'gbt_mountain_west_model.xml',
-              '041031':'gbt_mountain_west_model.xml',
-              '041032':'gbt_mountain_west_model.xml',
-              '041033':'gbt_mountain_west_model.xml',
-              '041034':'gbt_mountain_west_model.xml',
-              '041035':'gbt_mountain_west_model.xml',
-              '041036':'gbt_mountain_west_model.xml',
-              '041037':'gbt_mountain_west_model.xml',
-              '041038':'gbt_mountain_west_model.xml',
-              '041039':'gbt_mountain_west_model.xml',
-              '041040':'gbt_mountain_west_model.xml',
-              '041041':'gbt_mountain_west_model.xml',
-              '041042':'gbt_mountain_west_model.xml',
-              '041043':'gbt_mountain_west_model.xml',
-              '042026':'gbt_mountain_west_model.xml',  # 042
-              '042027':'gbt_mountain_west_model.xml',
-              '042028':'gbt_mountain_west_model.xml',
-              '042029':'gbt_mountain_west_model.xml',
-              '042030':'gbt_mountain_west_model.xml',
-              '042031':'gbt_mountain_west_model.xml',
-              '042032':'gbt_mountain_west_model.xml',
-              '042033':'gbt_mountain_west_model.xml',
-              '042034':'gbt_mountain_west_model.xml',
-              '042035':'gbt_mountain_west_model.xml',
-              '042036':'gbt_arid_west_model.xml',
-              '042037':'gbt_mountain_west_model.xml',
-              '042038':'gbt_mountain_west_model.xml',
-              '042039':'gbt_mountain_west_model.xml',
-              '042040':'gbt_mountain_west_model.xml',
-              '042041':'gbt_mountain_west_model.xml',
-              '042042':'gbt_mountain_west_model.xml',
-              '042043':'gbt_mountain_west_model.xml',
-              '043026':'gbt_mountain_west_model.xml',  # 043
-              '043027':'gbt_mountain_west_model.xml',
-              '043028':'gbt_mountain_west_model.xml',
-              '043029':'gbt_mountain_west_model.xml',
-              '043030':'gbt_mountain_west_model.xml',
-              '043031':'gbt_mountain_west_model.xml',
-              '043032':'gbt_mountain_west_model.xml',
-              '043033':'gbt_mountain_west_model.xml',
-              '043034':'gbt_mountain_west_model.xml',
-              '043035':'gbt_arid_west_model.xml',
-              '043036':'gbt_mountain_west_model.xml',
-              '043037':'gbt_mountain_west_model.xml',
-              '043038':'gbt_mountain_west_model.xml',
-              '043039':'gbt_mountain_west_model.xml',
-              '043040':'gbt_mountain_west_model.xml',
-              '043041':'gbt_mountain_west_model.xml',
-              '043042':'gbt_mountain_west_model.xml',
-              '043043':'gbt_mountain_west_model.xml',
-              '044026':'gbt_mountain_west_model.xml',  # 044
-              '044027':'gbt_mountain_west_model.xml',
-              '044028':'gbt_mountain_west_model.xml',
-              '044029':'gbt_mountain_west_model.xml',
-              '044030':'gbt_mountain_west_model.xml',
-              '044031':'gbt_mountain_west_model.xml',
-              '044032':'gbt_mountain_west_model.xml',
-              '044033':'gbt_arid_west_model.xml',
-              '044034':'gbt_arid_west_model.xml',
-              '044035':'gbt_mountain_west_model.xml',
-              '044036':'gbt_mountain_west_model.xml',
-              '044037':'gbt_mountain_west_model.xml',
-              '044038':'gbt_mountain_west_model.xml',
-              '044039':'gbt_mountain_west_model.xml',
-              '044040':'gbt_mountain_west_model.xml',
-              '044041':'gbt_mountain_west_model.xml',
-              '044042':'gbt_mountain_west_model.xml',
-              '044043':'gbt_mountain_west_model.xml',
-              '045026':'gbt_mountain_west_model.xml',  # 045
-              '045027':'gbt_mountain_west_model.xml',
-              '045028':'gbt_mountain_west_model.xml',
-              '045029':'gbt_mountain_west_model.xml',
-              '045030':'gbt_mountain_west_model.xml',
-              '045031':'gbt_mountain_west_model.xml',
-              '045032':'gbt_mountain_west_model.xml',
-              '045033':'gbt_mountain_west_model.xml',
-              '045034':'gbt_mountain_west_model.xml',
-              '045035':'gbt_mountain_west_model.xml',
-              '045036':'gbt_mountain_west_model.xml',
-              '045037':'gbt_mountain_west_model.xml',
-              '045038':'gbt_mountain_west_model.xml',
-              '045039':'gbt_mountain_west_model.xml',
-              '045040':'gbt_mountain_west_model.xml',
-              '045041':'gbt_mountain_west_model.xml',
-              '045042':'gbt_mountain_west_model.xml',
-              '045043':'gbt_mountain_west_model.xml',
-              '046026':'gbt_mountain_west_model.xml',  # 046
-              '046027':'gbt_mountain_west_model.xml',
-              '046028':'gbt_mountain_west_model.xml',
-              '046029':'gbt_mountain_west_model.xml',
-              '046030':'gbt_mountain_west_model.xml',
-              '046031':'gbt_mountain_west_model.xml',
-              '046032':'gbt_mountain_west_model.xml',
-              '046033':'gbt_mountain_west_model.xml',
-              '046034':'gbt_mountain_west_model.xml',
-              '046035':'gbt_mountain_west_model.xml',
-              '046036':'gbt_mountain_west_model.xml',
-              '046037':'gbt_mountain_west_model.xml',
-              '046038':'gbt_mountain_west_model.xml',
-              '046039':'gbt_mountain_west_model.xml',
-              '046040':'gbt_mountain_west_model.xml',
-              '046041':'gbt_mountain_west_model.xml',
-              '046042':'gbt_mountain_west_model.xml',
-              '046043':'gbt_mountain_west_model.xml',
-              '047026':'gbt_mountain_west_model.xml',  # 047
-              '047027':'gbt_mountain_west_model.xml',
-              '047028':'gbt_mountain_west_model.xml',
-              '047029':'gbt_mountain_west_model.xml',
-              '047030':'gbt_mountain_west_model.xml',
-              '047031':'gbt_mountain_west_model.xml',
-              '047032':'gbt_mountain_west_model.xml',
-              '047033':'gbt_mountain_west_model.xml',
-              '047034':'gbt_mountain_west_model.xml',
-              '047035':'gbt_mountain_west_model.xml',
-              '047036':'gbt_mountain_west_model.xml',
-              '047037':'gbt_mountain_west_model.xml',
-              '047038':'gbt_mountain_west_model.xml',
-              '047039':'gbt_mountain_west_model.xml',
-              '047040':'gbt_mountain_west_model.xml',
-              '047041':'gbt_mountain_west_model.xml',
-              '047042':'gbt_mountain_west_model.xml',
-              '047043':'gbt_mountain_west_model.xml',
-              '048026':'gbt_mountain_west_model.xml',  # 048
-              '048027':'gbt_mountain_west_model.xml',
-              '048028':'gbt_mountain_west_model.xml',
-              '048029':'gbt_mountain_west_model.xml',
-              '048030':'gbt_mountain_west_model.xml',
-              '048031':'gbt_mountain_west_model.xml',
-              '048032':'gbt_mountain_west_model.xml',
-              '048033':'gbt_mountain_west_model.xml',
-              '048034':'gbt_mountain_west_model.xml',
-              '048035':'gbt_mountain_west_model.xml',
-              '048036':'gbt_mountain_west_model.xml',
-              '048037':'gbt_mountain_west_model.xml',
-              '048038':'gbt_mountain_west_model.xml',
-              '048039':'gbt_mountain_west_model.xml',
-              '048040':'gbt_mountain_west_model.xml',
-              '048041':'gbt_mountain_west_model.xml',
-              '048042':'gbt_mountain_west_model.xml',
-              '048043':'gbt_mountain_west_model.xml'}
+# hash table for the path/row combinations, built from the rules of the
+# model registry.  'invalid' means no model exists for the specified path/row.
+model_hash = {}
+for (model_name, paths, rows) in MODEL_RULES:
+    for path in range (paths[0], paths[1] + 1):
+        for row in range (rows[0], rows[1] + 1):
+            model_hash.setdefault ('%03d%03d' % (path, row), model_name)
 
 
 def get_model_name(path=None, row=None):
@@ -0,0 +1,161 @@
+#! /usr/bin/env python
+import os
+
+from log_it import *
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created a registry of the boosted regression models which declares the
+#     model for each region of path/rows as rules, instead of listing every
+#     path/row, and validates the model files when the registry is opened.
+#
+# History:
+#
+# Notes:
+#   1. The rules are checked in order and the first rule covering the
+#      path/row is used, so the regional exceptions come before the default
+#      rule for the CONUS.  Path/rows not covered by a rule have no model.
+#   2. The registries are opened once per model directory in each process
+#      and inherited by the worker processes, so the model files are only
+#      checked once per run.  The resolved model file of each path/row is
+#      cached by the registry.
+#   3. The parsed models are cached by predict_burned_area, which keeps each
+#      model it has loaded in memory.  Along with the predictor kept by each
+#      worker (RegressionPredictor), each model is read from its XML file
+#      once per worker instead of once per scene.  The models are not saved
+#      in another form, since the OpenCV boosted trees can only be saved to
+#      and loaded from XML or YAML.
+############################################################################
+
+# rules for the models of the path/row regions; (model, (first path, last
+# path), (first row, last row))
+MODEL_RULES = [
+    ('gbt_east_model.xml', (15, 15), (35, 35)),
+    ('gbt_east_model.xml', (15, 15), (41, 42)),
+    ('gbt_east_model.xml', (16, 16), (31, 31)),
+    ('gbt_east_model.xml', (18, 18), (38, 38)),
+    ('gbt_east_model.xml', (24, 24), (29, 29)),
+    ('gbt_east_model.xml', (24, 24), (39, 39)),
+    ('gbt_east_model.xml', (25, 25), (40, 40)),
+    ('gbt_east_model.xml', (26, 26), (40, 42)),
+    ('gbt_gp_west_model.xml', (32, 32), (32, 32)),
+    ('gbt_gp_west_model.xml', (33, 33), (30, 30)),
+    ('gbt_arid_west_model.xml', (35, 36), (35, 35)),
+    ('gbt_arid_west_model.xml', (37, 37), (38, 38)),
+    ('gbt_arid_west_model.xml', (39, 39), (34, 34)),
+    ('gbt_arid_west_model.xml', (42, 42), (36, 36)),
+    ('gbt_arid_west_model.xml', (43, 43), (35, 35)),
+    ('gbt_arid_west_model.xml', (44, 44), (33, 34)),
+    # TODO - GAIL update the model rules.  Currently most path/rows are
+    #   pointing to the Mountain West.
+    ('gbt_mountain_west_model.xml', (10, 48), (26, 43)),
+]
+
+# registries opened in this process, by model directory
+_open_registries = {}
+
+
+def rule_model_name (path, row, rules=MODEL_RULES):
+    """Returns the name of the model for the path/row from the rules, or
+       None if no rule covers the path/row.
+    """
+
+    for (model_name, (first_path, last_path), (first_row, last_row))  \
+        in rules:
+        if first_path <= path <= last_path and first_row <= row <= last_row:
+            return model_name
+    return None
+
+
+def open_registry (model_dir, log_handler=None):
+    """Returns the ModelRegistry for the model directory.  The registry
+       already opened in this process for the directory is returned, so the
+       model files are only validated once.
+
+    Args:
+      model_dir - directory of the model XML files
+      log_handler - handler for the logging information
+    """
+
+    model_dir = os.path.abspath (model_dir)
+    if model_dir not in _open_registries:
+        _open_registries[model_dir] = ModelRegistry (model_dir,
+            log_handler=log_handler)
+    return _open_registries[model_dir]
+
+
+class ModelRegistry():
+    """Class for resolving the boosted regression model of each path/row."""
+
+    def __init__ (self, model_dir, rules=MODEL_RULES, log_handler=None):
+        """Initializes the registry and validates that the model file of
+           each rule exists.
+
+        Args:
+          model_dir - directory of the model XML files
+          rules - list of the (model, (first path, last path), (first row,
+              last row)) rules, checked in order
+          log_handler - handler for the logging information
+        """
+
+        self.model_dir = model_dir
+        self.rules = rules
+        self.log_handler = log_handler
+        self.model_files = {}
+        self.missing = []
+        self.resolved = {}
+
+        for (model_name, paths, rows) in rules:
+            if model_name in self.model_files or model_name in self.missing:
+                continue
+            model_file = '%s/%s' % (model_dir, model_name)
+            if os.path.exists (model_file):
+                self.model_files[model_name] = model_file
+            else:
+                self.missing.append (model_name)
+                msg = 'Model file does not exist for paths %d-%d, rows '  \
+                    '%d-%d: %s' % (paths[0], paths[1], rows[0], rows[1],
+                    model_file)
+                logIt (msg, self.log_handler)
+
+
+    def modelName (self, path, row):
+        """Returns the name of the model for the path/row, or None if no
+           rule covers the path/row.
+        """
+
+        return rule_model_name (path, row, self.rules)
+
+
+    def modelFile (self, path, row):
+        """Returns the model file for the path/row.
+
+        Args:
+          path - integer path value for the scene
+          row - integer row value for the scene
+
+        Returns:
+          None - no rule covers the path/row or its model file doesn't exist
+          model_file - full path of the model XML file
+        """
+
+        key = (path, row)
+        if key in self.resolved:
+            return self.resolved[key]
+
+        model_name = self.modelName (path, row)
+        model_file = None
+        if model_name is None:
+            msg = 'No model exists for path/row %d, %d' % (path, row)
+            logIt (msg, self.log_handler)
+        elif model_name in self.missing:
+            msg = 'Model file for path/row %d, %d does not exist: %s/%s' %  \
+                (path, row, self.model_dir, model_name)
+            logIt (msg, self.log_handler)
+        else:
+            model_file = self.model_files[model_name]
+
+        self.resolved[key] = model_file
+        return model_file
+
+######end of ModelRegistry class######
@@ -0,0 +1,101 @@
+#! /usr/bin/env python
+import numpy
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created the compact (uint8) encodings of the burn probability and count
+#     products, along with the helpers to convert between the compact
+#     encodings and the int16 values used by the processing.
+#
+# History:
+#
+# Notes:
+#   1. The burn probabilities (0 to 100) and the counts (burn count and good
+#      looks count) fit in a byte.  The int16 fill (-9999) and cloud/water
+#      (-9998) values are replaced by the reserved codes below, which are
+#      outside of the valid range of the products.
+#   2. The compact burn probabilities written by predict_burned_area
+#      (OUTPUT_COMPACT=1) use the same codes, defined as PBA_COMPACT_FILL
+#      and PBA_COMPACT_CLOUD_WATER in src/boosted_regression_tree/predict.h.
+#   3. The burned area product (first DOY a burn was observed) ranges up to
+#      366 so it is always int16.
+############################################################################
+
+# int16 values of the burn probabilities
+INT16_FILL = -9999
+INT16_CLOUD_WATER = -9998
+
+# reserved codes of the compact products
+COMPACT_FILL = 255
+COMPACT_CLOUD_WATER = 254
+
+# metadata data type of the compact products
+COMPACT_DATA_TYPE = 'UINT8'
+
+
+def is_compact (vals):
+    """Determines if the array holds compact (uint8) product values."""
+
+    return vals.dtype == numpy.uint8
+
+
+def encode_probability (vals, nodata=INT16_FILL, out=None):
+    """Converts int16 burn probabilities to the compact encoding.
+
+    Args:
+      vals - array of int16 burn probabilities (0-100, cloud/water, fill)
+      nodata - fill value of the int16 burn probabilities
+      out - optional uint8 output array of the same shape
+
+    Returns:
+      out - uint8 array of the compact burn probabilities
+    """
+
+    if out is None:
+        out = numpy.empty (vals.shape, dtype=numpy.uint8)
+    numpy.copyto (out, numpy.clip (vals, 0, 100), casting='unsafe')
+    out[vals == INT16_CLOUD_WATER] = COMPACT_CLOUD_WATER
+    out[vals == nodata] = COMPACT_FILL
+    return out
+
+
+def decode_probability (vals, nodata=INT16_FILL):
+    """Converts compact burn probabilities to int16.  Arrays which are not
+       compact are returned as-is.
+
+    Args:
+      vals - array of burn probabilities
+      nodata - fill value for the int16 burn probabilities
+
+    Returns:
+      int16 array of the burn probabilities
+    """
+
+    if not is_compact (vals):
+        return vals
+
+    out = vals.astype (numpy.int16)
+    out[vals == COMPACT_CLOUD_WATER] = INT16_CLOUD_WATER
+    out[vals == COMPACT_FILL] = nodata
+    return out
+
+
+def encode_count (vals, nodata=INT16_FILL, out=None):
+    """Converts int16 counts to the compact encoding.  Counts larger than
+       the largest valid compact count are clipped.
+
+    Args:
+      vals - array of int16 counts
+      nodata - fill value of the int16 counts
+      out - optional uint8 output array of the same shape
+
+    Returns:
+      out - uint8 array of the compact counts
+    """
+
+    if out is None:
+        out = numpy.empty (vals.shape, dtype=numpy.uint8)
+    numpy.copyto (out, numpy.clip (vals, 0, COMPACT_CLOUD_WATER - 1),
+        casting='unsafe')
+    out[vals == nodata] = COMPACT_FILL
+    return out
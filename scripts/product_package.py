@@ -0,0 +1,307 @@
+#! /usr/bin/env python
+import sys
+import os
+import time
+import zlib
+import glob
+import hashlib
+import tempfile
+import threading
+import zipfile
+import Queue
+
+from log_it import *
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created a class to package the annual burned area products into the zip
+#     file delivered to the user, replacing the external zip command.  The
+#     products are compressed in parallel by a pool of threads and streamed
+#     into the zip file as each one finishes, so the products of a year can
+#     be packaged as soon as that year's summaries are done.
+#
+# History:
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Moved the use of the zipfile internals to write_deflated, which is
+#       only used with the zipfile module of Python 2.7.
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Any error packaging a product is recorded, so the zip file isn't
+#       created without it.
+#
+# Notes:
+#   1. Each product is deflated to a temporary file by one of the threads;
+#      zlib and hashlib release the GIL, so the threads compress in
+#      parallel.  The compressed data is then copied into the zip file under
+#      a lock, so only the copy is serialized.
+#   2. The zip file is written to a temporary name and renamed once all of
+#      the products have been added, so a partial zip file is never left
+#      behind.
+#   3. If requested, a manifest with the SHA-256 checksum of each product is
+#      added as the last member of the zip file.  It uses the sha256sum
+#      format so it can be checked with 'sha256sum -c'.
+#   4. The zipfile module has no public interface for adding data which is
+#      already deflated, so write_deflated uses the internals of the Python
+#      2.7 zipfile module.  With any other zipfile module the products are
+#      added via ZipFile.write, which deflates them again under the lock.
+############################################################################
+
+# name of the checksum manifest within the zip file
+MANIFEST_NAME = 'MANIFEST.sha256'
+
+# size of the reads when compressing the products
+CHUNK_SIZE = 1024 * 1024
+
+# number of times a product is recompressed if it changes while it is
+# being compressed
+MAX_ATTEMPTS = 3
+
+# the deflated products are written via the zipfile internals only for the
+# version of the zipfile module they were written against
+DEFLATED_MEMBERS = (sys.version_info[0:2] == (2, 7)) and  \
+    hasattr (zipfile.ZipFile, '_writecheck') and  \
+    hasattr (zipfile.ZipInfo, 'FileHeader')
+
+
+def write_deflated (zip_file, zinfo, data):
+    """Writes a member whose data is already deflated to the zip file.
+    Description: Writes the local header and the deflated data at the end
+        of the zip file and adds the member to the central directory, which
+        is written when the zip file is closed.  This uses the internals of
+        the Python 2.7 zipfile module (_writecheck, _didModify, fp,
+        filelist, NameToInfo, and ZipInfo.FileHeader), so it is only used
+        if DEFLATED_MEMBERS is set.  The caller serializes the writes to
+        the zip file.
+
+    Args:
+      zip_file - ZipFile opened for writing
+      zinfo - ZipInfo of the member, with the CRC and sizes set
+      data - file of the deflated data, positioned at the start
+    """
+
+    zip64 = (zinfo.file_size > zipfile.ZIP64_LIMIT) or  \
+        (zinfo.compress_size > zipfile.ZIP64_LIMIT)
+    zip_file._writecheck (zinfo)
+    zip_file._didModify = True
+    zinfo.header_offset = zip_file.fp.tell()
+    zip_file.fp.write (zinfo.FileHeader (zip64))
+    while True:
+        buf = data.read (CHUNK_SIZE)
+        if not buf:
+            break
+        zip_file.fp.write (buf)
+    zip_file.filelist.append (zinfo)
+    zip_file.NameToInfo[zinfo.filename] = zinfo
+
+
+class ProductPackage():
+    """Class for handling the parallel packaging of products into a zip
+       file.
+    """
+
+    def __init__ (self, zip_file, num_threads=1, manifest=False,
+        log_handler=None):
+        """Opens the temporary zip file and starts the compression threads.
+
+        Args:
+          zip_file - name of the zip file to be created
+          num_threads - number of threads for compressing the products
+          manifest - if True then a checksum manifest is added to the zip
+          log_handler - handler for the logging information
+        """
+
+        self.zip_file = zip_file
+        self.manifest = manifest
+        self.log_handler = log_handler
+        self.temp_dir = os.path.dirname (os.path.abspath (zip_file))
+        self.temp_file = '%s.%d.tmp' % (zip_file, os.getpid())
+        self.zip = zipfile.ZipFile (self.temp_file, 'w', zipfile.ZIP_DEFLATED,
+            allowZip64=True)
+        self.lock = threading.Lock()
+        self.submitted = set()
+        self.checksums = {}
+        self.errors = []
+
+        self.work_queue = Queue.Queue()
+        self.threads = []
+        for i in range(max(num_threads, 1)):
+            thread = threading.Thread (target=self.worker)
+            thread.daemon = True
+            thread.start()
+            self.threads.append (thread)
+
+
+    def add (self, filenames):
+        """Queues products to be compressed into the zip file.  Products
+           which have already been queued are skipped.
+
+        Args:
+          filenames - list of the product files; they are stored in the zip
+              file by their base name
+        """
+
+        for filename in filenames:
+            arcname = os.path.basename (filename)
+            if arcname in self.submitted:
+                continue
+            self.submitted.add (arcname)
+            self.work_queue.put (filename)
+
+
+    def addPattern (self, patterns):
+        """Queues the products matching the glob patterns, skipping the
+           .aux.xml files generated by GDAL.
+
+        Args:
+          patterns - list of the glob patterns
+        """
+
+        for pattern in patterns:
+            filenames = [f for f in sorted(glob.glob (pattern))
+                if not f.endswith ('.aux.xml')]
+            self.add (filenames)
+
+
+    def worker (self):
+        """Compresses the products off the work queue until a None is
+           received.  A product which can't be packaged, for any reason, is
+           recorded as an error so the zip file isn't created without it.
+        """
+
+        while True:
+            filename = self.work_queue.get()
+            if filename is None:
+                break
+            try:
+                self.compress (filename)
+            except Exception, e:
+                msg = 'Error packaging %s: %s' % (filename, str(e))
+                logIt (msg, self.log_handler)
+                with self.lock:
+                    self.errors.append (filename)
+
+
+    def compress (self, filename):
+        """Deflates the product to a temporary file and then copies it into
+           the zip file.
+        Description: The CRC, sizes, and checksum are computed while the
+            product is deflated, so the local header can be written before
+            the compressed data and the zip file is written sequentially.
+            If the product is modified while it is being compressed, it is
+            compressed again.
+
+        History:
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              The deflated data is added via write_deflated, or via
+              ZipFile.write if the zipfile internals aren't available.
+
+        Args:
+          filename - name of the product file
+        """
+
+        for attempt in range(MAX_ATTEMPTS):
+            stat = os.stat (filename)
+            temp = tempfile.TemporaryFile (dir=self.temp_dir)
+            crc = 0
+            file_size = 0
+            compress_size = 0
+            sha256 = hashlib.sha256()
+            cmpr = zlib.compressobj (zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED,
+                -15)
+            fd = open (filename, 'rb')
+            while True:
+                buf = fd.read (CHUNK_SIZE)
+                if not buf:
+                    break
+                file_size += len(buf)
+                crc = zlib.crc32 (buf, crc)
+                sha256.update (buf)
+                buf = cmpr.compress (buf)
+                compress_size += len(buf)
+                temp.write (buf)
+            fd.close()
+            buf = cmpr.flush()
+            compress_size += len(buf)
+            temp.write (buf)
+
+            after = os.stat (filename)
+            if (after.st_mtime == stat.st_mtime) and  \
+               (after.st_size == file_size):
+                break
+            temp.close()
+            msg = '%s changed while being compressed; retrying' % filename
+            logIt (msg, self.log_handler)
+        else:
+            raise IOError ('%s kept changing while being compressed' %  \
+                filename)
+
+        zinfo = zipfile.ZipInfo (os.path.basename (filename),
+            time.localtime (stat.st_mtime)[0:6])
+        zinfo.external_attr = (stat.st_mode & 0xFFFF) << 16L
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+        zinfo.CRC = crc & 0xffffffff
+        zinfo.file_size = file_size
+        zinfo.compress_size = compress_size
+
+        # copy the compressed data into the zip file
+        temp.seek (0)
+        with self.lock:
+            if DEFLATED_MEMBERS:
+                write_deflated (self.zip, zinfo, temp)
+            else:
+                self.zip.write (filename, zinfo.filename)
+            self.checksums[zinfo.filename] = sha256.hexdigest()
+        temp.close()
+
+
+    def join (self):
+        """Waits for the threads to compress the queued products."""
+
+        for thread in self.threads:
+            self.work_queue.put (None)
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+
+
+    def abort (self):
+        """Waits for the threads and removes the partial zip file, leaving
+           any existing zip file in place.
+        """
+
+        self.join()
+        self.zip.close()
+        os.remove (self.temp_file)
+
+
+    def close (self):
+        """Waits for the queued products to be compressed, adds the
+           manifest, and renames the zip file.
+
+        Returns:
+            ERROR - error packaging one or more of the products; the zip
+                file is not created
+            SUCCESS - successful processing
+        """
+
+        self.join()
+
+        if len(self.errors) == 0 and self.manifest:
+            lines = ['%s  %s\n' % (self.checksums[name], name)
+                for name in sorted(self.checksums)]
+            self.zip.writestr (MANIFEST_NAME, ''.join(lines))
+        self.zip.close()
+
+        if len(self.errors) > 0:
+            msg = 'Error packaging %d products into %s' % (len(self.errors),
+                self.zip_file)
+            logIt (msg, self.log_handler)
+            os.remove (self.temp_file)
+            return ERROR
+
+        os.rename (self.temp_file, self.zip_file)
+        msg = 'Packaged %d products into %s' % (len(self.checksums),
+            self.zip_file)
+        logIt (msg, self.log_handler)
+        return SUCCESS
+
+######end of ProductPackage class######
@@ -0,0 +1,143 @@
+#! /usr/bin/env python
+import os
+
+from osgeo import gdal
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created the output format layer for the burned area products, so the
+#     products can be written as uncompressed ENVI (the default) or as tiled,
+#     compressed GeoTIFF.
+#
+# History:
+#
+# Notes:
+#   1. The GeoTIFF products are tiled (TILE_SIZE x TILE_SIZE) and use a
+#      horizontal differencing predictor, which works well with the integer
+#      products since they are mostly fill and zeros.  The files use the .tif
+#      extension.
+#   2. The inputs to predict_burned_area (the resampled bands, QA mask,
+#      seasonal summaries, and annual maximums) are read as raw binary by
+#      the C++ application, so they are always written as ENVI.
+#   3. Readers should use block_lines to read whole blocks of lines, so the
+#      tiles of a compressed product are only decompressed once.
+############################################################################
+
+# supported output formats
+FORMAT_ENVI = 'envi'
+FORMAT_GTIFF = 'gtiff'
+OUTPUT_FORMATS = [FORMAT_ENVI, FORMAT_GTIFF]
+DEFAULT_FORMAT = FORMAT_ENVI
+
+# supported GeoTIFF compression methods; ZSTD requires GDAL 2.3 or later
+COMPRESS_METHODS = ['DEFLATE', 'ZSTD', 'LZW', 'NONE']
+DEFAULT_COMPRESS = 'DEFLATE'
+
+# size of the GeoTIFF tiles
+TILE_SIZE = 256
+
+
+def raster_ext (output_format=DEFAULT_FORMAT):
+    """Returns the file extension for the output format."""
+
+    if output_format == FORMAT_GTIFF:
+        return '.tif'
+    return '.img'
+
+
+def raster_files (filename):
+    """Returns the list of files which make up a raster product.
+
+    Args:
+      filename - name of the .img (ENVI) or .tif (GeoTIFF) file
+
+    Returns:
+      list of the image file and, for ENVI, the .hdr file
+    """
+
+    if filename.endswith ('.img'):
+        return [filename, filename.replace ('.img', '.hdr')]
+    return [filename]
+
+
+def find_raster (base_name):
+    """Returns the existing raster product for the base filename.
+
+    Args:
+      base_name - name of the product without the file extension
+
+    Returns:
+      None - neither the ENVI nor the GeoTIFF product exists
+      filename - name of the existing product
+    """
+
+    for output_format in OUTPUT_FORMATS:
+        filename = base_name + raster_ext (output_format)
+        if os.path.exists (filename):
+            return filename
+    return None
+
+
+def create_raster (filename, ncol, nrow, data_type, geotrans=None, prj=None,
+    nodata=None, output_format=DEFAULT_FORMAT, compress=DEFAULT_COMPRESS):
+    """Creates a single band raster product in the output format.
+
+    Args:
+      filename - name of the output file
+      ncol - number of samples
+      nrow - number of lines
+      data_type - GDAL data type of the band
+      geotrans - geographic transform; not set if None
+      prj - projection; not set if None
+      nodata - noData value of the band; not set if None
+      output_format - FORMAT_ENVI or FORMAT_GTIFF
+      compress - compression method for FORMAT_GTIFF
+
+    Returns:
+      None - error creating the product
+      dataset - GDAL dataset of the product
+    """
+
+    if output_format == FORMAT_GTIFF:
+        driver = gdal.GetDriverByName('GTiff')
+        options = ['TILED=YES', 'BLOCKXSIZE=%d' % TILE_SIZE,
+            'BLOCKYSIZE=%d' % TILE_SIZE, 'COMPRESS=%s' % compress,
+            'BIGTIFF=IF_SAFER']
+        if compress != 'NONE':
+            options.append ('PREDICTOR=2')
+    else:
+        driver = gdal.GetDriverByName('ENVI')
+        options = []
+
+    ds = driver.Create (filename, ncol, nrow, 1, data_type, options)
+    if ds is None:
+        return None
+
+    if geotrans is not None:
+        ds.SetGeoTransform (geotrans)
+    if prj is not None:
+        ds.SetProjection (prj)
+    if nodata is not None:
+        ds.GetRasterBand(1).SetNoDataValue (nodata)
+
+    return ds
+
+
+def block_lines (bands):
+    """Returns the number of lines to read at a time so that the reads are
+       aligned with the blocks of all the bands.
+    Description: The block heights of the products (one line for ENVI and
+        TILE_SIZE for GeoTIFF) are multiples of each other, so the largest
+        block height is aligned with the blocks of every band.
+
+    Args:
+      bands - list of GDAL bands which will be read together
+
+    Returns:
+      number of lines to read at a time
+    """
+
+    nlines = 1
+    for band in bands:
+        nlines = max (nlines, band.GetBlockSize()[1])
+    return nlines
@@ -0,0 +1,382 @@
+#! /usr/bin/env python
+import os
+import json
+import time
+import socket
+import resource
+
+from log_it import *
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created a class to record the timing and resource usage of the burned area
+#     processing stages, scenes, and years as spans in a JSON-lines metrics
+#     file, and to summarize them along with the critical path of the run.
+#
+# History:
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Added events for the progress of the scene predictions, which are
+#       written as they are reported by predict_burned_area.
+#
+# Notes:
+#   1. Each span is one line of JSON, written with a single append to the
+#      metrics file when the span ends.  The worker processes inherit the
+#      metrics from the process which started them, so their spans go to the
+#      same file and name the stage they were run from as the parent.
+#   2. Wall time, CPU time (user + system, including the waited-for child
+#      processes such as predict_burned_area), and the bytes read and
+#      written (rchar/wchar of /proc/self/io) are the change over the span.
+#      The bytes read and written are not available on systems without
+#      /proc, and don't include the I/O of the child processes.
+#   3. The peak memory is the peak RSS of the process, or of the largest
+#      waited-for child process, at the end of the span.  Since the scenes
+#      and years are processed by workers, this is the peak of the worker
+#      up through that scene or year.
+#   4. The stages of a run are sequential and the scenes and years of a
+#      stage are processed in parallel, so the critical path of the run is
+#      the sequence of stages, each of which takes at least as long as its
+#      slowest scene or year.
+#   5. Events are written as they happen, i.e. the PROGRESS lines of
+#      predict_burned_area, and are identified by the event name instead of
+#      a span name.  The last predict_progress event of each scene has the
+#      time spent in I/O, assembling the samples, and evaluating the trees.
+############################################################################
+
+# name of the metrics file, written to the output directory
+METRICS_FILE = 'burned_area_metrics.jsonl'
+
+# kinds of spans
+SPAN_RUN = 'run'
+SPAN_STAGE = 'stage'
+SPAN_SCENE = 'scene'
+SPAN_YEAR = 'year'
+
+# event for the progress of the predictions of a scene
+EVENT_PREDICT_PROGRESS = 'predict_progress'
+
+# metrics opened in this process, by metrics file, so the stages run from
+# the end-to-end processing add their spans to the same run
+_open_metrics = {}
+
+
+def io_counters ():
+    """Returns the (bytes read, bytes written) by this process, or
+       (None, None) if not available.
+    """
+
+    try:
+        fd = open ('/proc/self/io', 'r')
+        counters = dict ([line.split(':') for line in fd.readlines()])
+        fd.close()
+        return (int (counters['rchar']), int (counters['wchar']))
+    except (IOError, ValueError, KeyError):
+        return (None, None)
+
+
+def peak_rss_mb ():
+    """Returns the peak RSS, in MB, of this process or its largest
+       waited-for child process.
+    """
+
+    rss = max (resource.getrusage (resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage (resource.RUSAGE_CHILDREN).ru_maxrss)
+    return rss / 1024.0
+
+
+def cpu_seconds ():
+    """Returns the user and system CPU time of this process and its
+       waited-for child processes.
+    """
+
+    usage = resource.getrusage (resource.RUSAGE_SELF)
+    child_usage = resource.getrusage (resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime +  \
+        child_usage.ru_utime + child_usage.ru_stime
+
+
+def open_metrics (metrics_file, log_handler=None):
+    """Returns the RunMetrics for the metrics file.  The metrics already
+       opened in this process for the file are returned, so spans nest
+       across the applications of an end-to-end run.
+
+    Args:
+      metrics_file - name of the JSON-lines metrics file; None disables the
+          metrics
+      log_handler - handler for the logging information
+    """
+
+    if metrics_file is None:
+        return RunMetrics (None, log_handler)
+
+    metrics_file = os.path.abspath (metrics_file)
+    if metrics_file not in _open_metrics:
+        _open_metrics[metrics_file] = RunMetrics (metrics_file, log_handler)
+    return _open_metrics[metrics_file]
+
+
+class RunMetrics():
+    """Class for handling the timing and resource metrics of a burned area
+       run.
+    """
+
+    def __init__ (self, metrics_file, log_handler=None):
+        """Initializes the metrics.
+
+        Args:
+          metrics_file - name of the JSON-lines metrics file; None disables
+              the metrics
+          log_handler - handler for the logging information
+        """
+
+        self.metrics_file = metrics_file
+        self.log_handler = log_handler
+        self.run_id = '%s-%d-%d' % (socket.gethostname(), os.getpid(),
+            int (time.time()))
+        self.open_spans = []
+
+
+    def enabled (self):
+        """Determines if the metrics are being recorded."""
+
+        return self.metrics_file is not None
+
+
+    def start (self, name, kind=SPAN_STAGE):
+        """Starts a span.  Stage and run spans become the parent of the
+           spans started after them, until they end.
+
+        Args:
+          name - name of the stage, scene, or year
+          kind - SPAN_RUN, SPAN_STAGE, SPAN_SCENE, or SPAN_YEAR
+
+        Returns:
+          dictionary for the span, passed to end()
+        """
+
+        parent = None
+        if len (self.open_spans) > 0:
+            parent = self.open_spans[-1]['path']
+
+        path = name
+        if parent is not None:
+            path = parent + '/' + name
+
+        (read_bytes, write_bytes) = io_counters()
+        span = {'name': name, 'kind': kind, 'path': path, 'parent': parent,
+            'start': time.time(), 'cpu': cpu_seconds(),
+            'read_bytes': read_bytes, 'write_bytes': write_bytes}
+        if self.enabled() and kind in [SPAN_RUN, SPAN_STAGE]:
+            self.open_spans.append (span)
+        return span
+
+
+    def end (self, span, status=SUCCESS):
+        """Ends the span and writes it to the metrics file.
+
+        Args:
+          span - dictionary returned by start()
+          status - ERROR or SUCCESS
+        """
+
+        if not self.enabled():
+            return
+        self.open_spans = [open_span for open_span in self.open_spans
+            if open_span is not span]
+
+        end_time = time.time()
+        (read_bytes, write_bytes) = io_counters()
+        if span['read_bytes'] is not None and read_bytes is not None:
+            read_bytes -= span['read_bytes']
+            write_bytes -= span['write_bytes']
+        record = {'run_id': self.run_id, 'pid': os.getpid(),
+            'span': span['name'], 'kind': span['kind'],
+            'path': span['path'], 'parent': span['parent'],
+            'start': span['start'], 'end': end_time,
+            'wall_seconds': end_time - span['start'],
+            'cpu_seconds': cpu_seconds() - span['cpu'],
+            'read_bytes': read_bytes, 'write_bytes': write_bytes,
+            'peak_rss_mb': peak_rss_mb(),
+            'status': 'success' if status == SUCCESS else 'error'}
+        self.writeRecord (record)
+
+
+    def event (self, event, name, values):
+        """Writes an event to the metrics file.
+
+        Args:
+          event - name of the event, i.e. EVENT_PREDICT_PROGRESS
+          name - name of the scene or year the event is for
+          values - dictionary of the values of the event
+        """
+
+        if not self.enabled():
+            return
+
+        parent = None
+        if len (self.open_spans) > 0:
+            parent = self.open_spans[-1]['path']
+
+        record = dict (values)
+        record.update ({'run_id': self.run_id, 'pid': os.getpid(),
+            'event': event, 'name': name, 'parent': parent,
+            'time': time.time()})
+        self.writeRecord (record)
+
+
+    def writeRecord (self, record):
+        """Appends the record to the metrics file as a line of JSON."""
+
+        # a single append of the whole line, so the lines written by the
+        # worker processes don't interleave
+        try:
+            fd = os.open (self.metrics_file,
+                os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0644)
+            os.write (fd, json.dumps (record, sort_keys=True) + '\n')
+            os.close (fd)
+        except OSError, e:
+            msg = 'Unable to write the run metrics to %s: %s' %  \
+                (self.metrics_file, str(e))
+            logIt (msg, self.log_handler)
+
+
+    def records (self):
+        """Returns the list of span and event records of this run from the
+           metrics file.
+        """
+
+        if not self.enabled() or not os.path.exists (self.metrics_file):
+            return []
+
+        records = []
+        fd = open (self.metrics_file, 'r')
+        for line in fd:
+            try:
+                record = json.loads (line)
+            except ValueError:
+                # skip the partial line of a killed run
+                continue
+            if record['run_id'] == self.run_id:
+                records.append (record)
+        fd.close()
+        return records
+
+
+    def summary (self):
+        """Summarizes the stages of this run and their critical path.
+        Description: The resource usage of a stage which was processed by
+            workers is the total of its scenes or years, since the usage of
+            the workers isn't included in the stage itself.  The critical
+            path is the sequence of the lowest-level stages, each along with
+            its slowest scene or year.
+
+        Returns:
+          list of the lines of the summary report
+        """
+
+        records = self.records()
+        events = [record for record in records if 'event' in record]
+        records = [record for record in records if 'span' in record]
+        if len (records) == 0:
+            return []
+
+        children = {}
+        for record in records:
+            children.setdefault (record['parent'], []).append (record)
+        for parent in children:
+            children[parent].sort (key=lambda record: record['start'])
+
+        def tasks (record):
+            return [child for child in children.get (record['path'], [])
+                if child['kind'] in [SPAN_SCENE, SPAN_YEAR]]
+
+        def stages (record):
+            return [child for child in children.get (record['path'], [])
+                if child['kind'] in [SPAN_RUN, SPAN_STAGE]]
+
+        def total (record, key):
+            items = tasks (record)
+            if len (items) == 0:
+                return record[key]
+            if None in [item[key] for item in items]:
+                return None
+            return sum ([item[key] for item in items])
+
+        def megabytes (nbytes):
+            if nbytes is None:
+                return '       n/a'
+            return '%10.1f' % (nbytes / (1024.0 * 1024.0))
+
+        # the critical path is the sequence of the lowest-level stages
+        def critical_path (record):
+            path = []
+            for stage in stages (record):
+                if len (stages (stage)) > 0:
+                    path.extend (critical_path (stage))
+                else:
+                    path.append (stage)
+            return path
+
+        runs = [record for record in children.get (None, [])
+            if record['kind'] == SPAN_RUN]
+        if len (runs) == 0:
+            return []
+        run = runs[-1]
+        path = critical_path (run)
+
+        lines = ['Run metrics summary (%s):' % self.metrics_file]
+        lines.append ('    %-40s %10s %10s %10s %10s %10s' % ('stage',
+            'wall (s)', 'cpu (s)', 'read (MB)', 'write (MB)', 'peak (MB)'))
+        for stage in path:
+            peak = max ([stage['peak_rss_mb']] +
+                [item['peak_rss_mb'] for item in tasks (stage)])
+            lines.append ('    %-40s %10.1f %10.1f %s %s %10.1f' %  \
+                (stage['path'], stage['wall_seconds'],
+                total (stage, 'cpu_seconds'),
+                megabytes (total (stage, 'read_bytes')),
+                megabytes (total (stage, 'write_bytes')), peak))
+
+        if len (path) == 0:
+            return lines
+
+        lines.append ('Critical path (%.1f of %.1f seconds): %s' %  \
+            (sum ([stage['wall_seconds'] for stage in path]),
+            run['wall_seconds'],
+            ' -> '.join ([stage['path'] for stage in path])))
+        for stage in path:
+            items = tasks (stage)
+            if len (items) == 0:
+                continue
+            slowest = max (items, key=lambda item: item['wall_seconds'])
+            lines.append ('    %s: slowest %s %s took %.1f of %.1f '  \
+                'seconds (%d %ss)' % (stage['path'], slowest['kind'],
+                slowest['span'], slowest['wall_seconds'],
+                stage['wall_seconds'], len (items), slowest['kind']))
+
+        longest = max (path, key=lambda stage: stage['wall_seconds'])
+        lines.append ('Longest stage: %s, %.1f%% of the run' %  \
+            (longest['path'],
+            100.0 * longest['wall_seconds'] / max (run['wall_seconds'],
+            1e-6)))
+
+        # the cost of the model is the total of the last progress of each
+        # scene
+        predict = {}
+        for record in events:
+            if record['event'] == EVENT_PREDICT_PROGRESS:
+                predict[record['name']] = record
+        if len (predict) > 0:
+            scenes = predict.values()
+            def predict_total (key):
+                return sum ([scene.get (key, 0) for scene in scenes])
+            elapsed = predict_total ('elapsed')
+            lines.append ('Model predictions: %d scenes, %d of %d pixels '  \
+                'predicted, %.0f pixels/second, %.1f s I/O, %.1f s samples, '  \
+                '%.1f s trees' % (len (scenes),
+                predict_total ('valid_pixels'), predict_total ('pixels'),
+                predict_total ('pixels') / max (elapsed, 1e-6),
+                predict_total ('io_seconds'),
+                predict_total ('feature_seconds'),
+                predict_total ('tree_seconds')))
+        return lines
+
+######end of RunMetrics class######
@@ -0,0 +1,126 @@
+#! /usr/bin/env python
+import os
+import glob
+import cProfile
+import pstats
+
+from log_it import *
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created functions to profile the burned area processing, including the
+#     multiprocessing workers, and to merge the profiles into a report of
+#     the most expensive functions.
+#
+# History:
+#
+# Notes:
+#   1. Each worker process profiles itself with cProfile and writes its
+#      profile to <label>_<pid>.prof in the profile directory when it runs
+#      out of work.  The parent process is profiled as main_<pid>.prof.
+#   2. The report merges all of the profiles in the directory, sorted by
+#      the time spent in each function itself, so the GDAL I/O, NumPy
+#      reductions, and Python loops can be told apart.  The executables run
+#      as separate programs (i.e. predict_burned_area) are not profiled.
+############################################################################
+
+# name of the profile directory, created in the output directory
+PROFILE_DIR = 'profile'
+
+# name of the merged report, written to the profile directory
+PROFILE_REPORT = 'profile_report.txt'
+
+# default number of functions in the merged report
+DEFAULT_TOP_N = 30
+
+
+def clear_profiles (profile_dir):
+    """Creates the profile directory, removing the profiles of a previous
+       run.
+    """
+
+    if not os.path.exists (profile_dir):
+        os.makedirs (profile_dir)
+    for prof_file in glob.glob (os.path.join (profile_dir, '*.prof')):
+        os.remove (prof_file)
+
+
+def start_profile (profile_dir):
+    """Starts profiling the current process.
+
+    Args:
+      profile_dir - directory of the profiles; None disables the profiling
+
+    Returns:
+      the profiler, or None if not profiling
+    """
+
+    if profile_dir is None:
+        return None
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def end_profile (profiler, profile_dir, label):
+    """Stops profiling the current process and writes its profile.
+
+    Args:
+      profiler - profiler returned by start_profile; nothing is done if None
+      profile_dir - directory of the profiles
+      label - name of the stage or worker, used in the profile filename
+    """
+
+    if profiler is None:
+        return
+
+    profiler.disable()
+    profiler.dump_stats (os.path.join (profile_dir,
+        '%s_%d.prof' % (label, os.getpid())))
+
+
+def profile_report (profile_dir, top_n=DEFAULT_TOP_N, log_handler=None):
+    """Merges the profiles in the directory and writes the report of the
+       top functions.
+
+    Args:
+      profile_dir - directory of the profiles
+      top_n - number of functions in the report
+      log_handler - handler for the logging information
+
+    Returns:
+      ERROR - no profiles were found or they could not be merged
+      SUCCESS - successful processing
+    """
+
+    prof_files = sorted (glob.glob (os.path.join (profile_dir, '*.prof')))
+    if len (prof_files) == 0:
+        msg = 'No profiles were found in ' + profile_dir
+        logIt (msg, log_handler)
+        return ERROR
+
+    report_file = os.path.join (profile_dir, PROFILE_REPORT)
+    fd = open (report_file, 'w')
+    try:
+        stats = pstats.Stats (prof_files[0], stream=fd)
+        for prof_file in prof_files[1:]:
+            stats.add (prof_file)
+    except (IOError, EOFError, ValueError, TypeError), e:
+        fd.close()
+        msg = 'Error merging the profiles in %s: %s' % (profile_dir, str(e))
+        logIt (msg, log_handler)
+        return ERROR
+
+    fd.write ('Merged profile of %d processes:\n' % len (prof_files))
+    for prof_file in prof_files:
+        fd.write ('    %s\n' % os.path.basename (prof_file))
+    stats.strip_dirs()
+    stats.sort_stats ('tottime').print_stats (top_n)
+    stats.sort_stats ('cumulative').print_stats (top_n)
+    fd.close()
+
+    msg = 'Merged profile of %d processes written to %s' %  \
+        (len (prof_files), report_file)
+    logIt (msg, log_handler)
+    return SUCCESS
@@ -9,6 +9,7 @@ import os
 import time
 import shutil
 from log_it import *
+from qa_mask import *
 
 
 #############################################################################
@@ -23,6 +24,9 @@ from log_it import *
 #       used
 #   Updated on 7/8/2015 by Gail Schmidt, USGS/EROS LSRD Project
 #       Thermal band is not used in burned area processing.
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       The single QA band is now the one-byte bit-packed QA mask from
+#       qa_mask.
 #
 ############################################################################
 class XML_Scene:
@@ -580,6 +584,8 @@ class XML_Scene:
           Updated on 12/8/2013 by Gail Schmidt, USGS/EROS LSRD Project
               Modified to back out the fmask band and return to the LEDAPS
               QA bands.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Modified to return the bit-packed QA mask for band_qa.
         
         Args:
           band - string representing which band to read (band1, band2, band3,
@@ -626,32 +632,28 @@ class XML_Scene:
             shadow_QA = self.band_shadow_QA.ReadAsArray()
             cloud_QA = self.band_cloud_QA.ReadAsArray()
         
-            # combine all the QA bands to one output with negative values to
-            # indicate the various types of QA values, with -9999 representing
-            # the noData value
-            QA = zeros (shape(fill_QA), dtype=int16)
-            QA[land_water_QA > 0] = -3
-            QA[snow_QA > 0] = -4
-            QA[shadow_QA > 0] = -5
-            QA[adjacent_cloud_QA > 0] = -6
-            QA[cloud_QA > 0] = -7
-            QA[fill_QA > 0] = -9999  # fill
-            return QA
+            # pack all the QA bands into the one-byte QA mask, with a bit
+            # for each type of QA value (see qa_mask for the bit layout)
+            return pack_qa (fill_QA, cloud_QA, shadow_QA, snow_QA,
+                land_water_QA, adjacent_cloud_QA)
 
 
     def createQaBand(self, log_handler=None):
         """Creates a single QA band from the multiple QA bands in the surface
            reflectance file.
         Description: createQaBand will create a single QA band using the various
-            QA bands from the surface reflectance product.  This will be an
-            INT16 product and the noData value will be set to -9999.  The
-            name of the band will be {xml_base_name}_mask.img.
+            QA bands from the surface reflectance product.  This will be a
+            BYTE product with the bit layout documented in qa_mask and the
+            noData value will be set to QA_NODATA.  The name of the band will
+            be {xml_base_name}_mask.img.
         
         History:
           Created in 2013 by Jodi Riegle and Todd Hawbaker, USGS Rocky Mountain
               Geographic Science Center
           Updated on 3/18/2014 by Gail Schmidt, USGS/EROS LSRD Project
               Modified to work with the ESPA internal file format.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Modified to write the bit-packed QA mask vs. the INT16 QA codes.
         
         Inputs:
           log_handler - open log file for logging or None for stdout
@@ -663,21 +665,21 @@ class XML_Scene:
         qa_file = self.xml_file.replace ('.xml', '_mask.img')
         self.band_dict['band_qa'] = qa_file
 
-        # create an output file with a single int16 band and get a pointer
+        # create an output file with a single byte band and get a pointer
         # to this band
         driver = gdal.GetDriverByName('ENVI')
         output_ds = driver.Create (qa_file, self.NCol, self.NRow, 1,  \
-            gdal.GDT_Int16)
+            gdal.GDT_Byte)
         output_ds.SetGeoTransform (self.dataset1.GetGeoTransform())
 ###        output_ds.SetProjection (self.dataset1.GetProjection())
         output_band_QA = output_ds.GetRasterBand(1)
 
-        # initialize the noData value to -9999
-        output_band_QA.SetNoDataValue(-9999)
+        # initialize the noData value to the fill value of the QA mask
+        output_band_QA.SetNoDataValue(QA_NODATA)
 
         # read each surface reflectance QA band, then generate the overall QA
-        # band, which is a combination of all the QA values (negative values
-        # flag any non-clear pixels and -9999 represents the fill pixels).
+        # band, which is a combination of all the QA values (non-zero values
+        # flag any non-clear pixels and QA_FILL represents the fill pixels).
         vals = self.getBandValues ('band_qa', log_handler)
         output_band_QA.WriteArray(vals, 0, 0)
 
@@ -689,10 +691,21 @@ class XML_Scene:
 
         # the GDAL SetGeoTransform and SetProjection don't play completely
         # well with our ENVI header.  just copy the ENVI head for band1 to
-        # the ENVI header for the mask band.
+        # the ENVI header for the mask band, with the data type and noData
+        # value of the byte QA mask.
         qa_hdr = qa_file.replace ('.img', '.hdr')
         band_hdr = qa_file.replace ('_mask.img', '_sr_band1.hdr')
-        shutil.copyfile (band_hdr, qa_hdr)
+        fd_in = open (band_hdr, 'r')
+        fd_out = open (qa_hdr, 'w')
+        for line in fd_in:
+            key = line.split('=')[0].strip().lower()
+            if key == 'data type':
+                line = 'data type = 1\n'
+            elif key == 'data ignore value':
+                line = 'data ignore value = %d\n' % QA_NODATA
+            fd_out.write (line)
+        fd_out.close()
+        fd_in.close()
 
         return
 #####end of XML_Scene class#####
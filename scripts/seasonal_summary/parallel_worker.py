@@ -1,7 +1,12 @@
 #! /usr/bin/env python
 import multiprocessing, Queue
+import os
 import time
 from log_it import *
+from run_metrics import *
+from run_profile import *
+from task_scheduler import *
+from task_journal import *
 
 #if temporalBAStack is already imported from a higher level script, then
 #this import is not needed
@@ -23,6 +28,8 @@ class parallelSceneWorker(multiprocessing.Process):
  
 
     def run(self):
+        # profile the worker, if specified
+        profiler = start_profile (self.stackObject.profile_dir)
         while not self.kill_received:
             # get a task
             try:
@@ -33,15 +40,28 @@ class parallelSceneWorker(multiprocessing.Process):
             # process the scene
             msg = 'Processing %s ...' % xml_file
             logIt (msg, self.stackObject.log_handler)
-            status = SUCCESS
-            status = self.stackObject.sceneResample (xml_file)
-            if status != SUCCESS:
+            self.stackObject.budget.acquire (xml_file)
+            try:
+                task_started (self.result_queue, xml_file)
+                span = self.stackObject.metrics.start (
+                    os.path.basename (xml_file), SPAN_SCENE)
+                status = self.stackObject.sceneResample (xml_file)
+                self.stackObject.metrics.end (span, status)
+                msg = 'Error resampling the surface reflectance bands in ' \
+                    'the XML file (%s).' % xml_file
+            except Exception, e:
+                status = ERROR
                 msg = 'Error resampling the surface reflectance bands in ' \
-                    'the XML file (%s). Processing will terminate.' % xml_file
+                    'the XML file (%s): %s' % (xml_file, str(e))
+            finally:
+                self.stackObject.budget.release (xml_file)
+            if status != SUCCESS:
                 logIt (msg, self.stackObject.log_handler)
  
-            # store the result
-            self.result_queue.put(status)
+            # store the result along with the scene
+            self.result_queue.put((xml_file, status))
+
+        end_profile (profiler, self.stackObject.profile_dir, 'resample')
 
 
 class parallelSummaryWorker(multiprocessing.Process):
@@ -60,6 +80,8 @@ class parallelSummaryWorker(multiprocessing.Process):
  
 
     def run(self):
+        # profile the worker, if specified
+        profiler = start_profile (self.stackObject.profile_dir)
         while not self.kill_received:
             # get a task
             try:
@@ -72,16 +94,30 @@ class parallelSummaryWorker(multiprocessing.Process):
             season = year_season[1]
             msg = 'Processing year %d, season %s ...' % (year, season)
             logIt (msg, self.stackObject.log_handler)
-            status = SUCCESS
-            status = self.stackObject.generateYearSeasonalSummaries (year,
-                season)
-            if status != SUCCESS:
+            self.stackObject.budget.acquire ((year, season))
+            try:
+                task_started (self.result_queue, (year, season))
+                span = self.stackObject.metrics.start (
+                    '%d %s' % (year, season), SPAN_YEAR)
+                status = self.stackObject.generateYearSeasonalSummaries (year,
+                    season)
+                self.stackObject.metrics.end (span, status)
+                msg = 'Error processing seasonal summaries for year %d, ' \
+                    'season %s.' % (year, season)
+            except Exception, e:
+                status = ERROR
                 msg = 'Error processing seasonal summaries for year %d, ' \
-                    'season %s. Processing will terminate.' % (year, season)
+                    'season %s: %s' % (year, season, str(e))
+            finally:
+                self.stackObject.budget.release ((year, season))
+            if status != SUCCESS:
                 logIt (msg, self.stackObject.log_handler)
  
-            # store the result
-            self.result_queue.put(status)
+            # store the result along with the year and season
+            self.result_queue.put(((year, season), status))
+
+        end_profile (profiler, self.stackObject.profile_dir,
+            'seasonal_summaries')
 
 
 class parallelMaxWorker(multiprocessing.Process):
@@ -100,6 +136,8 @@ class parallelMaxWorker(multiprocessing.Process):
  
 
     def run(self):
+        # profile the worker, if specified
+        profiler = start_profile (self.stackObject.profile_dir)
         while not self.kill_received:
             # get a task
             try:
@@ -110,13 +148,24 @@ class parallelMaxWorker(multiprocessing.Process):
             # process the scene
             msg = 'Processing year %d ...' % year
             logIt (msg, self.stackObject.log_handler)
-            status = SUCCESS
-            status = self.stackObject.generateYearMaximums (year)
+            self.stackObject.budget.acquire (year)
+            try:
+                task_started (self.result_queue, year)
+                span = self.stackObject.metrics.start (str (year), SPAN_YEAR)
+                status = self.stackObject.generateYearMaximums (year)
+                self.stackObject.metrics.end (span, status)
+                msg = 'Error processing maximums for year %d.' % year
+            except Exception, e:
+                status = ERROR
+                msg = 'Error processing maximums for year %d: %s' %  \
+                    (year, str(e))
+            finally:
+                self.stackObject.budget.release (year)
             if status != SUCCESS:
-                msg = 'Error processing maximums for year %d. Processing '  \
-                    'will terminate.' % year
                 logIt (msg, self.stackObject.log_handler)
  
-            # store the result
-            self.result_queue.put(status)
+            # store the result along with the year
+            self.result_queue.put((year, status))
+
+        end_profile (profiler, self.stackObject.profile_dir, 'annual_maximums')
 
@@ -21,9 +21,24 @@ from spectral_indices import *
 from spectral_index_from_espa import *
 from log_it import *
 from parallel_worker import *
+from stack_manifest import *
+from stack_table import *
+from stage_cache import *
+from run_metrics import *
+from run_profile import *
+from task_scheduler import *
+from scene_resample import *
+from qa_mask import *
+from task_journal import *
 
 NUM_SR_BANDS = 13
 
+# names of the list of XML files, the stack file, and the maximum extents
+# file, written to the input directory
+LIST_FILE = 'input_list.txt'
+STACK_FILE = 'input_stack.csv'
+BOUNDING_BOX_FILE = 'bounding_box_coordinates.csv'
+
 #############################################################################
 # Created on April 29, 2013 by Gail Schmidt, USGS/EROS
 # Created class to hold the methods which process various aspects of the
@@ -40,6 +55,30 @@ NUM_SR_BANDS = 13
 # Updated on Feb. 18, 2015 by Gail Schmidt, USGS/EROS
 # Modified to also exclude high RMSE and high cloud cover scenes in addition
 #   to the current L1G exclusion.
+# Updated on Oct. 18, 2026 by USGS/EROS LSRD Project
+# Added an incremental mode which only reprocesses the scenes and years
+#   affected by new or changed scenes in the stack.
+# Added an optional stage cache for the resampled bands, spectral indices,
+#   seasonal summaries, and annual maximums.
+# Resample each scene, create the QA mask, and compute the spectral indices
+#   in a single in-memory pass.  The gdal_merge.py processing is still
+#   available via --gdal_merge.
+# The QA mask is the one-byte bit-packed mask from qa_mask vs. int16 QA
+#   codes.
+# Added optional run metrics of the stages, scenes, and years.
+# Added optional profiling of the main process and the workers.
+# Added a memory budget which admits the scenes and years of the workers
+#   based on their estimated memory.
+# Split out the generation of the stack, the setup of the output
+#   directories, and the cleanup of the index files, so the stages can also
+#   be run a task at a time by do_distributed_burned_area.
+# Read and write the blocks of each resampled scene on a pool of I/O threads,
+#   so the I/O overlaps the computation of the QA mask and indices.
+# Record the scenes, seasons, and years of the stages in the task journal,
+#   if one was passed, so a retry only reruns the tasks which haven't
+#   completed.  A worker which dies fails its tasks vs. hanging the stage.
+# Incremental mode also reprocesses the scenes and years whose outputs were
+#   deleted or modified since the last run.
 #
 # Usage: process_temporal_stack.py --help prints the help message
 ############################################################################
@@ -58,9 +97,19 @@ class temporalBAStack():
     mask_dir = "None"         # QA mask data directory
     spatial_extent = None     # dictionary for spatial extent corners
     delete_src = None         # should original scenes be deleted
+    incremental = None        # only reprocess new or changed scenes
+    cache = None              # stage cache for the intermediate products
+    metrics = RunMetrics (None)   # run metrics; disabled by default
+    profile_dir = None        # directory of the worker profiles, if profiling
+    budget = MemoryBudget (None)  # memory budget of the workers; no gating
+    memory_limit = None       # memory limit of the workers in GB, if any
+    gdal_merge = None         # resample via gdal_merge.py vs. in-memory
+    io_threads = DEFAULT_IO_THREADS   # I/O threads of each resampled scene
+    journal = None            # TaskJournal of the completed tasks, if any
     log_handler = None        # file handler for the log file
     num_processors = 1        # default is no parallel processing
-    csv_data = None           # CSV data for the stack
+    stack = None              # StackTable of the scenes in the stack
+    seasons = None            # season definitions; None for the defaults
     nrow = 0                  # number of rows in stack for seasonal summaries
     ncol = 0                  # number of cols in stack for seasonal summaries
     geotrans = None           # geographic trans for seasonal summaries
@@ -451,7 +500,8 @@ class temporalBAStack():
         return return_dict
 
 
-    def resampleStack(self, bounding_extents_file, stack_file):
+    def resampleStack(self, bounding_extents_file, stack_file,
+        scene_list=None):
         """Resamples the ENVI surface reflectance bands in the temporal stack
            using the specified geographic extents.
         Description: resampleStack will resample the surface reflectance
@@ -468,13 +518,24 @@ class temporalBAStack():
               Modified to use the ESPA raw binary internal file format.
           Updated on 7/8/2015 by Gail Schmidt, USGS/EROS LSRD Project
               Thermal band is not used in burned area processing.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Added scene_list to only resample a subset of the stack.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Modified to accept the StackTable of the stack.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Moved the setup of the output directories to setupDirectories.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Each scene is recorded in the task journal, if there is one,
+              and the scenes which already completed are skipped.
         
         Args:
           bounding_extents_file - name of file which contains the bounding
               extents
-          stack_file - name of stack file; list of the XML products to be
-              processed in addition to the date, path/row, sensor, bounding
-              coords, pixel size, and UTM zone
+          stack_file - StackTable or name of stack file; list of the XML
+              products to be processed in addition to the date, path/row,
+              sensor, bounding coords, pixel size, and UTM zone
+          scene_list - list of XML files to be resampled; if None then all
+              the scenes in the stack file are resampled
         
         Returns:
             ERROR - error resampling all the surface reflectance bands
@@ -487,11 +548,96 @@ class temporalBAStack():
             # error message already written
             return ERROR
 
-        # open the stack file and read the header of the stack file
-        stack = csv.reader (open (stack_file, 'r'))
-        header_row = stack.next()
-        for elem in range (0, len(header_row)):
-            header_row[elem] = header_row[elem].strip()
+        # read the stack, if it isn't already a StackTable
+        stack = read_stack_table (stack_file, self.log_handler, self.seasons)
+        if stack is None:
+            # error message already written
+            return ERROR
+
+        # define and create the output directories for the resampled and
+        # converted files
+        self.setupDirectories()
+
+        # load up the work queue for processing scenes in parallel, along
+        # with the estimated memory to resample each scene.  the scenes which
+        # completed in a previous run are skipped.
+        self.budget = memory_budget (self.memory_limit, self.log_handler)
+        work_queue = multiprocessing.Queue()
+        tasks = {}
+        num_scenes = 0
+        for (i, xml_file) in enumerate (stack['file']):
+            if (scene_list is not None) and (xml_file not in scene_list):
+                continue
+            num_scenes += 1
+            task = 'resample/' + os.path.basename (xml_file)
+            if (self.journal is not None) and self.journal.isDone (task):
+                continue
+            self.budget.estimate (xml_file,
+                resample_memory_mb (stack['ncol'][i]))
+            work_queue.put(xml_file)
+            tasks[xml_file] = task
+
+        # nothing to do if none of the scenes in the list need to be
+        # resampled
+        if (scene_list is not None) and (num_scenes == 0):
+            msg = 'No new or changed scenes need to be resampled.'
+            logIt (msg, self.log_handler)
+            return SUCCESS
+
+        # make sure we have scenes to be processed
+        if num_scenes == 0:
+            msg = 'Error resampling bands stack file.  No bands were '  \
+                'specified in the stack'
+            logIt (msg, self.log_handler)
+            return ERROR
+
+        # nothing to do if all the scenes completed in a previous run
+        if len (tasks) == 0:
+            msg = 'All %d scenes were resampled in a previous run.' %  \
+                num_scenes
+            logIt (msg, self.log_handler)
+            return SUCCESS
+
+        # create a queue to pass to workers to store the processing status
+        result_queue = multiprocessing.Queue()
+ 
+        # spawn workers to process each scene in the stack - resample each
+        # band, create histograms and pyramids, and calculate the spectral
+        # indices
+        msg = 'Spawning %d scenes for resampling via %d '  \
+            'processors with %d I/O threads each, %s ....' % (len (tasks),
+            self.num_processors, self.io_threads, self.budget.describe())
+        logIt (msg, self.log_handler)
+        workers = []
+        for i in range(min (self.num_processors, len (tasks))):
+            worker = parallelSceneWorker(work_queue, result_queue, self)
+            worker.start()
+            workers.append (worker)
+ 
+        # collect the results off the queue, recording each scene in the
+        # task journal
+        failed = collect_results (result_queue, tasks, workers, self.journal,
+            budget=self.budget, log_handler=self.log_handler)
+        if len (failed) > 0:
+            msg = 'Error resampling bands in %d XML files: %s' %  \
+                (len (failed), ', '.join (failed))
+            logIt (msg, self.log_handler)
+            return ERROR
+
+        return SUCCESS
+
+
+    def setupDirectories(self):
+        """Sets up the output directories for the resampled bands, spectral
+           indices, and QA mask of the stack.
+        Description: setupDirectories defines the output directories in the
+            input directory, and creates them if they don't exist.
+
+        History:
+          Created on 10/18/2026 by USGS/EROS LSRD Project
+              Pulled from resampleStack so the directories are also set up
+              when the stages are run a task at a time.
+        """
 
         # define the output directory for each of the resampled and
         # converted files
@@ -527,48 +673,6 @@ class temporalBAStack():
             logIt (msg, self.log_handler)
             os.makedirs (self.mask_dir)
 
-        # load up the work queue for processing scenes in parallel
-        work_queue = multiprocessing.Queue()
-        num_scenes = 0
-        for scene in enumerate (stack):
-            xml_file = scene[1][header_row.index('file')]
-            work_queue.put(xml_file)
-            num_scenes += 1
-
-        # make sure we have scenes to be processed
-        if num_scenes == 0:
-            msg = 'Error resampling bands stack file.  No bands were '  \
-                'specified in ' + stack_file
-            logIt (msg, self.log_handler)
-            return ERROR
-
-        # create a queue to pass to workers to store the processing status
-        result_queue = multiprocessing.Queue()
- 
-        # spawn workers to process each scene in the stack - resample each
-        # band, create histograms and pyramids, and calculate the spectral
-        # indices
-        msg = 'Spawning %d scenes for resampling via %d '  \
-            'processors ....' % (num_scenes, self.num_processors)
-        logIt (msg, self.log_handler)
-        for i in range(self.num_processors):
-            worker = parallelSceneWorker(work_queue, result_queue, self)
-            worker.start()
- 
-        # collect the results off the queue
-        for i in range(num_scenes):
-            status = result_queue.get()
-            if status != SUCCESS:
-                msg = 'Error resampling bands in XML file (file %d in the ' \
-                    'stack).' % i
-                logIt (msg, self.log_handler)
-                return ERROR
-
-        # close the stack file
-        stack = None
-
-        return SUCCESS
-
 
     def sceneResample(self, xml_file):
         """Resamples the surface reflectance bands in the XML file to the
@@ -589,6 +693,17 @@ class temporalBAStack():
               Modified to use the ESPA internal raw binary format
           Updated on 7/9/2015 by Gail Schmidt, USGS/EROS LSRD Project
               Modified to clean up the original scenes if delete_src is true
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Modified to restore the outputs from the stage cache, if one
+              was specified and the scene has already been processed for the
+              current extents.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Modified to resample the bands, create the QA band, and compute
+              the spectral indices in a single in-memory pass.  The previous
+              gdal_merge.py processing was moved to sceneResampleGdalMerge.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              The blocks of the scene are read and written by io_threads
+              I/O threads.
         
         Args:
           xml_file - name of XML file to process
@@ -599,15 +714,112 @@ class temporalBAStack():
             SUCCESS - successful processing
         """
    
+        # restore the outputs from the stage cache if this scene has already
+        # been processed for the current extents.  the key is based on the
+        # XML file since the source bands may have been deleted.
+        startTime0 = time.time()
+        if self.cache is not None:
+            outputs = self.sceneOutputs (xml_file)
+            cache_key = self.cache.key ('resample', [xml_file],
+                sorted (self.spatial_extent.items()) + [QA_MASK_FORMAT])
+            if self.cache.restore (cache_key, outputs):
+                if self.delete_src:
+                    self.deleteSceneSource (xml_file)
+                return SUCCESS
+            self.cache.prepare (outputs)
+
         # parse the XML file looking for the surface reflectance bands 1-7
         # and the QA bands.  open each band and store the GDAL band connection.
-        startTime0 = time.time()
         xmlAttr = XML_Scene (xml_file)
         if xmlAttr is None:
             msg = 'Error reading the XML and setting up the bands: ' + xml_file
             logIt (msg, self.log_handler)
             return ERROR
 
+        # output filenames for the spectral indices
+        idx_dict = {}
+        idx_dict['ndvi'] = self.ndvi_dir +  \
+            os.path.basename (xml_file.replace ('.xml', '_ndvi.img'))
+        idx_dict['ndmi'] = self.ndmi_dir +  \
+            os.path.basename (xml_file.replace ('.xml', '_ndmi.img'))
+        idx_dict['nbr'] = self.nbr_dir +  \
+            os.path.basename (xml_file.replace ('.xml', '_nbr.img'))
+        idx_dict['nbr2'] = self.nbr2_dir +  \
+            os.path.basename (xml_file.replace ('.xml', '_nbr2.img'))
+
+        if self.gdal_merge:
+            status = self.sceneResampleGdalMerge (xml_file, xmlAttr,
+                idx_dict)
+        else:
+            # resample the bands, create the single QA band, and calculate
+            # the spectral indices in one pass; the QA file goes in the mask
+            # directory
+            resamp_band_dict = {}
+            for i in ['band1', 'band2', 'band3', 'band4', 'band5', 'band7']:
+                resamp_band_dict[i] = self.refl_dir + \
+                    os.path.basename (xmlAttr.band_dict[i])
+            resamp_band_dict['band_qa'] = self.mask_dir + \
+                os.path.basename (xml_file.replace ('.xml', '_mask.img'))
+            msg = '   Resampling to max bounds and calculating spectral ' \
+                'indices...'
+            logIt (msg, self.log_handler)
+            status = resample_scene (xmlAttr, self.spatial_extent,
+                resamp_band_dict, idx_dict, self.log_handler,
+                io_threads=self.io_threads)
+
+            # if specified then remove the original scene data after
+            # succesfully resampling the needed bands.  leave the MTL and XML
+            # file for downstream processing.
+            if (status == SUCCESS) and self.delete_src:
+                xmlAttr = None
+                self.deleteSceneSource (xml_file)
+
+        if status != SUCCESS:
+            msg = 'Error resampling and creating the spectral indices for ' \
+                + xml_file
+            logIt (msg, self.log_handler)
+            return ERROR
+
+        # clean up the classes and dictionaries
+        del (idx_dict)
+        xmlAttr = None
+
+        # save the outputs in the stage cache
+        if self.cache is not None:
+            self.cache.store (cache_key, outputs)
+
+        endTime0 = time.time()
+        msg = '***Total scene processing time = %f seconds' %  \
+            (endTime0 - startTime0)
+        logIt (msg, self.log_handler)
+        return SUCCESS
+
+
+    def sceneResampleGdalMerge(self, xml_file, xmlAttr, idx_dict):
+        """Resamples the scene to the maximum extents via gdal_merge.py and
+           then computes the spectral indices from the resampled files.
+        Description: sceneResampleGdalMerge writes the single QA band next
+            to the source scene, resamples the surface reflectance bands and
+            QA band to the bounding extents with gdal_merge.py, and then
+            reads the resampled files back to compute the spectral indices.
+            This is the original sceneResample processing, which is kept for
+            comparison with the in-memory processing.
+
+        History:
+          Created on 10/18/2026 by USGS/EROS LSRD Project
+              Pulled from sceneResample.
+
+        Args:
+          xml_file - name of XML file to process
+          xmlAttr - XML_Scene object for the XML file
+          idx_dict - dictionary of the spectral index output filenames
+
+        Returns:
+            ERROR - error resampling each band or determining the spectral
+                indices
+            SUCCESS - successful processing
+        """
+
         # create a single QA band from the surface reflectance QA bands
         xmlAttr.createQaBand (self.log_handler)
 
@@ -626,8 +838,13 @@ class temporalBAStack():
             msg = '   Resizing file (%s) to max bounds (%s)' %  \
                 (xmlAttr.band_dict[i], resamp_band_dict[i])
             logIt (msg, self.log_handler)
-            cmd = 'gdal_merge.py -o %s -init -9999 -n -9999 -a_nodata -9999 ' \
+            if i == 'band_qa':
+                nodata = QA_NODATA
+            else:
+                nodata = -9999
+            cmd = 'gdal_merge.py -o %s -init %d -n %d -a_nodata %d ' \
                 '-ul_lr %d %d %d %d -of ENVI %s' % (resamp_band_dict[i],  \
+                nodata, nodata, nodata,  \
                 self.spatial_extent['West'], self.spatial_extent['North'],  \
                 self.spatial_extent['East'], self.spatial_extent['South'],  \
                 xmlAttr.band_dict[i])
@@ -639,29 +856,7 @@ class temporalBAStack():
         # resampling the needed bands.  leave the MTL and XML file for
         # downstream processing.
         if self.delete_src:
-            # delete the original SR bands
-            globnames = os.path.basename (xml_file.replace ('.xml', '*_sr_*'))
-            filelist = glob.glob (globnames)
-            for myfile in filelist:
-                os.remove(myfile)
-
-            # delete the original cfmask bands and the generated QA mask
-            globnames = os.path.basename (xml_file.replace ('.xml', '*_*mask*'))
-            filelist = glob.glob (globnames)
-            for myfile in filelist:
-                os.remove(myfile)
-
-            # delete the original VER products
-            globnames = os.path.basename (xml_file.replace ('.xml', '*_VER*'))
-            filelist = glob.glob (globnames)
-            for myfile in filelist:
-                os.remove(myfile)
-
-            # delete the original GCP products
-            globnames = os.path.basename (xml_file.replace ('.xml', '*_GCP*'))
-            filelist = glob.glob (globnames)
-            for myfile in filelist:
-                os.remove(myfile)
+            self.deleteSceneSource (xml_file)
 
         # calculate ndvi, ndmi, nbr, nbr2 from the resampled files
         msg = '   Calculating spectral indices...'
@@ -672,50 +867,178 @@ class temporalBAStack():
             logIt (msg, self.log_handler)
             return ERROR
 
-        idx_dict = {}
-        idx_dict['ndvi'] = self.ndvi_dir +  \
-            os.path.basename (xml_file.replace ('.xml', '_ndvi.img'))
-        idx_dict['ndmi'] = self.ndmi_dir +  \
-            os.path.basename (xml_file.replace ('.xml', '_ndmi.img'))
-        idx_dict['nbr'] = self.nbr_dir +  \
-            os.path.basename (xml_file.replace ('.xml', '_nbr.img'))
-        idx_dict['nbr2'] = self.nbr2_dir +  \
-            os.path.basename (xml_file.replace ('.xml', '_nbr2.img'))
         status = specIndx.createSpectralIndices (idx_dict, self.log_handler)
         if status != SUCCESS:
             msg = 'Error creating the spectral indices for ' + xml_file
             logIt (msg, self.log_handler)
             return ERROR
 
-        # clean up the classes and dictionaries
-        del (idx_dict)
-        xmlAttr = None
         specIndx = None
-
-        endTime0 = time.time()
-        msg = '***Total scene processing time = %f seconds' %  \
-            (endTime0 - startTime0)
-        logIt (msg, self.log_handler)
         return SUCCESS
 
 
-    def generateSeasonalSummaries (self, stack_file):
+    def sceneOutputs(self, xml_file):
+        """Returns the list of output files created by sceneResample.
+        Description: sceneOutputs determines the resampled reflectance bands,
+            the resampled QA mask, and the spectral indices (along with the
+            ENVI headers) which are generated for the XML file.
+
+        History:
+          Created on 10/18/2026 by USGS/EROS LSRD Project
+
+        Args:
+          xml_file - name of XML file to process
+
+        Returns:
+            outputs - list of output files
+        """
+
+        base_name = os.path.basename (xml_file)
+        outputs = []
+        for band in ['band1', 'band2', 'band3', 'band4', 'band5', 'band7']:
+            outputs += envi_files (self.refl_dir +  \
+                base_name.replace ('.xml', '_sr_%s.img' % band))
+        outputs += envi_files (self.mask_dir +  \
+            base_name.replace ('.xml', '_mask.img'))
+        outputs += envi_files (self.ndvi_dir +  \
+            base_name.replace ('.xml', '_ndvi.img'))
+        outputs += envi_files (self.ndmi_dir +  \
+            base_name.replace ('.xml', '_ndmi.img'))
+        outputs += envi_files (self.nbr_dir +  \
+            base_name.replace ('.xml', '_nbr.img'))
+        outputs += envi_files (self.nbr2_dir +  \
+            base_name.replace ('.xml', '_nbr2.img'))
+
+        return outputs
+
+
+    def seasonalOutputs(self, year, season):
+        """Returns the list of output files of a seasonal summary.
+        Description: seasonalOutputs determines the good looks count, the
+            reflectance bands, and the spectral indices (along with the ENVI
+            headers) which are generated for the year and season.
+
+        History:
+          Created on 10/18/2026 by USGS/EROS LSRD Project
+
+        Args:
+          year - year of the seasonal summary
+          season - name of the season
+
+        Returns:
+            outputs - list of output files
+        """
+
+        outputs = envi_files (self.mask_dir + str(year) + '_' + season +  \
+            '_good_count.img')
+        for (dir_name, ind) in [(self.refl_dir, 'band3'),  \
+            (self.refl_dir, 'band4'), (self.refl_dir, 'band5'),  \
+            (self.refl_dir, 'band7'), (self.ndvi_dir, 'ndvi'),  \
+            (self.ndmi_dir, 'ndmi'), (self.nbr_dir, 'nbr'),  \
+            (self.nbr2_dir, 'nbr2')]:
+            outputs += envi_files (dir_name + str(year) + '_' + season +  \
+                '_' + ind + '.img')
+
+        return outputs
+
+
+    def maximumOutputs(self, year):
+        """Returns the list of output files of an annual maximum.
+        Description: maximumOutputs determines the maximum spectral indices
+            (along with the ENVI headers) which are generated for the year.
+
+        History:
+          Created on 10/18/2026 by USGS/EROS LSRD Project
+
+        Args:
+          year - year of the annual maximum
+
+        Returns:
+            outputs - list of output files
+        """
+
+        outputs = []
+        for (dir_name, ind) in [(self.ndvi_dir, 'ndvi'),  \
+            (self.ndmi_dir, 'ndmi'), (self.nbr_dir, 'nbr'),  \
+            (self.nbr2_dir, 'nbr2')]:
+            outputs += envi_files (dir_name + str(year) + '_maximum_' +  \
+                ind + '.img')
+
+        return outputs
+
+
+    def deleteSceneSource(self, xml_file):
+        """Removes the original scene data for the XML file.
+        Description: deleteSceneSource removes the original surface
+            reflectance bands, cfmask bands, generated QA mask, VER, and GCP
+            products for the XML file.  The MTL and XML file are left for
+            downstream processing.
+
+        History:
+          Created on 10/18/2026 by USGS/EROS LSRD Project
+              Pulled from sceneResample so it can also be used when the
+              resampled scene is restored from the stage cache.
+
+        Args:
+          xml_file - name of XML file to process
+
+        Returns: nothing
+        """
+
+        # delete the original SR bands
+        globnames = os.path.basename (xml_file.replace ('.xml', '*_sr_*'))
+        filelist = glob.glob (globnames)
+        for myfile in filelist:
+            os.remove(myfile)
+
+        # delete the original cfmask bands and the generated QA mask
+        globnames = os.path.basename (xml_file.replace ('.xml', '*_*mask*'))
+        filelist = glob.glob (globnames)
+        for myfile in filelist:
+            os.remove(myfile)
+
+        # delete the original VER products
+        globnames = os.path.basename (xml_file.replace ('.xml', '*_VER*'))
+        filelist = glob.glob (globnames)
+        for myfile in filelist:
+            os.remove(myfile)
+
+        # delete the original GCP products
+        globnames = os.path.basename (xml_file.replace ('.xml', '*_GCP*'))
+        filelist = glob.glob (globnames)
+        for myfile in filelist:
+            os.remove(myfile)
+
+
+    def generateSeasonalSummaries (self, stack_file, years=None,
+        season_names=None):
         """Generates the seasonal summaries for the temporal stack.
         Description: generateSeasonalSummaries will generate the seasonal
         summaries for the temporal stack.  If a log file was specified then the
         output from each application will be logged to that file.
+
+        History:
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Each season of each year is recorded in the task journal, if
+              there is one, and the seasons which already completed are
+              skipped.
         
         Args:
-          stack_file - name of stack file to create; list of the XML products
-              to be processed in addition to the date, path/row, sensor,
-              bounding coords, pixel size, and UTM zone
+          stack_file - StackTable or name of stack file; list of the XML
+              products to be processed in addition to the date, path/row,
+              sensor, bounding coords, pixel size, and UTM zone
+          years - set of years to be processed; if None then all the years
+              in the stack are processed
+          season_names - list of the seasons to be processed; if None then
+              all the seasons of the StackTable are processed
         
         Returns:
             ERROR - error generating the seasonal summaries
             SUCCESS - successful processing
         
         Notes:
-          1. Seasons are defined as:
+          1. Seasons are defined by the seasons of the StackTable, which by
+             default are:
              winter = dec (previous year), jan, and feb
              spring = mar, apr, may
              summer = jun, jul, aug
@@ -725,34 +1048,29 @@ class temporalBAStack():
           3. Good count is the number of 'lloks' with no QA flag set
         """
 
-        # make sure the stack file exists
-        if not os.path.exists(stack_file):
-            msg = 'Could not open stack file: ' + stack_file
-            logIt (msg, self.log_handler)
-            return ERROR
-
         # ignore divide by zero and invalid (NaN) values when doing array
         # division.  these will be handled on our own.
         seterr(divide='ignore', invalid='ignore')
 
-        # open and read the stack file
+        # read the stack, if it isn't already a StackTable
         startTime = time.time()
-        self.csv_data = recfromcsv (stack_file, delimiter=',', names=True)
-        if self.csv_data is None:
-            msg = 'Error reading the stack file: ' + stack_file
-            logIt (msg, self.log_handler)
+        self.stack = read_stack_table (stack_file, self.log_handler,
+            self.seasons)
+        if self.stack is None:
+            # error message already written
             return ERROR
+        self.stack.derivePaths (self.input_dir)
 
         # get the sorted, unique years in the stack; grab the first and last
         # year and use as the range of years to be processed.
-        years = unique (self.csv_data['year'])
-        start_year = years[0]
-        end_year = years[len(years)-1]
+        stack_years = self.stack.years
+        start_year = stack_years[0]
+        end_year = stack_years[len(stack_years)-1]
         msg = '\nProcessing stack for %d - %d' % (start_year, end_year)
         logIt (msg, self.log_handler)
 
         # determine band1 file for the first scene listed in the stack
-        first_file = self.csv_data['file_'][0]
+        first_file = self.stack['file'][0]
         base_file = os.path.basename(  \
             first_file.replace('.xml', '_sr_band1.img'))
         first_file = '%s%s' % (self.refl_dir, base_file)
@@ -773,36 +1091,56 @@ class temporalBAStack():
         enviMask = None
 
         # load up the work queue for processing yearly summaries in parallel.
-        # push each season of each year to a separate CPU.
+        # push each season of each year to a separate CPU, along with the
+        # estimated memory of the masks of all the scenes in the season.  the
+        # seasons which completed in a previous run are skipped.
+        if season_names is None:
+            season_names = self.stack.season_names
+        self.budget = memory_budget (self.memory_limit, self.log_handler)
         work_queue = multiprocessing.Queue()
-        num_years = end_year - start_year + 1
-
+        tasks = {}
+        process_years = []
         for year in range (start_year, end_year+1):
-            for season in ['winter', 'spring', 'summer', 'fall']:
+            if (years is not None) and (year not in years):
+                continue
+            process_years.append (year)
+            for season in season_names:
+                task = 'seasonal/%d_%s' % (year, season)
+                if (self.journal is not None) and self.journal.isDone (task):
+                    continue
+                self.budget.estimate ((year, season), seasonal_memory_mb (
+                    len (self.stack.seasonRows (year, season)), self.nrow,
+                    self.ncol))
                 print "Pushing %d, %s to the queue" % (year, season)
                 work_queue.put([year, season])
+                tasks[(year, season)] = task
+        num_years = len (process_years)
 
         # create a queue to pass to workers to store the processing status
         result_queue = multiprocessing.Queue()
  
         # spawn workers to process each year in the stack - generate the
         # seasonal summaries
-        msg = 'Spawning %d years for processing seasonal summaries via %d '  \
-            'processors ....' % (num_years, self.num_processors)
+        msg = 'Spawning %d years (%d seasons) for processing seasonal '  \
+            'summaries via %d processors, %s ....' % (num_years,
+            len (tasks), self.num_processors, self.budget.describe())
         logIt (msg, self.log_handler)
-        for i in range(self.num_processors):
+        workers = []
+        for i in range(min (self.num_processors, len (tasks))):
             worker = parallelSummaryWorker(work_queue, result_queue, self)
             worker.start()
+            workers.append (worker)
  
-        # collect the results off the queue
-        for i in range(num_years):
-            for season in ['winter', 'spring', 'summer', 'fall']:
-                status = result_queue.get()
-                if status != SUCCESS:
-                    msg = 'Error processing seasonal summaries for year %d ' \
-                        'and season %s' % (start_year + i, season)
-                    logIt (msg, self.log_handler)
-                    return ERROR
+        # collect the results off the queue, recording each season in the
+        # task journal
+        failed = collect_results (result_queue, tasks, workers, self.journal,
+            budget=self.budget, log_handler=self.log_handler)
+        if len (failed) > 0:
+            msg = 'Error processing seasonal summaries for %s' %  \
+                ', '.join (['year %d and season %s' % (year, season)  \
+                for (year, season) in failed])
+            logIt (msg, self.log_handler)
+            return ERROR
 
         endTime = time.time()
         msg = 'Processing time = %f seconds' % (endTime-startTime)
@@ -831,6 +1169,11 @@ class temporalBAStack():
               better support processing 2-year stacks of data. This makes
               better usage of the CPUs vs. just using 2 CPUs, one for each
               year and waiting for each to process all four seasons.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Modified to use the season index of the StackTable.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Modified to use the mask, band, and index filenames derived
+              by the StackTable, and to support custom seasons.
 
         Args:
           year - year to process the seasonal summaries
@@ -841,7 +1184,8 @@ class temporalBAStack():
             SUCCESS - successful processing
         
         Notes:
-          1. Seasons are defined as:
+          1. Seasons are defined by the seasons of the StackTable, which by
+             default are:
              winter = dec (previous year), jan, and feb
              spring = mar, apr, may
              summer = jun, jul, aug
@@ -852,47 +1196,38 @@ class temporalBAStack():
         """
 
         # determine which scenes apply to the current season in the
-        # current year
-        last_year = year - 1
-        if season == 'winter':
-            season_files =  \
-                ((self.csv_data['year'] == last_year) &  \
-                 (self.csv_data['month'] == 12)) |  \
-                ((self.csv_data['year'] == year) &  \
-                ((self.csv_data['month'] == 1) |    \
-                 (self.csv_data['month'] == 2)))
-        elif season == 'spring':
-            season_files = (self.csv_data['year'] == year) &  \
-                ((self.csv_data['month'] >= 3) &   \
-                 (self.csv_data['month'] <= 5))
-        elif season == 'summer':
-            season_files = (self.csv_data['year'] == year) &  \
-                ((self.csv_data['month'] >= 6) &   \
-                 (self.csv_data['month'] <= 8))
-        elif season=='fall':
-            season_files = (self.csv_data['year'] == year) &  \
-                ((self.csv_data['month'] >= 9) &   \
-                 (self.csv_data['month'] <= 11))
+        # current year; winter includes december of the previous year
+        season_files = self.stack.seasonRows (year, season)
  
         # how many scenes do we have for the current year and season?
         # if there aren't any files to process then write out a
         # product with fill
-        n_files = sum (season_files)
+        n_files = len (season_files)
         msg = '  season = %s,  file count = %d' % (season, n_files)
         logIt (msg, self.log_handler)
  
         # pull the files for this year and season
-        files = self.csv_data['file_'][season_files]
+        files = self.stack['file'][season_files]
+
+        # restore the outputs from the stage cache if this year and season
+        # have already been processed for the same scenes and extents
+        if self.cache is not None:
+            outputs = self.seasonalOutputs (year, season)
+            cache_key = self.cache.key ('seasonal', list(files),
+                [year, season, sorted (self.spatial_extent.items()),
+                QA_MASK_FORMAT])
+            if self.cache.restore (cache_key, outputs):
+                return SUCCESS
+            self.cache.prepare (outputs)
         
         # create the mask datasets -- stack of nrow x ncols
-        mask_data = zeros((n_files, self.nrow, self.ncol), dtype=int16)
+        mask_data = zeros((n_files, self.nrow, self.ncol), dtype=uint8)
 
         # loop through the current set of files, open the mask files,
         # and stack them up in a 3D array
+        mask_files = self.stack.sceneFiles ('mask', season_files)
         for i in range(0, n_files):
-            temp = files[i]
-            base_file = os.path.basename(temp.replace('.xml', '_mask.img'))
-            mask_file = '%s%s' % (self.mask_dir, base_file)
+            mask_file = mask_files[i]
             mask_dataset = gdal.Open (mask_file, gdalconst.GA_ReadOnly)
             if mask_dataset is None:
                 msg = 'Could not open mask file: ' + mask_file
@@ -904,8 +1239,8 @@ class temporalBAStack():
             mask_dataset = None
         
         # which voxels in the mask have good qa values?
-        mask_data_good = mask_data >= 0
-        mask_data_bad = mask_data < 0
+        mask_data_good = qa_is_good (mask_data)
+        mask_data_bad = qa_is_bad (mask_data)
         mask_data = None
         
         # summarize the number of good pixels in the stack for each
@@ -965,19 +1300,15 @@ class temporalBAStack():
             # generate the directory name for the index stack
             if (ind == 'ndvi'):
                 dir_name = self.ndvi_dir
-                ext = '_%s.img' % ind
             elif (ind == 'ndmi'):
                 dir_name = self.ndmi_dir
-                ext = '_%s.img' % ind
             elif (ind == 'nbr'):
                 dir_name = self.nbr_dir
-                ext = '_%s.img' % ind
             elif (ind == 'nbr2'):
                 dir_name = self.nbr2_dir
-                ext = '_%s.img' % ind
             else:   # refl file
                 dir_name = self.refl_dir
-                ext = '_sr_%s.img' % ind
+            ind_files = self.stack.sceneFiles (ind, season_files)
     
             # set up the season summaries file
             temp_file = dir_name + str(year) + '_' + season + '_' +  \
@@ -1004,8 +1335,7 @@ class temporalBAStack():
             input_ds = {}
             temp_band = {}
             for i in range(0, n_files):
-                base_file = os.path.basename(files[i]).replace('.xml', ext)
-                temp_file = '%s%s' % (dir_name, base_file)
+                temp_file = ind_files[i]
                 my_ds = gdal.Open (temp_file, gdalconst.GA_ReadOnly)
                 if my_ds is None:
                     msg = 'Could not open index/band file: ' + temp_file
@@ -1075,57 +1405,63 @@ class temporalBAStack():
         mask_data_good = None
         mask_data_bad = None
         good_looks = None
+
+        # save the outputs in the stage cache
+        if self.cache is not None:
+            self.cache.store (cache_key, outputs)
  
         return SUCCESS
 
 
-    def generateAnnualMaximums (self, stack_file):
+    def generateAnnualMaximums (self, stack_file, years=None):
         """Generates the annual maximums for the temporal stack.
         Description: generateAnnualMaximums will generate the maximum values
         for each year in the temporal stack.  If a log file was specified then
         the output from each application will be logged to that file.
         
         Args:
-          stack_file - name of stack file to create; list of the XML products
-              to be processed in addition to the date, path/row, sensor,
-              bounding coords, pixel size, and UTM zone
+          stack_file - StackTable or name of stack file; list of the XML
+              products to be processed in addition to the date, path/row,
+              sensor, bounding coords, pixel size, and UTM zone
+          years - set of years to be processed; if None then all the years
+              in the stack are processed
         
         Returns:
             ERROR - error generating the annual maximums
             SUCCESS - successful processing
         
+        History:
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Each year is recorded in the task journal, if there is one,
+              and the years which already completed are skipped.
+
         Notes:
           1. The seasons will be ignored.
         """
 
-        # make sure the stack file exists
-        if not os.path.exists(stack_file):
-            msg = 'Could not open stack file: ' + stack_file
-            logIt (msg, self.log_handler)
-            return ERROR
-
         # ignore divide by zero and invalid (NaN) values when doing array
         # division.  these will be handled on our own.
         seterr(divide='ignore', invalid='ignore')
 
-        # open and read the stack file
+        # read the stack, if it isn't already a StackTable
         startTime = time.time()
-        self.csv_data = recfromcsv (stack_file, delimiter=',', names=True)
-        if self.csv_data is None:
-            msg = 'Error reading the stack file: ' + stack_file
-            logIt (msg, self.log_handler)
+        self.stack = read_stack_table (stack_file, self.log_handler,
+            self.seasons)
+        if self.stack is None:
+            # error message already written
             return ERROR
+        self.stack.derivePaths (self.input_dir)
 
         # get the sorted, unique years in the stack; grab the first and last
         # year and use as the range of years to be processed.
-        years = unique (self.csv_data['year'])
-        start_year = years[0]
-        end_year = years[len(years)-1]
+        stack_years = self.stack.years
+        start_year = stack_years[0]
+        end_year = stack_years[len(stack_years)-1]
         msg = '\nProcessing stack for %d - %d' % (start_year, end_year)
         logIt (msg, self.log_handler)
 
         # determine band1 file for the first scene listed in the stack
-        first_file = self.csv_data['file_'][0]
+        first_file = self.stack['file'][0]
         base_file = os.path.basename(  \
             first_file.replace('.xml', '_sr_band1.img'))
         first_file = '%s%s' % (self.refl_dir, base_file)
@@ -1145,11 +1481,23 @@ class temporalBAStack():
         self.nodata = enviMask.NoData
         enviMask = None
 
-        # load up the work queue for processing annual maximums in parallel
+        # load up the work queue for processing annual maximums in parallel,
+        # along with the estimated memory of the masks of all the scenes in
+        # the year.  the years which completed in a previous run are skipped.
+        self.budget = memory_budget (self.memory_limit, self.log_handler)
         work_queue = multiprocessing.Queue()
-        num_years = end_year - start_year + 1
+        tasks = {}
         for year in range (start_year, end_year+1):
+            if (years is not None) and (year not in years):
+                continue
+            task = 'maximum/%d' % year
+            if (self.journal is not None) and self.journal.isDone (task):
+                continue
+            self.budget.estimate (year, maximum_memory_mb (
+                len (self.stack.yearRows (year)), self.nrow, self.ncol))
             work_queue.put(year)
+            tasks[year] = task
+        num_years = len (tasks)
 
         # create a queue to pass to workers to store the processing status
         result_queue = multiprocessing.Queue()
@@ -1157,20 +1505,24 @@ class temporalBAStack():
         # spawn workers to process each year in the stack - generate the
         # seasonal summaries
         msg = 'Spawning %d years for processing annual maximums via %d '  \
-            'processors ....' % (num_years, self.num_processors)
+            'processors, %s ....' % (num_years, self.num_processors,
+            self.budget.describe())
         logIt (msg, self.log_handler)
-        for i in range(self.num_processors):
+        workers = []
+        for i in range(min (self.num_processors, num_years)):
             worker = parallelMaxWorker(work_queue, result_queue, self)
             worker.start()
+            workers.append (worker)
  
-        # collect the results off the queue
-        for i in range(num_years):
-            status = result_queue.get()
-            if status != SUCCESS:
-                msg = 'Error processing annual maximums for year %d' %  \
-                    start_year + i
-                logIt (msg, self.log_handler)
-                return ERROR
+        # collect the results off the queue, recording each year in the task
+        # journal
+        failed = collect_results (result_queue, tasks, workers, self.journal,
+            budget=self.budget, log_handler=self.log_handler)
+        if len (failed) > 0:
+            msg = 'Error processing annual maximums for years %s' %  \
+                ', '.join ([str (year) for year in sorted (failed)])
+            logIt (msg, self.log_handler)
+            return ERROR
 
         endTime = time.time()
         msg = 'Processing time = %f seconds' % (endTime-startTime)
@@ -1188,6 +1540,11 @@ class temporalBAStack():
         History:
           Updated on 3/24/2014 by Gail Schmidt, USGS/EROS LSRD Project
               Modified to utilize the ESPA internal raw binary format
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Modified to use the year index of the StackTable.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Modified to use the mask and index filenames derived by the
+              StackTable.
         
         Args:
           year - year to process the maximums
@@ -1202,8 +1559,8 @@ class temporalBAStack():
         """
 
         # determine which files apply to the current year
-        year_files = (self.csv_data['year'] == year)
-        n_files = sum (year_files)
+        year_files = self.stack.yearRows (year)
+        n_files = len (year_files)
  
         # if there aren't any files to process then skip to the next year
         msg = '  year = %d,  file count = %d' % (year, n_files)
@@ -1212,17 +1569,26 @@ class temporalBAStack():
             return SUCCESS
  
         # pull the files for the current year
-        files = self.csv_data['file_'][year_files]
+        files = self.stack['file'][year_files]
+
+        # restore the outputs from the stage cache if this year has already
+        # been processed for the same scenes and extents
+        if self.cache is not None:
+            outputs = self.maximumOutputs (year)
+            cache_key = self.cache.key ('maximum', list(files),
+                [year, sorted (self.spatial_extent.items()), QA_MASK_FORMAT])
+            if self.cache.restore (cache_key, outputs):
+                return SUCCESS
+            self.cache.prepare (outputs)
             
         # create the mask datasets -- stack of nrow x ncols
-        mask_data = zeros((n_files, self.nrow, self.ncol), dtype=int16)
+        mask_data = zeros((n_files, self.nrow, self.ncol), dtype=uint8)
 
         # loop through the current set of files, open the mask files,
         # and stack them up in a 3D array
+        mask_files = self.stack.sceneFiles ('mask', year_files)
         for i in range(0, n_files):
-            temp = files[i]
-            base_file = os.path.basename(temp.replace('.xml', '_mask.img'))
-            mask_file = '%s%s' % (self.mask_dir, base_file)
+            mask_file = mask_files[i]
             mask_dataset = gdal.Open (mask_file, gdalconst.GA_ReadOnly)
             if mask_dataset is None:
                 msg = 'Could not open mask file: ' + mask_file
@@ -1234,7 +1600,7 @@ class temporalBAStack():
             mask_dataset = None
         
         # which voxels in the mask have fill values?
-        mask_data_bad = mask_data < 0
+        mask_data_bad = qa_is_bad (mask_data)
         mask_data = None
             
         # create the bad data mask that will hold a stack of mask_data_bad
@@ -1249,7 +1615,6 @@ class temporalBAStack():
             logIt (msg, self.log_handler)
                 
             # generate the directory name for the index stack
-            ext = '_%s.img' % ind
             if (ind == 'ndvi'):
                 dir_name = self.ndvi_dir
             elif (ind == 'ndmi'):
@@ -1258,6 +1623,7 @@ class temporalBAStack():
                 dir_name = self.nbr_dir
             elif (ind == 'nbr2'):
                 dir_name = self.nbr2_dir
+            ind_files = self.stack.sceneFiles (ind, year_files)
     
             # set up the annual maximum ENVI file
             temp_file = dir_name + str(year) + '_maximum_' + ind + '.img'
@@ -1283,9 +1649,7 @@ class temporalBAStack():
             input_ds = {}
             indx_band = {}
             for i in range(0, n_files):
-                temp = files[i]
-                base_file = os.path.basename(files[i]).replace('.xml', ext)
-                temp_file = '%s%s' % (dir_name, base_file)
+                temp_file = ind_files[i]
                 my_ds = gdal.Open (temp_file, gdalconst.GA_ReadOnly)
                 if my_ds is None:
                     msg = 'Could not open index file: ' + temp_file
@@ -1340,13 +1704,121 @@ class temporalBAStack():
  
         # clean up the masked datasets for the current year
         mask_data_bad = None
+
+        # save the outputs in the stage cache
+        if self.cache is not None:
+            self.cache.store (cache_key, outputs)
  
         return SUCCESS
 
 
+    def prepareStack (self, exclude_l1g=None, exclude_rmse=None,
+        exclude_cloud_cover=None):
+        """Generates the stack of scenes in the input directory.
+        Description: prepareStack excludes the L1G, high RMSE, and/or high
+            cloud cover scenes, if specified, then generates the list of XML
+            files, the stack file, and the maximum extents of the stack in
+            the current directory.  The stack is parsed into a StackTable,
+            which is saved for the downstream applications.
+
+        History:
+          Created on 10/18/2026 by USGS/EROS LSRD Project
+              Pulled from processStack so the stack can also be generated
+              when the stages are run a task at a time.
+
+        Args:
+          exclude_l1g - if True, then the L1G-based files are excluded
+          exclude_rmse - if True, then the high RMSE scenes are excluded
+          exclude_cloud_cover - if True, then the high cloud cover scenes are
+              excluded
+
+        Returns:
+            ERROR - error generating the stack
+            SUCCESS - successful processing
+        """
+
+        # go to the input_directory and exclude the L1G, high RMSE, and/or
+        # high cloud cover files, if specified
+        if exclude_l1g:
+            self.exclude_l1g_files()
+
+        if exclude_rmse:
+            self.exclude_rmse_files()
+
+        if exclude_cloud_cover:
+            self.exclude_cloud_cover_files()
+
+        # generate the list of XML files that will be processed from the
+        # current directory
+        status = self.generate_list (LIST_FILE)
+        if status != SUCCESS:
+            msg = 'Error creating the list of files to be processed. ' \
+                'Processing will terminate.'
+            logIt (msg, self.log_handler)
+            return ERROR
+
+        # run the executable to generate the stack of metadata for the input
+        # files and determine the maximum bounding extent of the temporal
+        # stack of products.  each XML file is parsed once, using a thread
+        # for each processor.  exit if any errors occur.
+        cmdstr = 'stack_metadata --list_file=%s --stack_file=%s ' \
+            '--extent_file=%s --num_threads=%d --verbose' % (LIST_FILE,
+            STACK_FILE, BOUNDING_BOX_FILE, self.num_processors)
+        cmdlist = cmdstr.split(' ')
+        try:
+            output = subprocess.check_output (cmdlist, stderr=None)
+            logIt (output, self.log_handler)
+        except subprocess.CalledProcessError, e:
+            msg = 'Error running stack_metadata. Processing will ' \
+                'terminate.\n ' + e.output
+            logIt (msg, self.log_handler)
+            return ERROR
+
+        # parse the stack file once into a table which is used by all of the
+        # processing stages, and save the table for the downstream
+        # applications so they don't need to parse the stack file again
+        self.stack = read_stack_table (STACK_FILE, self.log_handler,
+            self.seasons)
+        if self.stack is None:
+            msg = 'Error reading the stack file. Processing will terminate.'
+            logIt (msg, self.log_handler)
+            return ERROR
+        self.stack.save (stack_npz_file (STACK_FILE))
+        self.stack.derivePaths (self.input_dir)
+        return SUCCESS
+
+
+    def removeIndexFiles (self):
+        """Removes the per-scene spectral index files of the stack.
+        Description: The index files are only used to generate the seasonal
+            summaries and annual maximums.  They are not used downstream.
+            The reflectance and mask files are still needed in the boosted
+            regression.
+
+        History:
+          Created on 10/18/2026 by USGS/EROS LSRD Project
+              Pulled from processStack so the index files can also be
+              removed when the stages are run a task at a time.
+        """
+
+        cleanup_dirs = [self.ndvi_dir, self.ndmi_dir, self.nbr_dir,
+             self.nbr2_dir]
+        for full_xml_file in self.stack['file']:
+            for index_dir in cleanup_dirs:
+                xml_file = os.path.basename (  \
+                    full_xml_file.replace ('.xml', ''))
+                rm_files = glob.glob (index_dir + xml_file + '*')
+                for file in rm_files:
+                    print 'Remove: ' + file
+                    os.remove (os.path.join (file))
+
+
     def processStack (self, input_dir=None, exclude_l1g=None,  \
         exclude_rmse=None, exclude_cloud_cover=None, logfile=None,  \
-        num_processors=1, delete_src=None):
+        num_processors=1, delete_src=None, incremental=None, cache_dir=None,
+        cache_size=DEFAULT_CACHE_SIZE, gdal_merge=None, seasons=None,
+        metrics_file=None, profile=None, profile_dir=None, memory_limit=None,
+        io_threads=DEFAULT_IO_THREADS, journal=None):
         """Processes the temporal stack of data to generate seasonal summaries
            and annual maximums for each year in the stack.
         Description: processStack will process the temporal stack of data
@@ -1371,6 +1843,48 @@ class temporalBAStack():
               Added --delete_src argument.  If specified then the original
               source scenes will be removed after each has been resampled to
               the maximum geographic extents.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Added --incremental argument.  If specified then only the new
+              or changed scenes are resampled, and only the years of seasonal
+              summaries and annual maximums they affect are regenerated.
+              Added --cache_dir and --cache_size arguments for the stage
+              cache of the intermediate products.
+              Added --gdal_merge argument to resample the scenes with
+              gdal_merge.py instead of the single in-memory pass.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Replaced generate_stack and determine_max_extent with
+              stack_metadata, which parses each XML file once to write both
+              the stack file and the maximum extents, using num_processors
+              threads.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              The stack file is parsed once into a StackTable, which is
+              passed to the processing stages and saved as input_stack.npz
+              for the downstream applications.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Added --seasons argument for custom season definitions of the
+              seasonal summaries.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Added --metrics_file argument for the timing and resource
+              usage of the stages, scenes, and years.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Added --profile argument to profile the main process and each
+              of the workers, and merge the profiles into a report.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Added --memory_limit argument for the memory budget of the
+              workers.  A num_processors of 0 uses all the cores.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Moved the generation of the stack to prepareStack and the
+              cleanup of the index files to removeIndexFiles.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Added --io_threads argument for the number of threads reading
+              and writing the blocks of each resampled scene.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Added journal to record the scenes, seasons, and years in the
+              task journal of the calling application.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Incremental mode records the outputs of the scenes and years
+              in the manifest, and reprocesses those which were deleted or
+              modified.
         
         Args:
           input_dir - name of the directory in which to find the surface
@@ -1389,9 +1903,49 @@ class temporalBAStack():
           logfile - name of the logfile for logging information; if None then
               the output will be written to stdout
           num_processors - how many processors should be used for parallel
-              processing sections of the application
+              processing sections of the application; 0 uses all the cores
           delete_src - if set to true then the source scenes will be deleted
               after being resampled to the maximum geographic extents
+          incremental - if set to true then only the scenes which are new or
+              have changed since the last run (per the stack manifest) are
+              processed, along with the years they affect.  The per-scene
+              index files are kept so that later runs can regenerate the
+              affected years.
+          cache_dir - directory of the stage cache; if specified then the
+              resampled bands, spectral indices, seasonal summaries, and
+              annual maximums are restored from the cache when their inputs
+              and parameters haven't changed.  None disables the cache.
+          cache_size - maximum size of the stage cache in gigabytes
+          gdal_merge - if set to true then the scenes are resampled with
+              gdal_merge.py, and the QA band and spectral indices are
+              generated in separate passes over the files on disk
+          seasons - list of (season, months) tuples defining the seasons of
+              the seasonal summaries, where a negative month is that month
+              of the previous year; if None then DEFAULT_SEASONS are used.
+              The burned area models are trained on the default seasons.
+          metrics_file - name of the JSON-lines file for the run metrics of
+              the resampling, seasonal summaries, and annual maximums; None
+              disables the metrics
+          profile - if set to true then the main process and each of the
+              workers are profiled with cProfile.  The profiles are written
+              to the profile directory in the input directory and merged
+              into a report of the top functions at the end of processing.
+          profile_dir - directory for the profiles of the workers, when the
+              profiling was set up by the calling application; None
+              disables the profiling unless profile is set
+          memory_limit - memory budget of the workers in gigabytes.  Each
+              scene or year is processed once its estimated memory fits
+              within the budget.  If None then most of the memory available
+              on the node is used.
+          io_threads - number of threads reading and writing the blocks of
+              each scene while it is resampled.  The I/O of the scenes
+              overlaps their computation, with up to num_processors *
+              io_threads reads and writes at a time.  0 reads and writes the
+              blocks in the workers themselves.
+          journal - TaskJournal of the calling application.  Each scene,
+              season, and year is recorded in the journal, and those which
+              completed in a previous attempt are skipped.  None if the
+              tasks aren't journaled.
 
         Returns:
             ERROR - error running the BA applications and script
@@ -1429,8 +1983,20 @@ class temporalBAStack():
             parser.add_argument ('-p', '--num_processors', type=int,
                 dest='num_processors',
                 help='how many processors should be used for parallel '
-                    'processing sections of the application '
-                    '(default = 1, single threaded)')
+                    'processing sections of the application; 0 uses all '
+                    'the cores (default = 1, single threaded)')
+            parser.add_argument ('--memory_limit', type=float,
+                dest='memory_limit',
+                help='memory budget of the parallel workers in gigabytes; '
+                     'scenes and years are only processed once their '
+                     'estimated memory fits within the budget (default = '
+                     'most of the available memory)', metavar='GB')
+            parser.add_argument ('--io_threads', type=int,
+                dest='io_threads', default=DEFAULT_IO_THREADS,
+                help='number of threads reading and writing the blocks of '
+                     'each scene while it is resampled; 0 reads and writes '
+                     'them in the worker itself (default = %d)' %  \
+                     DEFAULT_IO_THREADS)
             parser.add_argument ('--exclude_l1g', dest='exclude_l1g',
                 default=False, action='store_true',
                 help='if True, then the L1G files are excluded from the '
@@ -1455,6 +2021,44 @@ class temporalBAStack():
                      'scene has been resampled to the maximum geographic '
                      'extents. The MTL and XML file will remain for downstream '
                      'processing.')
+            parser.add_argument ('--incremental',
+                dest='incremental', default=False, action='store_true',
+                help='if True, only the scenes which are new or have changed '
+                     'since the last run are processed, along with the years '
+                     'of seasonal summaries and annual maximums they affect.')
+            parser.add_argument ('--cache_dir', type=str, dest='cache_dir',
+                help='directory for the stage cache of intermediate '
+                     'products; the cache is not used if not specified',
+                metavar='DIR')
+            parser.add_argument ('--cache_size', type=float,
+                dest='cache_size', default=DEFAULT_CACHE_SIZE,
+                help='maximum size of the stage cache in gigabytes '
+                     '(default = %.0f)' % DEFAULT_CACHE_SIZE, metavar='GB')
+            parser.add_argument ('--gdal_merge',
+                dest='gdal_merge', default=False, action='store_true',
+                help='if True, the scenes are resampled with gdal_merge.py '
+                     'and the QA band and spectral indices are generated in '
+                     'separate passes, rather than in a single in-memory '
+                     'pass.')
+            parser.add_argument ('--seasons', type=parse_seasons,
+                dest='seasons', default=None,
+                help='season definitions for the seasonal summaries, as '
+                     'name=months separated by semicolons, where a negative '
+                     'month is that month of the previous year (default = '
+                     'winter=-12,1,2;spring=3,4,5;summer=6,7,8;'
+                     'fall=9,10,11)', metavar='SEASONS')
+            parser.add_argument ('--metrics_file', type=str,
+                dest='metrics_file',
+                help='name of the JSON-lines file for the timing and '
+                     'resource usage of each stage, scene, and year; the '
+                     'metrics are not recorded if not specified',
+                metavar='FILE')
+            parser.add_argument ('--profile',
+                dest='profile', default=False, action='store_true',
+                help='if True, the main process and each worker are '
+                     'profiled with cProfile, and a merged report of the '
+                     'top functions is written to the profile directory in '
+                     'the input directory.')
 
             options = parser.parse_args()
     
@@ -1464,6 +2068,15 @@ class temporalBAStack():
             exclude_rmse = options.exclude_rmse
             exclude_cloud_cover = options.exclude_cloud_cover
             self.delete_src = options.delete_src
+            self.incremental = options.incremental
+            self.gdal_merge = options.gdal_merge
+            self.seasons = options.seasons
+            cache_dir = options.cache_dir
+            cache_size = options.cache_size
+            metrics_file = options.metrics_file
+            profile = options.profile
+            memory_limit = options.memory_limit
+            self.io_threads = options.io_threads
 
             # input directory
             input_dir = options.input_dir
@@ -1477,6 +2090,11 @@ class temporalBAStack():
         else:
             self.num_processors = num_processors
             self.delete_src = delete_src
+            self.incremental = incremental
+            self.gdal_merge = gdal_merge
+            self.seasons = seasons
+            self.io_threads = io_threads
+            self.journal = journal
 
         # open the log file if it exists; use line buffering for the output
         self.log_handler = None
@@ -1485,6 +2103,21 @@ class temporalBAStack():
         msg = 'Burned area temporal stack processing of directory: ' +  \
             input_dir
         logIt (msg, self.log_handler)
+
+        # set up the stage cache, if specified
+        self.cache = None
+        if cache_dir is not None:
+            msg = 'Using stage cache: %s (%.1f GB)' % (cache_dir, cache_size)
+            logIt (msg, self.log_handler)
+            self.cache = StageCache (cache_dir, cache_size, self.log_handler)
+
+        # set up the run metrics, if specified
+        self.metrics = open_metrics (metrics_file, self.log_handler)
+
+        # use all the cores if requested, with the workers admitted within
+        # the memory limit
+        self.num_processors = resolve_processors (self.num_processors)
+        self.memory_limit = memory_limit
         
         # if the input_dir doesn't end with a closing directory path separator
         # then end it with one so that we don't have to add later when
@@ -1504,6 +2137,16 @@ class temporalBAStack():
                 'need write access to this directory.' % input_dir
             logIt (msg, self.log_handler)
             return ERROR
+
+        # set up the profiling of the workers, if specified.  the main
+        # process is also profiled when the profiling is requested here,
+        # vs. by the calling application.
+        self.profile_dir = profile_dir
+        main_profiler = None
+        if profile:
+            self.profile_dir = os.path.abspath (input_dir + PROFILE_DIR)
+            clear_profiles (self.profile_dir)
+            main_profiler = start_profile (self.profile_dir)
         msg = 'Changing directories for burned area stack processing: ' + \
             input_dir
         logIt (msg, self.log_handler)
@@ -1513,60 +2156,73 @@ class temporalBAStack():
         mydir = os.getcwd()
         os.chdir (input_dir)
 
-        # go to the input_directory and exclude the L1G, high RMSE, and/or
-        # high cloud cover files, if specified
-        if exclude_l1g:
-            self.exclude_l1g_files()
-
-        if exclude_rmse:
-            self.exclude_rmse_files()
-
-        if exclude_cloud_cover:
-            self.exclude_cloud_cover_files()
-
-        # generate the list of XML files that will be processed from the
-        # current directory
-        list_file = "input_list.txt"
-        status = self.generate_list (list_file)
+        # exclude the L1G, high RMSE, and/or high cloud cover files, if
+        # specified, and generate the stack of the remaining files
+        status = self.prepareStack (exclude_l1g, exclude_rmse,
+            exclude_cloud_cover)
         if status != SUCCESS:
-            msg = 'Error creating the list of files to be processed. ' \
-                'Processing will terminate.'
-            logIt (msg, self.log_handler)
-            os.chdir (mydir)
-            return ERROR
-
-        # run the executable to generate the stack of metadata for the input
-        # files.  exit if any errors occur.
-        logIt (msg, self.log_handler)
-        stack_file = "input_stack.csv"
-        cmdstr = 'generate_stack --list_file=%s --stack_file=%s ' \
-            '--verbose' % (list_file, stack_file)
-        cmdlist = cmdstr.split(' ')
-        try:
-            output = subprocess.check_output (cmdlist, stderr=None)
-            logIt (output, self.log_handler)
-        except subprocess.CalledProcessError, e:
-            msg = 'Error running generate_stack. Processing will ' \
-                'terminate.\n ' + e.output
-            logIt (msg, self.log_handler)
-            os.chdir (mydir)
-            return ERROR
-
-        # run the executable to determine the maximum bounding extent of
-        # the temporal stack of products.  exit if any errors occur.
-        bounding_box_file = 'bounding_box_coordinates.csv'
-        cmdstr = 'determine_max_extent --list_file=%s --extent_file=%s ' \
-            '--verbose' % (list_file, bounding_box_file)
-        cmdlist = cmdstr.split(' ')
-        try:
-            output = subprocess.check_output (cmdlist, stderr=None)
-            logIt (output, self.log_handler)
-        except subprocess.CalledProcessError, e:
-            msg = 'Error running determine_max_extent. Processing will ' \
-                'terminate.\n ' + e.output
-            logIt (msg, self.log_handler)
             os.chdir (mydir)
             return ERROR
+        stack_file = STACK_FILE
+        bounding_box_file = BOUNDING_BOX_FILE
+
+        # if processing incrementally, then determine which scenes are new or
+        # have changed since the last run.  only those scenes need to be
+        # resampled, and only the years they affect need new seasonal
+        # summaries and annual maximums.
+        resample_list = None
+        summary_years = None
+        maximum_years = None
+        if self.incremental:
+            manifest = StackManifest (input_dir + MANIFEST_FILE,
+                self.log_handler)
+            scenes = manifest.stackScenes (self.stack)
+            extent = manifest.extentSignature (bounding_box_file)
+            changed = manifest.changedScenes ('stack', scenes, extent)
+            if changed is None:
+                msg = 'Incremental processing: no previous run of the stack ' \
+                    'is available, so all scenes will be processed.'
+                logIt (msg, self.log_handler)
+            else:
+                # scenes whose resampled outputs were deleted or modified
+                # since the last run are reprocessed as if they changed, as
+                # are the years whose summaries or maximums were
+                (output_scenes, output_years) =  \
+                    manifest.changedOutputs ('stack')
+                changed_names = set([os.path.basename (scene['file'])  \
+                    for scene in changed])
+                changed += [scenes[name] for name in output_scenes  \
+                    if (name in scenes) and (name not in changed_names)]
+
+                resample_list = [scene['file'] for scene in changed  \
+                    if os.path.basename (scene['file']) in scenes]
+                summary_years = affected_summary_years (changed,
+                    self.stack.seasons) | output_years
+                maximum_years = set([scene['year'] for scene in changed]) |  \
+                    output_years
+
+                # the affected years need the index files for all of their
+                # scenes, so also resample any of those scenes whose index
+                # files are no longer around (i.e. cleaned up by a previous
+                # run which wasn't incremental)
+                for name in scenes:
+                    scene = scenes[name]
+                    scene_years = affected_summary_years ([scene],
+                        self.stack.seasons)
+                    if len (scene_years &  \
+                        (summary_years | maximum_years)) == 0:
+                        continue
+                    for ind in ['ndvi', 'ndmi', 'nbr', 'nbr2']:
+                        indx_file = input_dir + ind + '/' +  \
+                            name.replace ('.xml', '_%s.img' % ind)
+                        if not os.path.exists (indx_file) and  \
+                            scene['file'] not in resample_list:
+                            resample_list.append (scene['file'])
+                msg = 'Incremental processing: %d new or changed scenes, ' \
+                    'seasonal summary years %s, annual maximum years %s' %  \
+                    (len (changed), sorted (summary_years),
+                    sorted (maximum_years))
+                logIt (msg, self.log_handler)
 
         # resample the files to the maximum bounding extent of the stack
         # and calculate the spectral indices
@@ -1574,7 +2230,10 @@ class temporalBAStack():
             msg = 'Original source scenes will be deleted after resampling.'
             logIt (msg, self.log_handler)
 
-        status = self.resampleStack (bounding_box_file, stack_file)
+        span = self.metrics.start ('resample')
+        status = self.resampleStack (bounding_box_file, self.stack,
+            resample_list)
+        self.metrics.end (span, status)
         if status != SUCCESS:
             msg = 'Error resampling the list of files to the max bounding ' \
                 'extents. Processing will terminate.'
@@ -1583,7 +2242,9 @@ class temporalBAStack():
             return ERROR
 
         # generate the seasonal summaries for each year in the stack
-        status = self.generateSeasonalSummaries (stack_file)
+        span = self.metrics.start ('seasonal_summaries')
+        status = self.generateSeasonalSummaries (self.stack, summary_years)
+        self.metrics.end (span, status)
         if status != SUCCESS:
             msg = 'Error generating the seasonal summaries. Processing will ' \
                 'terminate.'
@@ -1592,7 +2253,9 @@ class temporalBAStack():
             return ERROR
 
         # generate the annual maximums for each year in the stack
-        status = self.generateAnnualMaximums (stack_file)
+        span = self.metrics.start ('annual_maximums')
+        status = self.generateAnnualMaximums (self.stack, maximum_years)
+        self.metrics.end (span, status)
         if status != SUCCESS:
             msg = 'Error generating the annual maximums. Processing will ' \
                 'terminate.'
@@ -1600,29 +2263,35 @@ class temporalBAStack():
             os.chdir (mydir)
             return ERROR
 
-        # open the stack file and read the header of the stack file
-        stack = csv.reader (open (stack_file, 'r'))
-        header_row = stack.next()
-        for elem in range (0, len(header_row)):
-            header_row[elem] = header_row[elem].strip()
-
-        # clean up the index files that were created as part of this processing
-        # to generate the annual and seasonal files.  they will not be used
-        # downstream.  the reflectance and mask files will still be needed
-        # in boosted regression.
-        cleanup_dirs = [self.ndvi_dir, self.ndmi_dir, self.nbr_dir,
-             self.nbr2_dir]
-        for scene in enumerate (stack):
-            for mydir in cleanup_dirs:
-                full_xml_file = scene[1][header_row.index('file')]
-                xml_file = os.path.basename (full_xml_file.replace ('.xml', ''))
-                rm_files = glob.glob (mydir + xml_file + '*')
-                for file in rm_files:
-                    print 'Remove: ' + file
-                    os.remove (os.path.join (file))
-
-        # close the stack file
-        stack = None
+        # record the scenes which were processed, along with their outputs
+        # and the outputs of each year, so the next incremental run only
+        # processes what has changed.  the per-scene index files are kept,
+        # since they are needed to regenerate the affected years.
+        if self.incremental:
+            scene_outputs = {}
+            for name in scenes:
+                scene_outputs[name] = self.sceneOutputs (scenes[name]['file'])
+            year_outputs = {}
+            for year in range (int(self.stack.years[0]),
+                int(self.stack.years[-1]) + 1):
+                year_outputs[year] = self.maximumOutputs (year)
+                for season in self.stack.season_names:
+                    year_outputs[year] += self.seasonalOutputs (year, season)
+            manifest.updateStage ('stack', scenes, extent, scene_outputs,
+                year_outputs)
+            status = manifest.write()
+            if status != SUCCESS:
+                msg = 'Error writing the stack manifest. Processing will ' \
+                    'terminate.'
+                logIt (msg, self.log_handler)
+                os.chdir (mydir)
+                return ERROR
+        else:
+            # clean up the index files that were created as part of this
+            # processing to generate the annual and seasonal files.  they will
+            # not be used downstream.  the reflectance and mask files will
+            # still be needed in boosted regression.
+            self.removeIndexFiles()
 
         # dump out the processing time, convert seconds to hours
         endTime0 = time.time()
@@ -1630,6 +2299,11 @@ class temporalBAStack():
             ((endTime0 - startTime0) / 3600.0)
         logIt (msg, self.log_handler)
 
+        # merge the profiles into the report of the top functions
+        if main_profiler is not None:
+            end_profile (main_profiler, self.profile_dir, 'main')
+            profile_report (self.profile_dir, log_handler=self.log_handler)
+
         msg = 'End time:' + \
             str(datetime.datetime.now().strftime("%b %d %Y %H:%M:%S"))
         logIt (msg, self.log_handler)
@@ -0,0 +1,213 @@
+# use true division so we don't have to worry about scalar divided by scalar
+# not being a floating point
+from __future__ import division
+
+from numpy import *
+from spectral_indices import *
+from qa_mask import *
+
+# numba is optional; without it the NumPy kernels in spectral_indices are
+# used instead
+try:
+    import numba
+    HAVE_COMPILED_KERNEL = True
+except ImportError:
+    HAVE_COMPILED_KERNEL = False
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created the per-pixel kernel which combines the surface reflectance QA
+#   bands into the single QA code and computes NDVI, NDMI, NBR, and NBR2 in
+#   one pass over the pixels.  The kernel is compiled with numba when it is
+#   available, otherwise the NumPy path (combine_qa and compute_indices) is
+#   used.
+#
+# History:
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Modified to generate the bit-packed QA mask from qa_mask (pack_qa)
+#       vs. the int16 QA codes of combine_qa.
+#
+# Notes:
+#   1. The compiled kernel follows the NumPy path exactly: the indices are
+#      computed in float32, 0/0 is replaced by 0, the index is scaled by
+#      1000.0, rounded half to even, clipped to the int16 range, and then
+#      set to noData for noData bands or flagged QA.  The outputs of the two
+#      paths are identical, which benchmarks/bench_qa_index_kernel.py
+#      --verify checks.
+############################################################################
+
+# indices generated by the kernel
+KERNEL_INDICES = ['ndvi', 'ndmi', 'nbr', 'nbr2']
+
+
+def qa_indices_workspace (shape, indices=KERNEL_INDICES):
+    """Allocates the working arrays for qa_indices_numpy.
+
+    History:
+      Created on October 18, 2026 by USGS/EROS LSRD Project
+
+    Args:
+      shape - largest (lines, samples) block which will be processed
+      indices - list of the indices which will be computed
+
+    Returns:
+      dictionary of the working arrays
+    """
+
+    workspace = {'bands': {}, 'band_masks': {}, 'outputs': {},
+        'scratch': empty (shape, dtype=float32),
+        'mask': empty (shape, dtype=bool),
+        'qa_mask': empty (shape, dtype=bool)}
+    for band in index_bands (indices):
+        workspace['bands'][band] = empty (shape, dtype=float32)
+        workspace['band_masks'][band] = empty (shape, dtype=bool)
+    for index in indices:
+        workspace['outputs'][index] = empty (shape, dtype=float32)
+
+    return workspace
+
+
+def qa_indices_numpy (qa_bands, refl, qa_out, index_out, nodata=-9999,
+    workspace=None):
+    """Combines the QA bands and computes the spectral indices with NumPy.
+    Description: Reference implementation of the kernel, built from
+        pack_qa and compute_indices.
+
+    History:
+      Created on October 18, 2026 by USGS/EROS LSRD Project
+
+    Args:
+      qa_bands - list of the fill, cloud, cloud shadow, snow, land/water,
+          and adjacent cloud QA arrays
+      refl - dictionary of the int16 reflectance arrays (band3, band4,
+          band5, band7)
+      qa_out - uint8 output array for the bit-packed QA mask
+      index_out - dictionary of int16 output arrays for the indices (ndvi,
+          ndmi, nbr, nbr2)
+      nodata - noData value of the bands and the outputs
+      workspace - working arrays from qa_indices_workspace, with at least
+          as many lines as qa_out and the same number of samples; if None
+          then they are allocated for this call
+    """
+
+    pack_qa (*(list(qa_bands) + [qa_out]))
+
+    if workspace is None:
+        workspace = qa_indices_workspace (qa_out.shape, index_out.keys())
+    nlines = qa_out.shape[0]
+    bands = {}
+    band_masks = {}
+    for band in index_bands (index_out.keys()):
+        bands[band] = workspace['bands'][band][:nlines]
+        band_masks[band] = workspace['band_masks'][band][:nlines]
+        copyto (bands[band], refl[band])
+    outputs = {}
+    for index in index_out.keys():
+        outputs[index] = workspace['outputs'][index][:nlines]
+    qa_mask = workspace['qa_mask'][:nlines]
+    qa_is_bad (qa_out, out=qa_mask)
+
+    compute_indices (bands, outputs, workspace['scratch'][:nlines],
+        workspace['mask'][:nlines], band_masks, nodata, 1000.0, qa_mask)
+    for index in index_out.keys():
+        round_to_int16 (outputs[index], index_out[index])
+
+
+if HAVE_COMPILED_KERNEL:
+    @numba.njit(error_model='numpy')
+    def _scaled_normalized_difference (a, b, invalid, nodata):
+        """Returns 1000 * (a - b) / (a + b) rounded to int16 for one pixel.
+        """
+        if invalid:
+            return int16(nodata)
+        x = (a - b) / (a + b)
+        if x != x:
+            x = float32(0.0)
+        x = rint(x * float32(1000.0))
+        if x > 32767.0:
+            x = float32(32767.0)
+        elif x < -32768.0:
+            x = float32(-32768.0)
+        return int16(x)
+
+    @numba.njit(error_model='numpy')
+    def _qa_indices_compiled (fill_QA, cloud_QA, shadow_QA, snow_QA,
+        land_water_QA, adjacent_cloud_QA, b3, b4, b5, b7, qa, ndvi, ndmi,
+        nbr, nbr2, nodata):
+        """Packs the QA bands and computes the four indices, one pixel at
+           a time.
+        """
+        nrow = fill_QA.shape[0]
+        ncol = fill_QA.shape[1]
+        for i in range(nrow):
+            for j in range(ncol):
+                # bit-packed QA mask, with the same layout as pack_qa
+                if fill_QA[i,j] > 0:
+                    q = QA_FILL
+                else:
+                    q = 0
+                    if cloud_QA[i,j] > 0:
+                        q |= QA_CLOUD
+                    if adjacent_cloud_QA[i,j] > 0:
+                        q |= QA_ADJACENT_CLOUD
+                    if shadow_QA[i,j] > 0:
+                        q |= QA_CLOUD_SHADOW
+                    if snow_QA[i,j] > 0:
+                        q |= QA_SNOW
+                    if land_water_QA[i,j] > 0:
+                        q |= QA_WATER
+                qa[i,j] = q
+                bad_qa = q != 0
+
+                # spectral indices
+                f3 = float32(b3[i,j])
+                f4 = float32(b4[i,j])
+                f5 = float32(b5[i,j])
+                f7 = float32(b7[i,j])
+                nodata3 = b3[i,j] == nodata
+                nodata4 = b4[i,j] == nodata
+                nodata5 = b5[i,j] == nodata
+                nodata7 = b7[i,j] == nodata
+                ndvi[i,j] = _scaled_normalized_difference (f4, f3,
+                    bad_qa or nodata3 or nodata4, nodata)
+                ndmi[i,j] = _scaled_normalized_difference (f4, f5,
+                    bad_qa or nodata4 or nodata5, nodata)
+                nbr[i,j] = _scaled_normalized_difference (f4, f7,
+                    bad_qa or nodata4 or nodata7, nodata)
+                nbr2[i,j] = _scaled_normalized_difference (f5, f7,
+                    bad_qa or nodata5 or nodata7, nodata)
+
+
+def qa_indices (qa_bands, refl, qa_out, index_out, nodata=-9999,
+    compiled=True, workspace=None):
+    """Combines the QA bands and computes the spectral indices.
+    Description: Uses the compiled kernel if numba is available, all four
+        indices are requested, and compiled is True.  Otherwise the NumPy
+        path is used.
+
+    History:
+      Created on October 18, 2026 by USGS/EROS LSRD Project
+
+    Args:
+      qa_bands - list of the fill, cloud, cloud shadow, snow, land/water,
+          and adjacent cloud QA arrays
+      refl - dictionary of the int16 reflectance arrays (band3, band4,
+          band5, band7)
+      qa_out - uint8 output array for the bit-packed QA mask
+      index_out - dictionary of int16 output arrays for the indices (ndvi,
+          ndmi, nbr, nbr2)
+      nodata - noData value of the bands and the outputs
+      compiled - if False then the NumPy path is always used
+      workspace - working arrays for the NumPy path, from
+          qa_indices_workspace; if None then they are allocated as needed
+    """
+
+    if compiled and HAVE_COMPILED_KERNEL and  \
+       (sorted (index_out.keys()) == sorted (KERNEL_INDICES)):
+        _qa_indices_compiled (*(list(qa_bands) +  \
+            [refl['band3'], refl['band4'], refl['band5'], refl['band7'],
+            qa_out, index_out['ndvi'], index_out['ndmi'], index_out['nbr'],
+            index_out['nbr2'], nodata]))
+    else:
+        qa_indices_numpy (qa_bands, refl, qa_out, index_out, nodata,
+            workspace)
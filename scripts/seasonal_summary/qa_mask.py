@@ -0,0 +1,131 @@
+from numpy import *
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created the definition of the bit-packed QA mask, which combines the
+#   surface reflectance QA bands (fill, cloud, adjacent cloud, cloud shadow,
+#   snow, and land/water) into a single byte per pixel, along with the
+#   vectorized helpers to build and test the mask.
+#
+# History:
+#
+# Notes:
+#   1. Bit layout of the QA mask (bit 0 is the least significant bit):
+#        bit 0 - fill
+#        bit 1 - cloud
+#        bit 2 - adjacent cloud
+#        bit 3 - cloud shadow
+#        bit 4 - snow
+#        bit 5 - water (land/water QA band)
+#        bits 6-7 - unused, always 0
+#      A value of 0 is a clear pixel.  Any non-zero value flags a pixel which
+#      is not used for the seasonal summaries, annual maximums, or the burn
+#      probabilities.  Fill pixels only have the fill bit set, so the noData
+#      value of the mask is QA_FILL.
+#   2. The layout is duplicated in src/boosted_regression_tree/
+#      PredictBurnedArea.h for GetInputQALine; the two need to be kept in
+#      sync.
+#   3. The previous int16 mask used -9999 for fill and -3 through -7 for the
+#      non-clear pixels.  qa_to_codes converts the bit-packed mask to those
+#      codes.
+############################################################################
+
+# bits of the QA mask
+QA_FILL = 1
+QA_CLOUD = 2
+QA_ADJACENT_CLOUD = 4
+QA_CLOUD_SHADOW = 8
+QA_SNOW = 16
+QA_WATER = 32
+
+# all of the non-clear bits
+QA_BAD = QA_FILL | QA_CLOUD | QA_ADJACENT_CLOUD | QA_CLOUD_SHADOW |  \
+    QA_SNOW | QA_WATER
+
+# noData value of the QA mask
+QA_NODATA = QA_FILL
+
+# version of the QA mask layout, used in the stage cache keys
+QA_MASK_FORMAT = 'bit-packed-v1'
+
+# codes of the previous int16 QA mask, in order of increasing precedence
+QA_CODES = [(QA_WATER, -3), (QA_SNOW, -4), (QA_CLOUD_SHADOW, -5),
+    (QA_ADJACENT_CLOUD, -6), (QA_CLOUD, -7)]
+
+
+def pack_qa (fill_QA, cloud_QA, shadow_QA, snow_QA, land_water_QA,
+    adjacent_cloud_QA, out=None):
+    """Packs the surface reflectance QA bands into the bit-packed QA mask.
+    Description: Sets the bit for each QA band which is non-zero.  Fill
+        pixels only have the fill bit set.
+
+    History:
+      Created on October 18, 2026 by USGS/EROS LSRD Project
+
+    Args:
+      fill_QA, cloud_QA, shadow_QA, snow_QA, land_water_QA,
+          adjacent_cloud_QA - arrays of the surface reflectance QA bands
+      out - optional uint8 output array of the same shape
+
+    Returns:
+        out - uint8 array of the QA mask
+    """
+
+    if out is None:
+        out = zeros (shape(fill_QA), dtype=uint8)
+    else:
+        out.fill (0)
+
+    for (qa_band, bit) in [(cloud_QA, QA_CLOUD),
+        (adjacent_cloud_QA, QA_ADJACENT_CLOUD),
+        (shadow_QA, QA_CLOUD_SHADOW), (snow_QA, QA_SNOW),
+        (land_water_QA, QA_WATER)]:
+        out[qa_band > 0] |= bit
+    out[fill_QA > 0] = QA_FILL
+
+    return out
+
+
+def qa_is_fill (mask, out=None):
+    """Returns a boolean array flagging the fill pixels of the QA mask."""
+
+    return equal (mask, QA_FILL, out=out)
+
+
+def qa_is_bad (mask, out=None):
+    """Returns a boolean array flagging the fill and non-clear pixels of the
+       QA mask.
+    """
+
+    return not_equal (mask, 0, out=out)
+
+
+def qa_is_good (mask, out=None):
+    """Returns a boolean array flagging the clear pixels of the QA mask."""
+
+    return equal (mask, 0, out=out)
+
+
+def qa_to_codes (mask, nodata=-9999):
+    """Converts the bit-packed QA mask to the codes of the previous int16
+       QA mask.
+    Description: Clear pixels are 0, fill pixels are nodata, and the other
+        pixels are -3 (water), -4 (snow), -5 (cloud shadow), -6 (adjacent
+        cloud), or -7 (cloud), with cloud taking precedence.
+
+    History:
+      Created on October 18, 2026 by USGS/EROS LSRD Project
+
+    Args:
+      mask - array of the bit-packed QA mask
+      nodata - code for the fill pixels
+
+    Returns:
+        QA - int16 array of the QA codes
+    """
+
+    QA = zeros (shape(mask), dtype=int16)
+    for (bit, code) in QA_CODES:
+        QA[(mask & bit) != 0] = code
+    QA[(mask & QA_FILL) != 0] = nodata
+    return QA
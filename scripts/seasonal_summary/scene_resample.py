@@ -0,0 +1,414 @@
+# use true division so we don't have to worry about scalar divided by scalar
+# not being a floating point
+from __future__ import division
+import os
+from multiprocessing.pool import ThreadPool
+
+from numpy import *
+from osgeo import gdal
+from spectral_indices import *
+from qa_index_kernel import *
+from qa_mask import *
+from log_it import *
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created a fused per-scene kernel which resamples the surface reflectance
+#   bands to the maximum extents of the stack, combines the QA bands into the
+#   single QA mask, and computes the spectral indices in one pass.
+#
+# History:
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Modified to compute the spectral indices with compute_indices into
+#       preallocated buffers.
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Modified to combine the QA and compute the spectral indices with
+#       qa_indices, which uses the compiled kernel when numba is available.
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Modified to write the QA mask as the one-byte bit-packed mask from
+#       qa_mask, with QA_NODATA as the noData value.
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Modified to read and write the blocks on a pool of I/O threads, so
+#       the reads and writes overlap the computation of the QA mask and
+#       spectral indices.
+#
+# Notes:
+#   1. The source bands and QA bands are read once, a block of lines at a
+#      time.  The QA mask and spectral indices are computed in memory and all
+#      of the outputs are written directly at their position in the maximum
+#      extents, so the intermediate QA mask and the padded copies of the
+#      bands never need to be reread from disk.
+#   2. The placement of the scene within the maximum extents follows the
+#      same offset and rounding rules as gdal_merge.py, so the outputs match
+#      the previous createQaBand, gdal_merge.py, and spectralIndex steps.
+#   3. With I/O threads, the reads of the next block are started before the
+#      current block is computed, and the writes of the current block run
+#      while the next block is read and computed.  GDAL releases the GIL
+#      during its reads and writes, so the threads do I/O while the process
+#      computes.  Each source and output file has its own dataset, and a
+#      dataset is only used by one thread at a time; the writes of a block
+#      are finished before the writes of the next block are started.  The
+#      outputs are double-buffered so a block can be filled while the
+#      previous block is being written.
+#   4. The scenes are resampled in parallel by the workers of resampleStack,
+#      so the I/O threads of a node are num_processors * io_threads.  The
+#      number of I/O threads should be sized for the filesystem; 0 reads and
+#      writes the blocks in the worker process itself.
+############################################################################
+
+# number of output lines processed at a time
+BLOCK_LINES = 256
+
+# default number of threads reading and writing the blocks of each scene
+DEFAULT_IO_THREADS = 4
+
+# noData value for the resampled bands and spectral indices; the QA mask
+# uses QA_NODATA
+NODATA = -9999
+
+
+def merge_window (src_geotrans, src_ncol, src_nrow, dst_geotrans, dst_ncol,
+    dst_nrow):
+    """Determines where the source image falls within the destination image.
+    Description: Computes the source and destination windows of the overlap
+        between the two images using the same rules as gdal_merge.py.
+
+    History:
+      Created on October 18, 2026 by USGS/EROS LSRD Project
+
+    Args:
+      src_geotrans - geographic transform of the source image
+      src_ncol - number of samples in the source image
+      src_nrow - number of lines in the source image
+      dst_geotrans - geographic transform of the destination image
+      dst_ncol - number of samples in the destination image
+      dst_nrow - number of lines in the destination image
+
+    Returns:
+        None - the images don't overlap or the windows differ in size, i.e.
+            the pixel sizes differ
+        (src_xoff, src_yoff, dst_xoff, dst_yoff, xsize, ysize) - windows of
+            the overlap
+    """
+
+    # intersection of the two images in projection coordinates
+    dst_ulx = dst_geotrans[0]
+    dst_uly = dst_geotrans[3]
+    dst_lrx = dst_ulx + dst_ncol * dst_geotrans[1]
+    dst_lry = dst_uly + dst_nrow * dst_geotrans[5]
+    src_ulx = src_geotrans[0]
+    src_uly = src_geotrans[3]
+    src_lrx = src_ulx + src_ncol * src_geotrans[1]
+    src_lry = src_uly + src_nrow * src_geotrans[5]
+
+    ulx = max (dst_ulx, src_ulx)
+    lrx = min (dst_lrx, src_lrx)
+    uly = min (dst_uly, src_uly)
+    lry = max (dst_lry, src_lry)
+    if (ulx >= lrx) or (lry >= uly):
+        return None
+
+    # destination window
+    dst_xoff = int((ulx - dst_ulx) / dst_geotrans[1] + 0.1)
+    dst_yoff = int((uly - dst_uly) / dst_geotrans[5] + 0.1)
+    dst_xsize = int((lrx - dst_ulx) / dst_geotrans[1] + 0.5) - dst_xoff
+    dst_ysize = int((lry - dst_uly) / dst_geotrans[5] + 0.5) - dst_yoff
+
+    # source window
+    src_xoff = int((ulx - src_ulx) / src_geotrans[1])
+    src_yoff = int((uly - src_uly) / src_geotrans[5])
+    src_xsize = int((lrx - src_ulx) / src_geotrans[1] + 0.5) - src_xoff
+    src_ysize = int((lry - src_uly) / src_geotrans[5] + 0.5) - src_yoff
+
+    if (src_xsize != dst_xsize) or (src_ysize != dst_ysize) or  \
+       (dst_xsize < 1) or (dst_ysize < 1):
+        return None
+
+    return (src_xoff, src_yoff, dst_xoff, dst_yoff, dst_xsize, dst_ysize)
+
+
+
+class ImmediateResult():
+    """Result of a read or write which was run immediately, since there is
+       no I/O thread pool.  Matches the get() of the results of the pool.
+    """
+
+    def __init__ (self, value):
+        self.value = value
+
+    def get (self):
+        return self.value
+
+
+def submit_io (pool, func, *args):
+    """Runs the read or write on the I/O thread pool, or immediately if
+       there is no pool.
+
+    Args:
+      pool - ThreadPool for the I/O or None
+      func - read or write method of a GDAL band
+      args - arguments of the read or write
+
+    Returns:
+        object whose get() waits for and returns the result of the read or
+        write, raising its exception if it failed
+    """
+
+    if pool is None:
+        return ImmediateResult (func (*args))
+    return pool.apply_async (func, args)
+
+
+def block_window (y0, dst_nrow, src_yoff, dst_yoff, ysize):
+    """Determines the lines of the output block which fall within the scene.
+
+    Args:
+      y0 - first output line of the block
+      dst_nrow - number of lines in the output
+      src_yoff - first source line within the output
+      dst_yoff - first output line within the scene
+      ysize - number of lines of the scene within the output
+
+    Returns:
+        (nlines, None) - number of lines in the block, which is outside of
+            the scene
+        (nlines, (src_y, nsrc, rows)) - number of lines in the block, along
+            with the first source line, number of source lines, and the
+            slice of the block lines within the scene
+    """
+
+    nlines = min (BLOCK_LINES, dst_nrow - y0)
+    first = max (y0, dst_yoff)
+    last = min (y0 + nlines, dst_yoff + ysize)
+    if first >= last:
+        return (nlines, None)
+    return (nlines, (src_yoff + (first - dst_yoff), last - first,
+        slice (first - y0, last - y0)))
+
+
+def read_block (pool, qa_sources, src_bands, src_xoff, xsize, window):
+    """Starts the reads of a block from the QA and reflectance bands.
+
+    Args:
+      pool - ThreadPool for the I/O or None
+      qa_sources - list of the source QA bands
+      src_bands - dictionary of the source reflectance bands
+      src_xoff - first source sample within the output
+      xsize - number of samples of the scene within the output
+      window - lines of the block within the scene from block_window
+
+    Returns:
+        None - the block is outside of the scene
+        (qa_reads, refl_reads) - results of the reads of the QA bands and
+            the dictionary of the reads of the reflectance bands
+    """
+
+    if window is None:
+        return None
+    (src_y, nsrc, rows) = window
+
+    qa_reads = []
+    for qa_band in qa_sources:
+        qa_reads.append (submit_io (pool, qa_band.ReadAsArray, src_xoff,
+            src_y, xsize, nsrc))
+    refl_reads = {}
+    for band in src_bands:
+        refl_reads[band] = submit_io (pool, src_bands[band].ReadAsArray,
+            src_xoff, src_y, xsize, nsrc)
+    return (qa_reads, refl_reads)
+
+
+def resample_scene (xmlAttr, spatial_extent, band_files, index_files,
+    log_handler=None, compiled=True, io_threads=DEFAULT_IO_THREADS):
+    """Resamples the scene to the maximum extents and computes the QA mask
+       and spectral indices in a single pass.
+    Description: resample_scene creates the resampled reflectance bands, the
+        QA mask, and the spectral indices over the maximum extents.  Each
+        block of lines is read from the source reflectance and QA bands,
+        the QA mask and spectral indices are computed in memory, and the
+        block is written to each output.  Areas of the maximum extents which
+        are outside of the scene are set to noData.
+
+    History:
+      Created on October 18, 2026 by USGS/EROS LSRD Project
+      Updated on 10/18/2026 by USGS/EROS LSRD Project
+          Added io_threads to read and write the blocks on a pool of I/O
+          threads, overlapping the I/O with the computation.
+
+    Args:
+      xmlAttr - XML_Scene object with the source bands opened
+      spatial_extent - dictionary of the maximum extents (North, South,
+          East, West)
+      band_files - dictionary of output filenames for the resampled bands
+          (band1, band2, band3, band4, band5, band7, band_qa)
+      index_files - dictionary of output filenames for the spectral indices
+          (ndvi, ndmi, nbr, nbr2)
+      log_handler - open log file for logging or None for stdout
+      compiled - if False then the NumPy kernels are used even if the
+          compiled kernel is available
+      io_threads - number of threads reading and writing the blocks; 0
+          reads and writes them in this process
+
+    Returns:
+        ERROR - error resampling the scene
+        SUCCESS - successful processing
+    """
+
+    # output grid for the maximum extents, using the pixel size of the scene
+    # and the gdal_merge.py rounding of the output size
+    src_geotrans = xmlAttr.dataset1.GetGeoTransform()
+    dst_geotrans = [spatial_extent['West'], src_geotrans[1], 0.0,  \
+        spatial_extent['North'], 0.0, src_geotrans[5]]
+    dst_ncol = int((spatial_extent['East'] - spatial_extent['West']) /  \
+        src_geotrans[1] + 0.5)
+    dst_nrow = int((spatial_extent['South'] - spatial_extent['North']) /  \
+        src_geotrans[5] + 0.5)
+    prj = xmlAttr.dataset1.GetProjection()
+
+    window = merge_window (src_geotrans, xmlAttr.NCol, xmlAttr.NRow,  \
+        dst_geotrans, dst_ncol, dst_nrow)
+    if window is None:
+        msg = 'Scene %s does not line up with the maximum extents' %  \
+            xmlAttr.xml_file
+        logIt (msg, log_handler)
+        return ERROR
+    (src_xoff, src_yoff, dst_xoff, dst_yoff, xsize, ysize) = window
+
+    # create the outputs
+    src_bands = {'band1': xmlAttr.band1, 'band2': xmlAttr.band2,
+        'band3': xmlAttr.band3, 'band4': xmlAttr.band4,
+        'band5': xmlAttr.band5, 'band7': xmlAttr.band7}
+    driver = gdal.GetDriverByName('ENVI')
+    output_ds = {}
+    output_band = {}
+    for (name, filename) in band_files.items() + index_files.items():
+        output_dir = os.path.dirname(filename)
+        if not os.path.exists(output_dir):
+            msg = 'Creating output directory ' + output_dir
+            logIt (msg, log_handler)
+            os.makedirs(output_dir)
+
+        if name == 'band_qa':
+            (data_type, nodata) = (gdal.GDT_Byte, QA_NODATA)
+        else:
+            (data_type, nodata) = (gdal.GDT_Int16, NODATA)
+        my_ds = driver.Create (filename, dst_ncol, dst_nrow, 1, data_type)
+        if my_ds is None:
+            msg = 'GDAL could not create output file: ' + filename
+            logIt (msg, log_handler)
+            return ERROR
+        my_ds.SetGeoTransform (dst_geotrans)
+        my_ds.SetProjection (prj)
+        output_ds[name] = my_ds
+        output_band[name] = my_ds.GetRasterBand(1)
+        output_band[name].SetNoDataValue(nodata)
+
+    # preallocate the buffers for the QA and spectral indices over the
+    # part of each block which falls within the scene, along with the
+    # output blocks.  the output blocks are double-buffered when the writes
+    # are run on the I/O threads.
+    shape = (BLOCK_LINES, xsize)
+    workspace = qa_indices_workspace (shape, index_files.keys())
+    qa_buf = empty (shape, dtype=uint8)
+    index_buf = {}
+    for index in index_files:
+        index_buf[index] = empty (shape, dtype=int16)
+
+    pool = None
+    num_slots = 1
+    if io_threads > 0:
+        pool = ThreadPool (io_threads)
+        num_slots = 2
+    block_bufs = []
+    for slot in range (num_slots):
+        bufs = {}
+        for name in output_band:
+            if name == 'band_qa':
+                bufs[name] = empty ((BLOCK_LINES, dst_ncol), dtype=uint8)
+            else:
+                bufs[name] = empty ((BLOCK_LINES, dst_ncol), dtype=int16)
+        block_bufs.append (bufs)
+
+    qa_sources = [xmlAttr.band_fill_QA, xmlAttr.band_cloud_QA,
+        xmlAttr.band_shadow_QA, xmlAttr.band_snow_QA,
+        xmlAttr.band_land_water_QA, xmlAttr.band_adjacent_cloud_QA]
+    cols = slice (dst_xoff, dst_xoff + xsize)
+
+    try:
+        # start the reads of the first block
+        blocks = range (0, dst_nrow, BLOCK_LINES)
+        windows = [block_window (y0, dst_nrow, src_yoff, dst_yoff, ysize)
+            for y0 in blocks]
+        reads = read_block (pool, qa_sources, src_bands, src_xoff, xsize,
+            windows[0][1])
+        writes = []
+
+        # loop through the output lines a block at a time
+        for (k, y0) in enumerate (blocks):
+            (nlines, window) = windows[k]
+            in_scene = window is not None
+
+            # wait for the reads of this block, then start the reads of the
+            # next block so they overlap the processing of this one
+            if in_scene:
+                (src_y, nsrc, rows) = window
+                (qa_reads, refl_reads) = reads
+                qa_bands = [qa_read.get() for qa_read in qa_reads]
+                refl = {}
+                for band in refl_reads:
+                    refl[band] = refl_reads[band].get()
+            if k + 1 < len (blocks):
+                reads = read_block (pool, qa_sources, src_bands, src_xoff,
+                    xsize, windows[k+1][1])
+
+            # pack the QA bands and calculate the spectral indices scaled
+            # by 1000.0, with the QA and noData pixels set to noData
+            if in_scene:
+                qa = qa_buf[:nsrc]
+                outputs = {}
+                for index in index_files:
+                    outputs[index] = index_buf[index][:nsrc]
+                qa_indices (qa_bands, refl, qa, outputs, NODATA, compiled,
+                    workspace)
+
+            # fill the output blocks of the resampled bands, the QA mask,
+            # and the spectral indices
+            bufs = block_bufs[k % num_slots]
+            for name in output_band:
+                my_vals = bufs[name][:nlines]
+                if name == 'band_qa':
+                    my_vals.fill (QA_NODATA)
+                    if in_scene:
+                        my_vals[rows, cols] = qa
+                else:
+                    my_vals.fill (NODATA)
+                    if in_scene:
+                        if name in index_files:
+                            my_vals[rows, cols] = outputs[name]
+                        else:
+                            my_vals[rows, cols] = refl[name]
+
+            # finish the writes of the previous block, so each output is
+            # only written by one thread at a time, then start the writes of
+            # this block
+            for write in writes:
+                write.get()
+            writes = []
+            for name in output_band:
+                writes.append (submit_io (pool, output_band[name].WriteArray,
+                    bufs[name][:nlines], 0, y0))
+        # end for y0
+
+        for write in writes:
+            write.get()
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    # close the outputs so the ENVI headers are written
+    for name in output_band.keys():
+        output_band[name] = None
+        output_ds[name] = None
+
+    return SUCCESS
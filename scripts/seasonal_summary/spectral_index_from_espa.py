@@ -8,8 +8,12 @@ from osgeo import osr
 from osgeo import gdal_array
 from osgeo import gdalconst
 from spectral_indices import *
+from qa_mask import *
 from log_it import *
 
+# default memory budget (MB) for the blocks of lines processed at a time
+DEFAULT_BLOCK_MB = 64.0
+
 
 #############################################################################
 # Created on May 1, 2013 by Gail Schmidt, USGS/EROS
@@ -24,6 +28,13 @@ from log_it import *
 #       Modified to use the ESPA internal raw binary format
 #   Updated on 7/8/2015 by Gail Schmidt, USGS/EROS LSRD Project
 #       Thermal band is not used in burned area processing.
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Modified to process the indices a block of lines at a time, within a
+#       memory budget, using float32 math into preallocated buffers.
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Modified to use the compute_indices kernels in spectral_indices.
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Modified to read the bit-packed byte QA mask.
 #
 ############################################################################
 class spectralIndex:
@@ -187,7 +198,8 @@ class spectralIndex:
         self.dataset_mask = None
 
 
-    def createSpectralIndices (self, index_dict, log_handler=None):
+    def createSpectralIndices (self, index_dict, log_handler=None,
+        max_block_mb=DEFAULT_BLOCK_MB):
         """Generates the specified spectral indices.
         Description: createSpectralIndices creates the desired spectral index
             products.  If mask is specified, then a combined mask file is
@@ -203,11 +215,17 @@ class spectralIndex:
           Updated on 5/21/2013 by Gail Schmidt, USGS/EROS LSRD Project
               Modified to process all the indices one line  at a time (vs. the
               entire band) since this is faster.
+          Updated on 10/18/2026 by USGS/EROS LSRD Project
+              Modified to read and write a block of lines at a time, sized to
+              fit within max_block_mb.  The indices are computed in float32
+              into preallocated buffers and rounded directly to int16.
         
         Args:
           index_dict - dictionary of index types (ndvi, nbr, nbr2, ndmi, mask)
               and the associated filename for the index file
           log_handler - open log file for logging or None for stdout
+          max_block_mb - memory budget in megabytes for the buffers of each
+              block of lines
         
         Returns:
             ERROR - error generating the spectral indices or mask
@@ -260,69 +278,71 @@ class spectralIndex:
             my_band.SetNoDataValue(nodata)
             output_band[index] = my_band
 
-        # loop through each line in the image and process
-        for y in range (0, nrow):
-            # read the QA data
-            qa = self.band_mask.ReadAsArray(0, y, ncol, 1)
+        # determine which input bands are needed for these indices
+        input_band = {'band3': self.band3, 'band4': self.band4,
+            'band5': self.band5, 'band7': self.band7}
+        needed_bands = index_bands (index_dict.keys())
+
+        # determine the number of lines per block from the memory budget.
+        # each line needs a float32 buffer and a noData mask for each input
+        # band, a float32 buffer for each index, the byte QA and its mask,
+        # the float32 and boolean scratch, and the int16 output.
+        bytes_per_line = ncol * (5 * len(needed_bands) + 4 * num_indices +  \
+            1 + 1 + 4 + 1 + 2)
+        block_lines = int(max_block_mb * 1024 * 1024 / bytes_per_line)
+        block_lines = max (1, min (block_lines, nrow))
+        msg = '    Processing %d lines per block' % block_lines
+        logIt (msg, log_handler)
+
+        # preallocate the buffers for the blocks
+        shape = (block_lines, ncol)
+        band_buf = {}
+        band_mask_buf = {}
+        for band in needed_bands:
+            band_buf[band] = empty (shape, dtype=float32)
+            band_mask_buf[band] = empty (shape, dtype=bool)
+        index_buf = {}
+        for index in index_dict.keys():
+            index_buf[index] = empty (shape, dtype=float32)
+        qa_mask = empty (shape, dtype=bool)
+        scratch = empty (shape, dtype=float32)
+        mask = empty (shape, dtype=bool)
+        out = empty (shape, dtype=int16)
+
+        # loop through each block of lines in the image and process
+        for y in range (0, nrow, block_lines):
+            nlines = min (block_lines, nrow - y)
+
+            # read the QA data and the bands needed for the indices, reading
+            # each band only once for all the indices
+            qa = self.band_mask.ReadAsArray(0, y, ncol, nlines)
+            qa_is_bad (qa, out=qa_mask[:nlines])
+            bands = {}
+            band_masks = {}
+            for band in needed_bands:
+                bands[band] = band_buf[band][:nlines]
+                band_masks[band] = band_mask_buf[band][:nlines]
+                input_band[band].ReadAsArray(0, y, ncol, nlines,
+                    buf_obj=bands[band])
+            outputs = {}
+            for index in index_dict.keys():
+                outputs[index] = index_buf[index][:nlines]
+
+            # calculate the spectral indices scaled by 1000.0, with the QA
+            # and noData pixels set to noData
+            compute_indices (bands, outputs, scratch[:nlines], mask[:nlines],
+                band_masks, nodata, 1000.0, qa_mask[:nlines])
 
-            # loop through the indices specified and process each index product
-            # reusing the line from each band where possible
-            b3 = b4 = b5 = b7 = None
+            # round to int16 and write the outputs
             for index in index_dict.keys():
-                # calculate the spectral index
-                if index == 'nbr':
-                    if b4 is None:
-                        b4 = self.band4.ReadAsArray(0, y, ncol,1)
-                    if b7 is None:
-                        b7 = self.band7.ReadAsArray(0, y, ncol, 1)
-                    newVals = 1000.0 * NBR(b4, b7, nodata)
-                    newVals[qa < 0] = nodata
-
-                    # write the output 
-                    my_output_band = output_band[index]
-                    my_output_band.WriteArray(newVals, 0, y)
-
-                elif index == 'nbr2':
-                    if b5 is None:
-                        b5 = self.band5.ReadAsArray(0, y, ncol, 1)
-                    if b7 is None:
-                        b7 = self.band7.ReadAsArray(0, y, ncol, 1)
-                    newVals = 1000.0 * NBR2(b5, b7, nodata)
-                    newVals[qa < 0] = nodata
-
-                    # write the output 
-                    my_output_band = output_band[index]
-                    my_output_band.WriteArray(newVals, 0, y)
-
-                elif index == 'ndmi':
-                    if b4 is None:
-                        b4 = self.band4.ReadAsArray(0, y, ncol, 1)
-                    if b5 is None:
-                        b5 = self.band5.ReadAsArray(0, y, ncol, 1)
-                    newVals = 1000.0 * NDMI(b4, b5, nodata)
-                    newVals[qa < 0] = nodata
-
-                    # write the output 
-                    my_output_band = output_band[index]
-                    my_output_band.WriteArray(newVals, 0, y)
-
-                elif index == 'ndvi':
-                    if b4 is None:
-                        b4 = self.band4.ReadAsArray(0, y, ncol, 1)
-                    if b3 is None:
-                        b3 = self.band3.ReadAsArray(0, y, ncol, 1)
-                    newVals = 1000.0 * NDVI(b3, b4, nodata)
-                    newVals[qa < 0] = nodata
-
-                    # write the output 
-                    my_output_band = output_band[index]
-                    my_output_band.WriteArray(newVals, 0, y)
-                # end if
+                round_to_int16 (outputs[index], out[:nlines])
+                output_band[index].WriteArray(out[:nlines], 0, y)
             # end for index
         # end for y
 
-        # cleanup the bands
-        b3 = b4 = b5 = b7 = None
+        # cleanup the buffers
+        band_buf = band_mask_buf = index_buf = None
+        qa_mask = scratch = mask = out = None
 
         # cleanup
         del (output_band)
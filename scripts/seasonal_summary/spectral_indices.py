@@ -14,125 +14,311 @@ from numpy import *
 #   1. Many of the calculations kick off a divide by zero error, if the
 #      pixel values are both zero.  The divide by zero warning is shut
 #      off for this processing.
-#   2. To deal with infinity and NaN values, the nan_to_num method is used
-#      after the spectral index calculation to handle any associated NaNs
-#      due to the denomerator being zero.
+#   2. NaN values due to the denomerator being zero are replaced by 0
+#      after the spectral index calculation.
+#
+# History:
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Added the *_kernel functions, which compute each index in float32
+#       into preallocated output and scratch buffers via out= ufuncs, and
+#       compute_indices to generate several indices at once from the same
+#       band buffers and noData masks.  The original functions now wrap the
+#       kernels.  They return float32, no longer call seterr on each call,
+#       and NaNs are now replaced by 0 (the nan_to_num result was
+#       previously discarded).
 #######################################################################
 
+########################################################################
+# Index kernels.  Each kernel computes the index from float32 band arrays
+# into the preallocated float32 out array, using scratch (same shape as
+# out) for any intermediate values.  NaN and noData handling is done by
+# compute_indices, not the kernels.
+########################################################################
+
+def normalized_difference_kernel(a, b, out, scratch):
+    """Computes (a - b) / (a + b).
+    """
+    subtract(a, b, out=out)
+    add(a, b, out=scratch)
+    divide(out, scratch, out=out)
+    return out
+
 # Normalized Burn Ratios
 # From Key and Benson 1999, Measuring and remote sensing of burn severity. In Proceedings of the Joint Fire Science Conference and Workshop, vol. II, Boise, ID, 15-17 June 1999. University of Idaho and International Association of Wildland Fire
-def NBR(b4, b7, nodata=-9999):
+def nbr_kernel(b4, b7, out, scratch):
     """Computes the normalized burn index.
     """
-    x = (b4-b7) / (b4+b7)
-    nan_to_num(x)
-    x[(b4==nodata) | (b7==nodata)] = nodata
-    return(x)
+    return normalized_difference_kernel(b4, b7, out, scratch)
 
-def NBR2(b5, b7, nodata=-9999):
+def nbr2_kernel(b5, b7, out, scratch):
     """Computes the normalized burn index 2.
     """
-    seterr(divide= 'ignore')  # ignore divide by zero
-    x = (b5-b7) / (b5+b7)
-    nan_to_num(x)
-    x[(b5==nodata) | (b7==nodata)] = nodata
-    return(x)
+    return normalized_difference_kernel(b5, b7, out, scratch)
 
 # Normalized Difference Moisture Index
-def NDMI(b4, b5, nodata=-9999):
+def ndmi_kernel(b4, b5, out, scratch):
     """Computes the normalized difference moisture index.
     """
-    seterr(divide= 'ignore')  # ignore divide by zero
-    x = (b4-b5) / (b4+b5)
-    nan_to_num(x)
-    x[(b4==nodata) | (b5==nodata)] = nodata
-    return(x)
+    return normalized_difference_kernel(b4, b5, out, scratch)
 
 # Normalized Difference Vegetation Index
 # From Rouse et al. 1973, Monitoring vegetation systems in the Great Plains with ERTS. In: Proc. Third ERTS Symposium, NASA, SP-351, vol. 1, pp. 309-317
-def NDVI(b3, b4, nodata=-9999):
+def ndvi_kernel(b3, b4, out, scratch):
     """Computes the normalized difference vegetation index.
     """
-    seterr(divide= 'ignore')  # ignore divide by zero
-    x = (b4-b3) / (b4+b3)
-    nan_to_num(x)
-    x[(b3==nodata) | (b4==nodata)] = nodata
-    return(x)
+    return normalized_difference_kernel(b4, b3, out, scratch)
 
 # Char Soil Index
 # Smith et al. 2005, Testing the potential of multi-spectral remote sensing for retrospectively estimating fire severity in African savanna environments. Remote Sensing of Environment 97 (1):92-115
-def CSI(b4, b5, nodata=-9999):
+def csi_kernel(b4, b5, out, scratch):
     """Computes the char soil index.
     """
-    seterr(divide= 'ignore')  # ignore divide by zero
-    x = b4/b5
-    nan_to_num(x)
-    x[(b4==nodata) | (b5==nodata)] = nodata
-    return(x)
+    divide(b4, b5, out=out)
+    return out
 
 # Mid-Infrared Burn Index 
 # Trigg and Flasse 2001, An evaluation of different bi-spectral spaces for discriminating burned shrub savanna.  International Journal of Remote Sensing 22(13):2641-2647
-def MIRBI(b5, b7, nodata=-9999):
+def mirbi_kernel(b5, b7, out, scratch):
     """Computes the mid-infrared burn index.
     """
-    x = ( (10*b7) - (9.5*b5) + 2 )
-    x[(b5==nodata) | (b7==nodata)] = nodata
-    return(x)
+    multiply(b7, 10.0, out=out)
+    multiply(b5, 9.5, out=scratch)
+    subtract(out, scratch, out=out)
+    add(out, 2.0, out=out)
+    return out
+
+def inverse_distance_kernel(a, a_offset, b, b_offset, out, scratch):
+    """Computes 1 / ((a - a_offset)^2 + (b - b_offset)^2).
+    """
+    subtract(a, a_offset, out=out)
+    square(out, out=out)
+    subtract(b, b_offset, out=scratch)
+    square(scratch, out=scratch)
+    add(out, scratch, out=out)
+    divide(1.0, out, out=out)
+    return out
 
 # Burned Area Index
 # Martin et al. 2005, Performanec of a burned-area index (BAIM) for mapping Mediterranean burned scars from MODIS data. In J. Ria, F. Perez-Cabello, and E. Chuvieco (Editors), Proceedings of the 5th International Workshop on Remote Sensing and GIS Applications to Forest Fire Management: Fire Effects Assessment (pp. 193-198). Paris: Universidad de Zaragoza, GOFC-GOLD, EARSel.
-def BAI(b3, b4, nodata=-9999):
+def bai_kernel(b3, b4, out, scratch):
     """Computes the burned area index.
     """
-    x = 1 / ( pow(b4-0.06,2) + pow(b3-0.1,2) )
-    x[(b4==nodata) | (b3==nodata)] = nodata
-    return(x)
+    return inverse_distance_kernel(b4, 0.06, b3, 0.1, out, scratch)
 
 # Martin et al. 2005, 
-def BAIM(b4, b5, nodata=-9999):
+def baim_kernel(b4, b5, out, scratch):
     """Computes the burned area index for mapping Mediterranean burn scars.
     """
-    x = 1 / ( pow(b4-0.05,2) + pow(b5-0.2,2) )
-    x[(b4==nodata) | (b5==nodata)] = nodata
-    return(x)
+    return inverse_distance_kernel(b4, 0.05, b5, 0.2, out, scratch)
 
-def BAIM2(b4, b7, nodata=-9999):
+def baim2_kernel(b4, b7, out, scratch):
     """Computes the burned area index for mapping Mediterranean burn scars 2.
     """
-    x = ( 1 / ( pow(b4-0.05,2) + pow(b7-0.2,2) ) )
-    x[(b4==nodata) | (b7==nodata)] = nodata
-    return(x)
+    return inverse_distance_kernel(b4, 0.05, b7, 0.2, out, scratch)
 
 # Soil-Adjusted Vegetation Index
 # Huete 1998, A soil adjusted vegetation index (SAVI). Remote Sensing of Environment, 25(3):295-309
-def SAVI(b3, b4, nodata=-9999):
+def savi_kernel(b3, b4, out, scratch):
     """Computes the soil adjusted vegetation index.
     """
-    seterr(divide= 'ignore')  # ignore divide by zero
-    x = ( 1.5 * (b4-b3) / (b4 + b3 + 0.5) )
-    nan_to_num(x)
-    x[(b3==nodata) | (b4==nodata)] = nodata
-    return(x)
+    subtract(b4, b3, out=out)
+    add(b4, b3, out=scratch)
+    add(scratch, 0.5, out=scratch)
+    divide(out, scratch, out=out)
+    multiply(out, 1.5, out=out)
+    return out
 
 # Enhanced Vegetaion Index
 # Huete et al. 2002, Overview of the radiometric and biophysical performance of the MODIS vegetation indices. Remote Sensing of Environment, 83(1-2):195-213
+def evi_kernel(b1, b3, b4, out, scratch):
+    """Computes the enhanced vegetation index.
+    """
+    # denominator b4 + 6*b3 - 7.5*b1 + 1, using out for the b1 term
+    multiply(b3, 6.0, out=scratch)
+    add(scratch, b4, out=scratch)
+    add(scratch, 1.0, out=scratch)
+    multiply(b1, 7.5, out=out)
+    subtract(scratch, out, out=scratch)
+
+    # numerator 2.5 * (b4 - b3)
+    subtract(b4, b3, out=out)
+    multiply(out, 2.5, out=out)
+    divide(out, scratch, out=out)
+    return out
+
 # Enhanced Vegetation Index 2
+# Jiang et al. 2008, Development of a two-band enhanced vegetation index without a blue band. Remote Sensing of Environment 112(10):3833-3845
+def evi2_kernel(b3, b4, out, scratch):
+    """Computes the enhanced vegetation index without a blue band.
+    """
+    multiply(b3, 2.4, out=scratch)
+    add(scratch, b4, out=scratch)
+    add(scratch, 1.0, out=scratch)
+    subtract(b4, b3, out=out)
+    multiply(out, 2.5, out=out)
+    divide(out, scratch, out=out)
+    return out
+
+# kernel and input bands for each index, in the order the kernel takes them
+INDEX_KERNELS = {
+    'nbr': (nbr_kernel, ('band4', 'band7')),
+    'nbr2': (nbr2_kernel, ('band5', 'band7')),
+    'ndmi': (ndmi_kernel, ('band4', 'band5')),
+    'ndvi': (ndvi_kernel, ('band3', 'band4')),
+    'csi': (csi_kernel, ('band4', 'band5')),
+    'mirbi': (mirbi_kernel, ('band5', 'band7')),
+    'bai': (bai_kernel, ('band3', 'band4')),
+    'baim': (baim_kernel, ('band4', 'band5')),
+    'baim2': (baim2_kernel, ('band4', 'band7')),
+    'savi': (savi_kernel, ('band3', 'band4')),
+    'evi': (evi_kernel, ('band1', 'band3', 'band4')),
+    'evi2': (evi2_kernel, ('band3', 'band4'))}
+
+
+def index_bands(indices):
+    """Returns the list of bands needed for the specified indices.
+    """
+    bands = []
+    for index in indices:
+        for band in INDEX_KERNELS[index][1]:
+            if band not in bands:
+                bands.append(band)
+    return bands
+
+
+def compute_indices(bands, outputs, scratch, mask, band_masks,
+    nodata=-9999, scale=1.0, qa_mask=None):
+    """Computes several spectral indices from the same band arrays.
+    Description: Each band is compared against noData once, and those masks
+        are shared by all of the indices which use the band.  Each index is
+        computed by its kernel into its output array, NaNs (from 0/0) are
+        replaced by 0, the index is scaled, and then the combined noData
+        mask of its bands and the QA is applied.  No arrays are allocated.
+
+    Args:
+      bands - dictionary of float32 band arrays (band1, band3, band4, ...)
+      outputs - dictionary of float32 output arrays, keyed by index name;
+          the indices computed are the keys of this dictionary
+      scratch - float32 scratch array, same shape as the bands
+      mask - boolean scratch array, same shape as the bands
+      band_masks - dictionary of boolean scratch arrays for the noData
+          masks of each band, same shape as the bands
+      nodata - noData value of the bands and the outputs
+      scale - scale factor applied to the indices (e.g. 1000.0)
+      qa_mask - optional boolean array flagging pixels to be set to noData
+
+    Returns:
+      outputs
+    """
+    with errstate(divide='ignore', invalid='ignore'):
+        for band in index_bands(outputs.keys()):
+            equal(bands[band], nodata, out=band_masks[band])
+
+        for index in outputs.keys():
+            (kernel, kernel_bands) = INDEX_KERNELS[index]
+            out = outputs[index]
+            kernel(*([bands[band] for band in kernel_bands] + [out, scratch]))
+
+            isnan(out, out=mask)
+            copyto(out, 0.0, where=mask)
+            if scale != 1.0:
+                multiply(out, scale, out=out)
+
+            copyto(mask, band_masks[kernel_bands[0]])
+            for band in kernel_bands[1:]:
+                logical_or(mask, band_masks[band], out=mask)
+            if qa_mask is not None:
+                logical_or(mask, qa_mask, out=mask)
+            copyto(out, nodata, where=mask)
+
+    return outputs
+
+
+def round_to_int16(vals, out):
+    """Rounds the float32 values to the int16 out array, clipping to the
+    int16 range.  vals is modified.
+    """
+    rint(vals, out=vals)
+    clip(vals, -32768, 32767, out=vals)
+    copyto(out, vals, casting='unsafe')
+    return out
+
+
+def compute_index(index, band_list, nodata):
+    """Computes a single index, allocating the output and scratch arrays.
+    """
+    band_list = [asarray(band, dtype=float32) for band in band_list]
+    bands = dict(zip(INDEX_KERNELS[index][1], band_list))
+    shape = band_list[0].shape
+    outputs = {index: empty(shape, dtype=float32)}
+    band_masks = {}
+    for band in bands:
+        band_masks[band] = empty(shape, dtype=bool)
+    compute_indices(bands, outputs, empty(shape, dtype=float32),
+        empty(shape, dtype=bool), band_masks, nodata)
+    return outputs[index]
+
+
+########################################################################
+# Single index functions, which allocate and return the index array.
+########################################################################
+
+def NBR(b4, b7, nodata=-9999):
+    """Computes the normalized burn index.
+    """
+    return compute_index('nbr', [b4, b7], nodata)
+
+def NBR2(b5, b7, nodata=-9999):
+    """Computes the normalized burn index 2.
+    """
+    return compute_index('nbr2', [b5, b7], nodata)
+
+def NDMI(b4, b5, nodata=-9999):
+    """Computes the normalized difference moisture index.
+    """
+    return compute_index('ndmi', [b4, b5], nodata)
+
+def NDVI(b3, b4, nodata=-9999):
+    """Computes the normalized difference vegetation index.
+    """
+    return compute_index('ndvi', [b3, b4], nodata)
+
+def CSI(b4, b5, nodata=-9999):
+    """Computes the char soil index.
+    """
+    return compute_index('csi', [b4, b5], nodata)
+
+def MIRBI(b5, b7, nodata=-9999):
+    """Computes the mid-infrared burn index.
+    """
+    return compute_index('mirbi', [b5, b7], nodata)
+
+def BAI(b3, b4, nodata=-9999):
+    """Computes the burned area index.
+    """
+    return compute_index('bai', [b3, b4], nodata)
+
+def BAIM(b4, b5, nodata=-9999):
+    """Computes the burned area index for mapping Mediterranean burn scars.
+    """
+    return compute_index('baim', [b4, b5], nodata)
+
+def BAIM2(b4, b7, nodata=-9999):
+    """Computes the burned area index for mapping Mediterranean burn scars 2.
+    """
+    return compute_index('baim2', [b4, b7], nodata)
+
+def SAVI(b3, b4, nodata=-9999):
+    """Computes the soil adjusted vegetation index.
+    """
+    return compute_index('savi', [b3, b4], nodata)
+
 def EVI(b1, b3, b4, nodata=-9999):
     """Computes the enhanced vegetation index.
     """
-    seterr(divide= 'ignore')  # ignore divide by zero
-    x = ( 2.5 * (b4-b3) / (b4 + 6*b3 - 7.5*b1 + 1) )
-    nan_to_num(x)
-    x[(b1==nodata) | (b3==nodata)| (b4==nodata)] = nodata
-    return(x)
+    return compute_index('evi', [b1, b3, b4], nodata)
 
-# Jiang et al. 2008, Development of a two-band enhanced vegetation index without a blue band. Remote Sensing of Environment 112(10):3833-3845
 def EVI2(b3, b4, nodata=-9999):
     """Computes the enhanced vegetation index without a blue band.
     """
-    seterr(divide= 'ignore')  # ignore divide by zero
-    x = ( 2.5 * (b4-b3) / (b4 + 2.4*b3 + 1) ) 
-    nan_to_num(x)
-    x[(b3==nodata) | (b4==nodata)] = nodata
-    return(x)
-
+    return compute_index('evi2', [b3, b4], nodata)
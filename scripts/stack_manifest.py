@@ -0,0 +1,368 @@
+#! /usr/bin/env python
+import os
+import json
+import hashlib
+
+from log_it import *
+from stack_table import *
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created a class to keep track of the scenes which have been processed for
+#     a temporal stack, so that only the scenes and years affected by new or
+#     changed scenes need to be reprocessed.
+#
+# History:
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       stackScenes uses the StackTable of the stack.
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       affected_summary_years supports custom season definitions.
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Record the size and modification time of the outputs of each stage,
+#       so outputs which were deleted or modified are processed again.
+#
+# Notes:
+#   The manifest is a JSON file in the input directory of the stack.  Each
+#   processing stage keeps its own list of scenes, since the stack stage
+#   (seasonal summaries and annual maximums) and the burned area stage
+#   (regressions, thresholds, and annual summaries) may have last succeeded
+#   with different versions of the stack.  The outputs of each stage are
+#   recorded per scene and per year, and only the outputs which existed when
+#   the stage was recorded are checked.
+############################################################################
+
+# name of the manifest file, written to the input directory of the stack
+MANIFEST_FILE = 'stack_manifest.json'
+
+
+def affected_summary_years (scenes, seasons=None):
+    """Returns the years of seasonal summaries affected by the scenes.
+    Description: Determines which years of seasonal summaries use the
+        specified scenes.  December scenes are part of the winter summary for
+        the following year, or for other season definitions, any month of
+        the previous year used by a season.
+
+    History:
+      Created on October 18, 2026 by USGS/EROS LSRD Project
+      Updated on October 18, 2026 by USGS/EROS LSRD Project
+          Added seasons for custom season definitions.
+
+    Args:
+      scenes - list of scene dictionaries from StackManifest.stackScenes
+      seasons - list of (season, months) tuples; DEFAULT_SEASONS if None
+
+    Returns:
+      set of years
+    """
+
+    if seasons is None:
+        seasons = DEFAULT_SEASONS
+    prev_months = set([-month for (season, months) in seasons
+        for month in months if month < 0])
+
+    years = set()
+    for scene in scenes:
+        years.add (scene['year'])
+        if scene['month'] in prev_months:
+            years.add (scene['year'] + 1)
+
+    return years
+
+
+def output_signature (filename):
+    """Returns the signature of an output file.
+
+    History:
+      Created on October 18, 2026 by USGS/EROS LSRD Project
+
+    Args:
+      filename - name of the output file
+
+    Returns:
+      None - the file doesn't exist
+      [size, modification time] of the file
+    """
+
+    try:
+        info = os.stat (filename)
+    except OSError:
+        return None
+
+    return [info.st_size, info.st_mtime]
+
+
+def output_signatures (filenames):
+    """Returns the signatures of the output files which exist.
+
+    History:
+      Created on October 18, 2026 by USGS/EROS LSRD Project
+
+    Args:
+      filenames - list of output files
+
+    Returns:
+      dictionary of signatures from output_signature keyed by the filename
+    """
+
+    signatures = {}
+    for filename in filenames:
+        signature = output_signature (filename)
+        if signature is not None:
+            signatures[filename] = signature
+
+    return signatures
+
+
+def outputs_changed (signatures):
+    """Returns whether any of the output files are missing or changed.
+
+    History:
+      Created on October 18, 2026 by USGS/EROS LSRD Project
+
+    Args:
+      signatures - dictionary of signatures from output_signatures
+
+    Returns:
+      True if an output file is missing or its signature differs
+    """
+
+    for filename in signatures:
+        if output_signature (filename) != list(signatures[filename]):
+            return True
+
+    return False
+
+
+class StackManifest():
+    """Class for handling the manifest of processed scenes in a temporal
+       stack.
+    """
+
+    def __init__ (self, manifest_file, log_handler=None):
+        """Initializes the manifest, reading the existing manifest file if
+           one exists.
+
+        Args:
+          manifest_file - name of the JSON manifest file
+          log_handler - handler for the logging information
+        """
+
+        self.manifest_file = manifest_file
+        self.log_handler = log_handler
+        self.manifest = {'stages': {}}
+
+        if os.path.exists (manifest_file):
+            try:
+                fd = open (manifest_file, 'r')
+                self.manifest = json.load (fd)
+                fd.close()
+            except ValueError:
+                msg = 'Unable to parse the stack manifest (%s). All scenes ' \
+                    'will be reprocessed.' % manifest_file
+                logIt (msg, self.log_handler)
+
+
+    def sceneHash (self, xml_file):
+        """Returns the content hash of the scene.
+        Description: The XML metadata file is used as the content of the
+            scene, since it identifies the band files along with their
+            production dates.  The XML file remains in the stack even if the
+            source bands are deleted after resampling.
+
+        Args:
+          xml_file - name of the XML file for the scene
+
+        Returns:
+          hex digest of the XML file
+        """
+
+        md5 = hashlib.md5()
+        fd = open (xml_file, 'rb')
+        for chunk in iter (lambda: fd.read (65536), ''):
+            md5.update (chunk)
+        fd.close()
+
+        return md5.hexdigest()
+
+
+    def stackScenes (self, stack):
+        """Returns the scenes in the stack along with their hashes.
+
+        Args:
+          stack - StackTable, or name of the stack file generated by
+              stack_metadata
+
+        Returns:
+          dictionary of scene dictionaries (file, year, month, hash) keyed by
+          the base name of the XML file
+        """
+
+        scenes = {}
+        stack = read_stack_table (stack, self.log_handler)
+        for row in stack.data:
+            xml_file = row['file']
+            scenes[os.path.basename (xml_file)] = {
+                'file': xml_file,
+                'year': int(row['year']),
+                'month': int(row['month']),
+                'hash': self.sceneHash (xml_file)}
+
+        return scenes
+
+
+    def extentSignature (self, bounding_extents_file):
+        """Returns a signature for the maximum extent of the stack.
+
+        Args:
+          bounding_extents_file - name of the bounding extents file generated
+              by stack_metadata
+
+        Returns:
+          the contents of the bounding extents file, with white space removed
+        """
+
+        fd = open (bounding_extents_file, 'r')
+        signature = ''.join (fd.read().split())
+        fd.close()
+
+        return signature
+
+
+    def changedScenes (self, stage, scenes, extent):
+        """Returns the scenes which have changed since the stage was last
+           processed.
+        Description: Compares the current scenes in the stack against the
+            scenes recorded for the stage.  Scenes which are new, have a
+            different hash, or have been removed from the stack are returned.
+
+        Args:
+          stage - name of the processing stage
+          scenes - dictionary of scenes from stackScenes
+          extent - extent signature from extentSignature
+
+        Returns:
+          None - the stage has not been processed or the maximum extent has
+              changed, so all scenes need to be reprocessed
+          changed - list of scene dictionaries which are new, have changed,
+              or have been removed
+        """
+
+        if stage not in self.manifest['stages']:
+            return None
+
+        prev = self.manifest['stages'][stage]
+        if prev['extent'] != extent:
+            msg = 'Maximum extent of the stack has changed since the last ' \
+                'run. All scenes will be reprocessed.'
+            logIt (msg, self.log_handler)
+            return None
+
+        changed = []
+        for name in scenes:
+            if (name not in prev['scenes']) or  \
+               (prev['scenes'][name]['hash'] != scenes[name]['hash']):
+                changed.append (scenes[name])
+
+        for name in prev['scenes']:
+            if name not in scenes:
+                changed.append (prev['scenes'][name])
+
+        return changed
+
+
+    def changedOutputs (self, stage):
+        """Returns the scenes and years whose outputs have changed since the
+           stage was last processed.
+        Description: Compares the outputs recorded for the stage against the
+            files on disk.  Outputs which have been deleted, or whose size or
+            modification time differs, need to be processed again.
+
+        History:
+          Created on October 18, 2026 by USGS/EROS LSRD Project
+
+        Args:
+          stage - name of the processing stage
+
+        Returns:
+          (names, years) - list of the names of the scenes, and set of the
+              years, with missing or changed outputs
+        """
+
+        names = []
+        years = set()
+        if stage not in self.manifest['stages']:
+            return (names, years)
+
+        outputs = self.manifest['stages'][stage].get ('outputs', {})
+        for (name, signatures) in outputs.get ('scenes', {}).items():
+            if outputs_changed (signatures):
+                names.append (name)
+        for (year, signatures) in outputs.get ('years', {}).items():
+            if outputs_changed (signatures):
+                years.add (int(year))
+
+        if len(names) > 0 or len(years) > 0:
+            msg = 'Outputs of the %s stage are missing or changed for ' \
+                'scenes %s and years %s' % (stage, sorted (names),
+                sorted (years))
+            logIt (msg, self.log_handler)
+
+        return (names, years)
+
+
+    def updateStage (self, stage, scenes, extent, scene_outputs=None,
+        year_outputs=None):
+        """Records the scenes which were processed for the stage.
+
+        History:
+          Updated on October 18, 2026 by USGS/EROS LSRD Project
+              Added scene_outputs and year_outputs to record the outputs
+              of the stage.
+
+        Args:
+          stage - name of the processing stage
+          scenes - dictionary of scenes from stackScenes
+          extent - extent signature from extentSignature
+          scene_outputs - dictionary of the lists of output files of each
+              scene, keyed by the name of the scene
+          year_outputs - dictionary of the lists of output files of each
+              year, keyed by the year
+        """
+
+        outputs = {'scenes': {}, 'years': {}}
+        for name in (scene_outputs or {}):
+            outputs['scenes'][name] = output_signatures (scene_outputs[name])
+        for year in (year_outputs or {}):
+            outputs['years'][str(year)] =  \
+                output_signatures (year_outputs[year])
+
+        self.manifest['stages'][stage] = {'extent': extent, 'scenes': scenes,
+            'outputs': outputs}
+
+
+    def write (self):
+        """Writes the manifest file.
+        Description: The manifest is written to a temporary file and then
+            renamed, so an interrupted write doesn't leave a partial
+            manifest behind.
+
+        Returns:
+            ERROR - error writing the manifest
+            SUCCESS - successful processing
+        """
+
+        temp_file = self.manifest_file + '.tmp'
+        try:
+            fd = open (temp_file, 'w')
+            json.dump (self.manifest, fd, indent=2, sort_keys=True)
+            fd.close()
+            os.rename (temp_file, self.manifest_file)
+        except (IOError, OSError), e:
+            msg = 'Unable to write the stack manifest (%s): %s' %  \
+                (self.manifest_file, str(e))
+            logIt (msg, self.log_handler)
+            return ERROR
+
+        return SUCCESS
+
+######end of StackManifest class######
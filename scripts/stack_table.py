@@ -0,0 +1,362 @@
+#! /usr/bin/env python
+import os
+import csv
+
+import numpy
+
+from log_it import *
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created a typed, in-memory table of the scenes in a temporal stack, so the
+#     stack file is parsed once and the table is passed between the
+#     processing stages instead of each stage rereading the CSV file.
+#
+# History:
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Added custom season definitions and the per-scene product filenames,
+#       so the table serves as the temporal index of the stack for all of
+#       the processing stages.
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Index every year from the first year of the stack through the year
+#       after the last, so the winter of a year without scenes still
+#       includes December of the previous year.
+#
+# Notes:
+#   1. The columns and their types follow the stack file written by
+#      stack_metadata.  The file column is named 'file' (numpy.recfromcsv
+#      renamed it to 'file_').
+#   2. The table is saved next to the CSV stack file as a compressed .npz
+#      file.  read_stack_table uses the .npz file when it is newer than the
+#      CSV file, so the standalone applications skip the CSV parsing too.
+#   3. The rows of each year and of each season of each year are indexed
+#      when the table is created, for every year from the first year of the
+#      stack through the year after the last, including the years which
+#      have no scenes.  By default winter includes December of
+#      the previous year, matching the seasonal summaries.  Other season
+#      definitions may be specified, where a negative month is that month
+#      of the previous year.
+#   4. The filenames of the per-scene products (resampled bands, QA mask,
+#      and spectral indices) are derived once for the input directory of
+#      the stack via derivePaths.
+############################################################################
+
+# columns of the stack file and their types; the string columns are sized
+# to the longest value in the stack
+STACK_COLUMNS = [('file', str), ('year', numpy.int32), ('season', str),
+    ('month', numpy.int32), ('day', numpy.int32), ('julian', numpy.int32),
+    ('path', numpy.int32), ('row', numpy.int32), ('satellite', str),
+    ('west', numpy.float64), ('east', numpy.float64),
+    ('north', numpy.float64), ('south', numpy.float64),
+    ('nrow', numpy.int32), ('ncol', numpy.int32), ('dx', numpy.float32),
+    ('dy', numpy.float32), ('utm_zone', numpy.int32)]
+
+# default seasons of the seasonal summaries, along with their months.  a
+# negative month is that month of the previous year.
+DEFAULT_SEASONS = [('winter', [-12, 1, 2]), ('spring', [3, 4, 5]),
+    ('summer', [6, 7, 8]), ('fall', [9, 10, 11])]
+SEASONS = [season for (season, months) in DEFAULT_SEASONS]
+
+# per-scene products; the directory relative to the input directory of the
+# stack and the suffix which replaces .xml in the scene filename
+SCENE_PRODUCTS = {
+    'band1': ('refl/', '_sr_band1.img'),
+    'band2': ('refl/', '_sr_band2.img'),
+    'band3': ('refl/', '_sr_band3.img'),
+    'band4': ('refl/', '_sr_band4.img'),
+    'band5': ('refl/', '_sr_band5.img'),
+    'band7': ('refl/', '_sr_band7.img'),
+    'mask': ('mask/', '_mask.img'),
+    'ndvi': ('ndvi/', '_ndvi.img'),
+    'ndmi': ('ndmi/', '_ndmi.img'),
+    'nbr': ('nbr/', '_nbr.img'),
+    'nbr2': ('nbr2/', '_nbr2.img')}
+
+
+def stack_npz_file (stack_file):
+    """Returns the name of the .npz file for the CSV stack file."""
+
+    return os.path.splitext (stack_file)[0] + '.npz'
+
+
+def parse_seasons (seasons_str):
+    """Parses a season definition string.
+
+    Args:
+      seasons_str - seasons separated by ';', each of which is the season
+          name and its comma-separated months, i.e. 'winter=-12,1,2;...'.
+          a negative month is that month of the previous year.
+
+    Returns:
+      list of (season, months) tuples
+
+    Raises:
+      ValueError - the season definition is not valid
+    """
+
+    seasons = []
+    for season_str in seasons_str.split (';'):
+        if season_str.strip() == '':
+            continue
+        (season, sep, months_str) = season_str.partition ('=')
+        season = season.strip()
+        if sep == '' or season == '':
+            raise ValueError ('invalid season definition: ' + season_str)
+        months = [int(month) for month in months_str.split (',')]
+        seasons.append ((season, months))
+
+    check_seasons (seasons)
+    return seasons
+
+
+def check_seasons (seasons):
+    """Verifies the season definitions.
+
+    Args:
+      seasons - list of (season, months) tuples
+
+    Raises:
+      ValueError - the season definitions are not valid
+    """
+
+    if len(seasons) == 0:
+        raise ValueError ('no seasons are defined')
+
+    names = [season for (season, months) in seasons]
+    if len(set(names)) != len(names):
+        raise ValueError ('duplicate season names: ' + ', '.join(names))
+
+    for (season, months) in seasons:
+        if len(months) == 0:
+            raise ValueError ('season %s has no months' % season)
+        for month in months:
+            if abs(month) < 1 or abs(month) > 12:
+                raise ValueError ('invalid month %d for season %s' %  \
+                    (month, season))
+
+
+class StackTable():
+    """Class for handling the table of scenes in a temporal stack.
+    """
+
+    def __init__ (self, data, seasons=None):
+        """Initializes the table and indexes the rows by year and season.
+
+        Args:
+          data - numpy structured array with the STACK_COLUMNS
+          seasons - list of (season, months) tuples; DEFAULT_SEASONS if None
+        """
+
+        if seasons is None:
+            seasons = DEFAULT_SEASONS
+        check_seasons (seasons)
+
+        self.data = data
+        self.seasons = seasons
+        self.season_names = [season for (season, months) in seasons]
+        self.years = numpy.unique (data['year'])
+        self.paths = {}
+        self.paths_dir = None
+
+        # index every year of the stack, including the years without any
+        # scenes and the year after the last, since their seasons may
+        # include months of the previous year
+        index_years = []
+        if len(self.years) > 0:
+            index_years = range (int(self.years[0]), int(self.years[-1]) + 2)
+
+        empty = numpy.zeros ((0,), dtype=numpy.intp)
+        self.year_rows = {}
+        month_rows = {}
+        for year in index_years:
+            rows = numpy.flatnonzero (data['year'] == year)
+            self.year_rows[year] = rows
+            months = data['month'][rows]
+            for month in range (1, 13):
+                month_rows[(year, month)] = rows[months == month]
+
+        self.season_rows = {}
+        for year in index_years:
+            for (season, months) in seasons:
+                rows = []
+                for month in months:
+                    if month < 0:
+                        rows.append (month_rows.get ((year-1, -month), empty))
+                    else:
+                        rows.append (month_rows[(year, month)])
+                self.season_rows[(year, season)] = numpy.concatenate (rows)
+
+
+    def __len__ (self):
+        return self.data.shape[0]
+
+
+    def __getitem__ (self, key):
+        """Returns a column by name, or the rows for an index or mask."""
+
+        return self.data[key]
+
+
+    def yearRows (self, year):
+        """Returns the array of row indices for the year."""
+
+        return self.year_rows.get (year, numpy.zeros ((0,), dtype=numpy.intp))
+
+
+    def yearRangeRows (self, start_year, end_year):
+        """Returns the sorted array of row indices for the years from
+           start_year to end_year, inclusive.
+        """
+
+        rows = [self.yearRows (year)
+            for year in range (start_year, end_year+1)]
+        if len(rows) == 0:
+            return numpy.zeros ((0,), dtype=numpy.intp)
+        return numpy.sort (numpy.concatenate (rows))
+
+
+    def seasonRows (self, year, season):
+        """Returns the array of row indices for the season of the year.
+           A season may include months of the previous year, i.e. winter
+           includes December of the previous year.
+        """
+
+        return self.season_rows.get ((year, season),
+            numpy.zeros ((0,), dtype=numpy.intp))
+
+
+    def summaryRows (self, year):
+        """Returns the array of row indices of the scenes which go into the
+           seasonal summaries of the year; by default December of the
+           previous year through November of the year.
+        """
+
+        return numpy.unique (numpy.concatenate ([self.seasonRows (year,
+            season) for season in self.season_names]))
+
+
+    def derivePaths (self, input_dir):
+        """Derives the filenames of the per-scene products for each scene.
+
+        Args:
+          input_dir - input directory of the stack, ending with a '/'
+        """
+
+        if self.paths_dir == input_dir:
+            return
+
+        base_names = [os.path.basename (xml_file)
+            for xml_file in self.data['file']]
+        self.paths = {}
+        for (product, (subdir, suffix)) in SCENE_PRODUCTS.items():
+            self.paths[product] = numpy.array ([input_dir + subdir +  \
+                base_name.replace ('.xml', suffix)
+                for base_name in base_names])
+        self.paths_dir = input_dir
+
+
+    def sceneFiles (self, product, rows=None):
+        """Returns the filenames of a per-scene product.
+
+        Args:
+          product - one of the SCENE_PRODUCTS
+          rows - array of row indices or mask; all the scenes if None
+
+        Returns:
+          array of filenames
+        """
+
+        if rows is None:
+            return self.paths[product]
+        return self.paths[product][rows]
+
+
+    def select (self, rows):
+        """Returns a new table with the rows for the index array or mask."""
+
+        return StackTable (self.data[rows], self.seasons)
+
+
+    def save (self, npz_file):
+        """Saves the table to a compressed .npz file."""
+
+        numpy.savez_compressed (npz_file, stack=self.data)
+
+######end of StackTable class######
+
+
+def read_stack_csv (stack_file, seasons=None):
+    """Reads the CSV stack file into a StackTable.
+
+    Args:
+      stack_file - name of the CSV stack file generated by stack_metadata
+      seasons - list of (season, months) tuples; DEFAULT_SEASONS if None
+
+    Returns:
+      StackTable for the stack
+    """
+
+    fd = open (stack_file, 'r')
+    stack = csv.reader (fd)
+    header_row = [elem.strip() for elem in stack.next()]
+    rows = [[elem.strip() for elem in row] for row in stack if len(row) > 0]
+    fd.close()
+
+    columns = []
+    dtype = []
+    for (name, col_type) in STACK_COLUMNS:
+        i = header_row.index (name)
+        if col_type is str:
+            values = numpy.array ([row[i] for row in rows], dtype=str)
+        else:
+            values = numpy.array ([col_type(float(row[i])) for row in rows],
+                dtype=col_type)
+        columns.append (values)
+        dtype.append ((name, values.dtype))
+
+    data = numpy.empty ((len(rows),), dtype=dtype)
+    for ((name, col_type), values) in zip (STACK_COLUMNS, columns):
+        data[name] = values
+
+    return StackTable (data, seasons)
+
+
+def read_stack_table (stack, log_handler=None, seasons=None):
+    """Returns the StackTable for the stack.
+    Description: The stack may already be a StackTable, in which case it is
+        returned as-is.  Otherwise it is the name of the .npz or CSV stack
+        file.  For a CSV stack file, the .npz file next to it is used if it
+        is newer.
+
+    Args:
+      stack - StackTable, or name of the .npz or CSV stack file
+      log_handler - handler for the logging information
+      seasons - list of (season, months) tuples; DEFAULT_SEASONS if None.
+          ignored if stack is a StackTable.
+
+    Returns:
+      None - error reading the stack file
+      StackTable for the stack
+    """
+
+    if isinstance (stack, StackTable):
+        return stack
+
+    npz_file = stack
+    if not stack.endswith ('.npz'):
+        npz_file = stack_npz_file (stack)
+        if (not os.path.exists (npz_file)) or  \
+           (os.path.getmtime (npz_file) < os.path.getmtime (stack)):
+            npz_file = None
+
+    try:
+        if npz_file is not None:
+            npz = numpy.load (npz_file)
+            table = StackTable (npz['stack'], seasons)
+            npz.close()
+            return table
+        return read_stack_csv (stack, seasons)
+    except (IOError, OSError, ValueError, KeyError), e:
+        msg = 'Error reading the stack file %s: %s' % (stack, str(e))
+        logIt (msg, log_handler)
+        return None
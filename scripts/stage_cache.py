@@ -0,0 +1,352 @@
+#! /usr/bin/env python
+import os
+import time
+import json
+import shutil
+import hashlib
+
+from log_it import *
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created a class to cache the outputs of the burned area processing stages,
+#     keyed on the content of their inputs and the processing parameters.
+#     A stage whose key is already in the cache restores its outputs from
+#     the cache instead of being reprocessed.
+#
+# History:
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Added the version of each stage, and of the stages upstream of it,
+#       to the cache keys.
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Keep a running total of the size of the cache, so the entries are
+#       only scanned when the total crosses the maximum size.  Only the
+#       files which aren't hard linked to an output count toward the size.
+#
+# Notes:
+#   1. Each cache entry is a directory named by its key which holds the
+#      output files along with an entry.json file.  entry.json records the
+#      size and modification time of each cached file so that an entry which
+#      has been modified is treated as invalid.
+#   2. Outputs are hard linked into and out of the cache when possible, and
+#      copied otherwise.  Since a hard link shares the file with the cache,
+#      prepare() must be called to remove the existing outputs before a
+#      stage rewrites them.
+#   3. The cache is bounded by the total size of the files in the entries
+#      which have a single link.  A file which is still hard linked to an
+#      output shares its disk space with the output, so it only counts once
+#      the output is removed.  The running total is an estimate which is
+#      refreshed by scanning the entries whenever it crosses the maximum
+#      size, and the least recently used entries are evicted first.
+#   4. The seasonal summaries, annual maximums, and burn probabilities read
+#      the resampled bands, QA masks, and spectral indices, which are
+#      determined by the scene XML files, the extents, the QA mask format,
+#      and the resampling itself.  Their keys hash the XML files rather
+#      than the much larger resampled files, so they include the QA mask
+#      format along with the versions of the upstream stages.  The version
+#      of a stage is bumped when a change alters its outputs, which
+#      invalidates its entries and those of every stage downstream of it.
+############################################################################
+
+# default maximum size of the cache in gigabytes
+DEFAULT_CACHE_SIZE = 100.0
+
+# version of the outputs of each stage; bump when a change alters them
+STAGE_VERSIONS = {'resample': 1, 'seasonal': 1, 'maximum': 1,
+    'regression': 1, 'threshold': 1}
+
+# stages whose outputs are read by each stage
+STAGE_INPUTS = {'resample': [], 'seasonal': ['resample'],
+    'maximum': ['resample'], 'regression': ['seasonal', 'maximum'],
+    'threshold': ['regression']}
+
+
+def stage_versions (stage):
+    """Returns the sorted list of (stage, version) of the stage and all of
+       the stages upstream of it.
+    """
+
+    versions = set()
+    stages = [stage]
+    while len (stages) > 0:
+        name = stages.pop()
+        versions.add ((name, STAGE_VERSIONS.get (name, 0)))
+        stages.extend (STAGE_INPUTS.get (name, []))
+    return sorted (versions)
+
+
+def envi_files (img_file):
+    """Returns the list of files which make up an ENVI image.
+
+    Args:
+      img_file - name of the ENVI .img file
+
+    Returns:
+      list of the .img and .hdr filenames
+    """
+
+    return [img_file, img_file.replace ('.img', '.hdr')]
+
+
+class StageCache():
+    """Class for handling the content-addressed cache of stage outputs.
+    """
+
+    def __init__ (self, cache_dir, cache_size=DEFAULT_CACHE_SIZE,
+        log_handler=None):
+        """Initializes the cache, creating the cache directory if needed.
+
+        Args:
+          cache_dir - directory for the cache entries
+          cache_size - maximum size of the cache in gigabytes
+          log_handler - handler for the logging information
+        """
+
+        self.cache_dir = os.path.abspath (cache_dir)
+        self.max_bytes = int(cache_size * 1024 * 1024 * 1024)
+        self.log_handler = log_handler
+        self.file_hashes = {}
+        self.total_bytes = None   # running size of the cache; None if unknown
+
+        if not os.path.exists (self.cache_dir):
+            try:
+                os.makedirs (self.cache_dir, 0755)
+            except OSError:
+                # another process may have created it already
+                if not os.path.exists (self.cache_dir):
+                    raise
+
+
+    def fileHash (self, filename):
+        """Returns the md5 of the file contents.  Hashes are saved by the
+           file size and modification time so each file is only read once.
+        """
+
+        stat = os.stat (filename)
+        hash_key = (filename, stat.st_size, stat.st_mtime)
+        if hash_key not in self.file_hashes:
+            md5 = hashlib.md5()
+            fd = open (filename, 'rb')
+            for chunk in iter (lambda: fd.read (1048576), ''):
+                md5.update (chunk)
+            fd.close()
+            self.file_hashes[hash_key] = md5.hexdigest()
+
+        return self.file_hashes[hash_key]
+
+
+    def key (self, stage, files=[], params=[]):
+        """Returns the cache key for a stage.
+
+        Args:
+          stage - name of the stage
+          files - list of input files; the contents of the files are hashed,
+              not their names
+          params - list of processing parameters
+
+        Returns:
+          hex digest which identifies the stage outputs; it includes the
+              versions of the stage and the stages upstream of it
+        """
+
+        md5 = hashlib.md5()
+        md5.update (stage)
+        md5.update (repr (stage_versions (stage)))
+        for filename in files:
+            md5.update (self.fileHash (filename))
+        md5.update (repr (params))
+
+        return md5.hexdigest()
+
+
+    def entryDir (self, key):
+        """Returns the directory for the cache entry."""
+
+        return os.path.join (self.cache_dir, key)
+
+
+    def isValid (self, key, outputs):
+        """Determines if the cache entry exists and is valid for the outputs.
+        """
+
+        entry_file = os.path.join (self.entryDir (key), 'entry.json')
+        if not os.path.exists (entry_file):
+            return False
+
+        try:
+            fd = open (entry_file, 'r')
+            entry = json.load (fd)
+            fd.close()
+        except (IOError, ValueError):
+            return False
+
+        for output in outputs:
+            name = os.path.basename (output)
+            cached_file = os.path.join (self.entryDir (key), name)
+            if (name not in entry['files']) or  \
+               (not os.path.exists (cached_file)):
+                return False
+            stat = os.stat (cached_file)
+            if [stat.st_size, stat.st_mtime] != entry['files'][name]:
+                return False
+
+        return True
+
+
+    def linkFile (self, src_file, dest_file):
+        """Hard links the file if possible, otherwise copies it."""
+
+        if os.path.exists (dest_file):
+            os.remove (dest_file)
+        try:
+            os.link (src_file, dest_file)
+        except OSError:
+            shutil.copy2 (src_file, dest_file)
+
+
+    def prepare (self, outputs):
+        """Removes the existing outputs before a stage rewrites them, so
+           that any of them shared with the cache are not modified.
+        """
+
+        for output in outputs:
+            if os.path.exists (output):
+                os.remove (output)
+
+
+    def restore (self, key, outputs):
+        """Restores the outputs of a stage from the cache.
+
+        Args:
+          key - cache key for the stage
+          outputs - list of output files for the stage
+
+        Returns:
+          True - the outputs were restored from the cache
+          False - the outputs are not in the cache
+        """
+
+        if not self.isValid (key, outputs):
+            return False
+
+        try:
+            for output in outputs:
+                cached_file = os.path.join (self.entryDir (key),
+                    os.path.basename (output))
+                self.linkFile (cached_file, output)
+
+            # mark the entry as recently used
+            os.utime (os.path.join (self.entryDir (key), 'entry.json'), None)
+        except (IOError, OSError), e:
+            msg = 'Unable to restore %s from the stage cache: %s' %  \
+                (key, str(e))
+            logIt (msg, self.log_handler)
+            return False
+
+        msg = '    Restored %d files from the stage cache (%s)' %  \
+            (len (outputs), key)
+        logIt (msg, self.log_handler)
+        return True
+
+
+    def store (self, key, outputs):
+        """Stores the outputs of a stage in the cache.
+
+        Args:
+          key - cache key for the stage
+          outputs - list of output files for the stage
+
+        Returns:
+            ERROR - error storing the outputs; the stage outputs themselves
+                are still valid
+            SUCCESS - successful processing
+        """
+
+        # build the entry in a temporary directory and then rename it, so a
+        # partially written entry is never used
+        entry_dir = self.entryDir (key)
+        temp_dir = '%s.%d.tmp' % (entry_dir, os.getpid())
+        try:
+            if os.path.exists (temp_dir):
+                shutil.rmtree (temp_dir)
+            os.makedirs (temp_dir)
+
+            entry = {'files': {}, 'created': time.time()}
+            for output in outputs:
+                name = os.path.basename (output)
+                cached_file = os.path.join (temp_dir, name)
+                self.linkFile (output, cached_file)
+                stat = os.stat (cached_file)
+                entry['files'][name] = [stat.st_size, stat.st_mtime]
+
+            fd = open (os.path.join (temp_dir, 'entry.json'), 'w')
+            json.dump (entry, fd)
+            fd.close()
+
+            if os.path.exists (entry_dir):
+                shutil.rmtree (entry_dir)
+            os.rename (temp_dir, entry_dir)
+        except (IOError, OSError), e:
+            msg = 'Unable to store %s in the stage cache: %s' % (key, str(e))
+            logIt (msg, self.log_handler)
+            shutil.rmtree (temp_dir, ignore_errors=True)
+            return ERROR
+
+        # scan the entries the first time, and then only when the running
+        # total crosses the maximum size
+        if self.total_bytes is None:
+            self.evict()
+        else:
+            try:
+                self.total_bytes += self.entrySize (entry_dir)
+            except OSError:
+                pass
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+        return SUCCESS
+
+
+    def entrySize (self, entry_dir):
+        """Returns the size of the files in the entry which have a single
+           link, i.e. aren't sharing their disk space with an output.
+        """
+
+        size = 0
+        for name in os.listdir (entry_dir):
+            stat = os.stat (os.path.join (entry_dir, name))
+            if stat.st_nlink == 1:
+                size += stat.st_size
+        return size
+
+
+    def evict (self):
+        """Removes the least recently used entries until the cache is within
+           its maximum size, and resets the running total of the cache size.
+        """
+
+        entries = []
+        total_bytes = 0
+        for key in os.listdir (self.cache_dir):
+            entry_dir = self.entryDir (key)
+            entry_file = os.path.join (entry_dir, 'entry.json')
+            try:
+                last_used = os.path.getmtime (entry_file)
+                size = self.entrySize (entry_dir)
+            except OSError:
+                # incomplete entry or being removed by another process
+                continue
+            entries.append ((last_used, size, entry_dir))
+            total_bytes += size
+
+        entries.sort()
+        for (last_used, size, entry_dir) in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            msg = 'Evicting %s from the stage cache' % entry_dir
+            logIt (msg, self.log_handler)
+            shutil.rmtree (entry_dir, ignore_errors=True)
+            total_bytes -= size
+
+        self.total_bytes = total_bytes
+
+######end of StageCache class######
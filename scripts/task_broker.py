@@ -0,0 +1,368 @@
+#! /usr/bin/env python
+import os
+import json
+import time
+import socket
+import sqlite3
+
+from log_it import *
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created a work queue of the burned area tasks of many path/row stacks,
+#     backed by a SQLite database on shared storage, so the tasks can be
+#     pulled by workers on any number of nodes.
+#
+# History:
+#
+# Notes:
+#   1. Each path/row stack is a job, made up of stages (i.e. resample,
+#      seasonal_summaries, regression).  A stage depends on the stages whose
+#      products it reads, and its tasks aren't handed out until all of the
+#      tasks of those stages are done.
+#   2. A stage starts out with a single plan task.  The plan task lists the
+#      tasks of the stage (i.e. the scenes or years of the stack), which
+#      aren't known until the stages before it have run.  The tasks are added
+#      in the same transaction which completes the plan task, so a stage is
+#      never seen as done before its tasks have been added.  This takes the
+#      place of a coordinator process; the dependencies are tracked by the
+#      broker itself.
+#   3. A task is leased to the worker which claims it.  The worker renews the
+#      lease while the task runs.  A task whose lease expires (i.e. the node
+#      went down) is handed out again.  A failed or expired task is retried
+#      up to the max_retries of its job, after which the job is failed and
+#      its later stages are not run.
+#   4. Each claim and completion is a single IMMEDIATE transaction, so the
+#      workers don't need any other locking.  The database needs to be on
+#      storage with working POSIX file locks, which is not the case for some
+#      NFS mounts.  The workers only use the methods of TaskBroker, so
+#      another broker (i.e. a directory of task files, or a message queue)
+#      can be substituted.
+############################################################################
+
+# name of the broker database, by default in the current directory
+BROKER_FILE = 'burned_area_broker.db'
+
+# default number of seconds a claimed task is leased to a worker before it
+# is handed out again, unless the lease is renewed
+DEFAULT_LEASE = 600
+
+# kinds of tasks
+KIND_PLAN = 'plan'
+KIND_TASK = 'task'
+
+# task status values
+STATUS_PENDING = 'pending'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+BROKER_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS jobs (
+        job TEXT PRIMARY KEY,
+        params TEXT NOT NULL,
+        max_retries INTEGER NOT NULL,
+        submitted REAL NOT NULL)''',
+    '''CREATE TABLE IF NOT EXISTS stage_deps (
+        job TEXT NOT NULL,
+        stage TEXT NOT NULL,
+        depends TEXT NOT NULL,
+        PRIMARY KEY (job, stage, depends))''',
+    '''CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job TEXT NOT NULL,
+        stage TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        task TEXT NOT NULL,
+        status TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        worker TEXT,
+        lease REAL,
+        started REAL,
+        finished REAL,
+        message TEXT,
+        UNIQUE (job, stage, kind, task))''',
+    '''CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, id)''',
+    '''CREATE INDEX IF NOT EXISTS tasks_stage ON tasks (job, stage, status)''']
+
+# pending tasks of jobs which haven't failed, and whose stage doesn't depend
+# on a stage with tasks which aren't done
+READY_TASK_SQL = '''
+    SELECT t.id, t.job, t.stage, t.kind, t.task, t.attempts, j.params
+    FROM tasks t JOIN jobs j ON j.job = t.job
+    WHERE t.status = ?
+      AND NOT EXISTS (SELECT 1 FROM tasks f
+          WHERE f.job = t.job AND f.status = ?)
+      AND NOT EXISTS (SELECT 1 FROM stage_deps d
+          JOIN tasks u ON u.job = d.job AND u.stage = d.depends
+          WHERE d.job = t.job AND d.stage = t.stage AND u.status != ?)
+    ORDER BY t.id LIMIT 1'''
+
+
+def worker_name ():
+    """Returns the name of this worker; the host name and process id."""
+
+    return '%s-%d' % (socket.gethostname(), os.getpid())
+
+
+class TaskBroker():
+    """Class for handling the work queue of the burned area tasks.
+    """
+
+    def __init__ (self, broker_file=BROKER_FILE, lease=DEFAULT_LEASE,
+        log_handler=None):
+        """Opens the broker database, creating it if it doesn't exist.
+
+        Args:
+          broker_file - name of the SQLite database, on shared storage
+          lease - seconds a claimed task is leased to a worker
+          log_handler - handler for the logging information
+        """
+
+        self.broker_file = broker_file
+        self.lease = lease
+        self.log_handler = log_handler
+
+        # autocommit mode, so the transactions are started explicitly with
+        # BEGIN IMMEDIATE; wait for the other workers to release the lock
+        self.db = sqlite3.connect (broker_file, timeout=lease,
+            isolation_level=None)
+        for statement in BROKER_SCHEMA:
+            self.db.execute (statement)
+
+
+    def close (self):
+        """Closes the broker database."""
+
+        self.db.close()
+
+
+    def transaction (self):
+        """Starts a transaction which holds the write lock of the database,
+           so the tasks can be read and updated atomically.
+        """
+
+        self.db.execute ('BEGIN IMMEDIATE')
+
+
+    def submitJob (self, job, params, stages, max_retries):
+        """Submits a job, with a plan task for each of its stages.  A job
+           which was already submitted is left as-is.
+
+        Args:
+          job - name of the job, i.e. the path/row of the stack
+          params - dictionary of the parameters of the job
+          stages - list of (stage, list of the stages it depends on) tuples
+          max_retries - number of times a failed task of the job is retried
+
+        Returns:
+          True if the job was submitted, False if it already exists
+        """
+
+        self.transaction()
+        try:
+            if self.db.execute ('SELECT 1 FROM jobs WHERE job = ?',
+                (job,)).fetchone() is not None:
+                self.db.execute ('COMMIT')
+                return False
+
+            self.db.execute ('INSERT INTO jobs VALUES (?, ?, ?, ?)',
+                (job, json.dumps (params), max_retries, time.time()))
+            for (stage, depends) in stages:
+                for depend in depends:
+                    self.db.execute ('INSERT INTO stage_deps VALUES (?, ?, ?)',
+                        (job, stage, depend))
+                self.db.execute ('INSERT INTO tasks (job, stage, kind, task, '
+                    'status) VALUES (?, ?, ?, ?, ?)', (job, stage, KIND_PLAN,
+                    json.dumps (stage), STATUS_PENDING))
+            self.db.execute ('COMMIT')
+        except sqlite3.Error:
+            self.db.execute ('ROLLBACK')
+            raise
+        return True
+
+
+    def claim (self, worker):
+        """Claims the next task which is ready to run, handing out the
+           running tasks whose lease has expired again first.
+
+        Args:
+          worker - name of the worker claiming the task
+
+        Returns:
+          None if no task is ready, otherwise a dictionary with the id, job,
+              stage, kind, task, attempts, and params of the job
+        """
+
+        now = time.time()
+        self.transaction()
+        try:
+            expired = self.db.execute ('SELECT id, worker FROM tasks '
+                'WHERE status = ? AND lease < ?',
+                (STATUS_RUNNING, now)).fetchall()
+            for (task_id, old_worker) in expired:
+                self.retryOrFail (task_id,
+                    'lease of worker %s expired' % old_worker)
+
+            row = self.db.execute (READY_TASK_SQL,
+                (STATUS_PENDING, STATUS_FAILED, STATUS_DONE)).fetchone()
+            if row is None:
+                self.db.execute ('COMMIT')
+                return None
+
+            (task_id, job, stage, kind, task, attempts, params) = row
+            self.db.execute ('UPDATE tasks SET status = ?, worker = ?, '
+                'lease = ?, started = ?, attempts = attempts + 1, '
+                'message = NULL WHERE id = ?', (STATUS_RUNNING, worker,
+                now + self.lease, now, task_id))
+            self.db.execute ('COMMIT')
+        except sqlite3.Error:
+            self.db.execute ('ROLLBACK')
+            raise
+
+        return {'id': task_id, 'job': job, 'stage': stage, 'kind': kind,
+            'task': json.loads (task), 'attempts': attempts + 1,
+            'params': json.loads (params)}
+
+
+    def renew (self, task_id):
+        """Renews the lease of a running task."""
+
+        self.db.execute ('UPDATE tasks SET lease = ? WHERE id = ? AND '
+            'status = ?', (time.time() + self.lease, task_id, STATUS_RUNNING))
+
+
+    def complete (self, task_id, new_tasks=None):
+        """Marks a task as done.  For a plan task, the tasks of its stage are
+           added in the same transaction.
+
+        Args:
+          task_id - id of the claimed task
+          new_tasks - list of the tasks of the stage, for a plan task
+        """
+
+        self.transaction()
+        try:
+            (job, stage) = self.db.execute ('SELECT job, stage FROM tasks '
+                'WHERE id = ?', (task_id,)).fetchone()
+            for task in (new_tasks or []):
+                self.db.execute ('INSERT OR IGNORE INTO tasks (job, stage, '
+                    'kind, task, status) VALUES (?, ?, ?, ?, ?)', (job, stage,
+                    KIND_TASK, json.dumps (task), STATUS_PENDING))
+            self.db.execute ('UPDATE tasks SET status = ?, finished = ?, '
+                'lease = NULL WHERE id = ?', (STATUS_DONE, time.time(),
+                task_id))
+            self.db.execute ('COMMIT')
+        except sqlite3.Error:
+            self.db.execute ('ROLLBACK')
+            raise
+
+
+    def fail (self, task_id, msg):
+        """Marks a task as failed; it is retried if the retries of its job
+           haven't been used up.
+
+        Args:
+          task_id - id of the claimed task
+          msg - error message for the failure
+        """
+
+        self.transaction()
+        try:
+            self.retryOrFail (task_id, msg)
+            self.db.execute ('COMMIT')
+        except sqlite3.Error:
+            self.db.execute ('ROLLBACK')
+            raise
+
+
+    def retryOrFail (self, task_id, msg):
+        """Puts a task back on the queue, or fails it if the retries of its
+           job have been used up.  Needs to be called within a transaction.
+        """
+
+        (attempts, max_retries) = self.db.execute ('SELECT t.attempts, '
+            'j.max_retries FROM tasks t JOIN jobs j ON j.job = t.job '
+            'WHERE t.id = ?', (task_id,)).fetchone()
+        status = STATUS_PENDING
+        if attempts > max_retries:
+            status = STATUS_FAILED
+        self.db.execute ('UPDATE tasks SET status = ?, finished = ?, '
+            'lease = NULL, message = ? WHERE id = ?', (status, time.time(),
+            msg, task_id))
+
+
+    def retryJob (self, job):
+        """Puts the failed tasks of a job back on the queue, with their
+           retries reset.
+
+        Returns:
+          number of tasks put back on the queue
+        """
+
+        cursor = self.db.execute ('UPDATE tasks SET status = ?, attempts = 0 '
+            'WHERE job = ? AND status = ?', (STATUS_PENDING, job,
+            STATUS_FAILED))
+        return cursor.rowcount
+
+
+    def remaining (self):
+        """Returns the number of pending and running tasks of the jobs which
+           haven't failed.  Once this is zero, there is nothing left for the
+           workers to do.
+        """
+
+        return self.db.execute ('SELECT COUNT(*) FROM tasks t '
+            'WHERE t.status IN (?, ?) AND NOT EXISTS (SELECT 1 FROM tasks f '
+            'WHERE f.job = t.job AND f.status = ?)', (STATUS_PENDING,
+            STATUS_RUNNING, STATUS_FAILED)).fetchone()[0]
+
+
+    def status (self):
+        """Summarizes the jobs and their stages.
+
+        Returns:
+          list of the lines of the status report
+        """
+
+        counts = {}
+        for (job, stage, status, count) in self.db.execute ('SELECT job, '
+            'stage, status, COUNT(*) FROM tasks WHERE kind = ? '
+            'GROUP BY job, stage, status', (KIND_TASK,)):
+            counts.setdefault ((job, stage), {})[status] = count
+
+        lines = []
+        jobs = [row[0] for row in self.db.execute ('SELECT job FROM jobs '
+            'ORDER BY submitted')]
+        for job in jobs:
+            plans = self.db.execute ('SELECT stage, status FROM tasks '
+                'WHERE job = ? AND kind = ? ORDER BY id',
+                (job, KIND_PLAN)).fetchall()
+            failed = self.db.execute ('SELECT stage, task, message FROM '
+                'tasks WHERE job = ? AND status = ?',
+                (job, STATUS_FAILED)).fetchall()
+            unfinished = self.db.execute ('SELECT COUNT(*) FROM tasks '
+                'WHERE job = ? AND status IN (?, ?)', (job, STATUS_PENDING,
+                STATUS_RUNNING)).fetchone()[0]
+            if len (failed) > 0:
+                job_status = STATUS_FAILED
+            elif unfinished == 0:
+                job_status = STATUS_DONE
+            else:
+                job_status = STATUS_RUNNING
+            lines.append ('%s: %s' % (job, job_status))
+
+            for (stage, plan_status) in plans:
+                stage_counts = counts.get ((job, stage), {})
+                if plan_status != STATUS_DONE:
+                    lines.append ('    %-20s plan %s' % (stage, plan_status))
+                    continue
+                lines.append ('    %-20s %d tasks %s' % (stage,
+                    sum (stage_counts.values()), ', '.join (['%d %s' %
+                    (stage_counts[status], status)
+                    for status in sorted (stage_counts)])))
+            for (stage, task, message) in failed:
+                lines.append ('    failed %s %s: %s' % (stage, task, message))
+        return lines
+
+######end of TaskBroker class######
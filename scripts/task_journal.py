@@ -0,0 +1,269 @@
+#! /usr/bin/env python
+import os
+import json
+import time
+import Queue
+
+from log_it import *
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created a class to checkpoint the tasks of the end-to-end burned area
+#     processing, so that a failed run can be resumed without rerunning the
+#     tasks which already completed.
+#
+# History:
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Added collect_results to collect the results of the parallel workers
+#       without hanging on a worker which dies, recording each task in the
+#       journal.
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Added task_started so collect_results only fails the task of a
+#       worker which dies, vs. terminating the workers which are still
+#       running.
+#
+# Notes:
+#   The journal is a JSON file in the output directory.  Each task (a
+#   processing stage, a scene, or a year) is recorded by name along with its
+#   status, the number of attempts, and the last error message.  The journal
+#   is rewritten after each update, via a temporary file and rename, so it
+#   always reflects the completed tasks if the run is killed.
+############################################################################
+
+# name of the journal file, written to the output directory
+JOURNAL_FILE = 'burned_area_journal.json'
+
+# default number of times a failed task is retried within a run
+DEFAULT_MAX_RETRIES = 2
+
+# task status values
+TASK_DONE = 'done'
+TASK_FAILED = 'failed'
+
+# number of seconds to wait for a result from the workers before checking
+# that they are still running
+RESULT_POLL_SECONDS = 10
+
+# status of the message a worker stores when it starts a task
+TASK_STARTED = 'started'
+
+
+def task_started (result_queue, item):
+    """Records on the result queue that this worker process started the
+       item, so collect_results can fail its task if the worker dies.
+
+    Args:
+      result_queue - queue of the results of the workers
+      item - item from the work queue
+    """
+
+    result_queue.put ((item, TASK_STARTED, os.getpid()))
+
+
+def collect_results (result_queue, tasks, workers, journal=None,
+    task_done=None, budget=None, log_handler=None):
+    """Collects the results of the parallel workers, recording each task in
+       the task journal.
+    Description: The (item, status) results of the workers are read off the
+        result queue with a timeout, checking on the workers between reads,
+        so a worker which dies without storing its result doesn't hang the
+        processing.  The workers record the items they start via
+        task_started.  When a worker dies, the task it was running is
+        failed and its memory is released to the budget, while the other
+        workers keep processing the rest of the tasks.  Results are
+        collected until all the tasks are done or no worker is left
+        running, at which point the tasks which were never run are failed.
+        The workers are joined before returning.
+
+    Args:
+      result_queue - queue of the (item, status) results of the workers
+      tasks - dictionary of the journal task name for each item on the work
+          queue of the workers
+      workers - list of the worker processes
+      journal - TaskJournal recording each task as done or failed; None if
+          the tasks aren't journaled
+      task_done - function called with each item which completes; None if
+          there is nothing to call
+      budget - MemoryBudget of the workers, which the items are acquired
+          from; None if the workers don't use a budget
+      log_handler - handler for the logging information
+
+    Returns:
+      list of the items which failed, or which have no result
+    """
+
+    remaining = dict (tasks)
+    owners = {}
+    reaped = set()
+    failed = []
+
+    def fail_task (item, msg):
+        task = remaining.pop (item)
+        if journal is not None:
+            journal.markFailed (task, msg)
+        failed.append (item)
+
+    exited = False
+    while len (remaining) > 0:
+        try:
+            message = result_queue.get (timeout=RESULT_POLL_SECONDS)
+        except Queue.Empty:
+            # fail the task of each worker which died while running it, and
+            # release its memory so the other workers aren't left waiting
+            for worker in workers:
+                if worker.is_alive() or (worker.pid in reaped):
+                    continue
+                reaped.add (worker.pid)
+                for item in [item for item in owners  \
+                    if (owners[item] == worker.pid) and (item in remaining)]:
+                    msg = 'Worker exited (code %s) without a result for %s' \
+                        % (str(worker.exitcode), remaining[item])
+                    logIt (msg, log_handler)
+                    fail_task (item, msg)
+                    if budget is not None:
+                        budget.release (item)
+
+            # the workers store their results before exiting, so wait once
+            # more for any results in flight once they have all exited
+            if exited:
+                break
+            exited = len ([worker for worker in workers  \
+                if worker.is_alive()]) == 0
+            continue
+
+        if message[1] == TASK_STARTED:
+            owners[message[0]] = message[2]
+            continue
+
+        (item, status) = message
+        task = remaining[item]
+        if status != SUCCESS:
+            fail_task (item, 'Error running ' + task)
+        else:
+            remaining.pop (item)
+            if journal is not None:
+                journal.markDone (task)
+            if task_done is not None:
+                task_done (item)
+
+    # fail the tasks which no worker was left to run
+    for item in sorted (remaining):
+        msg = 'No worker was left to run ' + remaining[item]
+        logIt (msg, log_handler)
+        fail_task (item, msg)
+
+    for worker in workers:
+        worker.join()
+
+    return failed
+
+
+class TaskJournal():
+    """Class for handling the journal of completed burned area tasks.
+    """
+
+    def __init__ (self, journal_file, resume=False, log_handler=None):
+        """Initializes the journal.  If resuming, then the existing journal
+           file is read so the completed tasks can be skipped; otherwise the
+           journal starts out empty.
+
+        Args:
+          journal_file - name of the JSON journal file
+          resume - if True, read the existing journal file
+          log_handler - handler for the logging information
+        """
+
+        self.journal_file = journal_file
+        self.log_handler = log_handler
+        self.tasks = {}
+
+        if resume and os.path.exists (journal_file):
+            try:
+                fd = open (journal_file, 'r')
+                self.tasks = json.load (fd)['tasks']
+                fd.close()
+            except (ValueError, KeyError):
+                msg = 'Unable to parse the task journal (%s). All tasks ' \
+                    'will be rerun.' % journal_file
+                logIt (msg, self.log_handler)
+                self.tasks = {}
+
+            num_done = len ([task for task in self.tasks  \
+                if self.tasks[task]['status'] == TASK_DONE])
+            msg = 'Resuming from the task journal: %d of %d tasks have ' \
+                'completed' % (num_done, len (self.tasks))
+            logIt (msg, self.log_handler)
+
+
+    def isDone (self, task):
+        """Determines if the task has completed."""
+
+        return (task in self.tasks) and  \
+            (self.tasks[task]['status'] == TASK_DONE)
+
+
+    def attempts (self, task):
+        """Returns the number of times the task has been attempted."""
+
+        if task not in self.tasks:
+            return 0
+        return self.tasks[task]['attempts']
+
+
+    def markDone (self, task):
+        """Records the task as completed and writes the journal."""
+
+        self.update (task, TASK_DONE, None)
+
+
+    def markFailed (self, task, msg=None):
+        """Records the task as failed and writes the journal."""
+
+        self.update (task, TASK_FAILED, msg)
+
+
+    def update (self, task, status, msg):
+        """Records the status of the task and writes the journal.
+
+        Args:
+          task - name of the task
+          status - TASK_DONE or TASK_FAILED
+          msg - error message for a failed task
+        """
+
+        self.tasks[task] = {'status': status,
+            'attempts': self.attempts (task) + 1,
+            'error': msg, 'time': time.time()}
+        self.write()
+
+
+    def failedTasks (self):
+        """Returns the sorted list of tasks which have failed."""
+
+        return sorted ([task for task in self.tasks  \
+            if self.tasks[task]['status'] == TASK_FAILED])
+
+
+    def write (self):
+        """Writes the journal file.
+
+        Returns:
+            ERROR - error writing the journal
+            SUCCESS - successful processing
+        """
+
+        temp_file = self.journal_file + '.tmp'
+        try:
+            fd = open (temp_file, 'w')
+            json.dump ({'tasks': self.tasks}, fd, indent=2, sort_keys=True)
+            fd.close()
+            os.rename (temp_file, self.journal_file)
+        except (IOError, OSError), e:
+            msg = 'Unable to write the task journal (%s): %s' %  \
+                (self.journal_file, str(e))
+            logIt (msg, self.log_handler)
+            return ERROR
+
+        return SUCCESS
+
+######end of TaskJournal class######
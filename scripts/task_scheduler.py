@@ -0,0 +1,304 @@
+#! /usr/bin/env python
+import multiprocessing
+
+from log_it import *
+
+#############################################################################
+# Created on October 18, 2026 by USGS/EROS LSRD Project
+# Created a memory budget to admit the tasks of the parallel workers based
+#     on their estimated memory, along with the memory estimates of the
+#     tasks of each processing stage, so the number of processors no longer
+#     has to be sized for the stage which uses the most memory.
+#
+# History:
+#   Updated on 10/18/2026 by USGS/EROS LSRD Project
+#       Updated the resampling estimate for the reads and double-buffered
+#       writes of the I/O threads.
+#
+# Notes:
+#   1. The memory of a task is estimated from the stack metadata, i.e. the
+#      number of lines and samples of the extents and the number of scenes
+#      in the season or year, using the arrays allocated by the task:
+#        resample - blocks of BLOCK_LINES lines of the bands, indices, and
+#            QA mask of the scene, with the reads of the next block and the
+#            writes of the previous block in flight on the I/O threads
+#        seasonal summaries - the QA mask of every scene in the season,
+#            along with its good and bad pixel masks
+#        annual maximums - the QA mask of every scene in the year, along
+#            with its bad pixel mask
+#        threshold - the burn probabilities, seeds, and region labels of
+#            the scene
+#        annual summaries - a block of lines of the burn probabilities and
+#            classifications of every scene in the year
+#   2. The budget is shared by the workers of a stage, which inherit it from
+#      the process which spawned them.  A worker waits for the estimated
+#      memory of its task to fit within the budget before processing it.  A
+#      task larger than the whole budget is processed by itself.
+#   3. The default budget is MEMORY_FRACTION of the memory available on the
+#      node (MemAvailable of /proc/meminfo) when the stage starts.  Without
+#      /proc/meminfo and a memory limit, the tasks are not gated.
+#   4. The predictions (predict_burned_area) are CPU-bound and use little
+#      memory, so they are not gated.  A number of processors of 0 uses all
+#      the cores of the node.
+############################################################################
+
+# fraction of the available memory used for the default budget
+MEMORY_FRACTION = 0.9
+
+# memory of a task beyond its arrays (GDAL block cache, NumPy temporaries,
+# and the Python objects of the task), in MB
+TASK_OVERHEAD_MB = 64.0
+
+# lines in each block of the resampling (scene_resample.BLOCK_LINES) and
+# the lines of the largest block of the annual summaries (the GeoTIFF tile
+# size of raster_output)
+RESAMPLE_LINES = 256
+SUMMARY_LINES = 256
+
+# number of int16 and uint8 block buffers of the resampling; the six
+# reflectance bands of two blocks, the four spectral indices, and the two
+# output blocks of the ten bands and indices, along with the six QA bands
+# of two blocks, the QA mask, and the two output blocks of the QA mask
+RESAMPLE_INT16_BUFFERS = 2 * 6 + 4 + 2 * 10
+RESAMPLE_UINT8_BUFFERS = 2 * 6 + 1 + 2
+
+# bytes per pixel of the QA masks of each scene of the seasonal summaries
+# (uint8 mask and bool good and bad masks) and annual maximums (uint8 mask
+# and bool bad mask)
+SEASONAL_BYTES_PER_SCENE = 3
+MAXIMUM_BYTES_PER_SCENE = 2
+
+# bytes per pixel of the seasonal summaries and annual maximums which don't
+# depend on the number of scenes (good looks count as summed and as written)
+SEASONAL_BYTES_PER_PIXEL = 9
+MAXIMUM_BYTES_PER_PIXEL = 0
+
+# bytes per pixel of the thresholding; the probabilities as read and as
+# int16, the float64 scars, the int32 flood-fill, seed, and final region
+# labels, and the bool seeds and burn classification
+THRESHOLD_BYTES_PER_PIXEL = 2 + 2 + 8 + 4 + 4 + 4 + 1 + 1
+
+# bytes per pixel of each scene of the annual summaries (int16 burn
+# probability and classification)
+SUMMARY_BYTES_PER_SCENE = 4
+
+MEGABYTE = 1024.0 * 1024.0
+
+
+def resolve_processors (num_processors):
+    """Returns the number of processors to use; 0 or None uses all the
+       cores of the node.
+    """
+
+    if num_processors is None or num_processors <= 0:
+        return multiprocessing.cpu_count()
+    return num_processors
+
+
+def available_memory_mb ():
+    """Returns the memory available on the node, in MB, or None if not
+       available.
+    """
+
+    try:
+        fd = open ('/proc/meminfo', 'r')
+        lines = fd.readlines()
+        fd.close()
+    except IOError:
+        return None
+
+    for line in lines:
+        fields = line.split()
+        if len (fields) >= 2 and fields[0] == 'MemAvailable:':
+            return int (fields[1]) / 1024.0
+    return None
+
+
+def resample_memory_mb (ncol):
+    """Returns the estimated memory, in MB, to resample a scene with ncol
+       samples.
+    """
+
+    return TASK_OVERHEAD_MB + RESAMPLE_LINES * ncol *  \
+        (2 * RESAMPLE_INT16_BUFFERS + RESAMPLE_UINT8_BUFFERS) / MEGABYTE
+
+
+def seasonal_memory_mb (n_files, nrow, ncol):
+    """Returns the estimated memory, in MB, of the seasonal summaries of a
+       season with n_files scenes of nrow x ncol pixels.
+    """
+
+    return TASK_OVERHEAD_MB + nrow * ncol *  \
+        (n_files * SEASONAL_BYTES_PER_SCENE + SEASONAL_BYTES_PER_PIXEL) /  \
+        MEGABYTE
+
+
+def maximum_memory_mb (n_files, nrow, ncol):
+    """Returns the estimated memory, in MB, of the annual maximums of a
+       year with n_files scenes of nrow x ncol pixels.
+    """
+
+    return TASK_OVERHEAD_MB + nrow * ncol *  \
+        (n_files * MAXIMUM_BYTES_PER_SCENE + MAXIMUM_BYTES_PER_PIXEL) /  \
+        MEGABYTE
+
+
+def threshold_memory_mb (nrow, ncol):
+    """Returns the estimated memory, in MB, to threshold the burn
+       probabilities of a scene of nrow x ncol pixels.
+    """
+
+    return TASK_OVERHEAD_MB +  \
+        nrow * ncol * THRESHOLD_BYTES_PER_PIXEL / MEGABYTE
+
+
+def summary_memory_mb (n_files, ncol):
+    """Returns the estimated memory, in MB, of the annual burn summaries of
+       a year with n_files scenes of ncol samples.
+    """
+
+    return TASK_OVERHEAD_MB + SUMMARY_LINES * ncol *  \
+        n_files * SUMMARY_BYTES_PER_SCENE / MEGABYTE
+
+
+def memory_budget (memory_limit=None, log_handler=None):
+    """Returns the MemoryBudget for a stage.
+
+    Args:
+      memory_limit - memory limit of the stage in gigabytes; if None then
+          MEMORY_FRACTION of the memory available on the node is used
+      log_handler - handler for the logging information
+
+    Returns:
+      MemoryBudget for the stage; the tasks are not gated if the available
+          memory can't be determined and no limit was specified
+    """
+
+    available_mb = available_memory_mb()
+    if memory_limit is not None:
+        budget_mb = memory_limit * 1024.0
+    elif available_mb is not None:
+        budget_mb = MEMORY_FRACTION * available_mb
+    else:
+        budget_mb = None
+
+    if budget_mb is not None and available_mb is not None and  \
+       budget_mb > available_mb:
+        msg = 'Memory limit of %.0f MB is more than the %.0f MB available'  \
+            % (budget_mb, available_mb)
+        logIt (msg, log_handler)
+
+    return MemoryBudget (budget_mb, log_handler)
+
+
+class MemoryBudget():
+    """Class for admitting the tasks of the parallel workers within a memory
+       budget.
+    """
+
+    def __init__ (self, budget_mb, log_handler=None):
+        """Initializes the budget.  The budget needs to be created before
+           the workers are spawned, so they share it.
+
+        Args:
+          budget_mb - memory budget in MB; None disables the budget
+          log_handler - handler for the logging information
+        """
+
+        self.budget_mb = budget_mb
+        self.log_handler = log_handler
+        self.task_mb = {}
+        if budget_mb is not None:
+            self.condition = multiprocessing.Condition()
+            self.in_use_mb = multiprocessing.Value ('d', 0.0, lock=False)
+            self.running = multiprocessing.Value ('i', 0, lock=False)
+
+
+    def enabled (self):
+        """Determines if the tasks are being gated."""
+
+        return self.budget_mb is not None
+
+
+    def estimate (self, task, memory_mb):
+        """Sets the estimated memory of a task.  The estimates need to be
+           set before the workers are spawned.
+
+        Args:
+          task - task as it is pulled from the work queue
+          memory_mb - estimated memory of the task in MB
+        """
+
+        self.task_mb[task] = memory_mb
+
+
+    def describe (self):
+        """Returns a description of the budget and the estimated memory of
+           its tasks, for logging.
+        """
+
+        if not self.enabled():
+            return 'no memory budget'
+        if len (self.task_mb) == 0:
+            return '%.0f MB memory budget' % self.budget_mb
+
+        largest_mb = max (self.task_mb.values())
+        return '%.0f MB memory budget, %.0f MB largest task '  \
+            '(%d at a time)' % (self.budget_mb, largest_mb,
+            max (1, int (self.budget_mb / largest_mb)))
+
+
+    def acquire (self, task):
+        """Waits for the estimated memory of the task to fit within the
+           budget and reserves it.
+
+        Args:
+          task - task as it is pulled from the work queue
+        """
+
+        if not self.enabled():
+            return
+
+        memory_mb = self.task_mb.get (task, 0.0)
+        self.condition.acquire()
+        try:
+            if self.running.value > 0 and  \
+               self.in_use_mb.value + memory_mb > self.budget_mb:
+                msg = 'Waiting for %.0f MB of the memory budget for %s '  \
+                    '(%.0f of %.0f MB in use)' % (memory_mb, str(task),
+                    self.in_use_mb.value, self.budget_mb)
+                logIt (msg, self.log_handler)
+            while self.running.value > 0 and  \
+                  self.in_use_mb.value + memory_mb > self.budget_mb:
+                self.condition.wait()
+            if memory_mb > self.budget_mb:
+                msg = 'Estimated memory of %.0f MB for %s is more than the '  \
+                    '%.0f MB budget; processing it by itself' %  \
+                    (memory_mb, str(task), self.budget_mb)
+                logIt (msg, self.log_handler)
+            self.in_use_mb.value += memory_mb
+            self.running.value += 1
+        finally:
+            self.condition.release()
+
+
+    def release (self, task):
+        """Releases the memory reserved for the task.
+
+        Args:
+          task - task as it is pulled from the work queue
+        """
+
+        if not self.enabled():
+            return
+
+        self.condition.acquire()
+        try:
+            self.in_use_mb.value = max (0.0,
+                self.in_use_mb.value - self.task_mb.get (task, 0.0))
+            self.running.value -= 1
+            self.condition.notify_all()
+        finally:
+            self.condition.release()
+
+######end of MemoryBudget class######
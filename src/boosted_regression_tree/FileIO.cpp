@@ -14,6 +14,9 @@ Date        Programmer       Reason
 ---------   --------------   -----------------------------------------
 12/7/2012   Jodi Riegle      Original development
 9/3/2013    Gail Schmidt     Modified to work in the ESPA environment
+10/18/2026  LSRD Project     Split the reading of the configuration file
+                             from the command line, so a series of
+                             configuration files can be read from stdin
 
 NOTES:
 *****************************************************************************/
@@ -27,63 +30,22 @@ namespace po = boost::program_options;
 using namespace boost;
 
 /******************************************************************************
-MODULE: loadParametersFromFile
+MODULE: AddConfigOptions
 
-PURPOSE: Reads the command-line parameters, determines the configuration file
-name, and reads the configuration file parameters.
+PURPOSE: Adds the configuration file parameters to the options description.
  
 RETURN VALUE:
-Type = bool
-Value          Description
------          -----------
-false          Error reading command-line or config file parameters
-true           Successful processing of the parameters
+Type = None
 
 HISTORY:
 Date          Programmer       Reason
 ----------    ---------------  -------------------------------------
-12/7/2012     Jodi Riegle      Original development
-9/3/2013      Gail Schmidt     Modified to work in the ESPA environment
-3/26/2014     Gail Schmidt     Modified to read ESPA internal file format.
-                               Also, we now expect the input surface reflectance
-                               product to be resampled to the same geographic
-                               extents as the seasonal summaries and annual
-                               maximums.  We will use the mask file generated
-                               as part of the seasonal summaries for this
-                               scene.
-NOTES:
-  1. The following parameters are required for training the model.
-     TREE_CNT
-     SHRINKAGE
-     MAX_DEPTH
-     SUBSAMPLE_FRACTION
-     CSV_FILE
-     NCSV_INPUTS (and this must match the expected value noted in
-                  PredictBurnedArea.h)
-      
-  2. The following parameters are required for loading the model.
-     INPUT_BASE_FILE
-     INPUT_MASK_FILE
-     INPUT_FILL_VALUE
-     SEASONAL_SUMMARIES_DIR
-     OUTPUT_IMG_FILE
-     LOAD_MODEL_XML
+10/18/2026    LSRD Project     Pulled from loadParametersFromFile so the
+                               options are shared with loadConfigFile
 
-  3. If saving the model, after training, then the following parameter is
-     required in addition to the training parameters.
-     SAVE_MODEL_XML
+NOTES:
 *****************************************************************************/
-bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
-    string config_filename;            /* configuration filename */
-    char errmsg[MAX_STR_LEN];          /* error message */
-
-    po::options_description cmd_line("Command-line options");
-    cmd_line.add_options()
-        ("config_file", po::value<string>(), "configuration file")
-        ("verbose", "print extra processing information (default is off)")
-        ("help", "produce help message");
-
-    po::options_description config("Configuration file parameters");
+static void AddConfigOptions (po::options_description &config) {
     config.add_options()
         ("INPUT_BASE_FILE", po::value<string>(),
             "base filename of the input surface reflectance file (resampled "
@@ -98,6 +60,9 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
         ("SEASONAL_SUMMARIES_DIR", po::value<string>(),
             "seasonal summaries directory")
         ("OUTPUT_IMG_FILE", po::value<string>(), "output image filename (.img)")
+        ("OUTPUT_COMPACT", po::value<bool>(),
+            "write the output probabilities as uint8, with 254 for the "
+            "cloud/water pixels and 255 for fill (default is int16)")
 
         /* training related */
         ("SAVE_MODEL_XML", po::value<string>(),
@@ -127,6 +92,58 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
         ("PREDICT_OUT", po::value<string>(),
             "output file for training - includes test error, train error and "
             "variables of importance (default is predict_out.txt)");
+}
+
+
+/******************************************************************************
+MODULE: loadParametersFromFile
+
+PURPOSE: Reads the command-line parameters, determines the configuration file
+name, and reads the configuration file parameters.
+ 
+RETURN VALUE:
+Type = bool
+Value          Description
+-----          -----------
+false          Error reading command-line or config file parameters
+true           Successful processing of the parameters
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+12/7/2012     Jodi Riegle      Original development
+9/3/2013      Gail Schmidt     Modified to work in the ESPA environment
+3/26/2014     Gail Schmidt     Modified to read ESPA internal file format.
+                               Also, we now expect the input surface reflectance
+                               product to be resampled to the same geographic
+                               extents as the seasonal summaries and annual
+                               maximums.  We will use the mask file generated
+                               as part of the seasonal summaries for this
+                               scene.
+10/18/2026    LSRD Project     Added --config_stdin to read the names of a
+                               series of configuration files from stdin.
+                               The configuration file is read by
+                               loadConfigFile.
+NOTES:
+  1. See loadConfigFile for the configuration file parameters.
+  2. If --config_stdin is specified then the configuration file isn't read;
+     the names of the configuration files are read from stdin by main.
+*****************************************************************************/
+bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
+    string config_filename;            /* configuration filename */
+    char errmsg[MAX_STR_LEN];          /* error message */
+
+    po::options_description cmd_line("Command-line options");
+    cmd_line.add_options()
+        ("config_file", po::value<string>(), "configuration file")
+        ("config_stdin", "read the names of a series of configuration files "
+            "for model prediction from stdin, one per line; the model is "
+            "only loaded again when LOAD_MODEL_XML changes")
+        ("verbose", "print extra processing information (default is off)")
+        ("help", "produce help message");
+
+    po::options_description config("Configuration file parameters");
+    AddConfigOptions (config);
 
     po::options_description cmdline_options;
     cmdline_options.add(cmd_line);
@@ -150,6 +167,13 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
         return false;
     }
 
+    /* The configuration files are read from stdin by main */
+    CONFIG_STDIN = false;
+    if (vm.count("config_stdin")) {
+        CONFIG_STDIN = true;
+        return true;
+    }
+
     if (vm.count("config_file")) {
         config_filename = vm["config_file"].as<string>();
     }
@@ -159,6 +183,64 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
         RETURN_ERROR (errmsg, "loadParametersFromFile", false);
     }
 
+    return loadConfigFile (ac, av, config_filename);
+}
+
+
+/******************************************************************************
+MODULE: loadConfigFile
+
+PURPOSE: Reads the configuration file parameters, which may also be
+specified on the command line.
+ 
+RETURN VALUE:
+Type = bool
+Value          Description
+-----          -----------
+false          Error reading the config file parameters
+true           Successful processing of the parameters
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/18/2026    LSRD Project     Pulled from loadParametersFromFile so a
+                               series of configuration files can be read
+
+NOTES:
+  1. The following parameters are required for training the model.
+     TREE_CNT
+     SHRINKAGE
+     MAX_DEPTH
+     SUBSAMPLE_FRACTION
+     CSV_FILE
+     NCSV_INPUTS (and this must match the expected value noted in
+                  PredictBurnedArea.h)
+      
+  2. The following parameters are required for loading the model.
+     INPUT_BASE_FILE
+     INPUT_MASK_FILE
+     INPUT_FILL_VALUE
+     SEASONAL_SUMMARIES_DIR
+     OUTPUT_IMG_FILE
+     LOAD_MODEL_XML
+
+  3. If saving the model, after training, then the following parameter is
+     required in addition to the training parameters.
+     SAVE_MODEL_XML
+
+  4. OUTPUT_COMPACT is optional for model prediction.  If true then the
+     output probabilities are written as uint8 vs. int16.
+*****************************************************************************/
+bool PredictBurnedArea::loadConfigFile(int ac, char* av[],
+    string config_filename) {
+    char errmsg[MAX_STR_LEN];          /* error message */
+
+    po::options_description config("Configuration file parameters");
+    AddConfigOptions (config);
+
+    po::options_description config_file_options;
+    config_file_options.add(config);
+
     /* Parse the config file options */
     po::variables_map config_vm;
     po::store(po::command_line_parser(ac, av).options(config).allow_unregistered().run(), config_vm);
@@ -168,7 +250,7 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
     if (!ifs) {
         sprintf (errmsg, "unable to open config file: %s",
             config_filename.c_str());
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
     } else {
         store (parse_config_file (ifs, config_file_options), config_vm);
         notify (config_vm);
@@ -194,7 +276,7 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
         sprintf (errmsg, "INPUT_MASK_FILE is a required config file "
             "parameter for model prediction. Use predict_burned_area --help "
             "for more information.");
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
     }
 
     if (config_vm.count("INPUT_FILL_VALUE")) {
@@ -204,7 +286,7 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
         sprintf (errmsg, "INPUT_FILL_VALUE is a required config file "
             "parameter for model prediction. Use predict_burned_area --help "
             "for more information.");
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
     }
 
     if (config_vm.count("SEASONAL_SUMMARIES_DIR")) {
@@ -215,7 +297,7 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
         sprintf (errmsg, "SEASONAL_SUMMARIES_DIR is a required config file "
             "parameter for model prediction. Use predict_burned_area --help "
             "for more information.");
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
     }
 
     if (config_vm.count("OUTPUT_IMG_FILE")) {
@@ -225,7 +307,12 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
         sprintf (errmsg, "OUTPUT_IMG_FILE is a required config file "
             "parameter for model prediction. Use predict_burned_area --help "
             "for more information.");
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
+    }
+
+    OUTPUT_COMPACT = false;
+    if (config_vm.count("OUTPUT_COMPACT")) {
+        OUTPUT_COMPACT = config_vm["OUTPUT_COMPACT"].as<bool>();
     }
 
     /* Training related inputs */
@@ -241,7 +328,7 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
     else if (train_model) {
         sprintf (errmsg, "TREE_CNT is a required config file parameter for "
             "training. Use predict_burned_area --help for more information.");
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
     }
 
     if (config_vm.count("SHRINKAGE")) {
@@ -250,7 +337,7 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
     else if (train_model) {
         sprintf (errmsg, "SHRINKAGE is a required config file parameter for "
             "training. Use predict_burned_area --help for more information.");
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
     }
 
     if (config_vm.count("MAX_DEPTH")) {
@@ -259,7 +346,7 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
     else if (train_model) {
         sprintf (errmsg, "MAX_DEPTH is a required config file parameter for "
             "training. Use predict_burned_area --help for more information.");
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
     }
 
     if (config_vm.count("SUBSAMPLE_FRACTION")) {
@@ -269,7 +356,7 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
         sprintf (errmsg, "SUBSAMPLE_FRACTION is a required config file "
             "parameter for training. Use predict_burned_area --help for more "
             "information.");
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
     }
 
     if (config_vm.count("PREDICT_OUT")) {
@@ -291,13 +378,13 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
                 "expected/supported number of CSV inputs for training and "
                 "prediction. Expected number of CSV inputs (not including "
                 "the final classification value) is %d.", EXPECTED_CSV_INPUTS);
-            RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+            RETURN_ERROR (errmsg, "loadConfigFile", false);
         }
     }
     else if (train_model) {
         sprintf (errmsg, "NCSV_INPUTS is a required config file parameter for "
             "training. Use predict_burned_area --help for more information.");
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
     }
     else
         NCSV_INPUTS = EXPECTED_CSV_INPUTS;
@@ -314,7 +401,7 @@ bool PredictBurnedArea::loadParametersFromFile(int ac, char* av[]) {
         sprintf (errmsg, "Both the input CSV_FILE for training the model "
             "and the LOAD_MODEL_XML file have been specified.  The model "
             "can only be trained or loaded from an XML file, but not both.");
-        RETURN_ERROR (errmsg, "loadParametersFromFile", false);
+        RETURN_ERROR (errmsg, "loadConfigFile", false);
     }
 
     return true;
@@ -15,21 +15,103 @@ Date          Programmer       Reason
 ----------    ---------------  -------------------------------------
 11/26/2012    Jodi Riegle      Original development
 9/3/2013      Gail Schmidt     Modified to work in the ESPA environment
+10/18/2026    LSRD Project     Added the progress and timing of the
+                               predictions
 
 NOTES:
 *****************************************************************************/
 
 #include <stdlib.h>
 #include <stdio.h>
+#include <sys/time.h>
 
 #include "PredictBurnedArea.h"
 #include "output.h"
 #include "input.h"
 
 PredictBurnedArea::PredictBurnedArea() {
+    model = &gbtrees;
     trueCnt = 0;
+    validPixels = 0;
+    ioSeconds = 0.0;
+    featureSeconds = 0.0;
+    treeSeconds = 0.0;
 }
 
 PredictBurnedArea::~PredictBurnedArea() {
+    map<string, CvGBTrees *>::iterator it;
+    for (it = loadedModels.begin(); it != loadedModels.end(); it++)
+        delete it->second;
+}
+
+
+/******************************************************************************
+MODULE:  WallSeconds
+
+PURPOSE:  Returns the current wall clock time in seconds, for timing the
+processing steps.
+
+RETURN VALUE:
+Type = double
+Value          Description
+-----          -----------
+seconds        Seconds since the epoch, with microsecond resolution
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/18/2026    LSRD Project     Original development
+
+NOTES:
+******************************************************************************/
+double WallSeconds() {
+    struct timeval tv;
+
+    gettimeofday (&tv, NULL);
+    return (double) tv.tv_sec + (double) tv.tv_usec * 1.0e-6;
+}
+
+
+/******************************************************************************
+MODULE:  PrintProgress (class PredictBurnedArea)
+
+PURPOSE:  Writes a machine-readable PROGRESS line to stdout with the lines
+completed, the pixels processed and predicted, the throughput, and the time
+spent in I/O, assembling the samples, and evaluating the trees.
+
+RETURN VALUE:
+Type = None
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/18/2026    LSRD Project     Original development
+
+NOTES:
+  1. The line is a set of space-separated key=value pairs following the
+     PROGRESS keyword, and stdout is flushed so the calling script sees the
+     line as soon as it's written.
+******************************************************************************/
+void PredictBurnedArea::PrintProgress
+(
+    int nlines_done,      /* I: number of lines completed */
+    int nlines,           /* I: number of lines in the scene */
+    int nsamps,           /* I: number of samples in the scene */
+    double start_time     /* I: wall clock time the predictions started */
+)
+{
+    double elapsed = WallSeconds () - start_time;
+    long npixels = (long) nlines_done * nsamps;
+    double rate = 0.0;
+
+    if (elapsed > 0.0)
+        rate = npixels / elapsed;
+
+    printf ("PROGRESS lines=%d nlines=%d pixels=%ld valid_pixels=%ld "
+        "elapsed=%.3f pixels_per_second=%.1f io_seconds=%.3f "
+        "feature_seconds=%.3f tree_seconds=%.3f\n", nlines_done, nlines,
+        npixels, validPixels, elapsed, rate, ioSeconds, featureSeconds,
+        treeSeconds);
+    fflush (stdout);
 }
 
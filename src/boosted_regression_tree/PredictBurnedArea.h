@@ -15,6 +15,12 @@ Date        Programmer       Reason
 9/15/2012   Jodi Riegle      Original development (based largely on routines
                              from the LEDAPS lndsr application)
 9/3/2013    Gail Schmidt     Modified to work in the ESPA environment
+10/18/2026  LSRD Project     Added the bit layout of the one-byte QA mask
+10/18/2026  LSRD Project     Added the compact (uint8) output option
+10/18/2026  LSRD Project     Added the progress and timing of the predictions
+10/18/2026  LSRD Project     Added reading a series of configuration files
+                             from stdin
+10/18/2026  LSRD Project     Added the cache of the loaded models
 
 NOTES:
 *****************************************************************************/
@@ -25,6 +31,7 @@ NOTES:
 #include <iostream>
 #include <fstream>
 #include <stdint.h>
+#include <map>
 #include "cv.h"
 #include "opencv2/ml/ml.hpp"
 #include "opencv2/highgui/highgui.hpp"
@@ -61,9 +68,36 @@ typedef enum {PREDMAT_B1=0, PREDMAT_B2, PREDMAT_B3, PREDMAT_B4, PREDMAT_B5,
    band1,band2,band3,band4,band5,band7,ndvi,ndmi,nbr,nbr2,ly_wi_b3,ly_wi_b4,ly_wi_b5,ly_wi_b7,ly_wi_ndvi,ly_wi_ndmi,ly_wi_nbr,ly_wi_nbr2,ly_sp_b3,ly_sp_b4,ly_sp_b5,ly_sp_b7,ly_sp_ndvi,ly_sp_ndmi,ly_sp_nbr,ly_sp_nbr2,ly_su_b3,ly_su_b4,ly_su_b5,ly_su_b7,ly_su_ndvi,ly_su_ndmi,ly_su_nbr,ly_su_nbr2,ly_fa_b3,ly_fa_b4,ly_fa_b5,ly_fa_b7,ly_fa_ndvi,ly_fa_ndmi,ly_fa_nbr,ly_fa_nbr2,ly_max_ndvi,ly_max_ndmi,ly_max_nbr,ly_max_nbr2,dndvi,dndmi,dnbr,dnbr2,fire */
 #define EXPECTED_CSV_INPUTS 50
 
+/* Number of lines between the PROGRESS lines written during the predictions.
+   Each PROGRESS line is a set of key=value pairs which are parsed by
+   scripts/boosted_regression_tree/do_boosted_regression.py. */
+#define PROGRESS_INTERVAL 100
+
+/* Keyword of the line written after the predictions of each configuration
+   file read from stdin (--config_stdin) are complete.  The calling script
+   waits for this line before sending the next configuration file. */
+#define SCENE_DONE_KEYWORD "SCENE_DONE"
+
 /* Typedefs for the integer types used by this application */
 typedef signed short int16;
 typedef char int8;
+typedef unsigned char uint8;
+
+/* Bit layout of the one-byte QA mask created by the seasonal summaries
+   (scripts/seasonal_summary/qa_mask.py).  A value of 0 is a clear pixel and
+   fill pixels only have the fill bit set.  These need to be kept in sync
+   with qa_mask.py. */
+#define QA_FILL 0x01
+#define QA_CLOUD 0x02
+#define QA_ADJACENT_CLOUD 0x04
+#define QA_CLOUD_SHADOW 0x08
+#define QA_SNOW 0x10
+#define QA_WATER 0x20
+
+/* QA mask tests: fill pixels, and fill or non-clear (cloud, adjacent cloud,
+   cloud shadow, snow, or water) pixels */
+#define QA_IS_FILL(qa) ((qa) == QA_FILL)
+#define QA_IS_BAD(qa) ((qa) != 0)
 
 /* Integer image coordinates data structure */
 typedef struct {
@@ -87,7 +121,7 @@ typedef struct {
   FILE *fp_img[NBAND_REFL_MAX]; /* File pointers for image data */
   int16 *img_buf;          /* Input data buffer (one line of image data) */
   FILE *fp_qa;             /* File pointer for QA data */
-  int16 *qa_buf;           /* Input mask/qa buffer (one line of data) */
+  uint8 *qa_buf;           /* Input mask/qa buffer (one line of data) */
 } Input_t;
 
 /* Structure for the 'output' burn area data */
@@ -98,6 +132,9 @@ typedef struct {
   Img_coord_int_t size; /* Output image size */
   FILE *fp_img;         /* File pointer for the image data */
   int16 *buf;           /* Output data buffer (one line of image data) */
+  bool compact;         /* Flag to indicate whether the output is written as
+                           uint8; 'true' = uint8, 'false' = int16 */
+  uint8 *compact_buf;   /* Compact output buffer (one line of image data) */
 } Output_t;
 
 /* Structure for the 'input' seasonal summary and annual max image data */
@@ -124,20 +161,35 @@ public:
     bool trainModel();
     bool predictModel(int iline, Output_t *ds_output);
     bool loadParametersFromFile(int ac, char* av[]);
+    bool loadConfigFile(int ac, char* av[], string config_filename);
     bool GetRbInputLYSummaryData(Input_Rb_t *ds_input, int line,
         BandIndex_t band, Season_t season);
     bool GetRbInputAnnualMaxData(Input_Rb_t *ds_input, int line, Index_t indx);
+    void PrintProgress(int nlines_done, int nlines, int nsamps,
+        double start_time);
 
     CvMLData cvml;           // contains the training data
     cv::Mat predMat;         // array for input data and predictions
-    cv::Mat qaMat;           // array for QA/mask data
+    cv::Mat qaMat;           // array for the one-byte QA/mask data
     cv::Mat lySummaryMat;    // array for last years seasonal summaries
                              // 1D array representing [PBA_NSEASONS][PBA_NBANDS]
     cv::Mat maxIndxMat;      // array for the maximum indices
                              // 1D array representing [PBA_NINDXS]
-    CvGBTrees gbtrees;
+    CvGBTrees gbtrees;       // model being trained
+    CvGBTrees *model;        // model used by the predictions
+    map<string, CvGBTrees *> loadedModels;  // models loaded, by XML file
     int trueCnt;
 
+    /* Progress and timing of the predictions */
+    long validPixels;        // number of pixels run through the model
+    double ioSeconds;        // time reading the inputs and writing the output
+    double featureSeconds;   // time computing the indices and assembling the
+                             // samples
+    double treeSeconds;      // time evaluating the trees
+
+    /* Command-line parameters */
+    bool CONFIG_STDIN;       // read the config files from stdin
+
     /* Parameters from the input config file */
     string INPUT_BASE_FILE;
     string INPUT_MASK_FILE;
@@ -145,6 +197,7 @@ public:
     bool predict_model;
     string SEASONAL_SUMMARIES_DIR;
     string OUTPUT_IMG_FILE;
+    bool OUTPUT_COMPACT;
     int TREE_CNT;
     float SHRINKAGE;
     int MAX_DEPTH;
@@ -169,4 +222,7 @@ public:
     float lry;
 };
 
+/* Prototypes */
+double WallSeconds();
+
 #endif /* PredictBurnedArea_H_ */
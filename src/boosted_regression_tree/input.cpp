@@ -24,6 +24,8 @@ Date          Programmer       Reason
 4/14/2014     Gail Schmidt     The single QA mask created by seasonal summ and
                                annual mask is a 16-bit signed int vs. the
                                previous unsigned char individual masks.
+10/18/2026    LSRD Project     The single QA mask is now the one-byte bit-packed
+                               mask (see PredictBurnedArea.h for the layout).
 
 NOTES:
 *****************************************************************************/
@@ -146,7 +148,7 @@ Input_t *OpenInput
   }
 
   /* Allocate the input QA/mask image buffer */
-  ds_input->qa_buf = (int16 *) calloc (ds_input->size.s, sizeof (int16));
+  ds_input->qa_buf = (uint8 *) calloc (ds_input->size.s, sizeof (uint8));
   if (ds_input->qa_buf == NULL) {
       sprintf (errstr, "allocating input QA/mask image buffer");
       RETURN_ERROR (errstr, "OpenInput", NULL);
@@ -353,8 +355,12 @@ Date          Programmer       Reason
 4/9/2014      Gail Schmidt     Use a local image buffer for reading the data
                                vs. allocating space and freeing for each line
                                read.
+10/18/2026    LSRD Project     Read the one-byte bit-packed QA mask vs. the
+                               int16 QA values.
 
 NOTES:
+  1. qaMat holds the bit-packed QA values; QA_IS_FILL and QA_IS_BAD test for
+     fill and non-clear pixels.
 *****************************************************************************/
 bool PredictBurnedArea::GetInputQALine
 (
@@ -370,13 +376,13 @@ bool PredictBurnedArea::GetInputQALine
     RETURN_ERROR("file not open", "GetInputQALine", false);
 
   /* Read the data */
-  if (read_raw_binary (ds_input->fp_qa, 1, ds_input->size.s, sizeof (int16),
+  if (read_raw_binary (ds_input->fp_qa, 1, ds_input->size.s, sizeof (uint8),
       ds_input->qa_buf) != SUCCESS)
     RETURN_ERROR("reading QA input", "GetInputQALine", false)
 
   /* Grabbing QA band and putting value into qaMat */
   for (samp = 0; samp < ds_input->size.s; samp++)
-      qaMat.at<short>(samp) = ds_input->qa_buf[samp];
+      qaMat.at<uchar>(samp) = ds_input->qa_buf[samp];
 
   return true;
 }
@@ -401,6 +407,7 @@ Date          Programmer       Reason
 9/15/2012     Jodi Riegle      Original development (based largely on routines
                                from the LEDAPS lndsr application)
 9/3/2013      Gail Schmidt     Modified to work in the ESPA environment
+10/18/2026    LSRD Project     Test for fill via the one-byte QA mask
 
 NOTES:
   1. The spectral index is multiplied by 1000.0 to match what is used in the
@@ -416,7 +423,7 @@ bool PredictBurnedArea::calcBands
 {
     for (int i = 0; i < ds_input->size.s; i++) {
         /* NDVI - using bands 4 and 3 */
-        if ((qaMat.at<short>(i) == INPUT_FILL_VALUE) ||
+        if (QA_IS_FILL (qaMat.at<uchar>(i)) ||
             (predMat.at<float>(i,PREDMAT_B4) + predMat.at<float>(i,PREDMAT_B3)
             == 0)) { //avoid division by 0 and fill data
             predMat.at<float>(i,PREDMAT_NDVI) = 0;
@@ -429,7 +436,7 @@ bool PredictBurnedArea::calcBands
         }
 
         /* NDMI - using bands 4 and 5 */
-        if ((qaMat.at<short>(i) == INPUT_FILL_VALUE) ||
+        if (QA_IS_FILL (qaMat.at<uchar>(i)) ||
             (predMat.at<float>(i,PREDMAT_B4) + predMat.at<float>(i,PREDMAT_B5)
             == 0)) { //avoid division by 0 and fill data
             predMat.at<float>(i,PREDMAT_NDMI) = 0; //avoid division by 0
@@ -442,7 +449,7 @@ bool PredictBurnedArea::calcBands
         }
 
         /* NBR - using bands 4 and 7 */
-        if ((qaMat.at<short>(i) == INPUT_FILL_VALUE) ||
+        if (QA_IS_FILL (qaMat.at<uchar>(i)) ||
             (predMat.at<float>(i,PREDMAT_B4) + predMat.at<float>(i,PREDMAT_B7)
             == 0)) { //avoid division by 0 and fill data
             predMat.at<float>(i,PREDMAT_NBR) = 0; //avoid division by 0
@@ -455,7 +462,7 @@ bool PredictBurnedArea::calcBands
         }
 
         /* NBR2 - using bands 5 and 7 */
-        if ((qaMat.at<short>(i) == INPUT_FILL_VALUE) ||
+        if (QA_IS_FILL (qaMat.at<uchar>(i)) ||
             (predMat.at<float>(i,PREDMAT_B5) + predMat.at<float>(i,PREDMAT_B7)
             == 0)) { //avoid division by 0 and fill data
             predMat.at<float>(i,PREDMAT_NBR2) = 0; //avoid division by 0
@@ -16,6 +16,7 @@ Date        Programmer       Reason
 9/3/2013    Gail Schmidt     Modified to work in the ESPA environment
 4/8/2014    Gail Schmidt     Modified to process data in the ESPA internal
                              raw binary format
+10/18/2026  LSRD Project     Added the compact (uint8) output option
 
 NOTES:
 *****************************************************************************/
@@ -52,13 +53,16 @@ HISTORY:
 Date          Programmer       Reason
 ----------    ---------------  -------------------------------------
 9/3/2013      Gail Schmidt     Modified to work in the ESPA environment
+10/18/2026    LSRD Project     Set the data type and fill value for the
+                               compact (uint8) output
 
 NOTES:
 *****************************************************************************/
 bool CreateOutputHeader
 (
   char *base_name,     /* I: input base filename of SR file to be processed */
-  char *output_file    /* I: name of output image file to create */
+  char *output_file,   /* I: name of output image file to create */
+  bool compact         /* I: is the output image uint8 vs. int16? */
 )
 {
   char errmsg[MAX_STR_LEN];         /* error string */
@@ -87,7 +91,21 @@ bool CreateOutputHeader
   }
 
   std::ofstream dst(output_hdr);
-  dst << src.rdbuf();
+  if (!compact) {
+    dst << src.rdbuf();
+    return true;
+  }
+
+  /* For the compact output, replace the data type and the fill value */
+  string line;
+  while (getline (src, line)) {
+    if (line.compare (0, 9, "data type") == 0)
+      dst << "data type = 1" << endl;
+    else if (line.compare (0, 17, "data ignore value") == 0)
+      dst << "data ignore value = " << PBA_COMPACT_FILL << endl;
+    else
+      dst << line << endl;
+  }
 
   return true;
 }
@@ -113,13 +131,15 @@ Date          Programmer       Reason
                                from the LEDAPS lndsr application)
 9/3/2013      Gail Schmidt     Modified to work in the ESPA environment
 4/8/2014      Gail Schmidt     Modified to use the ESPA raw binary file format
+10/18/2026    LSRD Project     Allocate the compact (uint8) output buffer
 
 NOTES:
 *****************************************************************************/
 Output_t *OpenOutput
 (
   char *file_name,        /* I: output filename to be created */
-  Img_coord_int_t *size   /* I: image size of the file to be created */
+  Img_coord_int_t *size,  /* I: image size of the file to be created */
+  bool compact            /* I: write the output as uint8 vs. int16? */
 )
 {
   Output_t *ds_output = NULL;   /* output structure to be populated */
@@ -137,6 +157,8 @@ Output_t *OpenOutput
   ds_output->open = false;
   ds_output->size.l = size->l;
   ds_output->size.s = size->s;
+  ds_output->compact = compact;
+  ds_output->compact_buf = NULL;
 
   /* Open file for write access */
   ds_output->fp_img = open_raw_binary (file_name, (char *) "wb");
@@ -149,6 +171,14 @@ Output_t *OpenOutput
   if (ds_output->buf == NULL)
     RETURN_ERROR ("allocating output buffer", "OpenOutput", NULL);
 
+  /* Allocate the compact output buffer */
+  if (compact) {
+    ds_output->compact_buf = (uint8 *) calloc (ds_output->size.s,
+      sizeof (uint8));
+    if (ds_output->compact_buf == NULL)
+      RETURN_ERROR ("allocating compact output buffer", "OpenOutput", NULL);
+  }
+
   return ds_output;
 }
 
@@ -222,8 +252,9 @@ bool FreeOutput
     if (ds_output->open)
       RETURN_ERROR("file still open", "FreeOutput", false);
 
-    /* Free the data buffer */
+    /* Free the data buffers */
     free (ds_output->buf);
+    free (ds_output->compact_buf);
 
     /* Free the filename */
     free (ds_output->file_name);
@@ -255,8 +286,12 @@ Date          Programmer       Reason
                                from the LEDAPS lndsr application)
 9/3/2013      Gail Schmidt     Modified to work in the ESPA environment
 4/8/2014      Gail Schmidt     Modified to use the ESPA raw binary file format
+10/18/2026    LSRD Project     Write the compact (uint8) output
 
 NOTES:
+  1. For the compact output, the probabilities (0-100) are written as-is and
+     PBA_CLOUD_WATER and PBA_FILL are written as PBA_COMPACT_CLOUD_WATER and
+     PBA_COMPACT_FILL.
 *****************************************************************************/
 bool PredictBurnedArea::PutOutputLine
 (
@@ -265,6 +300,8 @@ bool PredictBurnedArea::PutOutputLine
   int iline              /* I: current line to be written (0-based) */
 )
 {
+  int samp;              /* looping variable */
+
   /* Check the parameters */
   if (ds_output == (Output_t *)NULL)
     RETURN_ERROR("invalid output structure", "PutOutputLine", false);
@@ -274,8 +311,22 @@ bool PredictBurnedArea::PutOutputLine
     RETURN_ERROR("invalid line number", "PutOutputLine", false);
 
   /* Write the data */
-  if (write_raw_binary (ds_output->fp_img, 1, ds_output->size.s, sizeof (int16),
-    ds_output->buf) != SUCCESS)
+  if (ds_output->compact) {
+    for (samp = 0; samp < ds_output->size.s; samp++) {
+      if (ds_output->buf[samp] == PBA_FILL)
+        ds_output->compact_buf[samp] = PBA_COMPACT_FILL;
+      else if (ds_output->buf[samp] == PBA_CLOUD_WATER)
+        ds_output->compact_buf[samp] = PBA_COMPACT_CLOUD_WATER;
+      else
+        ds_output->compact_buf[samp] = (uint8) ds_output->buf[samp];
+    }
+
+    if (write_raw_binary (ds_output->fp_img, 1, ds_output->size.s,
+      sizeof (uint8), ds_output->compact_buf) != SUCCESS)
+      RETURN_ERROR("writing output", "PutOutputLine", false);
+  }
+  else if (write_raw_binary (ds_output->fp_img, 1, ds_output->size.s,
+    sizeof (int16), ds_output->buf) != SUCCESS)
     RETURN_ERROR("writing output", "PutOutputLine", false);
 
   return true;
@@ -25,8 +25,8 @@ NOTES:
 #include "PredictBurnedArea.h"
 
 /* Prototypes */
-bool CreateOutputHeader (char *base_name, char *output_file);
-Output_t *OpenOutput(char *file_name, Img_coord_int_t *size);
+bool CreateOutputHeader (char *base_name, char *output_file, bool compact);
+Output_t *OpenOutput(char *file_name, Img_coord_int_t *size, bool compact);
 bool CloseOutput(Output_t *ds_output);
 bool FreeOutput(Output_t *ds_output);
 
@@ -37,7 +37,8 @@ using namespace std;
 /******************************************************************************
 MODULE: loadModel (class PredictBurnedArea)
 
-PURPOSE: Loads a previously trained and saved model.
+PURPOSE: Loads a previously trained and saved model.  The models are cached
+by XML file, so a model already loaded is used again without reading it.
  
 RETURN VALUE:
 Type = None
@@ -48,12 +49,28 @@ HISTORY:
 Date          Programmer       Reason
 ----------    ---------------  -------------------------------------
 9/3/2013      Gail Schmidt     Original development
+10/18/2026    LSRD Project     Cache the loaded models by XML file
 
 NOTES:
+  1. The cached models remain in memory until the PredictBurnedArea object
+     is destroyed; there are only a handful of regional models.
 *****************************************************************************/
 void PredictBurnedArea::loadModel ()
 {
-  	gbtrees.load (LOAD_MODEL_XML.c_str());
+    map<string, CvGBTrees *>::iterator it;
+
+    it = loadedModels.find (LOAD_MODEL_XML);
+    if (it != loadedModels.end()) {
+        model = it->second;
+        return;
+    }
+
+    if (VERBOSE)
+        cout << "Loading the model from XML file: "
+             << LOAD_MODEL_XML.c_str() << endl;
+    model = new CvGBTrees;
+    model->load (LOAD_MODEL_XML.c_str());
+    loadedModels[LOAD_MODEL_XML] = model;
 }
 
 
@@ -180,6 +197,12 @@ Date          Programmer       Reason
                                of the QA values
 4/7/2014      Gail Schmidt     Using a single QA/mask band now which is int16
                                vs. the old uint8 masks
+10/18/2026    LSRD Project     The single QA/mask band is now the one-byte
+                               bit-packed mask
+10/18/2026    LSRD Project     The samples for the line are assembled before
+                               the trees are evaluated, so the time spent in
+                               each is tracked along with the number of pixels
+                               predicted.
 
 NOTES:
   1. It's assumed the model has already been trained and/or loaded.
@@ -196,15 +219,20 @@ bool PredictBurnedArea::predictModel
     int indx;                    /* indices looping variable */
     int sample_indx;             /* current sample index for stacking data */
     char errmsg[MAX_STR_LEN];    /* error message */
-    cv::Mat sample (1,NCSV_INPUTS+1,CV_32FC1);
+    double step_start;           /* start time of the current step */
+    cv::Mat samples (predMat.rows,NCSV_INPUTS+1,CV_32FC1);
                                  /* cvMat to hold the stacks of prediction
-                                    information for each of the samples; size
-                                    of this must be the same size as the array
-                                    of data set to the training module */
+                                    information for each of the samples in
+                                    the line; the number of columns must be
+                                    the same size as the array of data set
+                                    to the training module */
 
     /* Loop through the predicted matrix rows which currently represent
        the samples in the input image.  The columns represent each band. */
+    step_start = WallSeconds ();
     for( int y = 0; y < predMat.rows; y++ ) {
+        cv::Mat sample = samples.row(y);
+
         /* Add the surface reflectance and indices */
         sample.at<float>(0) = predMat.at<float>(y,PREDMAT_B1);
         sample.at<float>(1) = predMat.at<float>(y,PREDMAT_B2);
@@ -232,7 +260,7 @@ bool PredictBurnedArea::predictModel
             sample.at<float>(sample_indx++) = maxIndxMat.at<float>(y,indx);
 
         /* Add the deltas of the annual maximums for the indices */
-        if (qaMat.at<short>(y) == INPUT_FILL_VALUE) { // fill
+        if (QA_IS_FILL (qaMat.at<uchar>(y))) { // fill
             for (indx = 0; indx < PBA_NINDXS; indx++)
                 sample.at<float>(sample_indx++) = INPUT_FILL_VALUE;
         }
@@ -252,24 +280,33 @@ bool PredictBurnedArea::predictModel
             sample_indx, NCSV_INPUTS);
             RETURN_ERROR (errmsg, "predict_model", false);
         }
+    }
+    featureSeconds += WallSeconds () - step_start;
 
+    /* Run the model on the assembled samples */
+    step_start = WallSeconds ();
+    for( int y = 0; y < predMat.rows; y++ ) {
         /* If the current pixel isn't cloudy, water, or fill, then run the
            prediction for this pixel. If the pixel is cloud, shadow, or water,
            then set it to PBA_CLOUD_WATER. If the pixel is fill then set it to
            PBA_FILL. */
-        if (qaMat.at<short>(y) == INPUT_FILL_VALUE)  /* fill pixel */
+        if (QA_IS_FILL (qaMat.at<uchar>(y)))  /* fill pixel */
             output->buf[y] = PBA_FILL;
-        else if (qaMat.at<short>(y) < 0)   /* cloudy, snow, or water pixel */
+        else if (QA_IS_BAD (qaMat.at<uchar>(y)))  /* cloudy, snow, or water */
             output->buf[y] = PBA_CLOUD_WATER;
         else {  /* do the probability mapping for burned (class of 1) */
-            float response = gbtrees.predict_prob (sample, 1);
+            float response = model->predict_prob (samples.row(y), 1);
             output->buf[y] = (int16) (response * 100.0 + 0.5);
+            validPixels++;
         }
     }
+    treeSeconds += WallSeconds () - step_start;
 
     /* Write the line of probability mappings to the output file */
+    step_start = WallSeconds ();
     PutOutputLine (output, iline);
-    sample.release();
+    ioSeconds += WallSeconds () - step_start;
+    samples.release();
 
     return true;
 }
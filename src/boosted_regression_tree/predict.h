@@ -39,4 +39,10 @@ using namespace std;
 /* define the pixel values for fill for the output prediction scenes */
 #define PBA_FILL -9999
 
+/* define the pixel values for cloud/water and fill for the compact (uint8)
+   output prediction scenes; these need to be kept in sync with
+   scripts/product_encoding.py */
+#define PBA_COMPACT_CLOUD_WATER 254
+#define PBA_COMPACT_FILL 255
+
 #endif /* PREDICT_H_ */
@@ -35,6 +35,8 @@ Date        Programmer       Reason
                              Modified to use the single mask file created
                              during seasonal summary processing.  This single
                              mask is int16 vs. uint8.
+10/18/2026  LSRD Project     Replaced the timestamp every 100 lines with
+                             machine-readable PROGRESS lines.
 
 NOTES:
 ******************************************************************************/
@@ -60,39 +62,35 @@ char indx_str[PBA_NINDXS][MAX_STR_LEN] = {"ndvi", "ndmi", "nbr", "nbr2"};
     /* string to represent the indices in the annual maximums */
 
 /******************************************************************************
-MODULE:  main
+MODULE:  PredictScene
 
-PURPOSE:  Reads the user specified arguments, reads the config file, handles
-training the model and/or loading and running the model on the user-specified
-file and using the user-specified configurations for the model.
+PURPOSE:  Runs the loaded model on the scene of the current configuration,
+writing the burn probabilities to the output file.
 
 RETURN VALUE:
-Type = int
-Value          Description
------          -----------
-EXIT_FAILURE   Non-zero value to indicate an error occurred during processing
-EXIT_SUCCESS   Zero value to indicate successful processing
+Type = None
 
 HISTORY:
 Date          Programmer       Reason
 ----------    ---------------  -------------------------------------
-9/15/2012     Jodi Riegle      Original development
-9/3/2013      Gail Schmidt     Modified to work in the ESPA environment
-12/8/2013     Gail Schmidt     Added support for the adjacent cloud mask for
-                               the overall QA values
+10/18/2026    LSRD Project     Pulled from main so the predictions can be
+                               run for a series of configuration files
 
 NOTES:
-  1. predict_burned_area --help will provide input information.
-  2. This code is a mixture of true object-oriented C++ code and
-     traditional C-based code (error handling, file read/write)
+  1. Errors exit the application, the same as in main.
 ******************************************************************************/
-int main(int argc, char* argv[]) {
-    PredictBurnedArea pba;
+static void PredictScene
+(
+    PredictBurnedArea *pba        /* I: configuration and loaded model */
+)
+{
     int bnd;                           /* band/index looping variable */
     int season;                        /* season looping variable */
     int indx;                          /* indices looping variable */
     int ib;                            /* band and line counters */
     int acq_year;                      /* acquisition year of input scene */
+    double predict_start;              /* start time of the predictions */
+    double step_start;                 /* start time of the current step */
     char errstr[MAX_STR_LEN];          /* error string */
     char *output_file_name = NULL;     /* output filename */
     char lySummaryFile[PBA_NSEASONS][PBA_NBANDS][MAX_STR_LEN];/* last year */
@@ -101,72 +99,42 @@ int main(int argc, char* argv[]) {
     Output_t *output = NULL;           /* output structure and metadata */
     Input_Rb_t *lySummaryPtr[PBA_NSEASONS][PBA_NBANDS];  /* last year ptr */
     Input_Rb_t *maxIndxPtr[PBA_NINDXS];                  /* max indices ptr */
+    char* baseFile = (char *) pba->INPUT_BASE_FILE.c_str();
+    char* maskFile = (char *) pba->INPUT_MASK_FILE.c_str();
+    char* seasonalSummaryDir = (char *) pba->SEASONAL_SUMMARIES_DIR.c_str();
 
-    /* Read the config file */
-    if (!pba.loadParametersFromFile (argc, argv)) {
-        /* error message already printed in loadParametersFromFile so just
-           exit */
-        exit (EXIT_FAILURE);
-    }
-    char* baseFile = (char *) pba.INPUT_BASE_FILE.c_str();
-    char* maskFile = (char *) pba.INPUT_MASK_FILE.c_str();
-    char* seasonalSummaryDir = (char *) pba.SEASONAL_SUMMARIES_DIR.c_str();
+    /* Reset the progress and timing for this scene */
+    pba->validPixels = 0;
+    pba->ioSeconds = 0.0;
+    pba->featureSeconds = 0.0;
+    pba->treeSeconds = 0.0;
 
     /* Print some input processing info */
-    if (pba.VERBOSE) {
-        if (pba.train_model) {
-            cout << "Training the model using the following parameters -"
-                 << endl;
-            cout << "   Tree count: " << pba.TREE_CNT << endl;
-            cout << "   Maximum tree depth: " << pba.MAX_DEPTH << endl;
-            cout << "   Shrinkage: " << pba.SHRINKAGE << endl;
-            cout << "   Subsample fraction: " << pba.SUBSAMPLE_FRACTION << endl;
-            cout << "   Input CSV file: " << pba.CSV_FILE.c_str() << endl;
-            cout << "   Number of CSV predictors: " << pba.NCSV_INPUTS << endl;
-        }
-        if (pba.save_model)
-            cout << "Model will be saved to XML file: "
-                 << pba.SAVE_MODEL_XML.c_str() << endl;
-        if (pba.predict_model) {
-            cout << "Model predictions will be completed using the following "
-                    "parameters -" << endl;
-            cout << "  Input surface reflectance file: " << baseFile << endl;
-            cout << "  Input mask file: " << maskFile << endl;
-            cout << "  Fill value: " << pba.INPUT_FILL_VALUE << endl;
-            cout << "  Input seasonal summaries file: " << seasonalSummaryDir
+    if (pba->VERBOSE) {
+        cout << "Model predictions will be completed using the following "
+                "parameters -" << endl;
+        cout << "  Input surface reflectance file: " << baseFile << endl;
+        cout << "  Input mask file: " << maskFile << endl;
+        cout << "  Fill value: " << pba->INPUT_FILL_VALUE << endl;
+        if (pba->OUTPUT_COMPACT)
+            cout << "  Output probabilities will be written as uint8"
                  << endl;
-            if (pba.load_model)
-                cout << "Model will be loaded from XML file: "
-                     << pba.LOAD_MODEL_XML.c_str() << endl;
-        }
-    }
-
-    /* Train the model using the data provided in the input CSV file.  If
-       training is not specified then load the provided XML file for the
-       model. */
-    if (pba.train_model) {
-        if (!pba.trainModel ()) {
-            sprintf (errstr, "error training the model");
-            EXIT_ERROR(errstr, "main");
-        }
-    }
-    else if (pba.load_model) {
-        pba.loadModel ();
+        cout << "  Input seasonal summaries file: " << seasonalSummaryDir
+             << endl;
+        if (pba->load_model)
+            cout << "Model will be loaded from XML file: "
+                 << pba->LOAD_MODEL_XML.c_str() << endl;
     }
 
-    /* If not running model predictions, then we are done */
-    if (!pba.predict_model)
-        exit (EXIT_SUCCESS);
-
     /* Open the input image and mask files */
-    input = OpenInput (baseFile, maskFile, pba.INPUT_FILL_VALUE);
+    input = OpenInput (baseFile, maskFile, pba->INPUT_FILL_VALUE);
     if (input == NULL) {
         sprintf (errstr, "opening the input image or mask files");
-        EXIT_ERROR(errstr, "main");
+        EXIT_ERROR(errstr, "PredictScene");
     }
 
     /* Print some input metadata info */
-    if (pba.VERBOSE) {
+    if (pba->VERBOSE) {
         cout << "Number of input reflective bands: " << input->nband
              << endl;
         cout << "Number of input thermal bands: " << 1 << endl;
@@ -181,16 +149,17 @@ int main(int argc, char* argv[]) {
     acq_year = input->meta.acq_year;
 
     /* Create and open output file */
-    output_file_name = strdup(pba.OUTPUT_IMG_FILE.c_str());
-    if (!CreateOutputHeader (baseFile, output_file_name)) {
+    output_file_name = strdup(pba->OUTPUT_IMG_FILE.c_str());
+    if (!CreateOutputHeader (baseFile, output_file_name,
+        pba->OUTPUT_COMPACT)) {
         sprintf(errstr, "creating output header file for %s", output_file_name);
-        EXIT_ERROR(errstr, "main");
+        EXIT_ERROR(errstr, "PredictScene");
     }
 
-    output = OpenOutput (output_file_name, &input->size);
+    output = OpenOutput (output_file_name, &input->size, pba->OUTPUT_COMPACT);
     if (output == NULL) {
         sprintf (errstr, "opening output file: %s", output_file_name);
-        EXIT_ERROR(errstr, "main");
+        EXIT_ERROR(errstr, "PredictScene");
     }
 
     /* Create the filenames for the seasonal summmaries and annual maximums.
@@ -218,7 +187,7 @@ int main(int argc, char* argv[]) {
             if (lySummaryPtr[season][bnd] == NULL) {
                 sprintf (errstr, "opening file: %s",
                     lySummaryFile[season][bnd]);
-                EXIT_ERROR (errstr, "main");
+                EXIT_ERROR (errstr, "PredictScene");
             }
         }
     }
@@ -233,84 +202,95 @@ int main(int argc, char* argv[]) {
         maxIndxPtr[indx] = OpenRbInput (maxIndxFile[indx]);
         if (maxIndxPtr[indx] == NULL) {
             sprintf (errstr, "opening file: %s", maxIndxFile[indx]);
-            EXIT_ERROR (errstr, "main");
+            EXIT_ERROR (errstr, "PredictScene");
         }
     }
 
     /* Set up arrays for the seasonal summaries and annual maximums */
-    pba.lySummaryMat.create (input->size.s, PBA_NBANDS*PBA_NSEASONS, CV_32FC1);
-    pba.maxIndxMat.create (input->size.s, PBA_NINDXS, CV_32FC1);
+    pba->lySummaryMat.create (input->size.s, PBA_NBANDS*PBA_NSEASONS,
+        CV_32FC1);
+    pba->maxIndxMat.create (input->size.s, PBA_NINDXS, CV_32FC1);
 
     /* Set up arrays for the predicted data and QA/mask data.  These will hold
        a single line and single/multiple bands, depending on what is being
        represented.  For predMat (predicted matrix), bands 0-5 are the
        reflective bands (1-5, and 7), 6=NDVI, 7=NDMI, 8=NBR, 9=NBR2.  qaMat
        represents the QA band. */
-    pba.predMat.create (input->size.s, 10, CV_32FC1);
-    pba.qaMat.create (input->size.s, 1, CV_16S);
+    pba->predMat.create (input->size.s, 10, CV_32FC1);
+    pba->qaMat.create (input->size.s, 1, CV_8U);
 
     cout << second_clock::local_time() << " ======= Predict Started ======== "
          << endl;
+    predict_start = WallSeconds ();
 
     /* Loop through the lines in the image, read the reflective data, compute
        needed index products, read the QA data, and run the predictions */
     for (int iline = 0; iline < input->size.l; iline++) {
-        if (iline % 100 == 0) {
-            cout << second_clock::local_time() << " ======= line " << iline
-                 << " ======== " << endl;
-        }
-
         /* Read each reflective band for the current line */
+        step_start = WallSeconds ();
         for (ib = 0; ib < input->nband; ib++) {
-            if (!pba.GetInputData (input, ib)) {
+            if (!pba->GetInputData (input, ib)) {
                 sprintf (errstr, "reading input image data for line %d, "
                     "band %d", iline, ib);
-                EXIT_ERROR(errstr, "main");
+                EXIT_ERROR(errstr, "PredictScene");
             }
         }
 
+        pba->ioSeconds += WallSeconds () - step_start;
+
         /* Compute the NDVI, NDMI, NBR, and NBR2 for the current line */
-        if (!pba.calcBands (input)) {
+        step_start = WallSeconds ();
+        if (!pba->calcBands (input)) {
             sprintf (errstr, "reading input image data for line %d, band %d",
                 0, 1);
-            EXIT_ERROR(errstr, "main");
+            EXIT_ERROR(errstr, "PredictScene");
         }
+        pba->featureSeconds += WallSeconds () - step_start;
 
         /* Read the QA band for the current line */
-        if (!pba.GetInputQALine (input)) {
+        step_start = WallSeconds ();
+        if (!pba->GetInputQALine (input)) {
             sprintf (errstr, "reading input QA data for line %d", iline);
-            EXIT_ERROR(errstr, "main");
+            EXIT_ERROR(errstr, "PredictScene");
         }
 
         /* Read the seasonal summaries for the previous year */
         for (bnd = 0; bnd < PBA_NBANDS; bnd++) {
             for (season = 0; season < PBA_NSEASONS; season++) {
-                if (!pba.GetRbInputLYSummaryData (lySummaryPtr[season][bnd],
+                if (!pba->GetRbInputLYSummaryData (lySummaryPtr[season][bnd],
                     iline, (BandIndex_t) bnd, (Season_t) season)) {
                     sprintf (errstr, "reading previous year seasonal summary "
                         "data for line %d, band %s, season %s", iline,
                         band_indx_str[bnd], season_str[season]);
-                    EXIT_ERROR(errstr, "main");
+                    EXIT_ERROR(errstr, "PredictScene");
                 }
             }
         }
 
         /* Read the annual maximums for last year */
         for (indx = 0; indx < PBA_NINDXS; indx++) {
-            if (!pba.GetRbInputAnnualMaxData (maxIndxPtr[indx], iline,
+            if (!pba->GetRbInputAnnualMaxData (maxIndxPtr[indx], iline,
                 (Index_t) indx)) {
                 sprintf (errstr, "reading annual maximum data for line %d, "
                     "index %s", iline, indx_str[indx]);
-                EXIT_ERROR(errstr, "main");
+                EXIT_ERROR(errstr, "PredictScene");
             }
         }
+        pba->ioSeconds += WallSeconds () - step_start;
 
         /* Run the predictions for the current line */
-        if (!pba.predictModel (iline, output)) {
+        if (!pba->predictModel (iline, output)) {
             sprintf (errstr, "running the probability mappings for line %d",
                 iline);
-            EXIT_ERROR(errstr, "main");
+            EXIT_ERROR(errstr, "PredictScene");
         }
+
+        /* Report the progress every PROGRESS_INTERVAL lines and at the end
+           of the scene */
+        if ((iline + 1) % PROGRESS_INTERVAL == 0 ||
+            iline + 1 == input->size.l)
+            pba->PrintProgress (iline + 1, input->size.l, input->size.s,
+                predict_start);
     }
 
     cout << second_clock::local_time()
@@ -318,37 +298,165 @@ int main(int argc, char* argv[]) {
 
     /* Close the input file and free the structure */
     if (!CloseInput (input))
-        EXIT_ERROR("closing input surface reflectance file", "main");
+        EXIT_ERROR("closing input surface reflectance file", "PredictScene");
     if (!FreeInput (input))
-        EXIT_ERROR("freeing input surface reflectance file memory", "main");
+        EXIT_ERROR("freeing input surface reflectance file memory",
+            "PredictScene");
 
     /* Close the output file and free the structure */
     if (!CloseOutput (output))
-        EXIT_ERROR("closing output burned area file", "main");
+        EXIT_ERROR("closing output burned area file", "PredictScene");
     if (!FreeOutput (output))
-        EXIT_ERROR("freeing output burned area file memory", "main");
+        EXIT_ERROR("freeing output burned area file memory", "PredictScene");
 
     /* Close the seasonal summaries and annual maximum files */
     for (season = 0; season < PBA_NSEASONS; season++) {
         for (bnd = 0; bnd < PBA_NBANDS; bnd++) {
             if (!CloseRbInput (lySummaryPtr[season][bnd]))
-                EXIT_ERROR("closing input seasonal summary file", "main");
+                EXIT_ERROR("closing input seasonal summary file",
+                    "PredictScene");
             if (!FreeRbInput (lySummaryPtr[season][bnd]))
-                EXIT_ERROR("freeing input seasonal summary file", "main");
+                EXIT_ERROR("freeing input seasonal summary file",
+                    "PredictScene");
         }
     }
     for (indx = 0; indx < PBA_NINDXS; indx++) {
         if (!CloseRbInput (maxIndxPtr[indx]))
-            EXIT_ERROR("closing input annual maximum file", "main");
+            EXIT_ERROR("closing input annual maximum file", "PredictScene");
         if (!FreeRbInput (maxIndxPtr[indx]))
-            EXIT_ERROR("freeing input annual maximum file", "main");
+            EXIT_ERROR("freeing input annual maximum file", "PredictScene");
     }
 
     /* Release the data arrays */
-    pba.predMat.release();
-    pba.qaMat.release();
-    pba.lySummaryMat.release();
-    pba.maxIndxMat.release();
+    pba->predMat.release();
+    pba->qaMat.release();
+    pba->lySummaryMat.release();
+    pba->maxIndxMat.release();
+    free (output_file_name);
+}
+
+
+/******************************************************************************
+MODULE:  main
+
+PURPOSE:  Reads the user specified arguments, reads the config file, handles
+training the model and/or loading and running the model on the user-specified
+file and using the user-specified configurations for the model.
+
+RETURN VALUE:
+Type = int
+Value          Description
+-----          -----------
+EXIT_FAILURE   Non-zero value to indicate an error occurred during processing
+EXIT_SUCCESS   Zero value to indicate successful processing
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+9/15/2012     Jodi Riegle      Original development
+9/3/2013      Gail Schmidt     Modified to work in the ESPA environment
+12/8/2013     Gail Schmidt     Added support for the adjacent cloud mask for
+                               the overall QA values
+10/18/2026    LSRD Project     The QA mask is the one-byte bit-packed mask
+10/18/2026    LSRD Project     Added the OUTPUT_COMPACT (uint8) output option
+10/18/2026    LSRD Project     Write a PROGRESS line every PROGRESS_INTERVAL
+                               lines with the throughput and the time spent
+                               in I/O, assembling the samples, and evaluating
+                               the trees
+10/18/2026    LSRD Project     Moved the predictions to PredictScene.  Added
+                               --config_stdin to run the predictions for the
+                               configuration files read from stdin, writing a
+                               SCENE_DONE line after each one
+10/18/2026    LSRD Project     Each model is only loaded once with
+                               --config_stdin, since the models are cached
+
+NOTES:
+  1. predict_burned_area --help will provide input information.
+  2. With --config_stdin, each LOAD_MODEL_XML is loaded the first time it
+     is used and then cached, so the scenes can alternate between models.
+     An error in any of the scenes exits the application.
+  3. This code is a mixture of true object-oriented C++ code and
+     traditional C-based code (error handling, file read/write)
+******************************************************************************/
+int main(int argc, char* argv[]) {
+    PredictBurnedArea pba;
+    char errstr[MAX_STR_LEN];          /* error string */
+    string config_filename;            /* config file read from stdin */
+
+    /* Read the config file */
+    if (!pba.loadParametersFromFile (argc, argv)) {
+        /* error message already printed in loadParametersFromFile so just
+           exit */
+        exit (EXIT_FAILURE);
+    }
+
+    /* Run the predictions for each of the config files read from stdin,
+       loading each model only once */
+    if (pba.CONFIG_STDIN) {
+        while (getline (cin, config_filename)) {
+            if (config_filename.empty())
+                continue;
+
+            /* only the config file parameters are read, not the
+               command-line */
+            if (!pba.loadConfigFile (1, argv, config_filename)) {
+                /* error message already printed in loadConfigFile */
+                exit (EXIT_FAILURE);
+            }
+            if (!pba.predict_model || !pba.load_model) {
+                sprintf (errstr, "INPUT_BASE_FILE and LOAD_MODEL_XML are "
+                    "required in each config file read from stdin: %s",
+                    config_filename.c_str());
+                EXIT_ERROR(errstr, "main");
+            }
+
+            /* the models already loaded are cached */
+            pba.loadModel ();
+
+            PredictScene (&pba);
+            printf ("%s config_file=%s\n", SCENE_DONE_KEYWORD,
+                config_filename.c_str());
+            fflush (stdout);
+        }
+        exit (EXIT_SUCCESS);
+    }
+
+    /* Print some input processing info */
+    if (pba.VERBOSE) {
+        if (pba.train_model) {
+            cout << "Training the model using the following parameters -"
+                 << endl;
+            cout << "   Tree count: " << pba.TREE_CNT << endl;
+            cout << "   Maximum tree depth: " << pba.MAX_DEPTH << endl;
+            cout << "   Shrinkage: " << pba.SHRINKAGE << endl;
+            cout << "   Subsample fraction: " << pba.SUBSAMPLE_FRACTION << endl;
+            cout << "   Input CSV file: " << pba.CSV_FILE.c_str() << endl;
+            cout << "   Number of CSV predictors: " << pba.NCSV_INPUTS << endl;
+        }
+        if (pba.save_model)
+            cout << "Model will be saved to XML file: "
+                 << pba.SAVE_MODEL_XML.c_str() << endl;
+    }
+
+    /* Train the model using the data provided in the input CSV file.  If
+       training is not specified then load the provided XML file for the
+       model. */
+    if (pba.train_model) {
+        if (!pba.trainModel ()) {
+            sprintf (errstr, "error training the model");
+            EXIT_ERROR(errstr, "main");
+        }
+    }
+    else if (pba.load_model) {
+        pba.loadModel ();
+    }
+
+    /* If not running model predictions, then we are done */
+    if (!pba.predict_model)
+        exit (EXIT_SUCCESS);
+
+    /* Run the predictions for the scene */
+    PredictScene (&pba);
 
     exit (EXIT_SUCCESS);
 };
@@ -1,4 +1,4 @@
-#include "generate_stack.h"
+#include "scene_meta.h"
 
 /******************************************************************************
 MODULE:  read_xml
@@ -20,6 +20,9 @@ HISTORY:
 Date        Programmer       Reason
 ----------  ---------------  -------------------------------------
 3/12/2014   Gail Schmidt     Original Development
+10/18/2026  LSRD Project     Also read the projection extents, so the stack
+                             and the maximum extents can be determined from
+                             a single parse of the XML file
 
 NOTES:
 ******************************************************************************/
@@ -105,6 +108,24 @@ int read_xml
     scene_meta->pixel_size[1] = xml_metadata.band[refl_indx].pixel_size[1];
     scene_meta->utm_zone = gmeta->proj_info.utm_zone;
 
+    /* Assign the projection extents, using the outer extents of the pixels
+       if the corners were specified as the center of the pixel */
+    scene_meta->proj_extent[ESPA_WEST] = gmeta->proj_info.ul_corner[0];
+    scene_meta->proj_extent[ESPA_EAST] = gmeta->proj_info.lr_corner[0];
+    scene_meta->proj_extent[ESPA_NORTH] = gmeta->proj_info.ul_corner[1];
+    scene_meta->proj_extent[ESPA_SOUTH] = gmeta->proj_info.lr_corner[1];
+    if (!strcmp (gmeta->proj_info.grid_origin, "CENTER"))
+    {
+        scene_meta->proj_extent[ESPA_WEST] -=
+            xml_metadata.band[refl_indx].pixel_size[0] * 0.5;
+        scene_meta->proj_extent[ESPA_EAST] +=
+            xml_metadata.band[refl_indx].pixel_size[0] * 0.5;
+        scene_meta->proj_extent[ESPA_NORTH] +=
+            xml_metadata.band[refl_indx].pixel_size[1] * 0.5;
+        scene_meta->proj_extent[ESPA_SOUTH] -=
+            xml_metadata.band[refl_indx].pixel_size[1] * 0.5;
+    }
+
     count = snprintf (scene_meta->satellite, sizeof (scene_meta->satellite),
         "%s", gmeta->satellite);
     if (count < 0 || count >= sizeof (scene_meta->satellite))
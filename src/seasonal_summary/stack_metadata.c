@@ -0,0 +1,623 @@
+#include <getopt.h>
+#include <libxml/parser.h>
+#include "stack_metadata.h"
+
+/******************************************************************************
+MODULE:  stack_metadata
+
+PURPOSE:  Generates the CSV stack file and determines the maximum bounding
+extent for the input list of XML files, parsing each XML file once.
+
+RETURN VALUE:
+Type = int
+Value           Description
+-----           -----------
+ERROR           An error occurred during processing of the files
+SUCCESS         Processing was successful
+
+PROJECT:  Land Satellites Data System Science Research and Development (LSRD)
+at the USGS EROS
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/18/2026    LSRD Project     Original Development, combining
+                               generate_stack and determine_max_extent
+
+NOTES:
+  1. The outputs are the same as those of generate_stack (--stack_file) and
+     determine_max_extent (--extent_file).  The XML files are parsed in
+     parallel by --num_threads threads, and the outputs are written in the
+     order of the input list.
+  2. Files which can't be parsed are skipped, as in generate_stack and
+     determine_max_extent.  The maximum extents start with the extents of
+     the first file which was successfully parsed.
+******************************************************************************/
+int main (int argc, char *argv[])
+{
+    bool verbose;              /* verbose flag for printing messages */
+    char FUNC_NAME[] = "main"; /* function name */
+    char errmsg[STR_SIZE];     /* error message */
+    char **xml_infile = NULL;  /* array to hold list of input XML filenames */
+    char *list_infile=NULL;    /* file containing the temporal list of
+                                  reflectance products to be processed */
+    char *stack_file=NULL;     /* output CSV file for the XML stack */
+    char *extent_file=NULL;    /* output file for the maximum extents */
+
+    int i;                     /* looping variable */
+    int retval;                /* return status */
+    int nfiles;                /* number of files in the input list */
+    int nvalid;                /* number of files successfully parsed */
+    int num_threads;           /* number of parsing threads */
+    int nthreads;              /* number of parsing threads started */
+
+    double west_coord=-999.0;  /* west bounding coordinate of list */
+    double east_coord=-999.0;  /* east bounding coordinate of list */
+    double north_coord=-999.0; /* north bounding coordinate of list */
+    double south_coord=-999.0; /* south bounding coordinate of list */
+
+    Ba_scene_meta_t *scene_meta = NULL; /* metadata for each XML file */
+    Ba_scene_meta_t *meta = NULL;       /* metadata for the current file */
+    int *status = NULL;        /* status of the parse for each XML file */
+    Ba_parse_queue_t queue;    /* queue of files for the parsing threads */
+    pthread_t threads[MAX_THREADS]; /* parsing threads */
+    FILE *stack_fptr=NULL;     /* output file pointer for CSV stack */
+    FILE *extent_fptr=NULL;    /* output file pointer for file extents */
+
+    printf ("Generating CSV stack file and maximum extents ...\n");
+
+    /* Read the command-line arguments, including the name of the input
+       list of files and the output files for the stack and extents */
+    retval = get_args (argc, argv, &list_infile, &stack_file, &extent_file,
+        &num_threads, &verbose);
+    if (retval != SUCCESS)
+    {   /* get_args already printed the error message */
+        exit (ERROR);
+    }
+
+    /* Provide user information if verbose is turned on */
+    if (verbose)
+    {
+        printf ("  Input list file: %s\n", list_infile);
+        printf ("  Output stack file: %s\n", stack_file);
+        printf ("  Output extent file: %s\n", extent_file);
+        printf ("  Number of threads: %d\n", num_threads);
+    }
+
+    /* Read the list of XML files */
+    if (read_list (list_infile, &xml_infile, &nfiles) != SUCCESS)
+    {   /* read_list already printed the error message */
+        exit (ERROR);
+    }
+    if (verbose)
+        printf ("Input list file contains %d filenames\n", nfiles);
+
+    /* Allocate memory for the metadata and parse status of each file */
+    scene_meta = (Ba_scene_meta_t *) calloc (nfiles + 1,
+        sizeof (Ba_scene_meta_t));
+    status = (int *) calloc (nfiles + 1, sizeof (int));
+    if (scene_meta == NULL || status == NULL)
+    {
+        sprintf (errmsg, "Error allocating memory for the metadata of %d "
+            "XML files.", nfiles);
+        error_handler (true, FUNC_NAME, errmsg);
+        exit (ERROR);
+    }
+
+    /* Initialize libxml2 before the threads are started, so the parsers in
+       each thread share the same global state */
+    xmlInitParser ();
+
+    /* Parse the XML files in parallel.  Each thread takes the next file off
+       the queue until all the files have been parsed. */
+    queue.xml_infile = xml_infile;
+    queue.nfiles = nfiles;
+    queue.next_file = 0;
+    queue.verbose = verbose;
+    queue.scene_meta = scene_meta;
+    queue.status = status;
+    pthread_mutex_init (&queue.lock, NULL);
+
+    nthreads = 0;
+    for (i = 0; i < num_threads && i < nfiles; i++)
+    {
+        if (pthread_create (&threads[i], NULL, parse_worker, &queue) != 0)
+        {
+            sprintf (errmsg, "Unable to create parsing thread %d.  Using "
+                "%d threads.", i, nthreads);
+            error_handler (false, FUNC_NAME, errmsg);
+            break;
+        }
+        nthreads++;
+    }
+
+    /* If no threads could be started then parse the files in this thread */
+    if (nthreads == 0)
+        parse_worker (&queue);
+
+    for (i = 0; i < nthreads; i++)
+        pthread_join (threads[i], NULL);
+    pthread_mutex_destroy (&queue.lock);
+
+    /* Open the output CSV stack file */
+    stack_fptr = fopen (stack_file, "w");
+    if (stack_fptr == NULL)
+    {
+        sprintf (errmsg, "Unable to open the output CSV stack file: %s",
+            stack_file);
+        error_handler (true, FUNC_NAME, errmsg);
+        exit (ERROR);
+    }
+
+    /* Write the header for the stack file */
+    fprintf (stack_fptr, "file, year, season, month, day, julian, path, row, "
+        "satellite, west, east, north, south, nrow, ncol, dx, dy, utm_zone\n");
+
+    /* Loop through each of the parsed files, in the order of the input list,
+       writing the stack information and determining the maximum extents */
+    nvalid = 0;
+    for (i = 0; i < nfiles; i++)
+    {
+        if (status[i] != SUCCESS)
+        {  /* trouble processing this file so skip and go to the next one */
+            sprintf (errmsg, "Error processing file %s.  Skipping and moving "
+                "to the next file.", xml_infile[i]);
+            error_handler (false, FUNC_NAME, errmsg);
+            continue;
+        }
+        meta = &scene_meta[i];
+
+        /* Write the stack information */
+        fprintf (stack_fptr, "%s, %d, %s, %d, %d, %d, %d, %d, %s, "
+            "%lf, %lf, %lf, %lf, %d, %d, %f, %f, %d\n",
+            meta->filename, meta->acq_date.year, meta->season,
+            meta->acq_date.month, meta->acq_date.day,
+            meta->acq_date.doy, meta->wrs_path, meta->wrs_row,
+            meta->satellite, meta->bounding_coords[ESPA_WEST],
+            meta->bounding_coords[ESPA_EAST],
+            meta->bounding_coords[ESPA_NORTH],
+            meta->bounding_coords[ESPA_SOUTH],
+            meta->nlines, meta->nsamps,
+            meta->pixel_size[0], meta->pixel_size[1],
+            meta->utm_zone);
+
+        /* Determine the maximum bounds, starting with the bounds from the
+           first valid file */
+        if (nvalid == 0)
+        {
+            west_coord = meta->proj_extent[ESPA_WEST];
+            east_coord = meta->proj_extent[ESPA_EAST];
+            north_coord = meta->proj_extent[ESPA_NORTH];
+            south_coord = meta->proj_extent[ESPA_SOUTH];
+        }
+        else
+        {
+            if (meta->proj_extent[ESPA_WEST] < west_coord)
+                west_coord = meta->proj_extent[ESPA_WEST];
+            if (meta->proj_extent[ESPA_EAST] > east_coord)
+                east_coord = meta->proj_extent[ESPA_EAST];
+            if (meta->proj_extent[ESPA_NORTH] > north_coord)
+                north_coord = meta->proj_extent[ESPA_NORTH];
+            if (meta->proj_extent[ESPA_SOUTH] < south_coord)
+                south_coord = meta->proj_extent[ESPA_SOUTH];
+        }
+        nvalid++;
+    }
+
+    /* Close the output stack file */
+    fclose (stack_fptr);
+
+    /* Open the output bounding extents file */
+    extent_fptr = fopen (extent_file, "w");
+    if (extent_fptr == NULL)
+    {
+        sprintf (errmsg, "Unable to open the output bounding extents file: %s",
+            extent_file);
+        error_handler (true, FUNC_NAME, errmsg);
+        exit (ERROR);
+    }
+
+    if (verbose)
+    {
+        printf ("\n%d of %d files were successfully processed\n", nvalid,
+            nfiles);
+        printf ("\nMaximum extents of list --\n");
+        printf ("  East: %lf\n", east_coord);
+        printf ("  West: %lf\n", west_coord);
+        printf ("  North: %lf\n", north_coord);
+        printf ("  South: %lf\n", south_coord);
+    }
+
+    /* Write the bounding extents */
+    fprintf (extent_fptr, "West, North, East, South\n");
+    fprintf (extent_fptr, "%f, %f, %f, %f", west_coord, north_coord,
+        east_coord, south_coord);
+
+    /* Close the output file */
+    fclose (extent_fptr);
+
+    /* Free the filename pointers and metadata */
+    for (i = 0; i < nfiles; i++)
+        free (xml_infile[i]);
+    free (xml_infile);
+    free (scene_meta);
+    free (status);
+    xmlCleanupParser ();
+
+    free (list_infile);
+    free (stack_file);
+    free (extent_file);
+
+    /* Indicate successful completion of processing */
+    printf ("Stack file and maximum extent generation complete!\n");
+    exit (SUCCESS);
+}
+
+
+/******************************************************************************
+MODULE:  parse_worker
+
+PURPOSE:  Parses the XML files off the queue until the queue is empty.
+
+RETURN VALUE:
+Type = void *
+Value           Description
+-----           -----------
+NULL            Always
+
+PROJECT:  Land Satellites Data System Science Research and Development (LSRD)
+at the USGS EROS
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/18/2026    LSRD Project     Original Development
+
+NOTES:
+  1. The metadata and status of each file are written to the slot for that
+     file in the queue, so no locking is needed beyond taking the next file.
+******************************************************************************/
+void *parse_worker
+(
+    void *arg             /* I/O: parse queue (Ba_parse_queue_t *) */
+)
+{
+    int i;                                  /* index of the current file */
+    Ba_parse_queue_t *queue = (Ba_parse_queue_t *) arg;  /* parse queue */
+
+    while (1)
+    {
+        /* Take the next file off the queue */
+        pthread_mutex_lock (&queue->lock);
+        i = queue->next_file++;
+        pthread_mutex_unlock (&queue->lock);
+        if (i >= queue->nfiles)
+            break;
+
+        if (queue->verbose)
+            printf ("Processing current file %d: %s\n", i,
+                queue->xml_infile[i]);
+
+        /* Parse the current file */
+        queue->status[i] = read_xml (queue->xml_infile[i],
+            &queue->scene_meta[i]);
+    }
+
+    return (NULL);
+}
+
+
+/******************************************************************************
+MODULE:  read_list
+
+PURPOSE:  Reads the list of XML files, skipping blank lines.
+
+RETURN VALUE:
+Type = int
+Value           Description
+-----           -----------
+ERROR           Error opening or reading the list
+SUCCESS         No errors encountered
+
+PROJECT:  Land Satellites Data System Science Research and Development (LSRD)
+at the USGS EROS
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/18/2026    LSRD Project     Original Development, pulled from the main
+                               of generate_stack
+
+NOTES:
+  1. Memory is allocated for the array of filenames.  The caller is
+     responsible for freeing each of the nfiles filenames and the array.
+******************************************************************************/
+int read_list
+(
+    char *list_infile,    /* I: input list of XML files */
+    char ***xml_infile,   /* O: address of array of XML filenames */
+    int *nfiles           /* O: number of XML filenames in the array */
+)
+{
+    char FUNC_NAME[] = "read_list";  /* function name */
+    char errmsg[STR_SIZE];     /* error message */
+    char **files = NULL;       /* array of XML filenames */
+    int i;                     /* looping variable */
+    int curr_line;             /* counter of the current line */
+    int nlines;                /* number of lines in the input list */
+    int count;                 /* count of items read from file */
+    FILE *list_fptr=NULL;      /* input file pointer for list of files */
+
+    /* Open the input list of reflectance files */
+    list_fptr = fopen (list_infile, "r");
+    if (list_fptr == NULL)
+    {
+        sprintf (errmsg, "Unable to open the input temporal list file: %s",
+            list_infile);
+        error_handler (true, FUNC_NAME, errmsg);
+        return (ERROR);
+    }
+
+    /* Determine the maximum number of reflectance files in the input file.
+       Note the first scanf grabs lines with text.  If that fails, the second
+       scanf grabs empty lines.  We'll count all of them for now and then only
+       read the non-empty lines. */
+    nlines = 0;
+    while (EOF != (fscanf (list_fptr, "%*[^\n]"), fscanf (list_fptr, "%*c")))
+        nlines++;
+
+    /* Allocate memory for the list of filenames */
+    files = (char **) calloc (nlines + 1, sizeof (char *));
+    if (files == NULL)
+    {
+        sprintf (errmsg, "Error allocating memory for array of %d strings "
+            "to hold the list of XML filenames.", nlines);
+        error_handler (true, FUNC_NAME, errmsg);
+        fclose (list_fptr);
+        return (ERROR);
+    }
+    for (i = 0; i < nlines; i++)
+    {
+        files[i] = (char *) calloc (STR_SIZE, sizeof (char));
+        if (files[i] == NULL)
+        {
+            sprintf (errmsg, "Error allocating memory for array of %d "
+                "strings to hold the list of XML filenames.", nlines);
+            error_handler (true, FUNC_NAME, errmsg);
+            fclose (list_fptr);
+            return (ERROR);
+        }
+    }
+
+    /* Read the list of XML files in the input file */
+    rewind (list_fptr);
+    curr_line = 0;
+    for (i = 0; i < nlines; i++)
+    {
+        count = fscanf (list_fptr, "%s[^\n]", &files[curr_line][0]);
+        if (count == EOF)
+            break;
+        else if (count == 0)
+        { /* blank line so skip and move to the next; don't count the line */
+            fscanf (list_fptr, "%*c");
+        }
+        else
+            curr_line++;
+    }
+
+    /* Close the input file */
+    fclose (list_fptr);
+
+    /* Free the filenames for the blank lines */
+    for (i = curr_line; i < nlines; i++)
+        free (files[i]);
+
+    *xml_infile = files;
+    *nfiles = curr_line;
+    return (SUCCESS);
+}
+
+
+/******************************************************************************
+MODULE:  usage
+
+PURPOSE:  Prints the usage information for this application.
+
+RETURN VALUE:
+Type = None
+
+HISTORY:
+Date          Programmer       Reason
+--------      ---------------  -------------------------------------
+10/18/2026    LSRD Project     Original Development
+
+NOTES:
+******************************************************************************/
+void usage ()
+{
+    printf ("stack_metadata generates the CSV file which contains the "
+            "stack of input files along with their associated metadata "
+            "needed for processing burned area products, and determines "
+            "the maximum extent bounds in projection coordinates for the "
+            "stack.  Each XML file is only parsed once.\n\n");
+    printf ("usage: stack_metadata "
+            "--list_file=input_list_file "
+            "--stack_file=output_stack_csv_filename "
+            "--extent_file=output_extent_filename "
+            "[--num_threads=n] [--verbose]\n");
+
+    printf ("\nwhere the following parameters are required:\n");
+    printf ("    -list_file: name of the input text file containing the list "
+            "of XML files to be processed, one file per line\n");
+    printf ("    -stack_file: name of the output CSV file containing the "
+            "list of files and associated metadata\n");
+    printf ("    -extent_file: name of the output file containing the "
+            "maximum spatial extents in projection coords\n");
+    printf ("\nwhere the following parameters are optional:\n");
+    printf ("    -num_threads: number of threads for parsing the XML files "
+            "(default is 1, maximum is %d)\n", MAX_THREADS);
+    printf ("    -verbose: should intermediate messages be printed? (default "
+            "is false)\n");
+    printf ("\nstack_metadata --help will print the usage statement\n");
+    printf ("\nExample: stack_metadata "
+            "--list_file=input_list.txt --stack_file=input_stack.csv "
+            "--extent_file=bounding_box_coordinates.csv --num_threads=4 "
+            "--verbose\n");
+}
+
+
+/******************************************************************************
+MODULE:  get_args
+
+PURPOSE:  Gets the command-line arguments and validates that the required
+arguments were specified.
+
+RETURN VALUE:
+Type = int
+Value           Description
+-----           -----------
+ERROR           Error getting the command-line arguments or a command-line
+                argument and associated value were not specified
+SUCCESS         No errors encountered
+
+PROJECT:  Land Satellites Data System Science Research and Development (LSRD)
+at the USGS EROS
+
+HISTORY:
+Date          Programmer       Reason
+----------    ---------------  -------------------------------------
+10/18/2026    LSRD Project     Original Development
+
+NOTES:
+  1. Memory is allocated for the input and output files.  All of these should
+     be character pointers set to NULL on input.  The caller is responsible
+     for freeing the allocated memory upon successful return.
+******************************************************************************/
+short get_args
+(
+    int argc,             /* I: number of cmd-line args */
+    char *argv[],         /* I: string of cmd-line args */
+    char **list_infile,   /* O: address of input list filename */
+    char **stack_outfile, /* O: address of output stack filename */
+    char **extent_outfile, /* O: address of output extents filename */
+    int *num_threads,     /* O: number of parsing threads */
+    bool *verbose         /* O: verbose flag */
+)
+{
+    int c;                           /* current argument index */
+    int option_index;                /* index for the command-line option */
+    static int verbose_flag=0;       /* verbose flag */
+    char errmsg[STR_SIZE];           /* error message */
+    char FUNC_NAME[] = "get_args";   /* function name */
+    static struct option long_options[] =
+    {
+        {"verbose", no_argument, &verbose_flag, 1},
+        {"list_file", required_argument, 0, 'l'},
+        {"stack_file", required_argument, 0, 's'},
+        {"extent_file", required_argument, 0, 'o'},
+        {"num_threads", required_argument, 0, 'n'},
+        {"help", no_argument, 0, 'h'},
+        {0, 0, 0, 0}
+    };
+
+    /* Default to a single parsing thread */
+    *num_threads = 1;
+
+    /* Loop through all the cmd-line options */
+    opterr = 0;   /* turn off getopt_long error msgs as we'll print our own */
+    while (1)
+    {
+        /* optstring in call to getopt_long is empty since we will only
+           support the long options */
+        c = getopt_long (argc, argv, "", long_options, &option_index);
+        if (c == -1)
+        {   /* Out of cmd-line options */
+            break;
+        }
+
+        switch (c)
+        {
+            case 0:
+                /* If this option set a flag, do nothing else now. */
+                if (long_options[option_index].flag != 0)
+                    break;
+
+            case 'h':  /* help */
+                usage ();
+                return (ERROR);
+                break;
+
+            case 'l':  /* list infile */
+                *list_infile = strdup (optarg);
+                break;
+
+            case 's':  /* stack outfile */
+                *stack_outfile = strdup (optarg);
+                break;
+
+            case 'o':  /* extent outfile */
+                *extent_outfile = strdup (optarg);
+                break;
+
+            case 'n':  /* number of threads */
+                *num_threads = atoi (optarg);
+                break;
+
+            case '?':
+            default:
+                sprintf (errmsg, "Unknown option %s", argv[optind-1]);
+                error_handler (true, FUNC_NAME, errmsg);
+                usage ();
+                return (ERROR);
+                break;
+        }
+    }
+
+    /* Make sure the infiles and outfiles were specified */
+    if (*list_infile == NULL)
+    {
+        sprintf (errmsg, "Reflectance list input file is a required argument");
+        error_handler (true, FUNC_NAME, errmsg);
+        usage ();
+        return (ERROR);
+    }
+
+    if (*stack_outfile == NULL)
+    {
+        sprintf (errmsg, "Stack CSV output file is a required argument");
+        error_handler (true, FUNC_NAME, errmsg);
+        usage ();
+        return (ERROR);
+    }
+
+    if (*extent_outfile == NULL)
+    {
+        sprintf (errmsg, "Extents output file is a required argument");
+        error_handler (true, FUNC_NAME, errmsg);
+        usage ();
+        return (ERROR);
+    }
+
+    /* Validate the number of threads */
+    if (*num_threads < 1)
+    {
+        sprintf (errmsg, "Number of threads must be at least 1");
+        error_handler (true, FUNC_NAME, errmsg);
+        usage ();
+        return (ERROR);
+    }
+    else if (*num_threads > MAX_THREADS)
+    {
+        sprintf (errmsg, "Number of threads is limited to %d", MAX_THREADS);
+        error_handler (false, FUNC_NAME, errmsg);
+        *num_threads = MAX_THREADS;
+    }
+
+    /* Check the verbose flag */
+    if (verbose_flag)
+        *verbose = true;
+    else
+        *verbose = false;
+
+    return (SUCCESS);
+}
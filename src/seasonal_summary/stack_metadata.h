@@ -0,0 +1,56 @@
+#ifndef _STACK_METADATA_H_
+#define _STACK_METADATA_H_
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <math.h>
+#include <stdbool.h>
+#include <pthread.h>
+#include "error_handler.h"
+#include "raw_binary_io.h"
+#include "espa_metadata.h"
+#include "parse_metadata.h"
+#include "scene_meta.h"
+
+/* Local defines */
+#define MAX_THREADS 64       /* maximum number of parsing threads */
+
+typedef struct
+{
+    char **xml_infile;            /* list of input XML filenames */
+    int nfiles;                   /* number of files in the list */
+    int next_file;                /* index of the next file to be parsed */
+    pthread_mutex_t lock;         /* lock for next_file */
+    bool verbose;                 /* verbose flag for printing messages */
+    Ba_scene_meta_t *scene_meta;  /* O: metadata for each file */
+    int *status;                  /* O: status of the parse for each file */
+} Ba_parse_queue_t;
+
+/* Prototypes */
+void usage ();
+
+short get_args
+(
+    int argc,             /* I: number of cmd-line args */
+    char *argv[],         /* I: string of cmd-line args */
+    char **list_infile,   /* O: address of input list filename */
+    char **stack_outfile, /* O: address of output stack filename */
+    char **extent_outfile, /* O: address of output extents filename */
+    int *num_threads,     /* O: number of parsing threads */
+    bool *verbose         /* O: verbose flag */
+);
+
+int read_list
+(
+    char *list_infile,    /* I: input list of XML files */
+    char ***xml_infile,   /* O: address of array of XML filenames */
+    int *nfiles           /* O: number of XML filenames in the array */
+);
+
+void *parse_worker
+(
+    void *arg             /* I/O: parse queue (Ba_parse_queue_t *) */
+);
+
+#endif